@@ -186,6 +186,11 @@ class Settings:
             'min_news_items': 3,
             'min_social_mentions': 10,
             'source_diversity_bonus': 1.2
+        },
+        'transformer': {
+            'batch_size': int(os.getenv('SENTIMENT_BATCH_SIZE', '16')),
+            'max_length': int(os.getenv('SENTIMENT_MAX_LENGTH', '512')),
+            'memo_size': int(os.getenv('SENTIMENT_MEMO_SIZE', '4096'))
         }
     }
     
@@ -240,6 +245,17 @@ class Settings:
             'regulation': ['APRA', 'ASIC', 'regulation', 'compliance', 'capital'],
             'monetary': ['RBA', 'interest rate', 'cash rate', 'monetary policy'],
             'market': ['ASX', 'share price', 'dividend', 'earnings', 'profit']
+        },
+        'collection': {
+            'max_workers': int(os.getenv('NEWS_MAX_WORKERS', '8')),
+            'requests_per_second_per_host': float(os.getenv('NEWS_HOST_RATE_LIMIT', '1.0')),
+            'host_burst': 1,
+            # One deadline for the whole fan-out of news sources for a symbol
+            'collection_deadline_seconds': int(os.getenv('NEWS_COLLECTION_DEADLINE', '60')),
+            'rss_max_workers': int(os.getenv('NEWS_RSS_MAX_WORKERS', '6')),
+            # Titles whose word sets overlap by more than this are the same story
+            'dedup_similarity_threshold': float(os.getenv('NEWS_DEDUP_THRESHOLD', '0.8')),
+            'dedup_max_age_days': int(os.getenv('NEWS_DEDUP_MAX_AGE_DAYS', '14'))
         }
     }
     
@@ -312,6 +328,10 @@ class Settings:
         'duration_minutes': int(os.getenv('CACHE_DURATION_MINUTES', '15')),
         'max_size_mb': int(os.getenv('MAX_CACHE_SIZE_MB', '100')),
         'cleanup_frequency_hours': 24,
+        'rss_feed_ttl_minutes': int(os.getenv('RSS_FEED_TTL_MINUTES', '15')),
+        'sentiment_score_max_entries': int(os.getenv('SENTIMENT_SCORE_CACHE_MAX_ENTRIES', '200000')),
+        'sentiment_score_max_age_days': int(os.getenv('SENTIMENT_SCORE_CACHE_MAX_AGE_DAYS', '30')),
+        'ohlcv_refresh_minutes': int(os.getenv('OHLCV_REFRESH_MINUTES', '5')),
         'enable_redis': os.getenv('REDIS_URL') is not None
     }
     
@@ -1,6 +1,18 @@
 """Analysis components package"""
 
-from .technical import TechnicalAnalyzer
-from .news_impact import NewsImpactAnalyzer
+import importlib
 
-__all__ = ["TechnicalAnalyzer", "NewsImpactAnalyzer"]
\ No newline at end of file
+# Lazy imports so importing one analyzer (e.g. pattern_ai) does not load
+# news_impact and its scipy dependency
+_LAZY_EXPORTS = {
+    "TechnicalAnalyzer": ".technical",
+    "NewsImpactAnalyzer": ".news_impact",
+}
+
+__all__ = ["TechnicalAnalyzer", "NewsImpactAnalyzer"]
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Incremental Indicator State
+Streaming versions of the TechnicalAnalyzer indicators that update in O(1) per
+bar and can be saved between runs, so history only has to be replayed once
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from app.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Recent closes kept for the 1/5/20-bar momentum and the volume direction signal
+RECENT_CLOSES = 21
+
+
+class _RollingWindow:
+    """
+    Fixed-size window with a running sum, equivalent to
+    Series.rolling(window=size).mean() for the newest bar.
+
+    The sum is recomputed from the window once per `size` updates so
+    rounding errors cannot build up over long streams. NaN and non-zero
+    counts are tracked so a window of all zeros averages to exactly 0.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.nan_count = 0
+        self.nonzero_count = 0
+        self._since_resync = 0
+
+    def append(self, value: float):
+        if len(self.values) == self.size:
+            self._remove(self.values[0])
+        self.values.append(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+            self.nonzero_count += value != 0
+
+        self._since_resync += 1
+        if self._since_resync >= self.size:
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+            self._since_resync = 0
+
+    def _remove(self, value: float):
+        if math.isnan(value):
+            self.nan_count -= 1
+        else:
+            self.total -= value
+            self.nonzero_count -= value != 0
+
+    def mean(self, pending: Optional[float] = None) -> float:
+        """Window mean, optionally as if `pending` had been appended; NaN until the window is full"""
+        total, count = self.total, len(self.values)
+        nan_count, nonzero_count = self.nan_count, self.nonzero_count
+        if pending is not None:
+            if count == self.size:
+                dropped = self.values[0]
+                if math.isnan(dropped):
+                    nan_count -= 1
+                else:
+                    total -= dropped
+                    nonzero_count -= dropped != 0
+            else:
+                count += 1
+            if math.isnan(pending):
+                nan_count += 1
+            else:
+                total += pending
+                nonzero_count += pending != 0
+
+        if count < self.size or nan_count:
+            return float('nan')
+        if not nonzero_count:
+            return 0.0
+        return total / self.size
+
+    def to_dict(self) -> Dict:
+        return {'size': self.size, 'values': [None if math.isnan(v) else v for v in self.values]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> '_RollingWindow':
+        window = cls(data['size'])
+        for value in data['values']:
+            window.append(float('nan') if value is None else value)
+        return window
+
+
+class _AdjustedEWM:
+    """
+    Exponentially weighted mean with pandas' default adjust=True weighting,
+    equivalent to Series.ewm(span=span).mean() for the newest bar.
+    """
+
+    def __init__(self, span: int, numerator: float = 0.0, denominator: float = 0.0):
+        self.span = span
+        self.decay = 1 - 2 / (span + 1)
+        self.numerator = numerator
+        self.denominator = denominator
+
+    def append(self, value: float):
+        self.numerator = value + self.decay * self.numerator
+        self.denominator = 1 + self.decay * self.denominator
+
+    def value(self, pending: Optional[float] = None) -> float:
+        if pending is not None:
+            return (pending + self.decay * self.numerator) / (1 + self.decay * self.denominator)
+        if not self.denominator:
+            return float('nan')
+        return self.numerator / self.denominator
+
+    def to_dict(self) -> Dict:
+        return {'span': self.span, 'numerator': self.numerator, 'denominator': self.denominator}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> '_AdjustedEWM':
+        return cls(data['span'], data['numerator'], data['denominator'])
+
+
+class IndicatorState:
+    """
+    Streaming indicator state for one (symbol, interval).
+
+    Feeding the bars of a series one at a time through update() gives the
+    same values TechnicalAnalyzer._calculate_indicators computes over the
+    whole series: the 14-bar RSI, MACD(12, 26, 9), the configured SMA and
+    EMA periods and the 20-bar volume average. Bars with a missing close
+    are skipped.
+
+    indicators() can also evaluate a pending bar (e.g. the latest tick of
+    a bar that is still forming) without committing it to the state.
+    """
+
+    def __init__(self, symbol: str, interval: str = '1d', rsi_period: int = 14,
+                 sma_periods: Iterable[int] = (20, 50, 200), ema_periods: Iterable[int] = (12, 26),
+                 macd_fast: int = 12, macd_slow: int = 26, macd_signal: int = 9,
+                 volume_period: int = 20):
+        self.symbol = symbol
+        self.interval = interval
+        self.rsi_period = rsi_period
+        self.volume_period = volume_period
+        self.macd_slow = macd_slow
+
+        self.bars = 0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.has_volume = True
+        self.recent_closes = deque(maxlen=RECENT_CLOSES)
+
+        self.gains = _RollingWindow(rsi_period)
+        self.losses = _RollingWindow(rsi_period)
+        self.sma = {period: _RollingWindow(period) for period in sma_periods}
+        self.ema = {period: _AdjustedEWM(period) for period in ema_periods}
+        self.macd_fast = _AdjustedEWM(macd_fast)
+        self.macd_slow_ewm = _AdjustedEWM(macd_slow)
+        self.macd_signal = _AdjustedEWM(macd_signal)
+        self.volume = _RollingWindow(volume_period)
+
+    @classmethod
+    def from_settings(cls, symbol: str, interval: str, technical_settings: Dict) -> 'IndicatorState':
+        """Create a state with the periods of Settings.TECHNICAL_INDICATORS"""
+        return cls(
+            symbol, interval,
+            rsi_period=technical_settings['RSI']['period'],
+            sma_periods=technical_settings['SMA']['periods'],
+            ema_periods=technical_settings['EMA']['periods'],
+            macd_fast=technical_settings['MACD']['fast'],
+            macd_slow=technical_settings['MACD']['slow'],
+            macd_signal=technical_settings['MACD']['signal'],
+            volume_period=technical_settings['VOLUME']['ma_period'],
+        )
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return self.recent_closes[-1] if self.recent_closes else None
+
+    def update(self, close: float, volume: Optional[float] = None, timestamp=None):
+        """Commit one completed bar"""
+        close = float(close)
+        if math.isnan(close):
+            return
+
+        gain, loss = self._gain_loss(close)
+        self.gains.append(gain)
+        self.losses.append(loss)
+        for window in self.sma.values():
+            window.append(close)
+        for ewm in self.ema.values():
+            ewm.append(close)
+        self.macd_fast.append(close)
+        self.macd_slow_ewm.append(close)
+        self.macd_signal.append(self.macd_fast.value() - self.macd_slow_ewm.value())
+        self.volume.append(float('nan') if volume is None else float(volume))
+
+        self.recent_closes.append(close)
+        self.bars += 1
+        if timestamp is not None:
+            self.last_timestamp = pd.Timestamp(timestamp)
+
+    def update_frame(self, data: pd.DataFrame) -> int:
+        """
+        Commit the bars of an OHLCV frame that are newer than the last
+        committed one. Returns the number of bars added.
+        """
+        if data.empty:
+            return 0
+        if self.bars == 0:
+            self.has_volume = 'Volume' in data.columns
+
+        new_bars = data
+        if self.last_timestamp is not None:
+            new_bars = data[data.index > self._comparable(self.last_timestamp, data.index)]
+
+        closes = new_bars['Close'].to_numpy(dtype=float)
+        volumes = new_bars['Volume'].to_numpy(dtype=float) if self.has_volume else [None] * len(closes)
+        before = self.bars
+        for timestamp, close, volume in zip(new_bars.index, closes, volumes):
+            self.update(close, volume, timestamp)
+        return self.bars - before
+
+    def is_continuation(self, data: pd.DataFrame) -> bool:
+        """
+        Whether data extends this state without a gap: it must contain the
+        last committed bar, so no bars in between can have been missed.
+        """
+        if self.last_timestamp is None:
+            return self.bars == 0
+        if data.empty:
+            return True
+        return self._comparable(self.last_timestamp, data.index) in data.index
+
+    def indicators(self, close: Optional[float] = None, volume: Optional[float] = None) -> Dict:
+        """
+        Indicator values in the format of TechnicalAnalyzer._calculate_indicators.
+
+        Args:
+            close: Close of a pending bar to include without committing it.
+            volume: Volume of the pending bar.
+        """
+        pending = close is not None and not math.isnan(float(close))
+        bars = self.bars + 1 if pending else self.bars
+        price = float(close) if pending else self.last_close
+        if price is None:
+            price = 0.0
+
+        # Pending values for every window, or None to read the committed state
+        gain = loss = macd_pending = volume_pending = None
+        if pending:
+            gain, loss = self._gain_loss(price)
+            macd_pending = self.macd_fast.value(price) - self.macd_slow_ewm.value(price)
+            volume_pending = float('nan') if volume is None else float(volume)
+
+        indicators = {'rsi': self._rsi(bars, gain, loss)}
+
+        if bars < self.macd_slow:
+            line = signal = histogram = 0.0
+        else:
+            line = macd_pending if pending else self.macd_fast.value() - self.macd_slow_ewm.value()
+            signal = self.macd_signal.value(macd_pending)
+            histogram = line - signal
+        indicators['macd'] = {
+            'line': _finite_or(line, 0.0),
+            'signal': _finite_or(signal, 0.0),
+            'histogram': _finite_or(histogram, 0.0)
+        }
+
+        indicators['sma'] = {}
+        for period, window in self.sma.items():
+            value = window.mean(price if pending else None) if bars >= period else price
+            indicators['sma'][f'sma_{period}'] = _finite_or(value, price)
+
+        indicators['ema'] = {}
+        for period, ewm in self.ema.items():
+            value = ewm.value(price if pending else None) if bars >= period else price
+            indicators['ema'][f'ema_{period}'] = _finite_or(value, price)
+
+        if not self.has_volume or bars < self.volume_period:
+            indicators['volume'] = {'current': 0, 'average': 0, 'ratio': 1}
+        else:
+            if pending:
+                current = volume_pending
+            else:
+                current = self.volume.values[-1]
+            average = self.volume.mean(volume_pending)
+            indicators['volume'] = {
+                'current': current,
+                'average': average,
+                'ratio': current / average if average > 0 else 1
+            }
+
+        return indicators
+
+    def recent_frame(self, close: Optional[float] = None) -> pd.DataFrame:
+        """
+        The last closes as a frame for TechnicalAnalyzer's momentum, signal
+        and trend calculations, optionally ending with a pending close
+        """
+        closes = list(self.recent_closes)
+        if close is not None and not math.isnan(float(close)):
+            closes = (closes + [float(close)])[-RECENT_CLOSES:]
+        return pd.DataFrame({'Close': closes})
+
+    def _gain_loss(self, close: float):
+        # The first bar has no change and counts as a zero gain and loss,
+        # like the NaN diff that .where() replaces with 0
+        previous = self.last_close
+        delta = 0.0 if previous is None else close - previous
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    def _rsi(self, bars: int, gain: Optional[float], loss: Optional[float]) -> float:
+        if bars < self.rsi_period:
+            return 50.0
+        average_gain = self.gains.mean(gain)
+        average_loss = self.losses.mean(loss)
+        if math.isnan(average_gain) or math.isnan(average_loss):
+            return 50.0
+        # Same as dividing by loss.replace(0, np.inf)
+        rs = average_gain / average_loss if average_loss != 0 else 0.0
+        return float(100 - (100 / (1 + rs)))
+
+    @staticmethod
+    def _comparable(timestamp: pd.Timestamp, index: pd.Index) -> pd.Timestamp:
+        """Convert timestamp to the timezone awareness of index"""
+        index_tz = getattr(index, 'tz', None)
+        if index_tz is not None:
+            if timestamp.tzinfo is None:
+                return timestamp.tz_localize('UTC').tz_convert(index_tz)
+            return timestamp.tz_convert(index_tz)
+        if timestamp.tzinfo is not None:
+            return timestamp.tz_convert('UTC').tz_localize(None)
+        return timestamp
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': STATE_VERSION,
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'rsi_period': self.rsi_period,
+            'volume_period': self.volume_period,
+            'macd_slow': self.macd_slow,
+            'bars': self.bars,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            'has_volume': self.has_volume,
+            'recent_closes': list(self.recent_closes),
+            'gains': self.gains.to_dict(),
+            'losses': self.losses.to_dict(),
+            'sma': {str(period): window.to_dict() for period, window in self.sma.items()},
+            'ema': {str(period): ewm.to_dict() for period, ewm in self.ema.items()},
+            'macd_fast': self.macd_fast.to_dict(),
+            'macd_slow_ewm': self.macd_slow_ewm.to_dict(),
+            'macd_signal': self.macd_signal.to_dict(),
+            'volume': self.volume.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'IndicatorState':
+        if data.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')}")
+
+        state = cls(data['symbol'], data['interval'], rsi_period=data['rsi_period'],
+                    sma_periods=(), ema_periods=(), macd_slow=data['macd_slow'],
+                    volume_period=data['volume_period'])
+        state.bars = data['bars']
+        state.last_timestamp = pd.Timestamp(data['last_timestamp']) if data['last_timestamp'] else None
+        state.has_volume = data['has_volume']
+        state.recent_closes.extend(data['recent_closes'])
+        state.gains = _RollingWindow.from_dict(data['gains'])
+        state.losses = _RollingWindow.from_dict(data['losses'])
+        state.sma = {int(period): _RollingWindow.from_dict(window) for period, window in data['sma'].items()}
+        state.ema = {int(period): _AdjustedEWM.from_dict(ewm) for period, ewm in data['ema'].items()}
+        state.macd_fast = _AdjustedEWM.from_dict(data['macd_fast'])
+        state.macd_slow_ewm = _AdjustedEWM.from_dict(data['macd_slow_ewm'])
+        state.macd_signal = _AdjustedEWM.from_dict(data['macd_signal'])
+        state.volume = _RollingWindow.from_dict(data['volume'])
+        return state
+
+    def matches_settings(self, technical_settings: Dict) -> bool:
+        """Whether this state was built with the periods currently configured"""
+        return (
+            self.rsi_period == technical_settings['RSI']['period']
+            and list(self.sma) == list(technical_settings['SMA']['periods'])
+            and list(self.ema) == list(technical_settings['EMA']['periods'])
+            and self.macd_fast.span == technical_settings['MACD']['fast']
+            and self.macd_slow == technical_settings['MACD']['slow']
+            and self.macd_signal.span == technical_settings['MACD']['signal']
+            and self.volume_period == technical_settings['VOLUME']['ma_period']
+        )
+
+
+def _finite_or(value: float, default: float) -> float:
+    value = float(value)
+    return default if math.isnan(value) else value
+
+
+class IndicatorStateStore:
+    """SQLite store of IndicatorState snapshots keyed by (symbol, interval)"""
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the IndicatorStateStore.
+
+        Args:
+            db_path: SQLite file, DATA_DIR/indicator_state.db by default.
+        """
+        self.db_path = Path(db_path) if db_path else Settings().DATA_DIR / 'indicator_state.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS indicator_state (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    last_timestamp TEXT,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (symbol, interval)
+                )
+            """)
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def load(self, symbol: str, interval: str = '1d') -> Optional[IndicatorState]:
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT state FROM indicator_state WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            ).fetchone()
+        if not row:
+            return None
+        try:
+            return IndicatorState.from_dict(json.loads(row[0]))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable indicator state for {symbol} {interval}: {e}")
+            return None
+
+    def save(self, state: IndicatorState):
+        last_timestamp = state.last_timestamp.isoformat() if state.last_timestamp is not None else None
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO indicator_state (symbol, interval, last_timestamp, state, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (state.symbol, state.interval, last_timestamp, json.dumps(state.to_dict()), time.time()))
+            conn.commit()
+
+    def delete(self, symbol: str, interval: Optional[str] = None):
+        with self.get_connection() as conn:
+            if interval is None:
+                conn.execute("DELETE FROM indicator_state WHERE symbol = ?", (symbol,))
+            else:
+                conn.execute("DELETE FROM indicator_state WHERE symbol = ? AND interval = ?", (symbol, interval))
+            conn.commit()
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_indicator_state_store() -> IndicatorStateStore:
+    """Return the process-wide indicator state store."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = IndicatorStateStore()
+        return _shared_store
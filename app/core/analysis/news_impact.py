@@ -20,6 +20,11 @@ from app.core.sentiment.history import SentimentHistoryManager
 
 logger = logging.getLogger(__name__)
 
+# Columns of an aligned sentiment/price frame
+ALIGNED_COLUMNS = ['date', 'sentiment', 'news_count', 'price_open', 'price_high', 'price_low',
+                   'price_close', 'volume', 'price_change_pct', 'price_change_abs',
+                   'intraday_volatility', 'events']
+
 class NewsImpactAnalyzer:
     """Analyzes correlation between news sentiment and price movements"""
     
@@ -38,10 +43,8 @@ class NewsImpactAnalyzer:
     def analyze_sentiment_price_correlation(self, symbol: str, days: int = 30) -> Dict:
         """Analyze correlation between sentiment and price movements"""
         try:
-            # Get historical sentiment data
-            # Get all sentiment history and filter by symbol later
-            all_history = self.sentiment_history.load_sentiment_history()
-            sentiment_history = [h for h in all_history if h.get("symbol") == symbol]
+            # Get historical sentiment data for this symbol only
+            sentiment_history = self.sentiment_history.get_sentiment_history(symbol=symbol)
             
             if not sentiment_history:
                 return self._empty_correlation_result(symbol)
@@ -55,144 +58,163 @@ class NewsImpactAnalyzer:
             # Align sentiment and price data
             aligned_data = self._align_sentiment_and_price_data(sentiment_history, price_data)
             
-            if not aligned_data:
+            if aligned_data.empty:
                 return self._empty_correlation_result(symbol)
             
-            # Calculate correlations
-            correlations = self._calculate_correlations(aligned_data)
-            
-            # Analyze event impact
-            event_impact = self._analyze_event_impact(aligned_data)
-            
-            # Calculate predictive metrics
-            predictive_metrics = self._calculate_predictive_metrics(aligned_data)
-            
-            result = {
-                'symbol': symbol,
-                'analysis_period_days': days,
-                'data_points': len(aligned_data),
-                'correlations': correlations,
-                'event_impact': event_impact,
-                'predictive_metrics': predictive_metrics,
-                'summary': self._generate_correlation_summary(correlations, event_impact),
-                'recommendations': self._generate_recommendations(correlations, event_impact)
-            }
-            
-            # Save results
-            self._save_correlation_results(symbol, result)
-            
-            return result
+            return self._build_correlation_result(symbol, days, aligned_data)
             
         except Exception as e:
             logger.error(f"Error analyzing sentiment-price correlation for {symbol}: {e}")
             return self._empty_correlation_result(symbol)
     
-    def _align_sentiment_and_price_data(self, sentiment_history: List[Dict], price_data: pd.DataFrame) -> List[Dict]:
-        """Align sentiment data with price data by date"""
-        try:
-            aligned_data = []
-            
-            # Ensure we have a proper date index/column
-            price_data = price_data.copy()  # Avoid modifying original data
-            
-            if isinstance(price_data.index, pd.DatetimeIndex):
-                # Data has datetime index (common with yfinance)
-                price_data['Date'] = price_data.index.date
+    def _build_correlation_result(self, symbol: str, days: int, aligned_data: pd.DataFrame) -> Dict:
+        """Correlation, event impact and predictive metrics for one symbol's aligned rows"""
+        # Calculate correlations
+        correlations = self._calculate_correlations(aligned_data)
+        
+        # Analyze event impact
+        event_impact = self._analyze_event_impact(aligned_data)
+        
+        # Calculate predictive metrics
+        predictive_metrics = self._calculate_predictive_metrics(aligned_data)
+        
+        result = {
+            'symbol': symbol,
+            'analysis_period_days': days,
+            'data_points': len(aligned_data),
+            'correlations': correlations,
+            'event_impact': event_impact,
+            'predictive_metrics': predictive_metrics,
+            'summary': self._generate_correlation_summary(correlations, event_impact),
+            'recommendations': self._generate_recommendations(correlations, event_impact)
+        }
+        
+        # Save results
+        self._save_correlation_results(symbol, result)
+        
+        return result
+    
+    def _sentiment_frame(self, sentiment_history: List[Dict]) -> pd.DataFrame:
+        """Sentiment records as one row each, in record order, keyed by calendar date"""
+        return pd.DataFrame({
+            'symbol': [entry.get('symbol') for entry in sentiment_history],
+            'date': pd.DatetimeIndex([datetime.fromisoformat(entry['timestamp']).date() for entry in sentiment_history],
+                                     dtype='datetime64[ns]'),
+            'sentiment': [entry.get('overall_sentiment', entry.get('sentiment_score', 0)) for entry in sentiment_history],
+            'news_count': [entry.get('news_count', 0) for entry in sentiment_history],
+            'events': [entry.get('significant_events', {}).get('events_detected', []) for entry in sentiment_history]
+        })
+    
+    def _price_frame(self, price_data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Daily price rows indexed by calendar date, with price changes against
+        the previous bar and intraday volatility computed column-wise.
+        The first bar of a date is used when a date has several.
+        """
+        if isinstance(price_data.index, pd.DatetimeIndex):
+            # Data has datetime index (common with yfinance)
+            dates = price_data.index
+        else:
+            # Try to find a date column, or a named date index
+            date_col = None
+            for col in ['Date', 'date', 'Datetime', 'datetime', 'timestamp']:
+                if col in price_data.columns:
+                    date_col = col
+                    break
+            
+            if date_col:
+                dates = pd.DatetimeIndex(pd.to_datetime(price_data[date_col]))
+            elif price_data.index.name in ['Date', 'date', 'Datetime', 'datetime']:
+                dates = pd.DatetimeIndex(pd.to_datetime(price_data.index))
             else:
-                # Try to find or create a date column
-                date_col = None
-                for col in ['Date', 'date', 'Datetime', 'datetime', 'timestamp']:
-                    if col in price_data.columns:
-                        date_col = col
-                        break
-                
-                if date_col:
-                    price_data['Date'] = pd.to_datetime(price_data[date_col]).dt.date
-                elif price_data.index.name in ['Date', 'date', 'Datetime', 'datetime']:
-                    # Index might be named but not datetime
-                    price_data = price_data.reset_index()
-                    price_data['Date'] = pd.to_datetime(price_data[price_data.index.name]).dt.date
-                else:
-                    logger.error("No date information found in price data columns or index")
-                    return []
+                logger.error("No date information found in price data columns or index")
+                return None
+        
+        # Calendar dates in the exchange's local time, matching the sentiment dates
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        dates = dates.normalize().as_unit('ns')
+        
+        close = price_data['Close'].to_numpy(dtype=float)
+        prev_close = np.r_[np.nan, close[:-1]]
+        has_prev = np.arange(len(close)) > 0
+        
+        # The first bar has no previous close to compare with
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change_pct = np.where(has_prev, (close - prev_close) / prev_close * 100, 0)
+            price_change_abs = np.where(has_prev, close - prev_close, 0)
+            intraday_volatility = (price_data['High'].to_numpy(dtype=float) -
+                                   price_data['Low'].to_numpy(dtype=float)) / close * 100
+        
+        frame = pd.DataFrame({
+            'date': np.asarray(dates),
+            'price_open': price_data['Open'].to_numpy(),
+            'price_high': price_data['High'].to_numpy(),
+            'price_low': price_data['Low'].to_numpy(),
+            'price_close': price_data['Close'].to_numpy(),
+            'volume': price_data['Volume'].to_numpy(),
+            'price_change_pct': price_change_pct,
+            'price_change_abs': price_change_abs,
+            'intraday_volatility': intraday_volatility
+        })
+        return frame.drop_duplicates('date', keep='first').set_index('date')
+    
+    def _align_sentiment_and_price_data(self, sentiment_history: List[Dict], price_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Align sentiment data with price data by date
+        
+        Returns:
+            One row per sentiment record that has a price bar on its date,
+            in record order (empty if nothing aligns)
+        """
+        try:
+            price_frame = self._price_frame(price_data)
+            if price_frame is None:
+                return pd.DataFrame(columns=ALIGNED_COLUMNS)
             
-            for sentiment_entry in sentiment_history:
-                sentiment_date = datetime.fromisoformat(sentiment_entry['timestamp']).date()
-                
-                # Find matching price data
-                matching_price = price_data[price_data['Date'] == sentiment_date]
-                
-                if not matching_price.empty:
-                    price_row = matching_price.iloc[0]
-                    
-                    # Calculate price changes
-                    try:
-                        # Get previous day's close for comparison
-                        prev_close = None
-                        if len(price_data) > 1:
-                            # Get the index position in the DataFrame
-                            current_indices = price_data[price_data['Date'] == sentiment_date].index
-                            if len(current_indices) > 0:
-                                current_idx = current_indices[0]
-                                # Find the position of this index in the DataFrame
-                                idx_position = price_data.index.get_loc(current_idx)
-                                if idx_position > 0:
-                                    # Get the previous row by position
-                                    prev_close = price_data.iloc[idx_position - 1]['Close']
-                        
-                        if prev_close is not None:
-                            price_change_pct = ((price_row['Close'] - prev_close) / prev_close) * 100
-                            price_change_abs = price_row['Close'] - prev_close
-                        else:
-                            price_change_pct = 0
-                            price_change_abs = 0
-                        
-                        # Calculate intraday volatility
-                        intraday_volatility = ((price_row['High'] - price_row['Low']) / price_row['Close']) * 100
-                        
-                        aligned_data.append({
-                            'date': sentiment_date,
-                            'sentiment': sentiment_entry.get('overall_sentiment', sentiment_entry.get('sentiment_score', 0)),
-                            'news_count': sentiment_entry.get('news_count', 0),
-                            'price_open': price_row['Open'],
-                            'price_high': price_row['High'],
-                            'price_low': price_row['Low'],
-                            'price_close': price_row['Close'],
-                            'volume': price_row['Volume'],
-                            'price_change_pct': price_change_pct,
-                            'price_change_abs': price_change_abs,
-                            'intraday_volatility': intraday_volatility,
-                            'events': sentiment_entry.get('significant_events', {}).get('events_detected', [])
-                        })
-                    except Exception as e:
-                        logger.warning(f"Error calculating price changes for {sentiment_date}: {e}")
-                        continue
-            
-            return aligned_data
+            sentiment = self._sentiment_frame(sentiment_history)
+            aligned = sentiment.join(price_frame, on='date', how='inner')
+            return aligned[ALIGNED_COLUMNS].reset_index(drop=True)
             
         except Exception as e:
             logger.error(f"Error aligning sentiment and price data: {e}")
-            return []
+            return pd.DataFrame(columns=ALIGNED_COLUMNS)
     
-    def _calculate_correlations(self, aligned_data: List[Dict]) -> Dict:
+    def _align_panel(self, sentiment_history: List[Dict], price_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Align several symbols at once with a single (symbol, date) join"""
+        price_frames = {}
+        for symbol, data in price_data.items():
+            frame = self._price_frame(data) if data is not None and not data.empty else None
+            if frame is not None:
+                price_frames[symbol] = frame
+        
+        if not price_frames or not sentiment_history:
+            return pd.DataFrame(columns=['symbol'] + ALIGNED_COLUMNS)
+        
+        panel = pd.concat(price_frames, names=['symbol', 'date'])
+        sentiment = self._sentiment_frame(sentiment_history)
+        aligned = sentiment.join(panel, on=['symbol', 'date'], how='inner')
+        return aligned[['symbol'] + ALIGNED_COLUMNS].reset_index(drop=True)
+    
+    def _calculate_correlations(self, aligned_data: pd.DataFrame) -> Dict:
         """Calculate various correlation metrics"""
         try:
-            sentiments = [d['sentiment'] for d in aligned_data]
-            price_changes = [d['price_change_pct'] for d in aligned_data]
-            volatilities = [d['intraday_volatility'] for d in aligned_data]
-            volumes = [d['volume'] for d in aligned_data]
+            sentiments = aligned_data['sentiment'].to_numpy(dtype=float)
+            price_changes = aligned_data['price_change_pct'].to_numpy(dtype=float)
+            volatilities = aligned_data['intraday_volatility'].to_numpy(dtype=float)
+            volumes = aligned_data['volume'].to_numpy(dtype=float)
             
             # Remove any NaN values
-            valid_indices = [i for i in range(len(sentiments)) 
-                           if not (pd.isna(sentiments[i]) or pd.isna(price_changes[i]))]
+            valid = ~(np.isnan(sentiments) | np.isnan(price_changes))
+            valid_points = int(valid.sum())
             
-            if len(valid_indices) < 3:
+            if valid_points < 3:
                 return {'error': 'Insufficient data for correlation analysis'}
             
-            clean_sentiments = [sentiments[i] for i in valid_indices]
-            clean_price_changes = [price_changes[i] for i in valid_indices]
-            clean_volatilities = [volatilities[i] for i in valid_indices]
-            clean_volumes = [volumes[i] for i in valid_indices]
+            clean_sentiments = sentiments[valid]
+            clean_price_changes = price_changes[valid]
+            clean_volatilities = volatilities[valid]
+            clean_volumes = volumes[valid]
             
             # Calculate correlations
             pearson_sentiment_price, pearson_p_value = pearsonr(clean_sentiments, clean_price_changes)
@@ -204,17 +226,11 @@ class NewsImpactAnalyzer:
             # Sentiment vs volume
             pearson_sentiment_volume, _ = pearsonr(clean_sentiments, clean_volumes)
             
-            # Lagged correlations (next day price change)
-            if len(clean_sentiments) > 1:
-                lagged_price_changes = clean_price_changes[1:] + [0]  # Shift by one day
-                lagged_correlations = {}
-                for lag in range(1, min(4, len(clean_sentiments))):  # Up to 3 day lag
-                    if lag < len(clean_sentiments):
-                        lagged_prices = clean_price_changes[lag:] + [0] * lag
-                        lagged_corr, _ = pearsonr(clean_sentiments[:-lag], lagged_prices[:-lag])
-                        lagged_correlations[f'{lag}_day'] = lagged_corr
-            else:
-                lagged_correlations = {}
+            # Lagged correlations: sentiment against the price change `lag` points later
+            lagged_correlations = {}
+            for lag in range(1, min(4, valid_points)):  # Up to 3 day lag
+                lagged_corr, _ = pearsonr(clean_sentiments[:-lag], clean_price_changes[lag:])
+                lagged_correlations[f'{lag}_day'] = lagged_corr
             
             return {
                 'sentiment_vs_price': {
@@ -235,8 +251,8 @@ class NewsImpactAnalyzer:
                 'lagged_correlations': lagged_correlations,
                 'data_quality': {
                     'total_points': len(aligned_data),
-                    'valid_points': len(valid_indices),
-                    'data_completeness': len(valid_indices) / len(aligned_data)
+                    'valid_points': valid_points,
+                    'data_completeness': valid_points / len(aligned_data)
                 }
             }
             
@@ -244,30 +260,23 @@ class NewsImpactAnalyzer:
             logger.error(f"Error calculating correlations: {e}")
             return {'error': str(e)}
     
-    def _analyze_event_impact(self, aligned_data: List[Dict]) -> Dict:
+    def _analyze_event_impact(self, aligned_data: pd.DataFrame) -> Dict:
         """Analyze the impact of different event types on price movements"""
         try:
             event_impacts = {}
+            price_changes = aligned_data['price_change_pct'].to_numpy(dtype=float)
             
-            # Group by event types
-            event_types = set()
-            for data_point in aligned_data:
-                for event in data_point['events']:
-                    event_types.add(event['type'])
+            # Event types present on each row
+            row_event_types = [{event['type'] for event in events} for events in aligned_data['events']]
+            event_types = set().union(*row_event_types)
             
             for event_type in event_types:
-                event_days = []
-                non_event_days = []
-                
-                for data_point in aligned_data:
-                    has_event = any(event['type'] == event_type for event in data_point['events'])
-                    
-                    if has_event:
-                        event_days.append(data_point['price_change_pct'])
-                    else:
-                        non_event_days.append(data_point['price_change_pct'])
+                has_event = np.fromiter((event_type in types for types in row_event_types),
+                                        dtype=bool, count=len(row_event_types))
+                event_days = price_changes[has_event]
+                non_event_days = price_changes[~has_event]
                 
-                if event_days and non_event_days:
+                if len(event_days) and len(non_event_days):
                     event_impacts[event_type] = {
                         'avg_price_change_event_days': np.mean(event_days),
                         'avg_price_change_non_event_days': np.mean(non_event_days),
@@ -286,51 +295,29 @@ class NewsImpactAnalyzer:
             logger.error(f"Error analyzing event impact: {e}")
             return {'error': str(e)}
     
-    def _calculate_predictive_metrics(self, aligned_data: List[Dict]) -> Dict:
+    def _calculate_predictive_metrics(self, aligned_data: pd.DataFrame) -> Dict:
         """Calculate metrics for predicting price movements from sentiment"""
         try:
-            # Categorize sentiment and price movements
-            sentiment_categories = []
-            price_categories = []
-            
-            for data_point in aligned_data:
-                # Categorize sentiment
-                if data_point['sentiment'] > 0.2:
-                    sentiment_cat = 'positive'
-                elif data_point['sentiment'] < -0.2:
-                    sentiment_cat = 'negative'
-                else:
-                    sentiment_cat = 'neutral'
-                
-                # Categorize price change
-                if data_point['price_change_pct'] > 1:
-                    price_cat = 'up'
-                elif data_point['price_change_pct'] < -1:
-                    price_cat = 'down'
-                else:
-                    price_cat = 'flat'
-                
-                sentiment_categories.append(sentiment_cat)
-                price_categories.append(price_cat)
+            sentiments = aligned_data['sentiment'].to_numpy(dtype=float)
+            price_changes = aligned_data['price_change_pct'].to_numpy(dtype=float)
             
-            # Calculate accuracy metrics
-            correct_predictions = 0
-            total_predictions = len(sentiment_categories)
+            # Categorize sentiment and price movements
+            sentiment_categories = np.select([sentiments > 0.2, sentiments < -0.2], ['positive', 'negative'], 'neutral')
+            price_categories = np.select([price_changes > 1, price_changes < -1], ['up', 'down'], 'flat')
             
             confusion_matrix = {
-                'positive_sentiment': {'up': 0, 'down': 0, 'flat': 0},
-                'negative_sentiment': {'up': 0, 'down': 0, 'flat': 0},
-                'neutral_sentiment': {'up': 0, 'down': 0, 'flat': 0}
+                f'{sent_cat}_sentiment': {
+                    price_cat: int(np.count_nonzero((sentiment_categories == sent_cat) & (price_categories == price_cat)))
+                    for price_cat in ['up', 'down', 'flat']
+                }
+                for sent_cat in ['positive', 'negative', 'neutral']
             }
             
-            for sent_cat, price_cat in zip(sentiment_categories, price_categories):
-                confusion_matrix[f'{sent_cat}_sentiment'][price_cat] += 1
-                
-                # Count correct predictions
-                if (sent_cat == 'positive' and price_cat == 'up') or \
-                   (sent_cat == 'negative' and price_cat == 'down') or \
-                   (sent_cat == 'neutral' and price_cat == 'flat'):
-                    correct_predictions += 1
+            # Count correct predictions
+            correct_predictions = (confusion_matrix['positive_sentiment']['up'] +
+                                   confusion_matrix['negative_sentiment']['down'] +
+                                   confusion_matrix['neutral_sentiment']['flat'])
+            total_predictions = len(sentiment_categories)
             
             accuracy = correct_predictions / total_predictions if total_predictions > 0 else 0
             
@@ -340,14 +327,12 @@ class NewsImpactAnalyzer:
                 'total_predictions': total_predictions,
                 'correct_predictions': correct_predictions,
                 'sentiment_distribution': {
-                    'positive': sentiment_categories.count('positive'),
-                    'negative': sentiment_categories.count('negative'),
-                    'neutral': sentiment_categories.count('neutral')
+                    category: int(np.count_nonzero(sentiment_categories == category))
+                    for category in ['positive', 'negative', 'neutral']
                 },
                 'price_distribution': {
-                    'up': price_categories.count('up'),
-                    'down': price_categories.count('down'),
-                    'flat': price_categories.count('flat')
+                    category: int(np.count_nonzero(price_categories == category))
+                    for category in ['up', 'down', 'flat']
                 }
             }
             
@@ -520,10 +505,25 @@ class NewsImpactAnalyzer:
     def get_multi_symbol_analysis(self, symbols: List[str], days: int = 30) -> Dict:
         """Perform correlation analysis across multiple symbols"""
         try:
-            results = {}
+            # One history query and one (symbol, date) join for all symbols
+            sentiment_history = self.sentiment_history.get_sentiment_history(symbols=symbols)
+            symbols_with_history = {entry.get('symbol') for entry in sentiment_history}
+            price_data = {
+                symbol: self.data_feed.get_historical_data(symbol, period=f"{days}d")
+                for symbol in symbols if symbol in symbols_with_history
+            }
+            aligned = self._align_panel(sentiment_history, price_data)
             
+            results = {}
             for symbol in symbols:
-                results[symbol] = self.analyze_sentiment_price_correlation(symbol, days)
+                results[symbol] = self._empty_correlation_result(symbol)
+            for symbol, aligned_data in aligned.groupby('symbol', sort=False):
+                try:
+                    results[symbol] = self._build_correlation_result(
+                        symbol, days, aligned_data.drop(columns='symbol').reset_index(drop=True)
+                    )
+                except Exception as e:
+                    logger.error(f"Error analyzing sentiment-price correlation for {symbol}: {e}")
             
             # Calculate comparative metrics
             comparative_analysis = self._calculate_comparative_metrics(results)
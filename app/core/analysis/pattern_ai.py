@@ -3,44 +3,49 @@ AI-Powered Pattern Recognition for Trading Analysis
 Extends existing technical analysis with ML pattern detection
 """
 
-import numpy as np
-import pandas as pd
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
 import logging
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from scipy.signal import find_peaks, find_peaks_cwt
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-# Try to import talib and pandas_ta, make them optional
-try:
-    import pandas_ta as ta
-    PANDAS_TA_AVAILABLE = True
-except ImportError:
-    ta = None
-    PANDAS_TA_AVAILABLE = False
-
-try:
-    import talib
-    TALIB_AVAILABLE = True
-except ImportError:
-    talib = None
-    TALIB_AVAILABLE = False
+import numpy as np
+import pandas as pd
 
 from ..analysis.technical import TechnicalAnalyzer
 from ...config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Bump when the synthetic training data or the features change
+PATTERN_MODEL_VERSION = 1
+
+WINDOW_SIZES = [10, 20, 50]
+FEATURES_PER_WINDOW = 8  # price change, volatility, avg volume, volume trend, RSI, peaks, troughs, trend
+MIN_BARS = 50
+
 class AIPatternDetector:
     """
     ML-powered chart pattern detection system
     Integrates with your existing TechnicalAnalyzer
     """
     
-    def __init__(self):
+    def __init__(self, model_dir: Optional[str] = None):
+        """
+        Args:
+            model_dir: Where the trained classifier is persisted,
+                DATA_DIR/pattern_models by default.
+        """
+        # sklearn is imported here rather than at module level so that importing
+        # this module (e.g. for `app.main status`) stays cheap
+        from sklearn.cluster import KMeans
+        from sklearn.preprocessing import StandardScaler
+        
         self.pattern_classifier = KMeans(n_clusters=8, random_state=42)
         self.scaler = StandardScaler()
         self.is_trained = False
+        self.model_dir = Path(model_dir) if model_dir else Settings.DATA_DIR / 'pattern_models'
         
         # Pattern mappings
         self.pattern_names = {
@@ -73,9 +78,9 @@ class AIPatternDetector:
             # Extract pattern features
             features = self._extract_pattern_features(price_data)
             
-            # Train classifier if not done
+            # Load (or train once) the classifier
             if not self.is_trained:
-                self._train_pattern_classifier(features)
+                self._load_or_train_classifier()
             
             # Detect current pattern
             current_features = features[-1:].reshape(1, -1)
@@ -113,60 +118,236 @@ class AIPatternDetector:
             logger.error(f"Error detecting patterns for {symbol}: {e}")
             return self._empty_pattern_result(symbol)
     
+    def detect_patterns_many(self, price_data: Union[Dict[str, pd.DataFrame], pd.DataFrame],
+                             timestamps: Optional[Iterable] = None) -> pd.DataFrame:
+        """
+        Classify patterns for many symbols and bars in one batch
+        
+        Args:
+            price_data: OHLCV frames by symbol, or a panel with (symbol, field)
+                MultiIndex columns.
+            timestamps: Evaluate each symbol at its last bar at or before each
+                of these times. By default every bar with enough history.
+        
+        Returns:
+            One row per (symbol, timestamp) with the pattern_id,
+            pattern_detected, strength, confidence, signal,
+            breakout_probability, time_horizon_days and current_price that
+            detect_patterns gives when called with the bars up to that
+            timestamp. Target, support and resistance levels are left to
+            detect_patterns.
+        """
+        if isinstance(price_data, pd.DataFrame):
+            price_data = {
+                symbol: price_data[symbol].dropna(subset=['Close'])
+                for symbol in price_data.columns.get_level_values(0).unique()
+            }
+        
+        if not self.is_trained:
+            self._load_or_train_classifier()
+        
+        if timestamps is not None:
+            timestamps = pd.DatetimeIndex([pd.Timestamp(ts) for ts in timestamps])
+        
+        frames = []
+        for symbol, data in price_data.items():
+            if data is None or len(data) < MIN_BARS:
+                continue
+            
+            if timestamps is None:
+                ends = np.arange(MIN_BARS - 1, len(data))
+            else:
+                times = timestamps
+                if data.index.tz is not None and times.tz is None:
+                    times = times.tz_localize(data.index.tz)
+                elif data.index.tz is None and times.tz is not None:
+                    times = times.tz_convert(None)
+                ends = data.index.searchsorted(times, side='right') - 1
+                ends = np.unique(ends[ends >= MIN_BARS - 1])
+            if len(ends) == 0:
+                continue
+            
+            features = self._pattern_feature_matrix(
+                data['Close'].to_numpy(dtype=float), data['Volume'].to_numpy(dtype=float), ends
+            )
+            frame = self._classify_features(features)
+            frame.insert(0, 'timestamp', data.index[ends])
+            frame.insert(0, 'symbol', symbol)
+            frame['current_price'] = data['Close'].to_numpy(dtype=float)[ends]
+            frames.append(frame)
+        
+        if not frames:
+            return pd.DataFrame(columns=['symbol', 'timestamp', 'pattern_id', 'pattern_detected', 'strength',
+                                         'confidence', 'signal', 'breakout_probability', 'time_horizon_days',
+                                         'current_price'])
+        return pd.concat(frames, ignore_index=True)
+    
+    def _classify_features(self, features: np.ndarray) -> pd.DataFrame:
+        """Vectorized pattern classification, strength, confidence and signal for feature rows"""
+        valid = np.isfinite(features).all(axis=1)
+        n_rows = len(features)
+        pattern_id = np.full(n_rows, -1)
+        confidence = np.zeros(n_rows)
+        
+        if valid.any():
+            scaled = self.scaler.transform(features[valid])
+            pattern_id[valid] = self.pattern_classifier.predict(scaled)
+            centers = self.pattern_classifier.cluster_centers_[pattern_id[valid]]
+            distance = np.linalg.norm(scaled - centers, axis=1)
+            confidence[valid] = np.minimum(np.maximum(0, 1 - distance / 5.0), 1.0)
+        
+        # As _calculate_pattern_strength and _calculate_breakout_probability
+        strength = np.minimum((np.abs(features[:, -1]) + np.minimum(np.abs(features[:, -3]), 2.0) / 2.0) / 2, 1.0)
+        breakout = np.minimum((np.abs(features[:, 3]) + features[:, 1]) / 2, 1.0)
+        
+        # As _generate_pattern_signal
+        bullish = np.isin(pattern_id, [0, 4])
+        bearish = np.isin(pattern_id, [1, 3])
+        signal = np.select(
+            [confidence < self.confidence_levels['low'],
+             bullish & (strength > 0.6),
+             bearish & (strength > 0.6),
+             strength > 0.8],
+            ['HOLD', 'BUY', 'SELL', np.where(bullish, 'STRONG_BUY', 'STRONG_SELL')],
+            'HOLD'
+        )
+        
+        names = np.array([self.pattern_names[i] for i in range(len(self.pattern_names))] + ["Insufficient Data"])
+        frame = pd.DataFrame({
+            'pattern_id': pattern_id,
+            'pattern_detected': names[pattern_id],
+            'strength': np.where(valid, strength, 0.0),
+            'confidence': confidence,
+            'signal': np.where(valid, signal, 'HOLD'),
+            'breakout_probability': np.where(valid, breakout, 0.0),
+            'time_horizon_days': [self._estimate_time_horizon(i) if i >= 0 else 0 for i in pattern_id]
+        })
+        return frame
+    
     def _extract_pattern_features(self, data: pd.DataFrame) -> np.ndarray:
         """Extract features for pattern recognition"""
-        features = []
-        
-        # Rolling window analysis
-        window_sizes = [10, 20, 50]
-        
-        for window in window_sizes:
-            if len(data) >= window:
-                window_data = data.tail(window)
-                
-                # Price features
-                price_change = (window_data['Close'].iloc[-1] / window_data['Close'].iloc[0] - 1)
-                volatility = window_data['Close'].pct_change().std()
-                
-                # Volume features  
-                avg_volume = window_data['Volume'].mean()
-                volume_trend = np.polyfit(range(len(window_data)), window_data['Volume'], 1)[0]
-                
-                # Technical indicators - use available libraries
-                if PANDAS_TA_AVAILABLE and ta is not None:
-                    rsi = ta.rsi(window_data["Close"], length=14).iloc[-1] if len(window_data) >= 14 else 50
-                else:
-                    # Simple RSI calculation fallback
-                    if len(window_data) >= 14:
-                        delta = window_data['Close'].diff()
-                        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                        rs = gain / loss
-                        rsi = 100 - (100 / (1 + rs)).iloc[-1]
-                    else:
-                        rsi = 50
-                
-                # Peak/trough analysis
-                peaks, _ = find_peaks(window_data['Close'].values, distance=5)
-                troughs, _ = find_peaks(-window_data['Close'].values, distance=5)
-                
-                # Trend analysis
-                trend_slope = np.polyfit(range(len(window_data)), window_data['Close'], 1)[0]
-                
-                features.extend([
-                    price_change,
-                    volatility, 
-                    avg_volume,
-                    volume_trend,
-                    rsi,
-                    len(peaks),
-                    len(troughs),
-                    trend_slope
-                ])
-        
-        return np.array(features).reshape(1, -1)
+        close = data['Close'].to_numpy(dtype=float)
+        volume = data['Volume'].to_numpy(dtype=float)
+        windows = [window for window in WINDOW_SIZES if len(data) >= window]
+        return self._pattern_feature_matrix(close, volume, np.array([len(data) - 1]), windows)
+    
+    def _pattern_feature_matrix(self, close: np.ndarray, volume: np.ndarray, ends: np.ndarray,
+                                windows: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Pattern features of the windows ending at each index in ends, one row
+        per end with FEATURES_PER_WINDOW columns per window size. Every end
+        must have at least max(windows) - 1 bars before it.
+        """
+        columns = []
+        for window in windows or WINDOW_SIZES:
+            # Rolling window analysis: one row of prices/volumes per end
+            offsets = np.arange(window) - (window - 1)
+            prices = close[ends[:, None] + offsets]
+            volumes = volume[ends[:, None] + offsets]
+            
+            # Price features
+            price_change = prices[:, -1] / prices[:, 0] - 1
+            returns = prices[:, 1:] / prices[:, :-1] - 1
+            volatility = returns.std(axis=1, ddof=1)
+            
+            # Volume features
+            avg_volume = volumes.mean(axis=1)
+            volume_trend = self._rolling_slope(volumes)
+            
+            # RSI of the window's last 14 changes
+            if window >= 14:
+                delta = np.diff(prices, axis=1)[:, -14:]
+                gain = np.where(delta > 0, delta, 0).mean(axis=1)
+                loss = np.where(delta < 0, -delta, 0).mean(axis=1)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rsi = 100 - (100 / (1 + gain / loss))
+            else:
+                rsi = np.full(len(ends), 50.0)
+            
+            # Peak/trough analysis
+            peaks = self._count_peaks(prices)
+            troughs = self._count_peaks(-prices)
+            
+            # Trend analysis
+            trend_slope = self._rolling_slope(prices)
+            
+            columns.extend([price_change, volatility, avg_volume, volume_trend, rsi, peaks, troughs, trend_slope])
+        
+        return np.column_stack(columns)
+    
+    @staticmethod
+    def _rolling_slope(windows: np.ndarray) -> np.ndarray:
+        """Least-squares slope of each row against 0..n-1, as np.polyfit(range(n), row, 1)[0]"""
+        x = np.arange(windows.shape[1]) - (windows.shape[1] - 1) / 2
+        return (windows - windows.mean(axis=1, keepdims=True)) @ x / (x @ x)
+    
+    @staticmethod
+    def _count_peaks(windows: np.ndarray, distance: int = 5) -> np.ndarray:
+        """
+        Number of peaks find_peaks(row, distance=distance) finds in each row.
+        Rows with only strict, well-separated local maxima are counted
+        directly; rows with plateaus or close maxima go through find_peaks.
+        """
+        from scipy.signal import find_peaks
+        
+        is_peak = (windows[:, 1:-1] > windows[:, :-2]) & (windows[:, 1:-1] > windows[:, 2:])
+        counts = is_peak.sum(axis=1)
+        
+        has_plateau = (np.diff(windows, axis=1) == 0).any(axis=1)
+        close_peaks = np.zeros(len(windows), dtype=bool)
+        for gap in range(1, distance):
+            close_peaks |= (is_peak[:, gap:] & is_peak[:, :-gap]).any(axis=1)
+        
+        for row in np.flatnonzero(has_plateau | close_peaks):
+            counts[row] = len(find_peaks(windows[row], distance=distance)[0])
+        return counts
     
-    def _train_pattern_classifier(self, features: np.ndarray):
+    def _classifier_config(self) -> Dict:
+        import sklearn
+        
+        return {
+            'version': PATTERN_MODEL_VERSION,
+            'n_clusters': self.pattern_classifier.n_clusters,
+            'random_state': self.pattern_classifier.random_state,
+            'n_features': len(WINDOW_SIZES) * FEATURES_PER_WINDOW,
+            'sklearn': sklearn.__version__
+        }
+    
+    def _classifier_path(self) -> Path:
+        config = json.dumps(self._classifier_config(), sort_keys=True)
+        return self.model_dir / f"pattern_classifier_{hashlib.sha1(config.encode()).hexdigest()[:12]}.joblib"
+    
+    def _load_or_train_classifier(self):
+        """
+        Load the persisted classifier for the current config, training and
+        saving it first if there is none. Loaded models are shared by all
+        detectors in the process through the model registry.
+        """
+        import joblib
+        from app.core.ml.model_registry import get_model_registry
+        
+        path = self._classifier_path()
+        if path.exists():
+            try:
+                saved = get_model_registry().get(str(path))
+                self.scaler = saved['scaler']
+                self.pattern_classifier = saved['classifier']
+                self.is_trained = True
+                return
+            except Exception as e:
+                logger.warning(f"Retraining pattern classifier, could not load {path}: {e}")
+        
+        self._train_pattern_classifier(None)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            joblib.dump({'config': self._classifier_config(), 'scaler': self.scaler,
+                         'classifier': self.pattern_classifier}, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not persist pattern classifier: {e}")
+    
+    def _train_pattern_classifier(self, features: Optional[np.ndarray]):
         """Train the pattern classifier with synthetic data"""
         # For now, create synthetic training data
         # In production, you'd use historical labeled patterns
@@ -184,7 +365,8 @@ class AIPatternDetector:
     
     def _generate_synthetic_training_data(self) -> np.ndarray:
         """Generate synthetic training data for pattern classification"""
-        np.random.seed(42)
+        # Own generator, so training does not reseed the global one
+        rng = np.random.RandomState(42)
         n_samples = 1000
         n_features = 24  # 8 features * 3 windows
         
@@ -193,10 +375,10 @@ class AIPatternDetector:
         
         for _ in range(n_samples):
             # Random pattern with some structure
-            features = np.random.normal(0, 1, n_features)
+            features = rng.normal(0, 1, n_features)
             
             # Add some pattern-specific modifications
-            pattern_type = np.random.randint(0, 8)
+            pattern_type = rng.randint(0, 8)
             if pattern_type == 0:  # Bullish breakout
                 features[0] = abs(features[0]) + 0.5  # Positive price change
                 features[16] = abs(features[16]) + 0.5  # Strong trend
@@ -281,6 +463,8 @@ class AIPatternDetector:
     
     def _find_support_level(self, data: pd.DataFrame) -> float:
         """Find nearest support level"""
+        from scipy.signal import find_peaks
+        
         recent_data = data.tail(50) if len(data) > 50 else data
         lows = recent_data['Low'].values
         
@@ -296,6 +480,8 @@ class AIPatternDetector:
     
     def _find_resistance_level(self, data: pd.DataFrame) -> float:
         """Find nearest resistance level"""
+        from scipy.signal import find_peaks
+        
         recent_data = data.tail(50) if len(data) > 50 else data
         highs = recent_data['High'].values
         
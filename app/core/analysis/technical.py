@@ -10,6 +10,7 @@ from typing import Dict, List, Tuple, Optional
 import logging
 from datetime import datetime
 from app.config.settings import Settings
+from app.core.analysis.indicator_state import IndicatorState, IndicatorStateStore, get_indicator_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -34,35 +35,298 @@ class TechnicalAnalyzer:
         try:
             # Calculate indicators
             indicators = self._calculate_indicators(data)
+            return self._build_analysis(symbol, data, indicators)
             
-            # Generate signals
-            signals = self._generate_signals(indicators, data)
-            
-            # Calculate momentum
-            momentum = self._calculate_momentum(data, indicators)
-            
-            # Determine trend
-            trend = self._determine_trend(indicators, data)
-            
-            # Overall signal strength
-            overall_signal = self._calculate_overall_signal(signals)
-            
-            return {
+        except Exception as e:
+            logger.error(f"Error in technical analysis for {symbol}: {str(e)}")
+            return self._empty_analysis(symbol)
+    
+    def update_indicator_state(self, symbol: str, data: pd.DataFrame, interval: str = '1d',
+                               store: Optional[IndicatorStateStore] = None) -> IndicatorState:
+        """
+        Bring the saved indicator state of symbol/interval up to date with data.
+        
+        Only bars newer than the last committed one are processed. The state
+        is rebuilt from data when there is none yet, when it was built with
+        different periods, or when data no longer contains its last bar
+        (a gap or a re-adjusted history).
+        """
+        store = store or get_indicator_state_store()
+        state = store.load(symbol, interval)
+        
+        if state is None or not state.matches_settings(self.settings) or not state.is_continuation(data):
+            state = IndicatorState.from_settings(symbol, interval, self.settings)
+        
+        if state.update_frame(data):
+            store.save(state)
+        return state
+    
+    def analyze_state(self, symbol: str, state: IndicatorState,
+                      price: Optional[float] = None, volume: Optional[float] = None) -> Dict:
+        """
+        Technical analysis from an incremental indicator state without
+        reloading history. price/volume describe the bar that is still
+        forming (e.g. the latest quote); it is included but not committed.
+        """
+        bars = state.bars + (1 if price is not None else 0)
+        if bars < 20:
+            return self._empty_analysis(symbol)
+        
+        try:
+            indicators = state.indicators(price, volume)
+            return self._build_analysis(symbol, state.recent_frame(price), indicators)
+        except Exception as e:
+            logger.error(f"Error in technical analysis for {symbol}: {str(e)}")
+            return self._empty_analysis(symbol)
+    
+    def analyze_many(self, data: pd.DataFrame, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Technical analysis for many symbols at once
+        
+        Args:
+            data: Panel of OHLCV bars, either with (field, symbol) or
+                (symbol, field) MultiIndex columns (see build_panel), long
+                format with a (symbol, timestamp) row index, or a frame of
+                closes with one column per symbol.
+            symbols: Symbols to return, all symbols in the panel by default.
+        
+        Returns:
+            Per-symbol analysis dicts, the same as analyze() gives for each
+            symbol's own bars. Each symbol's bars are its rows with a close,
+            so symbols with different trading hours can share one panel.
+        """
+        closes, volumes = self._panel_fields(data)
+        if symbols is not None:
+            closes = closes.reindex(columns=symbols)
+            volumes = volumes.reindex(columns=symbols) if volumes is not None else None
+        
+        if closes.empty or closes.shape[1] == 0:
+            return {symbol: self._empty_analysis(symbol) for symbol in closes.columns}
+        
+        try:
+            prices, volume, lengths = self._align_bars(closes, volumes)
+            return self._analyze_aligned(list(closes.columns), prices, volume, lengths)
+        except Exception as e:
+            logger.error(f"Error in multi-symbol technical analysis: {str(e)}")
+            return {symbol: self._empty_analysis(symbol) for symbol in closes.columns}
+    
+    @staticmethod
+    def _panel_fields(data: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Close and Volume frames with one column per symbol"""
+        if isinstance(data.index, pd.MultiIndex):
+            closes = data['Close'].unstack(level=0)
+            volumes = data['Volume'].unstack(level=0) if 'Volume' in data.columns else None
+            return closes, volumes
+        
+        if isinstance(data.columns, pd.MultiIndex):
+            for level in range(data.columns.nlevels):
+                fields = data.columns.get_level_values(level)
+                if 'Close' in fields:
+                    closes = data.xs('Close', axis=1, level=level)
+                    volumes = data.xs('Volume', axis=1, level=level) if 'Volume' in fields else None
+                    return closes, volumes
+            raise ValueError("Panel has no Close column level")
+        
+        return data, None
+    
+    @staticmethod
+    def _align_bars(closes: pd.DataFrame, volumes: Optional[pd.DataFrame]):
+        """
+        Move each symbol's bars (rows with a close) to the bottom of its
+        column, keeping their order, so row -k is every symbol's k-th last
+        bar and the rows above a symbol's first bar are NaN
+        """
+        values = closes.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        order = np.argsort(valid, axis=0, kind='stable')
+        
+        prices = pd.DataFrame(np.take_along_axis(values, order, axis=0))
+        volume = None
+        if volumes is not None:
+            volume_values = volumes.reindex(index=closes.index, columns=closes.columns).to_numpy(dtype=float)
+            volume = pd.DataFrame(np.take_along_axis(volume_values, order, axis=0))
+        return prices, volume, valid.sum(axis=0)
+    
+    def _analyze_aligned(self, symbols: List[str], prices: pd.DataFrame,
+                         volume: Optional[pd.DataFrame], lengths: np.ndarray) -> Dict[str, Dict]:
+        """Vectorized counterpart of analyze() over bottom-aligned price columns"""
+        last = prices.iloc[-1].to_numpy()
+        
+        def last_value(frame: pd.DataFrame, min_bars: int, fallback) -> np.ndarray:
+            values = frame.iloc[-1].to_numpy()
+            return np.where((lengths < min_bars) | np.isnan(values), fallback, values)
+        
+        # RSI, as in _calculate_rsi
+        delta = prices.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rsi_series = 100 - (100 / (1 + gain / loss.replace(0, np.inf)))
+        rsi = last_value(rsi_series, 14, 50.0)
+        
+        # MACD, as in _calculate_macd
+        macd_series = prices.ewm(span=12).mean() - prices.ewm(span=26).mean()
+        signal_series = macd_series.ewm(span=9).mean()
+        macd_line = last_value(macd_series, 26, 0.0)
+        macd_signal = last_value(signal_series, 26, 0.0)
+        macd_histogram = last_value(macd_series - signal_series, 26, 0.0)
+        
+        sma = {period: last_value(prices.rolling(window=period).mean(), period, last)
+               for period in self.settings['SMA']['periods']}
+        ema = {period: last_value(prices.ewm(span=period).mean(), period, last)
+               for period in self.settings['EMA']['periods']}
+        
+        # Volume, as in _calculate_volume_indicators
+        has_volume = volume is not None
+        if has_volume:
+            current_volume = volume.iloc[-1].to_numpy()
+            avg_volume = volume.rolling(window=20).mean().iloc[-1].to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_ratio = np.where(avg_volume > 0, current_volume / avg_volume, 1.0)
+            volume_ratio = np.where(lengths < 20, 1.0, volume_ratio)
+        else:
+            volume_ratio = np.ones(len(symbols))
+        
+        # Momentum, as in _calculate_momentum
+        def price_change(bars_back: int) -> np.ndarray:
+            if len(prices) <= bars_back:
+                return np.zeros(len(symbols))
+            previous = prices.iloc[-1 - bars_back].to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = (last - previous) / previous * 100
+            return np.where(lengths > bars_back, change, 0.0)
+        
+        change_1d, change_5d, change_20d = price_change(1), price_change(5), price_change(20)
+        momentum_score = (change_1d * 10 + change_5d * 5 + change_20d * 2
+                          + (rsi - 50) * 0.5 + macd_histogram * 100)
+        momentum_score = np.where(volume_ratio > 2, momentum_score * 1.2, momentum_score)
+        momentum_score = np.clip(momentum_score, -100, 100)
+        
+        # Signals, as in _generate_signals: (signal code, strength) with buy=1, sell=-1
+        macd_strength = np.minimum(np.abs(macd_histogram) * 100, 1)
+        signal_arrays = {
+            'rsi': (
+                np.select([rsi < 30, rsi > 70], [1, -1], 0),
+                np.select([rsi < 30, rsi > 70], [(30 - rsi) / 30, (rsi - 70) / 30], 0)
+            ),
+            'macd': self._select_signal(
+                (macd_histogram > 0) & (macd_line > macd_signal),
+                (macd_histogram < 0) & (macd_line < macd_signal),
+                macd_strength
+            ),
+        }
+        sma_20 = sma.get(20, last)
+        sma_50 = sma.get(50, last)
+        sma_200 = sma.get(200, last)
+        signal_arrays['ma_trend'] = self._select_signal(
+            (last > sma_20) & (sma_20 > sma_50), (last < sma_20) & (sma_20 < sma_50), 0.8
+        )
+        if len(prices) >= 2:
+            previous_close = prices.iloc[-2].to_numpy()
+        else:
+            previous_close = np.full(len(symbols), np.nan)
+        high_volume = (volume_ratio > 2) & (lengths >= 2)
+        signal_arrays['volume'] = self._select_signal(
+            high_volume & (last > previous_close), high_volume & ~(last > previous_close),
+            np.minimum(volume_ratio / 3, 1)
+        )
+        
+        weights = {'rsi': 0.25, 'macd': 0.35, 'ma_trend': 0.25, 'volume': 0.15}
+        overall_signal = np.clip(
+            sum(code * strength * 100 * weights[name] for name, (code, strength) in signal_arrays.items()),
+            -100, 100
+        )
+        
+        results = {}
+        for i, symbol in enumerate(symbols):
+            if lengths[i] < 20:
+                results[symbol] = self._empty_analysis(symbol)
+                continue
+        
+            current_price = float(last[i])
+            indicators = {
+                'rsi': float(rsi[i]),
+                'macd': {
+                    'line': float(macd_line[i]),
+                    'signal': float(macd_signal[i]),
+                    'histogram': float(macd_histogram[i])
+                },
+                'sma': {f'sma_{period}': float(values[i]) for period, values in sma.items()},
+                'ema': {f'ema_{period}': float(values[i]) for period, values in ema.items()},
+            }
+            if has_volume:
+                indicators['volume'] = {
+                    'current': float(current_volume[i]),
+                    'average': float(avg_volume[i]),
+                    'ratio': float(volume_ratio[i])
+                }
+            else:
+                indicators['volume'] = {'current': 0, 'average': 0, 'ratio': 1}
+        
+            signals = {}
+            for name, (code, strength) in signal_arrays.items():
+                if code[i] == 0:
+                    signals[name] = {'signal': 'neutral', 'strength': 0}
+                else:
+                    signals[name] = {'signal': 'buy' if code[i] > 0 else 'sell', 'strength': float(strength[i])}
+        
+            momentum = {
+                'score': float(momentum_score[i]),
+                'price_change_1d': float(change_1d[i]),
+                'price_change_5d': float(change_5d[i]),
+                'price_change_20d': float(change_20d[i]),
+                'rsi_momentum': 'bullish' if rsi[i] > 50 else 'bearish' if rsi[i] < 50 else 'neutral',
+                'macd_momentum': 'bullish' if macd_histogram[i] > 0 else 'bearish' if macd_histogram[i] < 0 else 'neutral',
+                'volume_momentum': 'high' if volume_ratio[i] > 1.5 else 'normal',
+                'strength': self._classify_momentum_strength(momentum_score[i])
+            }
+        
+            results[symbol] = {
                 'symbol': symbol,
                 'timestamp': datetime.now().isoformat(),
-                'current_price': float(data['Close'].iloc[-1]),
+                'current_price': current_price,
                 'indicators': indicators,
                 'signals': signals,
                 'momentum': momentum,
-                'trend': trend,
-                'overall_signal': overall_signal,
+                'trend': self._classify_trend(current_price, float(sma_20[i]), float(sma_50[i]), float(sma_200[i])),
+                'overall_signal': float(overall_signal[i]),
                 'signal_strength': self._calculate_signal_strength(signals),
-                'recommendation': self._get_recommendation(overall_signal, momentum)
+                'recommendation': self._get_recommendation(float(overall_signal[i]), momentum)
             }
-            
-        except Exception as e:
-            logger.error(f"Error in technical analysis for {symbol}: {str(e)}")
-            return self._empty_analysis(symbol)
+        
+        return results
+    
+    @staticmethod
+    def _select_signal(buy: np.ndarray, sell: np.ndarray, strength) -> Tuple[np.ndarray, np.ndarray]:
+        code = np.select([buy, sell], [1, -1], 0)
+        strength = np.broadcast_to(np.asarray(strength, dtype=float), code.shape)
+        return code, np.where(code != 0, strength, 0.0)
+    
+    def _build_analysis(self, symbol: str, data: pd.DataFrame, indicators: Dict) -> Dict:
+        """Signals, momentum and trend for precomputed indicators"""
+        # Generate signals
+        signals = self._generate_signals(indicators, data)
+        
+        # Calculate momentum
+        momentum = self._calculate_momentum(data, indicators)
+        
+        # Determine trend
+        trend = self._determine_trend(indicators, data)
+        
+        # Overall signal strength
+        overall_signal = self._calculate_overall_signal(signals)
+        
+        return {
+            'symbol': symbol,
+            'timestamp': datetime.now().isoformat(),
+            'current_price': float(data['Close'].iloc[-1]),
+            'indicators': indicators,
+            'signals': signals,
+            'momentum': momentum,
+            'trend': trend,
+            'overall_signal': overall_signal,
+            'signal_strength': self._calculate_signal_strength(signals),
+            'recommendation': self._get_recommendation(overall_signal, momentum)
+        }
     
     def _calculate_indicators(self, data: pd.DataFrame) -> Dict:
         """Calculate basic technical indicators"""
@@ -281,6 +545,11 @@ class TechnicalAnalyzer:
         sma_50 = indicators['sma'].get('sma_50', current_price)
         sma_200 = indicators['sma'].get('sma_200', current_price)
         
+        return self._classify_trend(current_price, sma_20, sma_50, sma_200)
+    
+    @staticmethod
+    def _classify_trend(current_price: float, sma_20: float, sma_50: float, sma_200: float) -> Dict:
+        """Trend direction from the price and moving average alignment"""
         if current_price > sma_20 > sma_50 > sma_200:
             trend = 'strong_bullish'
             strength = 'strong'
@@ -380,17 +649,29 @@ class TechnicalAnalyzer:
 def get_market_data(symbol: str, period: str = '3mo', interval: str = '1d') -> pd.DataFrame:
     """
     Get market data for technical analysis
-    Using yfinance as a free data source
+    Read through the local OHLCV store, which only downloads missing bars from yfinance
     """
     try:
-        import yfinance as yf
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period=period, interval=interval)
-        return data
+        from app.core.data.ohlcv_store import get_ohlcv_store
+        return get_ohlcv_store().get_history(symbol, period=period, interval=interval)
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {str(e)}")
         return pd.DataFrame()
 
+def build_panel(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine per-symbol OHLCV frames into one panel for TechnicalAnalyzer.analyze_many
+    Columns are a (symbol, field) MultiIndex over the union of all bar times
+    """
+    frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty}
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1, sort=True)
+
+def get_market_data_many(symbols: List[str], period: str = '3mo', interval: str = '1d') -> pd.DataFrame:
+    """Market data for several symbols as a (symbol, field) panel"""
+    return build_panel({symbol: get_market_data(symbol, period=period, interval=interval) for symbol in symbols})
+
 # Example usage and testing
 if __name__ == "__main__":
     # Test the technical analyzer
@@ -28,6 +28,9 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.core.data.ohlcv_store import get_ohlcv_store
+from app.core.data.signal_store import ANALYSIS_TYPES, backfill_signals, load_signals, signal_source_tables
+
 class ComprehensiveBacktester:
     """Comprehensive backtesting system using all available data sources"""
     
@@ -43,10 +46,9 @@ class ComprehensiveBacktester:
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
     def fetch_historical_prices(self, symbol: str, period: str = "6mo") -> pd.DataFrame:
-        """Fetch historical price data from Yahoo Finance"""
+        """Fetch historical price data from Yahoo Finance via the local OHLCV store"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
+            data = get_ohlcv_store().get_history(symbol, period=period, interval='1d')
             data.reset_index(inplace=True)
             data['Symbol'] = symbol
             return data
@@ -99,6 +101,33 @@ class ComprehensiveBacktester:
         
         return sentiment_data
     
+    def load_signals(self) -> List[Tuple[str, pd.DataFrame]]:
+        """
+        Load trading signals per analysis type from the normalized signals table.
+        
+        Analysis rows added since the last load are extracted into the table
+        first, so each JSON blob is parsed only once across all runs. If the
+        database cannot be written (read-only or locked by a writer) the
+        signals already in the table are loaded instead.
+        """
+        signal_data = []
+        
+        for db_path in [self.unified_db, self.trading_db]:
+            if db_path.exists():
+                try:
+                    try:
+                        source_tables = list(backfill_signals(db_path))
+                    except sqlite3.OperationalError as e:
+                        print(f"⚠️ Signal backfill skipped for {db_path} ({e}), loading existing signals")
+                        source_tables = signal_source_tables(db_path)
+                    for source_table in source_tables:
+                        signals = load_signals(db_path, self.bank_symbols, source_table)
+                        signal_data.append((ANALYSIS_TYPES[source_table], signals))
+                except Exception as e:
+                    print(f"Error loading signals from {db_path}: {e}")
+        
+        return signal_data
+    
     def extract_signals_from_data(self, data_type: str, df: pd.DataFrame) -> pd.DataFrame:
         """Extract trading signals from complex JSON data"""
         signals_list = []
@@ -180,7 +209,7 @@ class ComprehensiveBacktester:
             return go.Figure().add_annotation(text=f"No price data available for {symbol}")
         
         # Get sentiment/signal data
-        sentiment_data = self.load_sentiment_data()
+        signal_data = self.load_signals()
         
         # Create subplots
         fig = make_subplots(
@@ -237,8 +266,7 @@ class ComprehensiveBacktester:
         
         # Process and add signal data
         all_signals = []
-        for data_type, df in sentiment_data:
-            signals = self.extract_signals_from_data(data_type, df)
+        for data_type, signals in signal_data:
             signals = signals[signals['symbol'] == symbol]
             all_signals.append(signals)
         
@@ -345,17 +373,15 @@ class ComprehensiveBacktester:
     
     def create_strategy_comparison(self) -> go.Figure:
         """Create strategy performance comparison"""
-        sentiment_data = self.load_sentiment_data()
+        signal_data = self.load_signals()
         
-        if not sentiment_data:
+        if not signal_data:
             return go.Figure().add_annotation(text="No sentiment data available for comparison")
         
         # Process all signals
         all_strategies = {}
         
-        for data_type, df in sentiment_data:
-            signals = self.extract_signals_from_data(data_type, df)
-            
+        for data_type, signals in signal_data:
             if not signals.empty:
                 # Group by strategy type
                 for strategy in signals['signal_type'].unique():
@@ -487,24 +513,18 @@ class ComprehensiveBacktester:
         }
         
         # Load and analyze all data
-        sentiment_data = self.load_sentiment_data()
+        all_signals = self.load_signals()
         
-        if not sentiment_data:
+        if not all_signals:
             report['summary']['status'] = 'No data available'
             return report
         
-        # Process signals for each strategy
-        all_signals = []
-        for data_type, df in sentiment_data:
-            signals = self.extract_signals_from_data(data_type, df)
-            all_signals.append((data_type, signals))
-        
         # Calculate basic metrics
         total_signals = sum(len(signals) for _, signals in all_signals)
         
         report['summary'] = {
             'total_signals_generated': total_signals,
-            'data_sources': len(sentiment_data),
+            'data_sources': len(all_signals),
             'analysis_period': '3 months',
             'symbols_covered': len(self.bank_symbols)
         }
@@ -6,7 +6,9 @@ Handles ASX symbol mapping and real-time price fetching
 """
 
 import logging
+import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
@@ -20,6 +22,7 @@ sys.path.insert(0, str(project_root))
 
 from app.config.settings import Settings
 from app.core.data.collectors.ig_markets_symbol_mapper import IGMarketsSymbolMapper
+from app.core.data.ohlcv_store import get_ohlcv_store
 
 # Try to import IG Markets components
 try:
@@ -62,6 +65,11 @@ class EnhancedMarketDataCollector:
         self.price_cache = {}
         self.cache_duration = 30  # 30 seconds
         
+        # In-flight fetches, so concurrent callers share one request per symbol
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self.in_flight_timeout = 30  # seconds to wait on another caller's fetch
+        
         # Track data source usage
         self.source_stats = {
             'ig_markets': 0,
@@ -84,6 +92,21 @@ class EnhancedMarketDataCollector:
             self.source_stats['cache_hits'] += 1
             return cached_data
         
+        _, waiting = self._claim_symbols([normalized_symbol])
+        if waiting:
+            return self._await_in_flight(normalized_symbol, waiting[normalized_symbol])
+        
+        price_data = None
+        try:
+            price_data = self._fetch_price(symbol, normalized_symbol)
+            return price_data
+        finally:
+            self._release_symbols({
+                normalized_symbol: price_data or self._create_error_response(normalized_symbol, "Price request failed")
+            })
+    
+    def _fetch_price(self, symbol: str, normalized_symbol: str) -> Dict[str, Any]:
+        """Fetch a single price from IG Markets, falling back to yfinance"""
         # Try IG Markets first for ASX symbols
         if self.ig_available and self._is_asx_symbol(normalized_symbol):
             ig_data = self._get_ig_markets_price(normalized_symbol)
@@ -105,28 +128,106 @@ class EnhancedMarketDataCollector:
     def get_current_prices_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Get current prices for multiple symbols efficiently
+        Cached symbols are served directly; the rest cost one multi-EPIC IG Markets
+        request plus one multi-ticker yfinance download for whatever IG could not price
         """
-        results = {}
+        normalized = {symbol: self._normalize_symbol(symbol) for symbol in symbols}
+        prices = {}
+        
+        for normalized_symbol in dict.fromkeys(normalized.values()):
+            cached_data = self._get_cached_price(normalized_symbol)
+            if cached_data:
+                self.source_stats['cache_hits'] += 1
+                prices[normalized_symbol] = cached_data
+        
+        pending = [s for s in dict.fromkeys(normalized.values()) if s not in prices]
+        owned, waiting = self._claim_symbols(pending)
+        
+        fetched = {}
+        try:
+            fetched = self._fetch_prices_batch(owned)
+        except Exception as e:
+            logger.error(f"Error getting batch prices for {owned}: {e}")
+        finally:
+            for normalized_symbol in owned:
+                if normalized_symbol not in fetched:
+                    fetched[normalized_symbol] = self._create_error_response(normalized_symbol, "Price request failed")
+            self._release_symbols(fetched)
+        prices.update(fetched)
+        
+        for normalized_symbol, future in waiting.items():
+            prices[normalized_symbol] = self._await_in_flight(normalized_symbol, future)
+        
+        return {symbol: prices[normalized_symbol] for symbol, normalized_symbol in normalized.items()}
+    
+    def _fetch_prices_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several prices in one round-trip per source and cache them together"""
+        prices = {}
+        if not symbols:
+            return prices
+        
+        # Try IG Markets first for ASX symbols
+        if self.ig_available:
+            asx_symbols = [s for s in symbols if self._is_asx_symbol(s)]
+            if asx_symbols:
+                prices.update(self._get_ig_markets_prices(asx_symbols))
+        
+        # Fallback to yfinance for everything IG Markets could not price
+        remaining = [s for s in symbols if s not in prices]
+        if remaining:
+            prices.update(self._get_yfinance_prices(remaining))
+        
+        now = time.time()
+        for symbol, price_data in prices.items():
+            self.price_cache[symbol] = (price_data, now)
         
         for symbol in symbols:
-            try:
-                price_data = self.get_current_price(symbol)
-                results[symbol] = price_data
-            except Exception as e:
-                logger.error(f"Error getting price for {symbol}: {e}")
-                results[symbol] = self._create_error_response(symbol, str(e))
+            if symbol not in prices:
+                self.source_stats['errors'] += 1
+                logger.error(f"Could not get price data for {symbol}")
+                prices[symbol] = self._create_error_response(symbol, "No data source available")
         
-        return results
+        return prices
+    
+    def _claim_symbols(self, symbols: List[str]) -> Tuple[List[str], Dict[str, Future]]:
+        """
+        Register this caller as the fetcher for symbols nobody else is fetching
+        Returns (symbols to fetch, futures for symbols already in flight)
+        """
+        owned, waiting = [], {}
+        with self._in_flight_lock:
+            for symbol in symbols:
+                future = self._in_flight.get(symbol)
+                if future is None:
+                    self._in_flight[symbol] = Future()
+                    owned.append(symbol)
+                else:
+                    waiting[symbol] = future
+        return owned, waiting
+    
+    def _release_symbols(self, results: Dict[str, Dict[str, Any]]):
+        """Publish fetched prices to callers waiting on the same symbols"""
+        with self._in_flight_lock:
+            futures = {symbol: self._in_flight.pop(symbol) for symbol in results if symbol in self._in_flight}
+        for symbol, future in futures.items():
+            future.set_result(results[symbol])
+    
+    def _await_in_flight(self, symbol: str, future: Future) -> Dict[str, Any]:
+        """Wait for another caller's fetch of the same symbol"""
+        try:
+            return future.result(timeout=self.in_flight_timeout)
+        except Exception as e:
+            logger.error(f"Waiting for in-flight price of {symbol} failed: {e}")
+            return self._create_error_response(symbol, str(e) or "Timed out waiting for price")
     
     def get_historical_data(self, symbol: str, period: str = "1mo") -> Optional[pd.DataFrame]:
         """
         Get historical data for a symbol
-        Currently uses yfinance - could be enhanced with IG Markets historical data
+        Read through the local OHLCV store (yfinance for missing bars)
         """
         try:
             normalized_symbol = self._normalize_symbol(symbol)
-            ticker = yf.Ticker(normalized_symbol)
-            data = ticker.history(period=period)
+            data = get_ohlcv_store().get_history(normalized_symbol, period=period, interval='1d')
             
             if not data.empty:
                 # Add symbol column for identification
@@ -197,15 +298,7 @@ class EnhancedMarketDataCollector:
                 
                 self.source_stats['ig_markets'] += 1
                 
-                return {
-                    'symbol': symbol,
-                    'price': float(price),
-                    'source': f"IG Markets - {source_info}",
-                    'delay_minutes': delay_minutes,
-                    'data_quality': 'real-time' if delay_minutes == 0 else 'delayed',
-                    'timestamp': datetime.now().isoformat(),
-                    'success': True
-                }
+                return self._ig_price_response(symbol, price, source_info, delay_minutes)
             
             return None
             
@@ -213,6 +306,35 @@ class EnhancedMarketDataCollector:
             logger.error(f"IG Markets error for {symbol}: {e}")
             return None
     
+    def _get_ig_markets_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get prices for several symbols with one IG Markets request"""
+        base_symbols = {symbol.replace('.AX', ''): symbol for symbol in symbols}
+        
+        try:
+            price_data = self.ig_price_fetcher.get_current_prices(list(base_symbols))
+        except Exception as e:
+            logger.error(f"IG Markets batch error for {symbols}: {e}")
+            return {}
+        
+        results = {}
+        for base_symbol, (price, source_info, delay_minutes) in price_data.items():
+            symbol = base_symbols[base_symbol]
+            self.source_stats['ig_markets'] += 1
+            results[symbol] = self._ig_price_response(symbol, price, source_info, delay_minutes)
+        return results
+    
+    def _ig_price_response(self, symbol: str, price: float, source_info: str, delay_minutes: int) -> Dict[str, Any]:
+        """Build the standard price response for an IG Markets quote"""
+        return {
+            'symbol': symbol,
+            'price': float(price),
+            'source': f"IG Markets - {source_info}",
+            'delay_minutes': delay_minutes,
+            'data_quality': 'real-time' if delay_minutes == 0 else 'delayed',
+            'timestamp': datetime.now().isoformat(),
+            'success': True
+        }
+    
     def _get_yfinance_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get price from yfinance with error handling"""
         try:
@@ -254,6 +376,72 @@ class EnhancedMarketDataCollector:
             logger.error(f"yfinance error for {symbol}: {e}")
             return None
     
+    def _get_yfinance_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get prices for several symbols from a single multi-ticker yfinance download"""
+        try:
+            # Five days of minute bars covers weekends and gives the previous close
+            data = yf.download(symbols, period='5d', interval='1m', group_by='ticker',
+                               auto_adjust=False, progress=False, threads=True)
+        except Exception as e:
+            logger.error(f"yfinance batch error for {symbols}: {e}")
+            return {}
+        
+        if data is None or data.empty:
+            return {}
+        
+        results = {}
+        for symbol in symbols:
+            try:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    bars = data[symbol]
+                elif len(symbols) == 1:
+                    bars = data
+                else:
+                    continue
+                
+                price_data = self._quote_from_minute_bars(symbol, bars.dropna(subset=['Close']))
+                if price_data:
+                    self.source_stats['yfinance'] += 1
+                    results[symbol] = price_data
+                    
+            except Exception as e:
+                logger.error(f"yfinance error for {symbol}: {e}")
+        
+        return results
+    
+    def _quote_from_minute_bars(self, symbol: str, bars: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Build a yfinance-style price response from intraday minute bars"""
+        if bars.empty:
+            return None
+        
+        price = float(bars['Close'].iloc[-1])
+        if price <= 0:
+            return None
+        
+        # Split the bars into the latest session and everything before it
+        session_dates = np.array(bars.index.date)
+        latest_session = bars[session_dates == session_dates[-1]]
+        earlier_sessions = bars[session_dates != session_dates[-1]]
+        previous_close = float(earlier_sessions['Close'].iloc[-1]) if not earlier_sessions.empty else 0
+        
+        delay_minutes = max(0, int((time.time() - bars.index[-1].timestamp()) / 60))
+        
+        return {
+            'symbol': symbol,
+            'price': price,
+            'source': f"yfinance ({'real-time' if delay_minutes < 60 else 'delayed'})",
+            'delay_minutes': delay_minutes,
+            'data_quality': 'real-time' if delay_minutes < 60 else 'delayed',
+            'timestamp': datetime.now().isoformat(),
+            'volume': int(latest_session['Volume'].sum()),
+            'day_high': float(latest_session['High'].max()),
+            'day_low': float(latest_session['Low'].min()),
+            'previous_close': previous_close,
+            'success': True
+        }
+    
     def _normalize_symbol(self, symbol: str) -> str:
         """Normalize symbol format for consistent processing"""
         symbol = symbol.upper().strip()
@@ -7,7 +7,7 @@ Maps ASX symbols to IG Markets EPICs for real-time price fetching
 import requests
 import json
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import time
 
 class IGMarketsASXMapper:
@@ -214,6 +214,71 @@ class IGMarketsASXMapper:
         if not market_data:
             return None
         
+        return self._extract_price(market_data)
+    
+    def get_market_data_batch(self, epics: List[str]) -> Dict[str, Dict]:
+        """
+        Get market data for several EPICs in one request per 50 EPICs
+        Returns dict of epic -> market data (same shape as get_market_data)
+        """
+        results = {}
+        epics = list(dict.fromkeys(epics))
+        if not epics or not self.ensure_authenticated():
+            return results
+        
+        headers = {
+            'Accept': 'application/json',
+            'X-IG-API-KEY': self.api_key,
+            'X-SECURITY-TOKEN': self.auth_token,
+            'CST': self.cst_token,
+            'Version': '2'
+        }
+        
+        # IG accepts at most 50 EPICs per multi-market request
+        for start in range(0, len(epics), 50):
+            chunk = epics[start:start + 50]
+            try:
+                response = requests.get(f'{self.base_url}/markets', headers=headers,
+                                        params={'epics': ','.join(chunk)}, timeout=10)
+                
+                if response.status_code != 200:
+                    self.logger.error(f"Batch market data request failed: {response.status_code}")
+                    continue
+                
+                for market_data in response.json().get('marketDetails', []):
+                    epic = market_data.get('instrument', {}).get('epic')
+                    if epic:
+                        results[epic] = market_data
+                        
+            except Exception as e:
+                self.logger.error(f"Batch market data error for {chunk}: {e}")
+        
+        return results
+    
+    def get_prices(self, asx_symbols: List[str]) -> Dict[str, Tuple[float, str]]:
+        """
+        Get current prices for several ASX symbols with a single market request
+        Returns dict of symbol -> (price, status); unmapped or unpriced symbols are omitted
+        """
+        epics = {}
+        for asx_symbol in asx_symbols:
+            epic = self.get_asx_epic(asx_symbol)
+            if epic:
+                epics[asx_symbol] = epic
+        
+        market_data_by_epic = self.get_market_data_batch(list(epics.values()))
+        
+        prices = {}
+        for asx_symbol, epic in epics.items():
+            market_data = market_data_by_epic.get(epic)
+            if market_data:
+                price_data = self._extract_price(market_data)
+                if price_data:
+                    prices[asx_symbol] = price_data
+        return prices
+    
+    def _extract_price(self, market_data: Dict) -> Optional[Tuple[float, str]]:
+        """Pick the best available price from a market data snapshot"""
         snapshot = market_data.get('snapshot', {})
         instrument = market_data.get('instrument', {})
         
@@ -22,6 +22,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.config.settings import Settings
+from app.core.data.ohlcv_store import get_ohlcv_store
 
 # Import enhanced market data collector
 try:
@@ -217,11 +218,10 @@ class ASXDataFeed:
             return df
         
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period, interval=interval)
+            # Local OHLCV store: repeat requests are disk reads plus any new tail bars
+            hist = get_ohlcv_store().get_history(symbol, period=period, interval=interval)
             
             if not hist.empty:
-                # Cache disabled - just return the data
                 return hist
             
         except Exception as e:
@@ -9,7 +9,7 @@ import requests
 import logging
 from datetime import datetime, timedelta
 import time
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 from ig_markets_asx_mapper import IGMarketsASXMapper
 
 class RealTimePriceFetcher:
@@ -53,18 +53,9 @@ class RealTimePriceFetcher:
             
             if price_data:
                 price, status = price_data
-                
-                # Determine delay based on market status
-                if 'LIVE' in status:
-                    delay_minutes = 0  # Real-time during market hours
-                elif 'HISTORICAL' in status:
-                    delay_minutes = 60  # Historical data (market closed)
-                else:
-                    delay_minutes = 120  # Unknown status
-                
                 source_info = f"IG Markets - {status}"
                 self.source_stats['ig_markets'] += 1
-                return price, source_info, delay_minutes
+                return price, source_info, self._ig_delay_minutes(status)
         except Exception as e:
             self.logger.error(f"IG Markets error for {symbol}: {e}")
         
@@ -88,6 +79,34 @@ class RealTimePriceFetcher:
         self.source_stats['errors'] += 1
         return None
     
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Tuple[float, str, int]]:
+        """
+        Get IG Markets prices for several symbols in a single market request
+        Returns symbol -> (price, source_info, delay_minutes); symbols IG could not
+        price are omitted so the caller can batch its own fallback
+        """
+        try:
+            prices = self.ig_markets.get_prices(symbols)
+        except Exception as e:
+            self.logger.error(f"IG Markets batch error for {symbols}: {e}")
+            return {}
+        
+        results = {}
+        for symbol, (price, status) in prices.items():
+            source_info = f"IG Markets - {status}"
+            self.source_stats['ig_markets'] += 1
+            results[symbol] = (price, source_info, self._ig_delay_minutes(status))
+        return results
+    
+    @staticmethod
+    def _ig_delay_minutes(status: str) -> int:
+        """Estimate data delay from the IG market status"""
+        if 'LIVE' in status:
+            return 0  # Real-time during market hours
+        elif 'HISTORICAL' in status:
+            return 60  # Historical data (market closed)
+        return 120  # Unknown status
+    
     def get_stats(self) -> Dict[str, int]:
         """Get usage statistics for debugging"""
         return self.source_stats.copy()
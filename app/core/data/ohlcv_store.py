@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Local OHLCV Store
+Keeps downloaded price history on disk and only fetches the missing tail bars
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+
+# Approximate calendar span of each yfinance period
+PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653
+}
+
+# Calendar days per unit for other N{wk,mo,y} periods
+PERIOD_UNIT_DAYS = {'wk': 7, 'mo': 31, 'y': 366}
+
+PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+# Extra calendar days fetched before N-session windows, for public holidays
+# and exchanges whose sessions start on the previous UTC day
+SESSION_SLACK_DAYS = 4
+
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600,
+    '1d': 86400, '5d': 432000, '1wk': 604800, '1mo': 2678400, '3mo': 7948800
+}
+
+# covered_from value meaning the full available history has been fetched
+FULL_HISTORY = -(2 ** 62)
+
+
+def _yfinance_history(symbol: str, interval: str, period: Optional[str] = None,
+                      start: Optional[datetime] = None) -> pd.DataFrame:
+    """Download bars from yfinance either for a period or from a start time"""
+    import yfinance as yf
+    ticker = yf.Ticker(symbol)
+    if start is not None:
+        return ticker.history(start=start, interval=interval)
+    return ticker.history(period=period, interval=interval)
+
+
+class OHLCVStore:
+    """
+    SQLite store of OHLCV bars keyed by (symbol, interval, bar time).
+
+    The first request for a symbol/interval downloads the requested period.
+    Later requests are served from disk. Once the newest stored bar is older
+    than the refresh interval, only the bars from the last stored one onwards
+    are downloaded and upserted. When a new dividend or split appears in those
+    tail bars the series is downloaded again, because yfinance back-adjusts
+    earlier prices.
+    """
+
+    def __init__(self, db_path=None, refresh_seconds: Optional[int] = None,
+                 fetcher: Callable[..., pd.DataFrame] = _yfinance_history):
+        """
+        Initialize the OHLCVStore.
+
+        Args:
+            db_path: SQLite file, DATA_DIR/ohlcv_store.db by default.
+            refresh_seconds: Minimum age of the last fetch before tail bars are requested.
+            fetcher: Function (symbol, interval, period=None, start=None) -> bars DataFrame.
+        """
+        settings = Settings()
+        self.db_path = Path(db_path) if db_path else settings.DATA_DIR / 'ohlcv_store.db'
+        if refresh_seconds is None:
+            refresh_seconds = settings.CACHE_SETTINGS['ohlcv_refresh_minutes'] * 60
+        self.refresh_seconds = refresh_seconds
+        self.fetcher = fetcher
+        self.stats = {'disk_hits': 0, 'tail_fetches': 0, 'full_fetches': 0, 'errors': 0}
+
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS ohlcv_bars (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    dividends REAL,
+                    stock_splits REAL,
+                    PRIMARY KEY (symbol, interval, ts)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS ohlcv_series (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    covered_from INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    tz TEXT,
+                    PRIMARY KEY (symbol, interval)
+                );
+            """)
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_history(self, symbol: str, period: str = '3mo', interval: str = '1d') -> pd.DataFrame:
+        """
+        Return bars for a symbol in the same shape as yfinance's Ticker.history.
+
+        Args:
+            symbol: Ticker symbol, e.g. 'CBA.AX'.
+            period: yfinance-style period ('5d', '3mo', '1y', 'ytd', 'max', ...).
+            interval: yfinance-style bar interval ('1h', '1d', ...).
+
+        Returns:
+            DataFrame indexed by bar time, empty if no data could be obtained.
+        """
+        window_start = self._window_start(period)
+        if window_start is None:
+            # Period the store cannot map to a window; fetch it directly
+            try:
+                data = self.fetcher(symbol, interval, period=period)
+                self.stats['full_fetches'] += 1
+                return data if data is not None else pd.DataFrame()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Error fetching data for {symbol}: {str(e)}")
+                return pd.DataFrame()
+
+        with self._series_lock(symbol, interval):
+            series = self._get_series(symbol, interval)
+            try:
+                if series is None or series['covered_from'] > window_start:
+                    self._full_fetch(symbol, interval, period, window_start, series)
+                elif time.time() - series['fetched_at'] >= self._refresh_after(interval):
+                    self._tail_fetch(symbol, interval, series)
+                else:
+                    self.stats['disk_hits'] += 1
+            except Exception as e:
+                # Serve whatever history is already on disk
+                self.stats['errors'] += 1
+                logger.error(f"Error fetching data for {symbol}: {str(e)}")
+
+            bars = self._read_bars(symbol, interval, window_start)
+
+        parsed = self._parse_period(period)
+        if parsed and parsed[1] == 'd':
+            bars = self._last_sessions(bars, parsed[0])
+        return bars
+
+    def invalidate(self, symbol: str, interval: Optional[str] = None):
+        """Drop the stored bars for a symbol (one interval, or all of them)."""
+        clause, params = ("symbol = ?", [symbol]) if interval is None else \
+            ("symbol = ? AND interval = ?", [symbol, interval])
+        with self.get_connection() as conn:
+            conn.execute(f"DELETE FROM ohlcv_bars WHERE {clause}", params)
+            conn.execute(f"DELETE FROM ohlcv_series WHERE {clause}", params)
+            conn.commit()
+
+    def _full_fetch(self, symbol: str, interval: str, period: str, window_start: int,
+                    series: Optional[Dict]):
+        if period in PERIOD_DAYS or period in ('ytd', 'max'):
+            data = self.fetcher(symbol, interval, period=period)
+        else:
+            # Not a period yfinance accepts; request the window from its start
+            data = self.fetcher(symbol, interval, start=datetime.fromtimestamp(window_start, tz=timezone.utc))
+        self.stats['full_fetches'] += 1
+        if data is None or data.empty:
+            return
+        covered_from = window_start if series is None else min(window_start, series['covered_from'])
+        self._store_bars(symbol, interval, data, covered_from)
+
+    def _tail_fetch(self, symbol: str, interval: str, series: Dict):
+        last_ts = self._last_bar_ts(symbol, interval)
+        if last_ts is None:
+            return
+
+        # Re-fetch the newest stored bar too, it may have been incomplete
+        start = datetime.fromtimestamp(last_ts, tz=timezone.utc)
+        data = self.fetcher(symbol, interval, start=start)
+        self.stats['tail_fetches'] += 1
+        if data is None or data.empty:
+            self._touch_series(symbol, interval)
+            return
+
+        new_bars = data[self._bar_timestamps(data.index) > last_ts]
+        corporate_action = any(
+            column in new_bars and (new_bars[column].fillna(0) != 0).any()
+            for column in ('Dividends', 'Stock Splits')
+        )
+        if corporate_action:
+            # Adjusted history before the action has changed; download it again
+            logger.info(f"Corporate action in new {symbol} bars, refreshing stored {interval} history")
+            covered_from = series['covered_from']
+            start = None if covered_from == FULL_HISTORY else datetime.fromtimestamp(covered_from, tz=timezone.utc)
+            full = self.fetcher(symbol, interval, period='max') if start is None else \
+                self.fetcher(symbol, interval, start=start)
+            if full is not None and not full.empty:
+                self.invalidate(symbol, interval)
+                self._store_bars(symbol, interval, full, covered_from)
+                return
+
+        self._store_bars(symbol, interval, data, series['covered_from'])
+
+    def _store_bars(self, symbol: str, interval: str, data: pd.DataFrame, covered_from: int):
+        timestamps = self._bar_timestamps(data.index)
+        frame = data.reindex(columns=PRICE_COLUMNS).fillna({'Dividends': 0, 'Stock Splits': 0})
+        rows = [
+            (symbol, interval, int(ts), *[None if pd.isna(v) else float(v) for v in values])
+            for ts, values in zip(timestamps, frame.itertuples(index=False, name=None))
+        ]
+        tz = str(data.index.tz) if data.index.tz is not None else 'UTC'
+
+        with self.get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ohlcv_bars "
+                "(symbol, interval, ts, open, high, low, close, volume, dividends, stock_splits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO ohlcv_series (symbol, interval, covered_from, fetched_at, tz) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (symbol, interval, int(covered_from), time.time(), tz)
+            )
+            conn.commit()
+
+    def _touch_series(self, symbol: str, interval: str):
+        with self.get_connection() as conn:
+            conn.execute(
+                "UPDATE ohlcv_series SET fetched_at = ? WHERE symbol = ? AND interval = ?",
+                (time.time(), symbol, interval)
+            )
+            conn.commit()
+
+    def _read_bars(self, symbol: str, interval: str, window_start: int) -> pd.DataFrame:
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT ts, open, high, low, close, volume, dividends, stock_splits "
+                "FROM ohlcv_bars WHERE symbol = ? AND interval = ? AND ts >= ? ORDER BY ts",
+                (symbol, interval, window_start)
+            ).fetchall()
+            tz_row = conn.execute(
+                "SELECT tz FROM ohlcv_series WHERE symbol = ? AND interval = ?", (symbol, interval)
+            ).fetchone()
+
+        if not rows:
+            return pd.DataFrame()
+
+        frame = pd.DataFrame(rows, columns=['ts'] + PRICE_COLUMNS)
+        index = pd.to_datetime(frame.pop('ts'), unit='s', utc=True)
+        frame.index = pd.DatetimeIndex(index).tz_convert(tz_row[0] if tz_row and tz_row[0] else 'UTC')
+        frame.index.name = 'Date' if INTERVAL_SECONDS.get(interval, 86400) >= 86400 else 'Datetime'
+        return frame
+
+    def _get_series(self, symbol: str, interval: str) -> Optional[Dict]:
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT covered_from, fetched_at FROM ohlcv_series WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            ).fetchone()
+        return {'covered_from': row[0], 'fetched_at': row[1]} if row else None
+
+    def _last_bar_ts(self, symbol: str, interval: str) -> Optional[int]:
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT MAX(ts) FROM ohlcv_bars WHERE symbol = ? AND interval = ?", (symbol, interval)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _refresh_after(self, interval: str) -> int:
+        return min(INTERVAL_SECONDS.get(interval, 86400), self.refresh_seconds)
+
+    def _series_lock(self, symbol: str, interval: str) -> threading.Lock:
+        """Per-series lock so concurrent callers wait for a single download."""
+        with self._lock:
+            key = (symbol, interval)
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    @staticmethod
+    def _bar_timestamps(index: pd.DatetimeIndex) -> np.ndarray:
+        """Bar times as UTC epoch seconds"""
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        return np.asarray((index - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1), dtype='int64')
+
+    @staticmethod
+    def _parse_period(period: str) -> Optional[Tuple[int, str]]:
+        """Split an N{d,wk,mo,y} period into (N, unit)"""
+        match = PERIOD_PATTERN.match(period)
+        if not match or int(match.group(1)) <= 0:
+            return None
+        return int(match.group(1)), match.group(2)
+
+    @staticmethod
+    def _last_sessions(bars: pd.DataFrame, sessions: int) -> pd.DataFrame:
+        """Keep the bars of the last N trading sessions (exchange-local dates)"""
+        if bars.empty:
+            return bars
+        dates = bars.index.normalize()
+        keep = dates.unique()[-sessions:]
+        return bars[dates.isin(keep)]
+
+    @staticmethod
+    def _window_start(period: str) -> Optional[int]:
+        """Earliest bar time (epoch seconds) a request for period covers, None if period is unknown"""
+        now = datetime.now(timezone.utc)
+        if period == 'max':
+            return FULL_HISTORY
+        if period == 'ytd':
+            return int(datetime(now.year, 1, 1, tzinfo=timezone.utc).timestamp())
+        parsed = OHLCVStore._parse_period(period)
+        if parsed is None:
+            return None
+
+        count, unit = parsed
+        # Align to the day so repeated calls within a day share one window
+        today = pd.Timestamp(now.date(), tz='UTC')
+        if unit == 'd':
+            # N trading sessions back; get_history trims to the last N sessions
+            start = today - pd.offsets.BDay(count) - pd.Timedelta(days=SESSION_SLACK_DAYS)
+        else:
+            start = today - pd.Timedelta(days=PERIOD_DAYS.get(period, count * PERIOD_UNIT_DAYS[unit]))
+        return int(start.timestamp())
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_ohlcv_store() -> OHLCVStore:
+    """Return the process-wide OHLCV store."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = OHLCVStore()
+        return _shared_store
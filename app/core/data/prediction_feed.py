@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Prediction Feed
+Local publish/subscribe channel for new predictions. Publishers append to a
+SQLite outbox with a monotonic sequence number and wake subscribers with a
+Unix-domain datagram; each subscriber keeps its own cursor, so services
+block until something is published instead of polling the predictions
+database, and resume where they left off after a restart. Consumers still
+scan the predictions database every RECONCILE_INTERVAL_SECONDS to pick up
+anything whose publish was missed.
+
+Environment:
+    PREDICTION_FEED_DB                 feed database (DATA_DIR/prediction_feed.db)
+    PREDICTION_FEED_SOCKET_DIR         wake-up sockets (DATA_DIR/prediction_feed)
+    PREDICTION_FEED_RETENTION_DAYS     days outbox rows are kept (14); a consumer
+                                       stopped for longer skips the pruned rows
+                                       and relies on its reconcile scan
+    PREDICTION_FEED_RECONCILE_SECONDS  how often consumers scan the predictions
+                                       database while the feed is up (3600)
+
+Usage (show the feed and consumer cursors):
+    python -m app.core.data.prediction_feed
+"""
+
+import glob
+import json
+import logging
+import os
+import select
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from app.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prediction_outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    prediction_id TEXT NOT NULL,
+    symbol TEXT,
+    payload TEXT NOT NULL,              -- JSON of the prediction row
+    published_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prediction_outbox_published ON prediction_outbox(published_at);
+
+CREATE TABLE IF NOT EXISTS prediction_feed_cursors (
+    consumer TEXT PRIMARY KEY,
+    last_seq INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Outbox rows older than this are pruned when publishing
+RETENTION_DAYS = int(os.getenv('PREDICTION_FEED_RETENTION_DAYS', '14'))
+
+# Consumers with a working feed only scan the predictions database this often
+RECONCILE_INTERVAL_SECONDS = int(os.getenv('PREDICTION_FEED_RECONCILE_SECONDS', '3600'))
+
+
+def default_feed_path() -> Path:
+    """Feed database shared by all publishers and subscribers"""
+    return Path(os.getenv('PREDICTION_FEED_DB', str(Settings().DATA_DIR / 'prediction_feed.db')))
+
+
+def default_socket_dir() -> Path:
+    """Directory holding one wake-up socket per subscriber"""
+    return Path(os.getenv('PREDICTION_FEED_SOCKET_DIR', str(Settings().DATA_DIR / 'prediction_feed')))
+
+
+@contextmanager
+def _connect(db_path: Path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def ensure_feed(db_path=None) -> Path:
+    """Create the feed database and its tables if they do not exist"""
+    db_path = Path(db_path) if db_path else default_feed_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    with _connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+    return db_path
+
+
+def notify_subscribers(socket_dir=None) -> int:
+    """
+    Wake every subscriber blocked on the feed.
+
+    Sockets nobody is bound to any more are removed. Returns the number of
+    subscribers notified.
+    """
+    socket_dir = Path(socket_dir) if socket_dir else default_socket_dir()
+    notified = 0
+    sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sender.setblocking(False)
+    try:
+        for path in glob.glob(str(socket_dir / '*.sock')):
+            try:
+                sender.sendto(b'1', path)
+                notified += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Subscriber exited without cleaning up
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except (BlockingIOError, OSError):
+                # A full queue already holds a pending wake-up
+                notified += 1
+    finally:
+        sender.close()
+    return notified
+
+
+def publish_predictions(predictions: Iterable[Dict[str, Any]], db_path=None, socket_dir=None) -> int:
+    """
+    Append predictions to the outbox in one transaction and wake subscribers.
+
+    Each prediction is a dict of predictions-table columns and must contain
+    prediction_id. Returns the sequence number of the last published row
+    (0 if nothing was published).
+    """
+    rows = [
+        (str(prediction['prediction_id']), prediction.get('symbol'),
+         json.dumps(prediction, default=str), datetime.now().isoformat())
+        for prediction in predictions
+    ]
+    if not rows:
+        return 0
+
+    db_path = ensure_feed(db_path)
+    with _connect(db_path) as conn:
+        cursor = conn.executemany(
+            "INSERT INTO prediction_outbox (prediction_id, symbol, payload, published_at) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        last_seq = conn.execute("SELECT MAX(seq) FROM prediction_outbox").fetchone()[0]
+        cutoff = (datetime.now() - timedelta(days=RETENTION_DAYS)).isoformat()
+        conn.execute("DELETE FROM prediction_outbox WHERE published_at < ?", (cutoff,))
+        conn.commit()
+
+    notify_subscribers(socket_dir)
+    logger.debug(f"Published {cursor.rowcount} predictions up to seq {last_seq}")
+    return last_seq
+
+
+def publish_prediction(prediction: Dict[str, Any], db_path=None, socket_dir=None) -> int:
+    """Publish a single prediction (see publish_predictions)"""
+    return publish_predictions([prediction], db_path=db_path, socket_dir=socket_dir)
+
+
+def publish_saved_predictions(predictions_db, prediction_ids: Iterable[str], db_path=None, socket_dir=None) -> int:
+    """
+    Publish predictions already committed to a predictions table.
+
+    The rows are read back by prediction_id, so every writer publishes the
+    same payload: the full predictions row. Returns the last published seq.
+    """
+    prediction_ids = [str(prediction_id) for prediction_id in prediction_ids]
+    if not prediction_ids:
+        return 0
+
+    rows = []
+    with _connect(Path(predictions_db)) as conn:
+        conn.row_factory = sqlite3.Row
+        for i in range(0, len(prediction_ids), 500):
+            chunk = prediction_ids[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(dict(row) for row in conn.execute(
+                f"SELECT * FROM predictions WHERE prediction_id IN ({placeholders})", chunk
+            ))
+
+    return publish_predictions(rows, db_path=db_path, socket_dir=socket_dir)
+
+
+class PredictionSubscriber:
+    """
+    One named consumer of the prediction feed.
+
+    Events are delivered at least once: fetch() returns everything after the
+    consumer's cursor and ack() moves the cursor, so anything fetched but not
+    acknowledged before a crash is delivered again. A new consumer starts at
+    the end of the feed unless start_from_beginning is set.
+    """
+
+    def __init__(self, consumer: str, db_path=None, socket_dir=None, start_from_beginning: bool = False):
+        self.consumer = consumer
+        self.db_path = ensure_feed(db_path)
+        self.socket_dir = Path(socket_dir) if socket_dir else default_socket_dir()
+        self.socket_path = self.socket_dir / f"{consumer}.sock"
+
+        with _connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT last_seq FROM prediction_feed_cursors WHERE consumer = ?", (consumer,)
+            ).fetchone()
+            if row is None:
+                start = 0 if start_from_beginning else conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM prediction_outbox"
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT INTO prediction_feed_cursors (consumer, last_seq, updated_at) VALUES (?, ?, ?)",
+                    (consumer, start, datetime.now().isoformat())
+                )
+                conn.commit()
+                self.last_seq = start
+            else:
+                self.last_seq = row[0]
+
+        self._socket = None
+        try:
+            self.socket_dir.mkdir(parents=True, exist_ok=True)
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._socket.bind(str(self.socket_path))
+            self._socket.setblocking(False)
+        except OSError as e:
+            # Without a wake-up socket wait() degrades to sleeping for the timeout
+            logger.warning(f"Prediction feed wake-ups unavailable for {consumer}: {e}")
+            if self._socket is not None:
+                self._socket.close()
+            self._socket = None
+
+    def fetch(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Published predictions after the cursor, oldest first.
+
+        Each event is the published prediction dict plus its feed 'seq'.
+        """
+        with _connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT seq, payload FROM prediction_outbox WHERE seq > ? ORDER BY seq LIMIT ?",
+                (self.last_seq, limit)
+            ).fetchall()
+
+        events = []
+        for seq, payload in rows:
+            try:
+                event = json.loads(payload)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable prediction feed entry {seq}")
+                continue
+            event['seq'] = seq
+            events.append(event)
+        return events
+
+    def ack(self, seq: int):
+        """Persist the cursor: everything up to seq has been handled"""
+        if seq <= self.last_seq:
+            return
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE prediction_feed_cursors SET last_seq = ?, updated_at = ? WHERE consumer = ?",
+                (seq, datetime.now().isoformat(), self.consumer)
+            )
+            conn.commit()
+        self.last_seq = seq
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until a publisher signals or the timeout passes.
+
+        Returns True when woken by a publish notification.
+        """
+        if self._socket is None:
+            time.sleep(max(timeout, 0))
+            return False
+
+        readable, _, _ = select.select([self._socket], [], [], max(timeout, 0))
+        if not readable:
+            return False
+
+        # Collapse a burst of notifications into one wake-up
+        while True:
+            try:
+                self._socket.recv(64)
+            except (BlockingIOError, OSError):
+                break
+        return True
+
+    def wait_for_events(self, timeout: float, limit: int = 500) -> List[Dict[str, Any]]:
+        """Return pending events immediately, otherwise block up to timeout for new ones"""
+        events = self.fetch(limit)
+        if events:
+            return events
+        if self.wait(timeout):
+            return self.fetch(limit)
+        return []
+
+    def close(self):
+        """Close and remove the wake-up socket"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    feed_path = ensure_feed()
+    with _connect(feed_path) as conn:
+        total, last = conn.execute("SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM prediction_outbox").fetchone()
+        print(f"{feed_path}: {total} predictions in outbox, last seq {last}")
+        for consumer, last_seq, updated_at in conn.execute(
+            "SELECT consumer, last_seq, updated_at FROM prediction_feed_cursors ORDER BY consumer"
+        ):
+            print(f"  {consumer}: seq {last_seq} ({last - last_seq} pending, updated {updated_at})")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Signal Store
+Normalized long-format table of per-symbol trading signals extracted from the
+JSON columns of enhanced_morning_analysis and enhanced_evening_analysis
+
+Usage (backfill existing analysis rows):
+    python -m app.core.data.signal_store data/trading_predictions.db
+"""
+
+import json
+import logging
+import sqlite3
+import sys
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MORNING_TABLE = 'enhanced_morning_analysis'
+EVENING_TABLE = 'enhanced_evening_analysis'
+
+# Analysis table -> data type name used by the backtesters
+ANALYSIS_TYPES = {
+    MORNING_TABLE: 'morning_analysis',
+    EVENING_TABLE: 'evening_analysis',
+}
+
+SIGNAL_COLUMNS = ['timestamp', 'symbol', 'signal_type', 'signal', 'confidence',
+                  'sentiment_score', 'technical_score', 'price']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,            -- UTC, 'YYYY-MM-DD HH:MM:SS.ffffff'
+    symbol TEXT NOT NULL,
+    source TEXT NOT NULL,               -- traditional, ml or evening_ml
+    action TEXT NOT NULL,
+    confidence REAL,
+    sentiment_score REAL,
+    technical_score REAL,
+    price REAL,
+    source_table TEXT NOT NULL,
+    source_rowid INTEGER NOT NULL,
+    UNIQUE (source_table, source_rowid, symbol, source)
+);
+CREATE INDEX IF NOT EXISTS idx_signals_symbol_timestamp ON signals(symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp);
+
+CREATE TABLE IF NOT EXISTS signal_backfill_state (
+    source_table TEXT PRIMARY KEY,
+    last_rowid INTEGER NOT NULL
+);
+"""
+
+
+def ensure_signals_table(conn: sqlite3.Connection):
+    """
+    Create the signals table and its indexes if they do not exist.
+
+    Statements are run one by one because executescript() commits the
+    caller's pending transaction first.
+    """
+    for statement in SCHEMA.split(';'):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _utc_timestamp(value: Any) -> Optional[str]:
+    try:
+        ts = pd.to_datetime(value, utc=True).tz_localize(None)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(ts):
+        return None
+    return ts.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def _parse(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def extract_morning_signals(technical_signals: Any, ml_predictions: Any) -> List[Tuple]:
+    """
+    Signals from one morning analysis row as (symbol, source, action,
+    confidence, sentiment_score, technical_score, price) tuples.
+    Both arguments may be JSON text or already-parsed dicts.
+    """
+    rows = []
+    traditional = _parse(technical_signals)
+    ml_pred = _parse(ml_predictions)
+
+    if isinstance(traditional, dict):
+        for symbol, signal_data in traditional.items():
+            if isinstance(signal_data, dict):
+                rows.append((
+                    symbol, 'traditional',
+                    signal_data.get('final_signal', 'HOLD'),
+                    signal_data.get('overall_confidence', 0.5),
+                    signal_data.get('sentiment_contribution', 0),
+                    signal_data.get('rsi', 50),
+                    signal_data.get('current_price', 0)
+                ))
+
+    if isinstance(ml_pred, dict):
+        for symbol, ml_data in ml_pred.items():
+            if isinstance(ml_data, dict):
+                # ML doesn't separate sentiment and integrates all features
+                rows.append((
+                    symbol, 'ml',
+                    ml_data.get('optimal_action', 'HOLD'),
+                    ml_data.get('confidence', 0.5),
+                    0, 0, 0
+                ))
+
+    return rows
+
+
+def extract_evening_signals(next_day_predictions: Any) -> List[Tuple]:
+    """Signals from one evening analysis row (its bank_predictions section)"""
+    rows = []
+    ml_results = _parse(next_day_predictions)
+
+    if isinstance(ml_results, dict) and isinstance(ml_results.get('bank_predictions'), dict):
+        for symbol, ml_data in ml_results['bank_predictions'].items():
+            if isinstance(ml_data, dict):
+                rows.append((
+                    symbol, 'evening_ml',
+                    ml_data.get('optimal_action', 'HOLD'),
+                    ml_data.get('confidence', 0.5),
+                    0, 0, 0
+                ))
+
+    return rows
+
+
+def _numeric(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _insert_signals(conn: sqlite3.Connection, source_table: str, source_rowid: int,
+                    timestamp: Any, signals: Iterable[Tuple]) -> int:
+    utc_timestamp = _utc_timestamp(timestamp)
+    if utc_timestamp is None:
+        return 0
+    records = [
+        (utc_timestamp, symbol, source, str(action), _numeric(confidence),
+         _numeric(sentiment_score), _numeric(technical_score), _numeric(price),
+         source_table, source_rowid)
+        for symbol, source, action, confidence, sentiment_score, technical_score, price in signals
+    ]
+    conn.executemany("""
+        INSERT OR IGNORE INTO signals
+        (timestamp, symbol, source, action, confidence, sentiment_score,
+         technical_score, price, source_table, source_rowid)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, records)
+    return len(records)
+
+
+def record_morning_signals(conn: sqlite3.Connection, source_rowid: int, timestamp: Any,
+                           technical_signals: Any, ml_predictions: Any) -> int:
+    """Write the signals of a newly inserted enhanced_morning_analysis row"""
+    ensure_signals_table(conn)
+    signals = extract_morning_signals(technical_signals, ml_predictions)
+    return _insert_signals(conn, MORNING_TABLE, source_rowid, timestamp, signals)
+
+
+def record_evening_signals(conn: sqlite3.Connection, source_rowid: int, timestamp: Any,
+                           next_day_predictions: Any) -> int:
+    """Write the signals of a newly inserted enhanced_evening_analysis row"""
+    ensure_signals_table(conn)
+    signals = extract_evening_signals(next_day_predictions)
+    return _insert_signals(conn, EVENING_TABLE, source_rowid, timestamp, signals)
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def backfill_signals(db_path, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Extract signals from analysis rows that are not in the signals table yet.
+
+    Progress is tracked per source table by rowid, so repeated runs only
+    parse rows added since the previous run.
+
+    Returns:
+        Number of signals written per source table.
+    """
+    written = {}
+    with sqlite3.connect(db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        ensure_signals_table(conn)
+
+        for source_table in (MORNING_TABLE, EVENING_TABLE):
+            if source_table not in tables:
+                continue
+
+            columns = set(_table_columns(conn, source_table))
+            if source_table == MORNING_TABLE:
+                wanted = ['technical_signals', 'ml_predictions']
+            else:
+                wanted = ['next_day_predictions']
+            if not set(wanted) <= columns:
+                continue
+
+            state = conn.execute(
+                "SELECT last_rowid FROM signal_backfill_state WHERE source_table = ?", (source_table,)
+            ).fetchone()
+            last_rowid = state[0] if state else 0
+            written[source_table] = 0
+
+            while True:
+                rows = conn.execute(
+                    f"SELECT rowid, timestamp, {', '.join(wanted)} FROM {source_table} "
+                    f"WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+
+                # Rows the analyzers already recorded signals for need no parsing
+                recorded = {row[0] for row in conn.execute(
+                    "SELECT DISTINCT source_rowid FROM signals "
+                    "WHERE source_table = ? AND source_rowid BETWEEN ? AND ?",
+                    (source_table, rows[0][0], rows[-1][0])
+                )}
+
+                for rowid, timestamp, *payload in rows:
+                    if rowid in recorded:
+                        continue
+                    try:
+                        if source_table == MORNING_TABLE:
+                            signals = extract_morning_signals(*payload)
+                        else:
+                            signals = extract_evening_signals(*payload)
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Skipping unparseable {source_table} row {rowid}: {e}")
+                        continue
+                    written[source_table] += _insert_signals(conn, source_table, rowid, timestamp, signals)
+
+                last_rowid = rows[-1][0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO signal_backfill_state (source_table, last_rowid) VALUES (?, ?)",
+                    (source_table, last_rowid)
+                )
+                conn.commit()
+
+    return written
+
+
+def _connect_read_only(db_path) -> sqlite3.Connection:
+    """Open a database for reading only, so loading never needs a write lock"""
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def signal_source_tables(db_path) -> List[str]:
+    """
+    Analysis tables that already have rows in the signals table.
+
+    Used to load signals when the backfill cannot write to the database
+    (read-only file or a writer holding the lock).
+    """
+    with closing(_connect_read_only(db_path)) as conn:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='signals'"
+        ).fetchone():
+            return []
+        present = {row[0] for row in conn.execute("SELECT DISTINCT source_table FROM signals")}
+    return [table for table in (MORNING_TABLE, EVENING_TABLE) if table in present]
+
+
+def load_signals(db_path, symbols: Optional[List[str]] = None,
+                 source_table: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load signals with one query into a typed DataFrame.
+
+    Columns match the backtesters' signal frames: timestamp (UTC, naive
+    datetime64), symbol, signal_type, signal, confidence, sentiment_score,
+    technical_score and price, newest analysis first.
+    """
+    clauses, params = [], []
+    if symbols:
+        clauses.append(f"symbol IN ({', '.join('?' for _ in symbols)})")
+        params.extend(symbols)
+    if source_table:
+        clauses.append("source_table = ?")
+        params.append(source_table)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with closing(_connect_read_only(db_path)) as conn:
+        df = pd.read_sql_query(f"""
+            SELECT timestamp, symbol, source AS signal_type, action AS signal,
+                   confidence, sentiment_score, technical_score, price
+            FROM signals
+            {where}
+            ORDER BY timestamp DESC, source_rowid DESC, id
+        """, conn, params=params)
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='%Y-%m-%d %H:%M:%S.%f')
+    for column in ['confidence', 'sentiment_score', 'technical_score', 'price']:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype(float)
+    return df[SIGNAL_COLUMNS]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for path in sys.argv[1:] or ['data/trading_predictions.db']:
+        counts = backfill_signals(path)
+        print(f"{path}: " + (", ".join(f"{table} {count} signals" for table, count in counts.items()) or "no analysis tables"))
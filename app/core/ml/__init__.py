@@ -1,8 +1,15 @@
 """Machine Learning components package"""
 
-from .ensemble.enhanced_ensemble import EnhancedTransformerEnsemble, ModelPrediction
-from .training.pipeline import MLTrainingPipeline  
-from .prediction.predictor import PricePredictor
+import importlib
+
+# Lazy imports: the ensemble, training and prediction modules pull in pandas,
+# sklearn and scipy, so they are only imported when one of them is first used
+_LAZY_EXPORTS = {
+    "EnhancedTransformerEnsemble": ".ensemble.enhanced_ensemble",
+    "ModelPrediction": ".ensemble.enhanced_ensemble",
+    "MLTrainingPipeline": ".training.pipeline",
+    "PricePredictor": ".prediction.predictor",
+}
 
 __all__ = [
     "EnhancedTransformerEnsemble",
@@ -10,3 +17,9 @@ __all__ = [
     "MLTrainingPipeline",
     "PricePredictor",
 ]
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -43,6 +43,7 @@ warnings.filterwarnings('ignore')
 try:
     from ..analysis.technical import TechnicalAnalyzer, get_market_data
     from ...config.settings import Settings
+    from .model_registry import get_model_registry
 except ImportError:
     # Fallback for direct execution
     import sys
@@ -50,6 +51,7 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     from app.core.analysis.technical import TechnicalAnalyzer, get_market_data
     from app.config.settings import Settings
+    from app.core.ml.model_registry import get_model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +77,9 @@ class EnhancedMLTrainingPipeline:
         # Initialize logger
         self.logger = logging.getLogger(__name__)
         
+        # Loaded models stay resident and are shared across pipeline instances
+        self.model_registry = get_model_registry()
+        
         # Define required features as per instructions
         self.required_features = {
             'technical_indicators': [
@@ -869,84 +874,157 @@ class EnhancedMLTrainingPipeline:
         Returns:
             Dictionary with direction, magnitude, and confidence predictions
         """
-        try:
-            # Extract features for prediction
-            market_data = get_market_data(symbol, period='3mo', interval='1h')
-            if market_data.empty:
-                return {'error': 'No market data available'}
-            
-            technical_result = self.technical_analyzer.analyze(symbol, market_data)
-            features = self._extract_comprehensive_features(
-                sentiment_data, technical_result, market_data, symbol
-            )
-            
-            if not self._validate_features(features):
-                return {'error': 'Invalid features'}
-            
-            # Load models
-            direction_model_path = os.path.join(self.models_dir, 'current_direction_model.pkl')
-            magnitude_model_path = os.path.join(self.models_dir, 'current_magnitude_model.pkl')
-            metadata_path = os.path.join(self.models_dir, 'current_enhanced_metadata.json')
-            
-            # Check if all required model files exist
-            missing_files = []
-            if not os.path.exists(direction_model_path):
-                missing_files.append('direction model')
-            if not os.path.exists(magnitude_model_path):
-                missing_files.append('magnitude model')
-            if not os.path.exists(metadata_path):
-                missing_files.append('metadata')
-            
-            if missing_files:
-                error_msg = f"ML models not available for {symbol}: missing {', '.join(missing_files)}. Please retrain models or use manual analysis."
-                logger.error(error_msg)
-                return {'error': error_msg, 'requires_manual_analysis': True}
-            
-            try:
-                direction_model = joblib.load(direction_model_path)
-                magnitude_model = joblib.load(magnitude_model_path)
-            except Exception as e:
-                error_msg = f"Failed to load ML models for {symbol}: {str(e)}. Models may be corrupted."
-                logger.error(error_msg)
-                return {'error': error_msg, 'requires_model_retraining': True}
+        return self.predict_batch([symbol], {symbol: sentiment_data})[symbol]
+    
+    def predict_batch(self, symbols: List[str], sentiment_data: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Make enhanced predictions for several symbols at once
+        
+        Features for every symbol are stacked into one matrix so each model is
+        called once per batch rather than once per symbol.
+        
+        Args:
+            symbols: Stock symbols to predict
+            sentiment_data: Sentiment analysis result per symbol
             
-            # Prepare feature vector
+        Returns:
+            Dictionary of symbol -> prediction (same shape as predict_enhanced)
+        """
+        results = {}
+        features_by_symbol = {}
+        
+        for symbol in symbols:
             try:
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
+                features = self._build_prediction_features(sentiment_data.get(symbol, {}), symbol)
+                if 'error' in features:
+                    results[symbol] = features
+                else:
+                    features_by_symbol[symbol] = features
             except Exception as e:
-                error_msg = f"Failed to load model metadata for {symbol}: {str(e)}"
-                logger.error(error_msg)
-                return {'error': error_msg, 'requires_model_retraining': True}
-            
-            feature_columns = metadata.get('feature_columns', [])
-            if not feature_columns:
-                error_msg = f"Invalid model metadata for {symbol}: no feature columns defined"
-                logger.error(error_msg)
-                return {'error': error_msg, 'requires_model_retraining': True}
-            feature_vector = [features.get(col, 0) for col in feature_columns]
-            X = np.array(feature_vector).reshape(1, -1)
-            
-            # Make predictions
-            direction_pred = direction_model.predict(X)[0]
-            direction_proba = direction_model.predict_proba(X)
-            magnitude_pred = magnitude_model.predict(X)[0]
-            
-            # Calculate confidence scores
-            direction_confidence = [np.max(proba) for proba in direction_proba]
+                logger.error(f"Enhanced prediction error for {symbol}: {e}")
+                results[symbol] = {'error': str(e)}
+        
+        if features_by_symbol:
+            batch_symbols = list(features_by_symbol)
+            models = self._load_current_models(', '.join(batch_symbols))
+            if 'error' in models:
+                for symbol in batch_symbols:
+                    results[symbol] = dict(models)
+            else:
+                try:
+                    results.update(self._predict_feature_batch(models, features_by_symbol))
+                except Exception as e:
+                    logger.error(f"Enhanced prediction error for {', '.join(batch_symbols)}: {e}")
+                    for symbol in batch_symbols:
+                        results[symbol] = {'error': str(e)}
+        
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    def _build_prediction_features(self, sentiment_data: Dict, symbol: str) -> Dict:
+        """Extract and validate the feature dictionary for one symbol"""
+        market_data = get_market_data(symbol, period='3mo', interval='1h')
+        if market_data.empty:
+            return {'error': 'No market data available'}
+        
+        technical_result = self.technical_analyzer.analyze(symbol, market_data)
+        features = self._extract_comprehensive_features(
+            sentiment_data, technical_result, market_data, symbol
+        )
+        
+        if not self._validate_features(features):
+            return {'error': 'Invalid features'}
+        
+        return features
+    
+    def _load_current_models(self, symbol: str) -> Dict:
+        """
+        Fetch the current direction/magnitude models and metadata from the model registry
+        
+        Files are only deserialised when they change on disk; otherwise the
+        resident copies are returned.
+        """
+        direction_model_path = os.path.join(self.models_dir, 'current_direction_model.pkl')
+        magnitude_model_path = os.path.join(self.models_dir, 'current_magnitude_model.pkl')
+        metadata_path = os.path.join(self.models_dir, 'current_enhanced_metadata.json')
+        
+        # Check if all required model files exist
+        missing_files = []
+        if not os.path.exists(direction_model_path):
+            missing_files.append('direction model')
+        if not os.path.exists(magnitude_model_path):
+            missing_files.append('magnitude model')
+        if not os.path.exists(metadata_path):
+            missing_files.append('metadata')
+        
+        if missing_files:
+            error_msg = f"ML models not available for {symbol}: missing {', '.join(missing_files)}. Please retrain models or use manual analysis."
+            logger.error(error_msg)
+            return {'error': error_msg, 'requires_manual_analysis': True}
+        
+        try:
+            direction_model = self.model_registry.get(direction_model_path)
+            magnitude_model = self.model_registry.get(magnitude_model_path)
+        except Exception as e:
+            error_msg = f"Failed to load ML models for {symbol}: {str(e)}. Models may be corrupted."
+            logger.error(error_msg)
+            return {'error': error_msg, 'requires_model_retraining': True}
+        
+        try:
+            metadata = self.model_registry.get_json(metadata_path)
+        except Exception as e:
+            error_msg = f"Failed to load model metadata for {symbol}: {str(e)}"
+            logger.error(error_msg)
+            return {'error': error_msg, 'requires_model_retraining': True}
+        
+        feature_columns = metadata.get('feature_columns', [])
+        if not feature_columns:
+            error_msg = f"Invalid model metadata for {symbol}: no feature columns defined"
+            logger.error(error_msg)
+            return {'error': error_msg, 'requires_model_retraining': True}
+        
+        return {
+            'direction_model': direction_model,
+            'magnitude_model': magnitude_model,
+            'feature_columns': feature_columns,
+            'version': metadata.get('version')
+        }
+    
+    def _predict_feature_batch(self, models: Dict, features_by_symbol: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Run each model once over the stacked feature matrix"""
+        feature_columns = models['feature_columns']
+        symbols = list(features_by_symbol)
+        X = np.array([
+            [features_by_symbol[symbol].get(col, 0) for col in feature_columns]
+            for symbol in symbols
+        ])
+        
+        # Make predictions
+        direction_preds = models['direction_model'].predict(X)
+        direction_probas = models['direction_model'].predict_proba(X)
+        magnitude_preds = models['magnitude_model'].predict(X)
+        
+        # Confidence per sample and timeframe: highest class probability
+        direction_confidences = np.column_stack([np.max(proba, axis=1) for proba in direction_probas])
+        
+        # Safe conversion with NaN handling
+        def safe_int_convert(value):
+            return int(value) if not np.isnan(value) else 0
+        
+        def safe_float_convert(value):
+            return float(value) if not np.isnan(value) else 0.0
+        
+        results = {}
+        timestamp = datetime.now().isoformat()
+        for i, symbol in enumerate(symbols):
+            direction_pred = direction_preds[i]
+            magnitude_pred = magnitude_preds[i]
+            direction_confidence = direction_confidences[i]
             avg_confidence = np.mean(direction_confidence)
             
             # Determine optimal action
             action = self._determine_optimal_action(direction_pred, magnitude_pred, avg_confidence)
             
-            # Safe conversion with NaN handling
-            def safe_int_convert(value):
-                return int(value) if not np.isnan(value) else 0
-            
-            def safe_float_convert(value):
-                return float(value) if not np.isnan(value) else 0.0
-            
-            return {
+            results[symbol] = {
                 'direction_predictions': {
                     '1h': safe_int_convert(direction_pred[0]),
                     '4h': safe_int_convert(direction_pred[1]),
@@ -964,12 +1042,11 @@ class EnhancedMLTrainingPipeline:
                     'average': safe_float_convert(avg_confidence)
                 },
                 'optimal_action': action,
-                'timestamp': datetime.now().isoformat()
+                'model_version': models['version'],
+                'timestamp': timestamp
             }
-            
-        except Exception as e:
-            logger.error(f"Enhanced prediction error for {symbol}: {e}")
-            return {'error': str(e)}
+        
+        return results
     
     def _determine_optimal_action(self, direction_pred: np.ndarray, magnitude_pred: np.ndarray, confidence: float) -> str:
         """
@@ -1,5 +1,17 @@
 """Ensemble learning components"""
 
-from .enhanced_ensemble import EnhancedTransformerEnsemble, ModelPrediction
+import importlib
+
+# Lazy imports so the package can be located without loading pandas and sklearn
+_LAZY_EXPORTS = {
+    "EnhancedTransformerEnsemble": ".enhanced_ensemble",
+    "ModelPrediction": ".enhanced_ensemble",
+}
 
 __all__ = ["EnhancedTransformerEnsemble", "ModelPrediction"]
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,6 +11,8 @@ import logging
 from datetime import datetime
 import joblib
 
+from app.core.sentiment.score_cache import SentimentScoreCache, pipeline_model_id
+
 logger = logging.getLogger(__name__)
 
 class EnhancedTransformerEnsemble:
@@ -19,8 +21,10 @@ class EnhancedTransformerEnsemble:
     Combines multiple models with XGBoost meta-learner
     """
     
-    def __init__(self, base_analyzer):
+    def __init__(self, base_analyzer, score_cache=None):
         self.base_analyzer = base_analyzer
+        # Reuse the analyzer's persistent article score cache when available
+        self.score_cache = score_cache or getattr(base_analyzer, 'score_cache', None)
         self.meta_learner = None
         self.ensemble_weights = {}
         self.confidence_threshold = 0.8
@@ -55,13 +59,25 @@ class EnhancedTransformerEnsemble:
             predictions = {}
             confidences = {}
             
+            content_key = SentimentScoreCache.content_key(text) if self.score_cache else None
+            
             # Get predictions from all models
             for name, model in self.base_analyzer.transformer_models.items():
+                model_id = pipeline_model_id(model, name)
+                cached_score = self.score_cache.get(content_key, model_id) if self.score_cache else None
+                if cached_score is not None:
+                    # Confidence is the magnitude of the signed model score
+                    predictions[name] = cached_score
+                    confidences[name] = abs(cached_score)
+                    continue
+                
                 try:
                     result = model(text)
                     if isinstance(result, list) and len(result) > 0:
                         predictions[name] = result[0]['score'] if result[0]['label'] == 'POSITIVE' else -result[0]['score']
                         confidences[name] = result[0]['score']
+                        if self.score_cache:
+                            self.score_cache.put(content_key, model_id, predictions[name])
                 except Exception as e:
                     logger.warning(f"Model {name} failed: {e}")
                     continue
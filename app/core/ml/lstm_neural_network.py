@@ -25,8 +25,12 @@ from datetime import datetime, timedelta
 import logging
 import os
 import json
+import hashlib
+import shutil
 from typing import Dict, List, Tuple, Optional
 import warnings
+from numpy.lib.format import open_memmap
+from numpy.lib.stride_tricks import sliding_window_view
 warnings.filterwarnings('ignore')
 
 # Scikit-learn imports (always needed)
@@ -53,6 +57,248 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Columns of the training join that are not model inputs
+SEQUENCE_EXCLUDE_COLS = ['id', 'symbol', 'timestamp', 'feature_version', 'created_at',
+                         'price_direction_1h', 'price_direction_4h', 'price_direction_1d',
+                         'price_magnitude_1h', 'price_magnitude_4h', 'price_magnitude_1d',
+                         'optimal_action', 'confidence_score', 'target_symbol']
+DIRECTION_COLS = ['price_direction_1h', 'price_direction_4h', 'price_direction_1d']
+MAGNITUDE_COLS = ['price_magnitude_1h', 'price_magnitude_4h', 'price_magnitude_1d']
+
+SEQUENCE_CACHE_VERSION = 1
+
+class SequenceDatasetBuilder:
+    """
+    Builds LSTM training sequences from the enhanced_features/enhanced_outcomes
+    join without holding the join or per-sequence copies in memory.
+
+    The join is streamed in chunks ordered by symbol and time. Each symbol's
+    windows are strided views over its feature rows (plus the last
+    sequence_length rows carried over from the previous chunk) and are copied
+    once, straight into a preallocated array. With a cache directory that
+    array is a .npy memmap that later runs reopen instead of rebuilding, as
+    long as the joined rows have not changed.
+    """
+    
+    def __init__(self, db_path: str, sequence_length: int = 10, chunk_size: int = 5000,
+                 cache_dir: Optional[str] = None):
+        self.db_path = db_path
+        self.sequence_length = sequence_length
+        self.chunk_size = chunk_size
+        self.cache_dir = cache_dir
+        
+        self.feature_scaler = StandardScaler()
+        self.target_scaler = MinMaxScaler(feature_range=(-1, 1))
+    
+    _JOIN = '''
+        FROM enhanced_features ef
+        INNER JOIN enhanced_outcomes eo ON ef.id = eo.feature_id
+        WHERE eo.price_direction_4h IS NOT NULL
+    '''
+    
+    def _rows_query(self) -> str:
+        return f'''
+            SELECT ef.*, eo.price_direction_1h, eo.price_direction_4h, eo.price_direction_1d,
+                   eo.price_magnitude_1h, eo.price_magnitude_4h, eo.price_magnitude_1d,
+                   eo.optimal_action, eo.confidence_score, eo.symbol as target_symbol
+            {self._JOIN}
+            ORDER BY eo.symbol, ef.timestamp, ef.id
+        '''
+    
+    def _symbol_summary(self, conn: sqlite3.Connection) -> List[Tuple]:
+        """Per-symbol row counts, timestamp range and id checksums of the join"""
+        return conn.execute(f'''
+            SELECT eo.symbol, COUNT(*), MIN(ef.timestamp), MAX(ef.timestamp),
+                   MAX(ef.id), TOTAL(ef.id), MAX(eo.id), TOTAL(eo.id)
+            {self._JOIN}
+            GROUP BY eo.symbol
+            ORDER BY eo.symbol
+        ''').fetchall()
+    
+    def _feature_columns(self, conn: sqlite3.Connection) -> List[str]:
+        cursor = conn.execute(f"{self._rows_query()} LIMIT 0")
+        return [col[0] for col in cursor.description if col[0] not in SEQUENCE_EXCLUDE_COLS]
+    
+    def _fingerprint(self, summary: List[Tuple], feature_cols: List[str]) -> str:
+        payload = json.dumps([SEQUENCE_CACHE_VERSION, self.sequence_length, feature_cols, summary],
+                             default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+    
+    def build(self, min_samples: int = 50) -> Tuple[np.ndarray, Dict, Dict]:
+        """
+        Build (or reopen) the scaled sequence dataset
+        
+        Returns:
+            X: 3D array (samples, sequence_length, features), a read-only
+               memmap when a cache directory is configured
+            targets: Dictionary with 'direction' and 'magnitude' arrays
+            metadata: Information about the prepared data
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            # One read transaction, so the row scan sees the rows the summary counted;
+            # the connection's context manager ends it on exit
+            conn.execute("BEGIN")
+            summary = self._symbol_summary(conn)
+            feature_cols = self._feature_columns(conn)
+            
+            total_rows = sum(row[1] for row in summary)
+            if total_rows < min_samples:
+                logger.warning(f"Insufficient data for LSTM: {total_rows} samples (minimum: {min_samples})")
+                return None, None, None
+            
+            # Symbols with too few rows for one sequence are skipped
+            counts = {row[0]: row[1] for row in summary}
+            n_sequences = sum(max(count - self.sequence_length, 0) for count in counts.values())
+            if n_sequences < min_samples:
+                logger.warning(f"Insufficient sequences for LSTM: {n_sequences} sequences (minimum: {min_samples})")
+                return None, None, None
+            
+            metadata = {
+                'sequences_created': n_sequences,
+                'sequence_length': self.sequence_length,
+                'feature_count': len(feature_cols),
+                'feature_columns': feature_cols,
+                'symbols_processed': len(summary),
+                'data_range': {
+                    'start': min(row[2] for row in summary),
+                    'end': max(row[3] for row in summary)
+                }
+            }
+            
+            cache_path = None
+            if self.cache_dir:
+                cache_path = os.path.join(self.cache_dir, self._fingerprint(summary, feature_cols))
+                cached = self._load_cache(cache_path)
+                if cached is not None:
+                    logger.info(f"Reusing cached LSTM sequences from {cache_path}")
+                    return cached
+            
+            return self._build_arrays(conn, counts, feature_cols, n_sequences, metadata, cache_path)
+    
+    def _build_arrays(self, conn: sqlite3.Connection, counts: Dict[str, int], feature_cols: List[str],
+                      n_sequences: int, metadata: Dict, cache_path: Optional[str]):
+        length = self.sequence_length
+        shape = (n_sequences, length, len(feature_cols))
+        
+        tmp_path = None
+        if cache_path:
+            tmp_path = f"{cache_path}.tmp{os.getpid()}"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+            X = open_memmap(os.path.join(tmp_path, 'X.npy'), mode='w+', dtype=np.float64, shape=shape)
+        else:
+            X = np.empty(shape, dtype=np.float64)
+        y_direction = np.empty((n_sequences, len(DIRECTION_COLS)), dtype=np.float64)
+        y_magnitude = np.empty((n_sequences, len(MAGNITUDE_COLS)), dtype=np.float64)
+        
+        offset = 0
+        current_symbol = None
+        tail = np.empty((0, len(feature_cols)))
+        
+        for chunk in pd.read_sql_query(self._rows_query(), conn, chunksize=self.chunk_size):
+            symbols = chunk['target_symbol'].to_numpy()
+            features = np.nan_to_num(chunk[feature_cols].to_numpy(dtype=np.float64), nan=0.0)
+            directions = np.nan_to_num(chunk[DIRECTION_COLS].to_numpy(dtype=np.float64), nan=0)
+            magnitudes = np.nan_to_num(chunk[MAGNITUDE_COLS].to_numpy(dtype=np.float64), nan=0.0)
+            
+            # Rows arrive grouped by symbol; handle each run of one symbol at once
+            starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]])
+            ends = np.r_[starts[1:], len(symbols)]
+            for start, end in zip(starts, ends):
+                symbol = symbols[start]
+                if symbol != current_symbol:
+                    current_symbol = symbol
+                    tail = tail[:0]
+                if counts.get(symbol, 0) < length + 1:
+                    continue
+                
+                rows = np.concatenate([tail, features[start:end]])
+                n_windows = len(rows) - length
+                # Never write past the arrays sized from the summary
+                n_new = min(n_windows, n_sequences - offset)
+                if n_new > 0:
+                    # (windows, features, length) view -> (windows, length, features)
+                    windows = sliding_window_view(rows, length, axis=0).transpose(0, 2, 1)
+                    X[offset:offset + n_new] = windows[:n_new]
+                    # Targets are the rows right after each window, all in this run
+                    target_start = end - n_windows
+                    y_direction[offset:offset + n_new] = directions[target_start:target_start + n_new]
+                    y_magnitude[offset:offset + n_new] = magnitudes[target_start:target_start + n_new]
+                    offset += n_new
+                tail = rows[-length:].copy()
+        
+        if offset != n_sequences:
+            # The tables changed between the summary and the row scan
+            X, y_direction, y_magnitude = X[:offset], y_direction[:offset], y_magnitude[:offset]
+            metadata['sequences_created'] = offset
+        
+        # Same scaling as fitting on X.reshape(-1, features), one block at a time
+        block = max(1, self.chunk_size // length)
+        for i in range(0, len(X), block):
+            self.feature_scaler.partial_fit(X[i:i + block].reshape(-1, X.shape[-1]))
+        for i in range(0, len(X), block):
+            X_block = X[i:i + block]
+            X[i:i + block] = self.feature_scaler.transform(X_block.reshape(-1, X.shape[-1])).reshape(X_block.shape)
+        
+        targets = {
+            'direction': np.where(y_direction == 1, 1, 0),
+            'magnitude': self.target_scaler.fit_transform(y_magnitude)
+        }
+        
+        if tmp_path:
+            X.flush()
+            del X
+            X = self._save_cache(tmp_path, cache_path, targets, metadata, n_rows=offset)
+        
+        logger.info(f"Created {len(X)} sequences with {X.shape[2]} features each")
+        logger.info(f"Sequence shape: {X.shape}, Direction targets: {targets['direction'].shape}, "
+                    f"Magnitude targets: {targets['magnitude'].shape}")
+        
+        return X, targets, metadata
+    
+    def _save_cache(self, tmp_path: str, cache_path: str, targets: Dict, metadata: Dict,
+                    n_rows: int) -> np.ndarray:
+        import joblib
+        
+        np.save(os.path.join(tmp_path, 'direction.npy'), targets['direction'])
+        np.save(os.path.join(tmp_path, 'magnitude.npy'), targets['magnitude'])
+        joblib.dump(self.feature_scaler, os.path.join(tmp_path, 'feature_scaler.pkl'))
+        joblib.dump(self.target_scaler, os.path.join(tmp_path, 'target_scaler.pkl'))
+        with open(os.path.join(tmp_path, 'metadata.json'), 'w') as f:
+            json.dump(metadata, f, default=str)
+        
+        # Older datasets are superseded by this one
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if path != tmp_path and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, cache_path)
+        
+        return np.load(os.path.join(cache_path, 'X.npy'), mmap_mode='r')[:n_rows]
+    
+    def _load_cache(self, cache_path: str):
+        if not os.path.isdir(cache_path):
+            return None
+        try:
+            import joblib
+            
+            X = np.load(os.path.join(cache_path, 'X.npy'), mmap_mode='r')
+            targets = {
+                'direction': np.load(os.path.join(cache_path, 'direction.npy')),
+                'magnitude': np.load(os.path.join(cache_path, 'magnitude.npy'))
+            }
+            feature_scaler = joblib.load(os.path.join(cache_path, 'feature_scaler.pkl'))
+            target_scaler = joblib.load(os.path.join(cache_path, 'target_scaler.pkl'))
+            with open(os.path.join(cache_path, 'metadata.json')) as f:
+                metadata = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable LSTM sequence cache {cache_path}: {e}")
+            return None
+        
+        self.feature_scaler = feature_scaler
+        self.target_scaler = target_scaler
+        return X[:len(targets['direction'])], targets, metadata
+
 class LSTMNeuralNetwork:
     """
     LSTM Neural Network for stock price prediction and trading signal generation
@@ -62,6 +308,7 @@ class LSTMNeuralNetwork:
         self.db_path = db_path
         self.sequence_length = sequence_length  # How many time steps to look back
         self.models_dir = "data/ml_models/models"
+        self.sequence_cache_dir = "data/ml_models/sequence_cache"
         os.makedirs(self.models_dir, exist_ok=True)
         
         # Model architecture parameters
@@ -92,10 +339,15 @@ class LSTMNeuralNetwork:
             return False
         return True
     
-    def prepare_sequence_data(self, min_samples: int = 50) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    def prepare_sequence_data(self, min_samples: int = 50, use_cache: bool = True) -> Tuple[np.ndarray, np.ndarray, Dict]:
         """
         Prepare sequential data for LSTM training
         
+        Args:
+            min_samples: Minimum joined rows and sequences required
+            use_cache: Memory-map the sequences under sequence_cache_dir and
+                reuse them while the training data is unchanged
+        
         Returns:
             X: 3D array (samples, sequence_length, features)
             y: Dictionary with target arrays
@@ -106,108 +358,16 @@ class LSTMNeuralNetwork:
             
         logger.info("Preparing sequence data for LSTM training...")
         
-        conn = sqlite3.connect(self.db_path)
-        
-        # Get sequential data ordered by time
-        query = '''
-            SELECT ef.*, eo.price_direction_1h, eo.price_direction_4h, eo.price_direction_1d,
-                   eo.price_magnitude_1h, eo.price_magnitude_4h, eo.price_magnitude_1d,
-                   eo.optimal_action, eo.confidence_score, eo.symbol as target_symbol
-            FROM enhanced_features ef
-            INNER JOIN enhanced_outcomes eo ON ef.id = eo.feature_id
-            WHERE eo.price_direction_4h IS NOT NULL
-            ORDER BY ef.symbol, ef.timestamp
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        
-        if len(df) < min_samples:
-            logger.warning(f"Insufficient data for LSTM: {len(df)} samples (minimum: {min_samples})")
-            return None, None, None
-        
-        # Feature columns (exclude metadata)
-        exclude_cols = ['id', 'symbol', 'timestamp', 'feature_version', 'created_at', 
-                       'price_direction_1h', 'price_direction_4h', 'price_direction_1d',
-                       'price_magnitude_1h', 'price_magnitude_4h', 'price_magnitude_1d',
-                       'optimal_action', 'confidence_score', 'target_symbol']
-        
-        feature_cols = [col for col in df.columns if col not in exclude_cols]
-        
-        # Prepare features and targets
-        X_sequences = []
-        y_direction = []
-        y_magnitude = []
-        
-        # Group by symbol to maintain temporal order within each stock
-        for symbol in df['target_symbol'].unique():
-            symbol_data = df[df['target_symbol'] == symbol].sort_values('timestamp')
-            
-            if len(symbol_data) < self.sequence_length + 1:
-                continue  # Skip symbols with insufficient data
-            
-            # Extract features and targets
-            features = symbol_data[feature_cols].values
-            directions = symbol_data[['price_direction_1h', 'price_direction_4h', 'price_direction_1d']].values
-            magnitudes = symbol_data[['price_magnitude_1h', 'price_magnitude_4h', 'price_magnitude_1d']].values
-            
-            # Handle NaN values
-            features = np.nan_to_num(features, nan=0.0)
-            directions = np.nan_to_num(directions, nan=0)
-            magnitudes = np.nan_to_num(magnitudes, nan=0.0)
-            
-            # Create sequences
-            for i in range(len(features) - self.sequence_length):
-                # Input sequence: last sequence_length time steps
-                X_seq = features[i:i + self.sequence_length]
-                
-                # Target: next time step
-                y_dir = directions[i + self.sequence_length]
-                y_mag = magnitudes[i + self.sequence_length]
-                
-                X_sequences.append(X_seq)
-                y_direction.append(y_dir)
-                y_magnitude.append(y_mag)
-        
-        if len(X_sequences) < min_samples:
-            logger.warning(f"Insufficient sequences for LSTM: {len(X_sequences)} sequences (minimum: {min_samples})")
-            return None, None, None
-        
-        # Convert to numpy arrays
-        X = np.array(X_sequences)
-        y_direction = np.array(y_direction)
-        y_magnitude = np.array(y_magnitude)
-        
-        # Normalize features
-        X_reshaped = X.reshape(-1, X.shape[-1])
-        X_scaled = self.feature_scaler.fit_transform(X_reshaped)
-        X = X_scaled.reshape(X.shape)
-        
-        # Scale targets
-        y_magnitude = self.target_scaler.fit_transform(y_magnitude)
-        
-        # Convert direction to binary (0/1 instead of -1/1)
-        y_direction = np.where(y_direction == 1, 1, 0)
-        
-        targets = {
-            'direction': y_direction,
-            'magnitude': y_magnitude
-        }
-        
-        metadata = {
-            'sequences_created': len(X_sequences),
-            'sequence_length': self.sequence_length,
-            'feature_count': len(feature_cols),
-            'feature_columns': feature_cols,
-            'symbols_processed': len(df['target_symbol'].unique()),
-            'data_range': {
-                'start': df['timestamp'].min(),
-                'end': df['timestamp'].max()
-            }
-        }
+        builder = SequenceDatasetBuilder(
+            self.db_path,
+            sequence_length=self.sequence_length,
+            cache_dir=self.sequence_cache_dir if use_cache else None
+        )
+        X, targets, metadata = builder.build(min_samples=min_samples)
         
-        logger.info(f"Created {len(X)} sequences with {X.shape[2]} features each")
-        logger.info(f"Sequence shape: {X.shape}, Direction targets: {y_direction.shape}, Magnitude targets: {y_magnitude.shape}")
+        if X is not None:
+            self.feature_scaler = builder.feature_scaler
+            self.target_scaler = builder.target_scaler
         
         return X, targets, metadata
     
@@ -1,8 +1,16 @@
 """ML prediction components"""
 
-from .predictor import PricePredictor, PricePrediction
-from .backtester import MLBacktester
-from .market_aware_predictor import MarketAwarePricePredictor, create_market_aware_predictor, predict_with_market_context
+import importlib
+
+# Lazy imports so importing one predictor does not load the others
+_LAZY_EXPORTS = {
+    "PricePredictor": ".predictor",
+    "PricePrediction": ".predictor",
+    "MLBacktester": ".backtester",
+    "MarketAwarePricePredictor": ".market_aware_predictor",
+    "create_market_aware_predictor": ".market_aware_predictor",
+    "predict_with_market_context": ".market_aware_predictor",
+}
 
 __all__ = [
     "PricePredictor", 
@@ -11,4 +19,10 @@ __all__ = [
     "MarketAwarePricePredictor",
     "create_market_aware_predictor",
     "predict_with_market_context"
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,12 +8,14 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import sqlite3
 import joblib
 import json
 import os
 
+from app.core.ml.model_registry import get_model_registry
+
 logger = logging.getLogger(__name__)
 
 class MLBacktester:
@@ -23,9 +25,80 @@ class MLBacktester:
         self.ml_pipeline = ml_pipeline
         self.data_feed = data_feed
     
-    def backtest_predictions(self, symbol: str, start_date: str, end_date: str) -> Dict:
+    def backtest_predictions(self, symbol: str, start_date: str, end_date: str,
+                             buy_threshold: float = 0.5, sell_threshold: float = 0.5,
+                             max_holding_days: Optional[int] = None,
+                             max_price_lag_days: int = 0) -> Dict:
         """
         Backtest ML predictions against actual price movements
+        
+        All feature rows are scored in one model call, prices are aligned with
+        a merge-asof join and trades are derived from the signal arrays.
+        
+        Args:
+            symbol: Stock symbol
+            start_date: First feature timestamp to include
+            end_date: Last feature timestamp to include
+            buy_threshold: Buy when the profitable probability is above this
+            sell_threshold: Sell when the profitable probability is at or below this
+            max_holding_days: Force an exit after this many days (None to hold until a sell signal)
+            max_price_lag_days: How many days back a feature row may look for a
+                price (0 only trades on days with a price bar)
+        """
+        aligned = self.prepare_backtest_data(symbol, start_date, end_date, max_price_lag_days)
+        if 'error' in aligned:
+            return aligned
+        
+        return self._run_backtest(aligned, buy_threshold, sell_threshold, max_holding_days)
+    
+    def sweep_parameters(self, symbol: str, start_date: str, end_date: str,
+                         thresholds: List[float] = None,
+                         holding_periods: List[Optional[int]] = None,
+                         max_price_lag_days: int = 0) -> pd.DataFrame:
+        """
+        Grid search over signal thresholds and holding periods.
+        
+        Features, predictions and prices are loaded and aligned once; each
+        parameter combination only re-runs the array-based trade simulation.
+        
+        Args:
+            thresholds: Probability thresholds to use for both buy and sell signals
+            holding_periods: Maximum holding periods in days (None means no limit)
+        
+        Returns:
+            One row of metrics per (threshold, holding period), best total return first
+        """
+        thresholds = thresholds or [0.5, 0.55, 0.6, 0.65, 0.7]
+        holding_periods = holding_periods or [None, 1, 3, 5, 10]
+        
+        aligned = self.prepare_backtest_data(symbol, start_date, end_date, max_price_lag_days)
+        if 'error' in aligned:
+            logger.warning(f"Parameter sweep for {symbol}: {aligned['error']}")
+            return pd.DataFrame()
+        
+        rows = []
+        for threshold in thresholds:
+            for holding_days in holding_periods:
+                result = self._run_backtest(aligned, threshold, threshold, holding_days)
+                rows.append({
+                    'symbol': symbol,
+                    'threshold': threshold,
+                    'max_holding_days': holding_days,
+                    'total_return': result['total_return'],
+                    'final_capital': result['final_capital'],
+                    **result['metrics']
+                })
+        
+        return pd.DataFrame(rows).sort_values('total_return', ascending=False).reset_index(drop=True)
+    
+    def prepare_backtest_data(self, symbol: str, start_date: str, end_date: str,
+                              max_price_lag_days: int = 0) -> Dict:
+        """
+        Load feature rows, score them with the current model and align prices.
+        
+        Returns:
+            Dict of aligned arrays (dates, prices, probabilities, known) ready
+            for _run_backtest, or {'error': ...}
         """
         # Get historical sentiment data
         conn = sqlite3.connect(self.ml_pipeline.db_path)
@@ -46,115 +119,206 @@ class MLBacktester:
             symbol, 
             period='1y'  # Adjust as needed
         )
+        if price_data is None or price_data.empty:
+            return {'error': 'No price data found'}
         
-        # Simulate trades based on ML predictions
-        trades = []
-        capital = 10000  # Starting capital
-        position = 0
-        
-        for idx, row in sentiment_df.iterrows():
-            # Prepare features for ML prediction
-            features = {
-                'sentiment_score': row['sentiment_score'],
-                'confidence': row['confidence'],
-                'news_count': row['news_count'],
-                'reddit_sentiment': row['reddit_sentiment'],
-                'event_score': row['event_score']
-            }
+        if self.ml_pipeline.get_latest_model_version():
+            predictions = self._predict_batch(sentiment_df)
+        else:
+            # Without a trained model no row produces a signal
+            predictions = {'probability': np.full(len(sentiment_df), 0.5),
+                           'known': np.zeros(len(sentiment_df), dtype=bool)}
+        
+        # First bar of each trading day, keyed by the exchange-local date
+        price_index = price_data.index
+        if price_index.tz is not None:
+            price_index = price_index.tz_localize(None)
+        daily_prices = pd.DataFrame({
+            'price_date': price_index.normalize(),
+            'price': price_data['Close'].to_numpy(dtype=float)
+        }).drop_duplicates('price_date', keep='first')
+        
+        timestamps = pd.to_datetime(sentiment_df['timestamp'])
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_localize(None)
+        features = pd.DataFrame({
+            'trade_date': timestamps.dt.normalize(),
+            'probability': predictions['probability'],
+            'known': predictions['known']
+        })
+        features['row'] = np.arange(len(features))
+        
+        aligned = pd.merge_asof(
+            features.sort_values('trade_date', kind='stable'),
+            daily_prices,
+            left_on='trade_date',
+            right_on='price_date',
+            direction='backward',
+            tolerance=pd.Timedelta(days=max_price_lag_days)
+        ).sort_values('row', kind='stable')
+        
+        # Rows without a price on (or shortly before) their date are not traded
+        aligned = aligned[aligned['price'].notna()]
+        
+        return {
+            'dates': aligned['trade_date'].dt.date.to_numpy(),
+            'day_numbers': aligned['trade_date'].to_numpy().astype('datetime64[D]'),
+            'prices': aligned['price'].to_numpy(dtype=float),
+            'probabilities': aligned['probability'].to_numpy(dtype=float),
+            'known': aligned['known'].to_numpy(dtype=bool)
+        }
+    
+    def _run_backtest(self, aligned: Dict, buy_threshold: float, sell_threshold: float,
+                      max_holding_days: Optional[int] = None) -> Dict:
+        """Simulate long-only trades from aligned prediction and price arrays"""
+        prices = aligned['prices']
+        probabilities = aligned['probabilities']
+        known = aligned['known']
+        day_numbers = aligned['day_numbers']
+        
+        buy_rows = np.flatnonzero(known & (probabilities > buy_threshold))
+        sell_rows = np.flatnonzero(known & (probabilities <= sell_threshold))
+        
+        # Walk trade by trade: each step is a pair of binary searches, so the
+        # cost depends on the number of trades rather than the number of rows
+        entries, exits = [], []
+        cursor = 0
+        while True:
+            next_buy = np.searchsorted(buy_rows, cursor)
+            if next_buy >= len(buy_rows):
+                break
+            entry = buy_rows[next_buy]
             
-            # Get ML prediction
-            if self.ml_pipeline.get_latest_model_version():
-                prediction = self._get_ml_prediction(features, row['timestamp'])
-                
-                # Find matching price data
-                trade_date = pd.to_datetime(row['timestamp']).date()
-                price_row = price_data[price_data.index.date == trade_date]
-                
-                if not price_row.empty:
-                    current_price = price_row['Close'].iloc[0]
-                    
-                    # Simple trading logic
-                    if prediction['prediction'] == 'PROFITABLE' and position == 0:
-                        # Buy signal
-                        position = capital / current_price
-                        capital = 0
-                        entry_price = current_price
-                        entry_date = trade_date
-                        
-                    elif prediction['prediction'] == 'UNPROFITABLE' and position > 0:
-                        # Sell signal
-                        capital = position * current_price
-                        trade_return = (current_price - entry_price) / entry_price
-                        
-                        trades.append({
-                            'entry_date': entry_date,
-                            'exit_date': trade_date,
-                            'entry_price': entry_price,
-                            'exit_price': current_price,
-                            'return': trade_return,
-                            'prediction': prediction
-                        })
-                        
-                        position = 0
+            next_sell = np.searchsorted(sell_rows, entry + 1)
+            exit_row = sell_rows[next_sell] if next_sell < len(sell_rows) else len(prices)
+            if max_holding_days is not None:
+                deadline = day_numbers[entry] + np.timedelta64(max_holding_days, 'D')
+                expiry = entry + 1 + np.searchsorted(day_numbers[entry + 1:], deadline)
+                exit_row = min(exit_row, expiry)
+            
+            entries.append(entry)
+            if exit_row >= len(prices):
+                break
+            exits.append(exit_row)
+            cursor = exit_row + 1
+        
+        entries = np.asarray(entries, dtype=int)
+        exits = np.asarray(exits, dtype=int)
+        closed_entries = entries[:len(exits)]
+        
+        returns = (prices[exits] - prices[closed_entries]) / prices[closed_entries]
+        capital = 10000 * float(np.prod(prices[exits] / prices[closed_entries]))
+        open_position = None
+        if len(entries) > len(exits):
+            # Still invested at the end of the data: mark the position to the last aligned price
+            entry = entries[-1]
+            capital *= prices[-1] / prices[entry]
+            open_position = {
+                'entry_date': aligned['dates'][entry],
+                'entry_price': prices[entry],
+                'mark_date': aligned['dates'][-1],
+                'mark_price': prices[-1],
+                'unrealized_return': (prices[-1] - prices[entry]) / prices[entry]
+            }
+        
+        trades = [
+            {
+                'entry_date': aligned['dates'][entry],
+                'exit_date': aligned['dates'][exit_row],
+                'entry_price': prices[entry],
+                'exit_price': prices[exit_row],
+                'return': trade_return,
+                'prediction': {
+                    'prediction': 'PROFITABLE' if probabilities[exit_row] > 0.5 else 'UNPROFITABLE',
+                    'probability': probabilities[exit_row]
+                }
+            }
+            for entry, exit_row, trade_return in zip(closed_entries, exits, returns)
+        ]
         
         # Calculate performance metrics
         metrics = self._calculate_backtest_metrics(trades, capital)
         
         return {
             'trades': trades,
+            'open_position': open_position,
             'metrics': metrics,
             'final_capital': capital,
             'total_return': (capital - 10000) / 10000
         }
     
-    def _get_ml_prediction(self, features: Dict, timestamp: str) -> Dict:
-        """Get ML prediction for given features"""
+    def _predict_batch(self, sentiment_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Score all feature rows with the current model in a single call.
+        
+        Returns:
+            'probability' of a profitable trade per row and 'known', which is
+            False where no prediction could be made (treated as UNKNOWN)
+        """
+        count = len(sentiment_df)
+        unknown = {'probability': np.full(count, 0.5), 'known': np.zeros(count, dtype=bool)}
+        
         try:
             # Load current model
             model_path = os.path.join(self.ml_pipeline.models_dir, 'current_model.pkl')
             metadata_path = os.path.join(self.ml_pipeline.models_dir, 'current_metadata.json')
             
             if not os.path.exists(model_path) or not os.path.exists(metadata_path):
-                return {'prediction': 'UNKNOWN', 'probability': 0.5}
+                return unknown
             
-            model = joblib.load(model_path)
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            registry = get_model_registry()
+            model = registry.get(model_path)
+            metadata = registry.get_json(metadata_path)
             
             # Prepare features
-            feature_df = pd.DataFrame([features])
+            feature_df = sentiment_df[
+                ['sentiment_score', 'confidence', 'news_count', 'reddit_sentiment', 'event_score']
+            ].reset_index(drop=True)
             
             # Add engineered features
             feature_df['sentiment_confidence_interaction'] = (
                 feature_df['sentiment_score'] * feature_df['confidence']
             )
-            feature_df['news_volume_category'] = pd.cut(
+            volume_category = pd.cut(
                 feature_df['news_count'], 
                 bins=[0, 5, 10, 20, 100], 
                 labels=[0, 1, 2, 3]
-            ).astype(int)
+            )
+            # Rows outside the news-count bins cannot be scored
+            known = volume_category.notna().to_numpy()
+            feature_df['news_volume_category'] = volume_category.cat.codes
             
             # Add time features
-            ts = pd.to_datetime(timestamp)
-            feature_df['hour'] = ts.hour
-            feature_df['day_of_week'] = ts.dayofweek
-            feature_df['is_market_hours'] = 1 if 10 <= ts.hour <= 16 else 0
+            ts = pd.to_datetime(sentiment_df['timestamp']).reset_index(drop=True)
+            feature_df['hour'] = ts.dt.hour
+            feature_df['day_of_week'] = ts.dt.dayofweek
+            feature_df['is_market_hours'] = ts.dt.hour.between(10, 16).astype(int)
             
             # Reorder columns to match training
             feature_df = feature_df[metadata['feature_columns']]
             
-            # Make prediction
-            probability = model.predict_proba(feature_df)[0, 1]
-            prediction = 'PROFITABLE' if probability > 0.5 else 'UNPROFITABLE'
+            probability = np.full(count, 0.5)
+            if known.any():
+                probability[known] = model.predict_proba(feature_df[known])[:, 1]
             
-            return {
-                'prediction': prediction,
-                'probability': probability
-            }
+            return {'probability': probability, 'known': known}
             
         except Exception as e:
-            logger.error(f"Error making ML prediction: {e}")
+            logger.error(f"Error making ML predictions: {e}")
+            return unknown
+    
+    def _get_ml_prediction(self, features: Dict, timestamp: str) -> Dict:
+        """Get ML prediction for given features"""
+        row = pd.DataFrame([{**features, 'timestamp': timestamp}])
+        result = self._predict_batch(row)
+        if not result['known'][0]:
             return {'prediction': 'UNKNOWN', 'probability': 0.5}
+        
+        probability = result['probability'][0]
+        return {
+            'prediction': 'PROFITABLE' if probability > 0.5 else 'UNPROFITABLE',
+            'probability': probability
+        }
     
     def _calculate_backtest_metrics(self, trades: List[Dict], final_capital: float) -> Dict:
         """Calculate backtesting performance metrics"""
@@ -6,11 +6,13 @@ Detects unusual market behavior and sentiment patterns
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
+import hashlib
 import logging
+import os
 from datetime import datetime, timedelta
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import DBSCAN
+from pathlib import Path
+
+from numpy.lib.stride_tricks import sliding_window_view
 import warnings
 
 from ..sentiment.enhanced_scoring import EnhancedSentimentScorer
@@ -19,6 +21,17 @@ from ...config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Bump when the features or model setup change so cached detectors are refit
+DETECTOR_CACHE_VERSION = 1
+
+# Bars of history behind each anomaly feature row
+LOOKBACK = 20
+
+FEATURE_NAMES = [
+    'price_z_score', 'price_change_rate', 'volume_ratio', 'volume_z_score',
+    'volatility_ratio', 'sentiment_score', 'trend_strength', 'price_momentum'
+]
+
 class AnomalyType:
     """Anomaly type classifications"""
     PRICE_ANOMALY = "price_anomaly"
@@ -34,26 +47,30 @@ class AnomalyDetector:
     Integrates with your existing sentiment and technical analysis
     """
     
-    def __init__(self):
+    def __init__(self, model_dir: Optional[str] = None):
+        """
+        Args:
+            model_dir: Where trained detectors are cached per symbol,
+                DATA_DIR/anomaly_models by default.
+        """
+        # sklearn is imported here rather than at module level so that importing
+        # this module (e.g. for `app.main status`) stays cheap
+        from sklearn.cluster import DBSCAN
+        
         # Initialize models
-        self.price_detector = IsolationForest(contamination=0.1, random_state=42)
-        self.volume_detector = IsolationForest(contamination=0.1, random_state=42)
-        self.sentiment_detector = IsolationForest(contamination=0.1, random_state=42)
-        self.volatility_detector = IsolationForest(contamination=0.1, random_state=42)
+        self._activate(self._new_models())
         
         # Clustering for pattern anomalies
         self.pattern_clusterer = DBSCAN(eps=0.5, min_samples=5)
         
-        # Scalers for normalization
-        self.price_scaler = StandardScaler()
-        self.volume_scaler = StandardScaler()
-        self.sentiment_scaler = StandardScaler()
-        self.volatility_scaler = StandardScaler()
-        
         # Training status
         self.is_trained = False
         self.baseline_period_days = 30
         
+        # Trained detectors and latest-window statistics per symbol
+        self.model_dir = Path(model_dir) if model_dir else Settings.DATA_DIR / 'anomaly_models'
+        self._baselines: Dict[str, Dict] = {}
+        
         # Thresholds
         self.anomaly_thresholds = {
             'severe': -0.6,      # Very unusual
@@ -77,12 +94,13 @@ class AnomalyDetector:
         Comprehensive anomaly detection across multiple dimensions
         """
         try:
-            # Train baseline models if needed
-            if not self.is_trained:
-                self._train_baseline_models(historical_data)
+            # Detectors for this symbol, refit only when its bars changed
+            baseline = self._get_baseline(symbol, historical_data)
+            self._activate(baseline['models'])
+            self.is_trained = baseline['trained']
             
             # Extract current features
-            current_features = self._extract_anomaly_features(current_data, historical_data)
+            current_features = self._features_from_window(current_data, baseline['window'])
             
             # Detect anomalies across different dimensions
             anomalies = {
@@ -116,7 +134,7 @@ class AnomalyDetector:
                 anomalies['anomalies_detected'].append(volatility_anomaly)
             
             # Cross-dimensional correlation anomalies
-            correlation_anomaly = self._detect_correlation_anomaly(current_features, historical_data)
+            correlation_anomaly = self._detect_correlation_anomaly(baseline['window'].get('price_volume_correlation'))
             if correlation_anomaly['is_anomaly']:
                 anomalies['anomalies_detected'].append(correlation_anomaly)
             
@@ -141,54 +159,115 @@ class AnomalyDetector:
     
     def _extract_anomaly_features(self, current_data: Dict, historical_data: pd.DataFrame) -> Dict:
         """Extract features for anomaly detection"""
-        features = {}
+        return self._features_from_window(current_data, self._window_statistics(historical_data))
+    
+    def _window_statistics(self, historical_data: pd.DataFrame) -> Dict:
+        """
+        Statistics of the last LOOKBACK bars that the current features are
+        measured against. They only change when a new bar arrives.
+        """
+        # Historical context (last 20 periods)
+        recent_data = historical_data.tail(LOOKBACK) if len(historical_data) > LOOKBACK else historical_data
+        if len(recent_data) == 0:
+            return {}
+        
+        returns = recent_data['Close'].pct_change().dropna()
+        current_volatility = returns.std()
+        historical_volatility = returns.rolling(10).std().mean()
         
-        # Current market data
+        window = {
+            'avg_price': recent_data['Close'].mean(),
+            'price_std': recent_data['Close'].std(),
+            'avg_volume': recent_data['Volume'].mean(),
+            'volume_std': recent_data['Volume'].std(),
+            'volatility_ratio': current_volatility / historical_volatility if historical_volatility > 0 else 1,
+            'trend_strength': abs(np.polyfit(range(len(recent_data)), recent_data['Close'], 1)[0]),
+            'price_momentum': recent_data['Close'].pct_change().tail(3).mean(),
+            'price_volume_correlation': None
+        }
+        
+        # Price-volume correlation of the same window
+        if len(historical_data) >= LOOKBACK:
+            price_changes = recent_data['Close'].pct_change().dropna()
+            volume_changes = recent_data['Volume'].pct_change().dropna()
+            if len(price_changes) > 5 and len(volume_changes) > 5:
+                window['price_volume_correlation'] = price_changes.corr(volume_changes)
+        
+        return window
+    
+    def _features_from_window(self, current_data: Dict, window: Dict) -> Dict:
+        """Anomaly features of the current price, volume and sentiment"""
         current_price = current_data.get('price', 0)
         current_volume = current_data.get('volume', 0)
         current_sentiment = current_data.get('sentiment_score', 0)
         
-        # Historical context (last 20 periods)
-        recent_data = historical_data.tail(20) if len(historical_data) > 20 else historical_data
-        
-        if len(recent_data) > 0:
-            # Price features
-            avg_price = recent_data['Close'].mean()
-            price_std = recent_data['Close'].std()
-            price_change_rate = (current_price / avg_price - 1) if avg_price > 0 else 0
-            
-            # Volume features
-            avg_volume = recent_data['Volume'].mean()
-            volume_std = recent_data['Volume'].std()
-            volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
-            
-            # Volatility features
-            returns = recent_data['Close'].pct_change().dropna()
-            current_volatility = returns.std()
-            historical_volatility = returns.rolling(10).std().mean()
-            volatility_ratio = current_volatility / historical_volatility if historical_volatility > 0 else 1
-            
-            # Trend features
-            trend = np.polyfit(range(len(recent_data)), recent_data['Close'], 1)[0]
-            
-            features = {
-                'price_z_score': (current_price - avg_price) / price_std if price_std > 0 else 0,
-                'price_change_rate': price_change_rate,
-                'volume_ratio': volume_ratio,
-                'volume_z_score': (current_volume - avg_volume) / volume_std if volume_std > 0 else 0,
-                'volatility_ratio': volatility_ratio,
-                'sentiment_score': current_sentiment,
-                'trend_strength': abs(trend),
-                'price_momentum': recent_data['Close'].pct_change().tail(3).mean()
-            }
-        else:
+        if not window:
             # Default values if insufficient data
-            features = {
+            return {
                 'price_z_score': 0, 'price_change_rate': 0, 'volume_ratio': 1,
                 'volume_z_score': 0, 'volatility_ratio': 1, 'sentiment_score': 0,
                 'trend_strength': 0, 'price_momentum': 0
             }
         
+        avg_price, price_std = window['avg_price'], window['price_std']
+        avg_volume, volume_std = window['avg_volume'], window['volume_std']
+        
+        return {
+            'price_z_score': (current_price - avg_price) / price_std if price_std > 0 else 0,
+            'price_change_rate': (current_price / avg_price - 1) if avg_price > 0 else 0,
+            'volume_ratio': current_volume / avg_volume if avg_volume > 0 else 1,
+            'volume_z_score': (current_volume - avg_volume) / volume_std if volume_std > 0 else 0,
+            'volatility_ratio': window['volatility_ratio'],
+            'sentiment_score': current_sentiment,
+            'trend_strength': window['trend_strength'],
+            'price_momentum': window['price_momentum']
+        }
+    
+    def build_baseline_features(self, historical_data: pd.DataFrame) -> np.ndarray:
+        """
+        Anomaly features of every bar against the LOOKBACK bars before it,
+        one row per bar from the LOOKBACK-th on, columns in FEATURE_NAMES
+        order. All windows are computed at once with strided views.
+        """
+        close = historical_data['Close'].to_numpy(dtype=float)
+        volume = historical_data['Volume'].to_numpy(dtype=float)
+        n_rows = len(close) - LOOKBACK
+        if n_rows <= 0:
+            return np.empty((0, len(FEATURE_NAMES)))
+        
+        # Windows ending just before each bar
+        close_windows = sliding_window_view(close, LOOKBACK)[:n_rows]
+        volume_windows = sliding_window_view(volume, LOOKBACK)[:n_rows]
+        current_price = close[LOOKBACK:]
+        current_volume = volume[LOOKBACK:]
+        
+        avg_price = close_windows.mean(axis=1)
+        price_std = close_windows.std(axis=1, ddof=1)
+        avg_volume = volume_windows.mean(axis=1)
+        volume_std = volume_windows.std(axis=1, ddof=1)
+        
+        # Returns inside each window: the LOOKBACK - 1 changes between its bars
+        returns = close[1:] / close[:-1] - 1
+        return_windows = sliding_window_view(returns, LOOKBACK - 1)[:n_rows]
+        current_volatility = return_windows.std(axis=1, ddof=1)
+        rolling_volatility = sliding_window_view(returns, 10).std(axis=1, ddof=1)
+        historical_volatility = sliding_window_view(rolling_volatility, LOOKBACK - 10)[:n_rows].mean(axis=1)
+        
+        # Least-squares slope of each window, as np.polyfit(range(LOOKBACK), window, 1)
+        x = np.arange(LOOKBACK) - (LOOKBACK - 1) / 2
+        trend = (close_windows - avg_price[:, None]) @ x / (x @ x)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features = np.column_stack([
+                np.where(price_std > 0, (current_price - avg_price) / price_std, 0),
+                np.where(avg_price > 0, current_price / avg_price - 1, 0),
+                np.where(avg_volume > 0, current_volume / avg_volume, 1),
+                np.where(volume_std > 0, (current_volume - avg_volume) / volume_std, 0),
+                np.where(historical_volatility > 0, current_volatility / historical_volatility, 1),
+                np.random.normal(0, 0.3, n_rows),  # Mock sentiment for training
+                np.abs(trend),
+                return_windows[:, -3:].mean(axis=1)
+            ])
         return features
     
     def _train_baseline_models(self, historical_data: pd.DataFrame):
@@ -199,27 +278,12 @@ class AnomalyDetector:
                 return
             
             # Prepare training features
-            training_features = []
-            
-            for i in range(20, len(historical_data)):  # Need lookback window
-                window_data = historical_data.iloc[i-20:i]
-                current_row = historical_data.iloc[i]
-                
-                mock_current = {
-                    'price': current_row['Close'],
-                    'volume': current_row['Volume'],
-                    'sentiment_score': np.random.normal(0, 0.3)  # Mock sentiment for training
-                }
-                
-                features = self._extract_anomaly_features(mock_current, window_data)
-                training_features.append(list(features.values()))
+            training_array = self.build_baseline_features(historical_data)
             
-            if len(training_features) < 10:
+            if len(training_array) < 10:
                 logger.warning("Insufficient training samples for anomaly detection")
                 return
             
-            training_array = np.array(training_features)
-            
             # Train individual detectors
             price_features = training_array[:, [0, 1]].reshape(-1, 1)  # price_z_score, price_change_rate
             volume_features = training_array[:, [2, 3]].reshape(-1, 1)  # volume ratios
@@ -249,6 +313,91 @@ class AnomalyDetector:
         except Exception as e:
             logger.error(f"Error training anomaly detection models: {e}")
     
+    @staticmethod
+    def _new_models() -> Dict[str, Any]:
+        """Untrained detectors and scalers"""
+        from sklearn.ensemble import IsolationForest
+        from sklearn.preprocessing import StandardScaler
+        
+        return {
+            'price_detector': IsolationForest(contamination=0.1, random_state=42),
+            'volume_detector': IsolationForest(contamination=0.1, random_state=42),
+            'sentiment_detector': IsolationForest(contamination=0.1, random_state=42),
+            'volatility_detector': IsolationForest(contamination=0.1, random_state=42),
+            'price_scaler': StandardScaler(),
+            'volume_scaler': StandardScaler(),
+            'sentiment_scaler': StandardScaler(),
+            'volatility_scaler': StandardScaler()
+        }
+    
+    def _activate(self, models: Dict[str, Any]):
+        """Use the given detectors and scalers for detection"""
+        for name, model in models.items():
+            setattr(self, name, model)
+    
+    def _get_baseline(self, symbol: str, historical_data: pd.DataFrame) -> Dict:
+        """
+        Trained detectors and latest-window statistics for symbol.
+        
+        Detectors are kept in memory and cached on disk together with a
+        fingerprint of the bars they were trained on, so they are only
+        refit when the history changes (normally when a new bar arrives).
+        """
+        fingerprint = self._data_fingerprint(historical_data)
+        baseline = self._baselines.get(symbol)
+        if baseline and baseline['fingerprint'] == fingerprint:
+            return baseline
+        
+        baseline = self._load_baseline(symbol, fingerprint)
+        if baseline is None:
+            models = self._new_models()
+            self._activate(models)
+            self.is_trained = False
+            self._train_baseline_models(historical_data)
+            baseline = {'fingerprint': fingerprint, 'models': models, 'trained': self.is_trained}
+            if self.is_trained:
+                self._save_baseline(symbol, baseline)
+        
+        baseline['window'] = self._window_statistics(historical_data)
+        self._baselines[symbol] = baseline
+        return baseline
+    
+    @staticmethod
+    def _data_fingerprint(historical_data: pd.DataFrame) -> str:
+        digest = hashlib.sha1(f"v{DETECTOR_CACHE_VERSION}:{len(historical_data)}".encode())
+        if len(historical_data):
+            columns = historical_data[['Close', 'Volume']]
+            digest.update(pd.util.hash_pandas_object(columns, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    def _baseline_path(self, symbol: str) -> Path:
+        return self.model_dir / f"{symbol.replace('/', '_')}.joblib"
+    
+    def _load_baseline(self, symbol: str, fingerprint: str) -> Optional[Dict]:
+        path = self._baseline_path(symbol)
+        if not path.exists():
+            return None
+        try:
+            import joblib
+            cached = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable anomaly detector cache {path}: {e}")
+            return None
+        if cached.get('fingerprint') != fingerprint:
+            return None
+        return {'fingerprint': fingerprint, 'models': cached['models'], 'trained': True}
+    
+    def _save_baseline(self, symbol: str, baseline: Dict):
+        path = self._baseline_path(symbol)
+        try:
+            import joblib
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            joblib.dump({'fingerprint': baseline['fingerprint'], 'models': baseline['models']}, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not cache anomaly detectors for {symbol}: {e}")
+    
     def _detect_price_anomaly(self, features: Dict) -> Dict:
         """Detect price-related anomalies"""
         try:
@@ -256,7 +405,7 @@ class AnomalyDetector:
             scaled_data = self.price_scaler.transform(price_data)
             
             anomaly_score = self.price_detector.decision_function(scaled_data)[0]
-            is_anomaly = self.price_detector.predict(scaled_data)[0] == -1
+            is_anomaly = anomaly_score < 0  # IsolationForest.predict flags negative decision scores
             
             return {
                 'type': AnomalyType.PRICE_ANOMALY,
@@ -280,7 +429,7 @@ class AnomalyDetector:
             scaled_data = self.volume_scaler.transform(volume_data)
             
             anomaly_score = self.volume_detector.decision_function(scaled_data)[0]
-            is_anomaly = self.volume_detector.predict(scaled_data)[0] == -1
+            is_anomaly = anomaly_score < 0
             
             # Additional volume checks
             unusual_volume = features['volume_ratio'] > self.alert_settings['volume_multiplier']
@@ -308,7 +457,7 @@ class AnomalyDetector:
             scaled_data = self.sentiment_scaler.transform(sentiment_data)
             
             anomaly_score = self.sentiment_detector.decision_function(scaled_data)[0]
-            is_anomaly = self.sentiment_detector.predict(scaled_data)[0] == -1
+            is_anomaly = anomaly_score < 0
             
             # Check for extreme sentiment
             extreme_sentiment = abs(features['sentiment_score']) > 0.8
@@ -334,7 +483,7 @@ class AnomalyDetector:
             scaled_data = self.volatility_scaler.transform(volatility_data)
             
             anomaly_score = self.volatility_detector.decision_function(scaled_data)[0]
-            is_anomaly = self.volatility_detector.predict(scaled_data)[0] == -1
+            is_anomaly = anomaly_score < 0
             
             # Check for extreme volatility
             extreme_volatility = features['volatility_ratio'] > self.alert_settings['volatility_multiplier']
@@ -353,21 +502,14 @@ class AnomalyDetector:
         except Exception as e:
             return {'type': AnomalyType.VOLATILITY_ANOMALY, 'is_anomaly': False, 'score': 0, 'error': str(e)}
     
-    def _detect_correlation_anomaly(self, features: Dict, historical_data: pd.DataFrame) -> Dict:
-        """Detect correlation anomalies between price and volume"""
+    def _detect_correlation_anomaly(self, correlation: Optional[float]) -> Dict:
+        """
+        Detect correlation anomalies between price and volume
+        correlation is the price-volume change correlation of the latest
+        window, or None if there is not enough history
+        """
         try:
-            if len(historical_data) < 20:
-                return {'type': AnomalyType.CORRELATION_ANOMALY, 'is_anomaly': False, 'score': 0}
-            
-            recent_data = historical_data.tail(20)
-            
-            # Calculate price-volume correlation
-            price_changes = recent_data['Close'].pct_change().dropna()
-            volume_changes = recent_data['Volume'].pct_change().dropna()
-            
-            if len(price_changes) > 5 and len(volume_changes) > 5:
-                correlation = price_changes.corr(volume_changes)
-                
+            if correlation is not None:
                 # Typical price-volume correlation should be positive
                 # Negative correlation might indicate unusual behavior
                 unusual_correlation = correlation < -0.3 or correlation > 0.8
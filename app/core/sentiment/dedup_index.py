@@ -0,0 +1,288 @@
+"""Near-duplicate news index using MinHash signatures and LSH banding"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Universal hashing modulo a Mersenne prime, truncated to 32 bits
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def title_tokens(title: str) -> Set[str]:
+    """Word set of a lowercased title, as used for the Jaccard comparison."""
+    return set((title or '').lower().split())
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _token_hash(token: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def lsh_bands(threshold: float, num_perm: int, recall: float = 0.99) -> Tuple[int, int]:
+    """
+    Choose LSH (bands, rows) for a similarity threshold.
+
+    Picks the most rows per band (fewest spurious candidates) for which a
+    pair at exactly the threshold still collides in some band with the given
+    probability. Candidates are verified exactly, so only missed pairs matter.
+
+    Returns:
+        (bands, rows) with bands * rows <= num_perm.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Persistent near-duplicate index for news titles.
+
+    Each cluster is represented by the first title that started it. New
+    titles are MinHashed over their word sets and only compared with
+    representatives that share an LSH band bucket, so assigning a batch is
+    near-linear in its size instead of comparing every pair. Candidates are
+    confirmed with the exact Jaccard similarity, so results match a full
+    pairwise comparison apart from the rare pair the banding misses.
+
+    Clusters are kept in SQLite (WAL mode), so the same syndicated story
+    gets the same cluster id across runs, symbols and processes. Without a
+    db_path the index lives in memory for the lifetime of the object.
+    """
+
+    def __init__(self, db_path=None, threshold: float = 0.8, num_perm: int = 128,
+                 max_age_days: int = 14, seed: int = 1):
+        """
+        Initialize the NearDuplicateIndex.
+
+        Args:
+            db_path: Path to the SQLite index file, or None for in-memory.
+            threshold: Titles with Jaccard similarity above this are duplicates.
+            num_perm: Number of MinHash permutations per signature.
+            max_age_days: Clusters not seen for this long are evicted.
+            seed: Seed for the MinHash permutations (must stay fixed for a db).
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.max_age_days = max_age_days
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self.stats = {'assigned': 0, 'new_clusters': 0, 'candidates': 0}
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 61, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 61, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._memory_conn = None
+        if self.db_path is None:
+            self._memory_conn = sqlite3.connect(':memory:', check_same_thread=False)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self.get_connection() as conn:
+            if self.db_path is not None:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS news_clusters (
+                    cluster_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_clusters_last_seen ON news_clusters(last_seen);
+
+                CREATE TABLE IF NOT EXISTS news_cluster_buckets (
+                    bucket INTEGER NOT NULL,
+                    cluster_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_cluster_buckets ON news_cluster_buckets(bucket);
+                CREATE INDEX IF NOT EXISTS idx_news_cluster_buckets_cluster ON news_cluster_buckets(cluster_id);
+            """)
+            conn.commit()
+
+        self.evict()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for database connections"""
+        if self._memory_conn is not None:
+            yield self._memory_conn
+            return
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """MinHash signature (num_perm uint64 values) of a token set."""
+        hashes = np.fromiter((_token_hash(token) for token in tokens), dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # uint64 products wrap around, which still gives a valid hash family
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def bucket_keys(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket key per LSH band of a signature."""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(chunk.tobytes(), digest_size=8, person=band.to_bytes(2, 'little')).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    def assign(self, titles: List[str]) -> List[Optional[int]]:
+        """
+        Assign a cluster id to each title, creating clusters as needed.
+
+        Titles are processed in order, so a title can join a cluster started
+        earlier in the same batch. The whole batch runs in one transaction.
+
+        Args:
+            titles: Article titles.
+
+        Returns:
+            Cluster id per title (None for empty titles).
+        """
+        token_sets = [title_tokens(title) for title in titles]
+        bucket_keys = [self.bucket_keys(self.signature(tokens)) if tokens else [] for tokens in token_sets]
+        all_keys = list({key for keys in bucket_keys for key in keys})
+
+        now = time.time()
+        cluster_ids: List[Optional[int]] = []
+        with self._lock, self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Representatives sharing any bucket with this batch
+                buckets: Dict[int, List[int]] = {}
+                for start in range(0, len(all_keys), 500):
+                    chunk = all_keys[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT bucket, cluster_id FROM news_cluster_buckets "
+                        f"WHERE bucket IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for bucket, cluster_id in rows:
+                        buckets.setdefault(bucket, []).append(cluster_id)
+
+                candidate_ids = list({cid for ids in buckets.values() for cid in ids})
+                representatives: Dict[int, Set[str]] = {}
+                for start in range(0, len(candidate_ids), 500):
+                    chunk = candidate_ids[start:start + 500]
+                    rows = conn.execute(
+                        f"SELECT cluster_id, title FROM news_clusters "
+                        f"WHERE cluster_id IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    representatives.update((cid, title_tokens(title)) for cid, title in rows)
+
+                seen = set()
+                for title, tokens, keys in zip(titles, token_sets, bucket_keys):
+                    if not tokens:
+                        cluster_ids.append(None)
+                        continue
+
+                    candidates = {cid for key in keys for cid in buckets.get(key, ())}
+                    self.stats['candidates'] += len(candidates)
+                    matches = [cid for cid in candidates
+                               if cid in representatives and jaccard(tokens, representatives[cid]) > self.threshold]
+
+                    if matches:
+                        cluster_id = min(matches)
+                    else:
+                        cluster_id = conn.execute(
+                            "INSERT INTO news_clusters (title, created_at, last_seen) VALUES (?, ?, ?)",
+                            (title.lower().strip(), now, now)
+                        ).lastrowid
+                        conn.executemany(
+                            "INSERT INTO news_cluster_buckets (bucket, cluster_id) VALUES (?, ?)",
+                            [(key, cluster_id) for key in keys]
+                        )
+                        representatives[cluster_id] = tokens
+                        for key in keys:
+                            buckets.setdefault(key, []).append(cluster_id)
+                        self.stats['new_clusters'] += 1
+
+                    seen.add(cluster_id)
+                    cluster_ids.append(cluster_id)
+
+                if seen:
+                    seen = list(seen)
+                    for start in range(0, len(seen), 500):
+                        chunk = seen[start:start + 500]
+                        conn.execute(
+                            f"UPDATE news_clusters SET last_seen = ? "
+                            f"WHERE cluster_id IN ({','.join('?' * len(chunk))})", [now] + chunk
+                        )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        self.stats['assigned'] += len(titles)
+        return cluster_ids
+
+    def evict(self) -> int:
+        """
+        Remove clusters that have not been seen within max_age_days.
+
+        Returns:
+            Number of clusters removed.
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        try:
+            with self.get_connection() as conn:
+                conn.execute("""
+                    DELETE FROM news_cluster_buckets WHERE cluster_id IN (
+                        SELECT cluster_id FROM news_clusters WHERE last_seen < ?
+                    )
+                """, (cutoff,))
+                removed = conn.execute("DELETE FROM news_clusters WHERE last_seen < ?", (cutoff,)).rowcount
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"News dedup index eviction failed: {e}")
+            return 0
+
+        if removed:
+            logger.info(f"Evicted {removed} news clusters")
+        return removed
+
+
+def deduplicate_news(news_items: List[Dict], index: NearDuplicateIndex) -> List[Dict]:
+    """
+    Keep the first article of each near-duplicate cluster.
+
+    Kept articles get a 'cluster_id' key; articles without a title are dropped.
+    """
+    titles = [item.get('title', '') or '' for item in news_items]
+    cluster_ids = index.assign([title.lower().strip() for title in titles])
+
+    unique_news = []
+    kept_clusters = set()
+    for item, cluster_id in zip(news_items, cluster_ids):
+        if cluster_id is None or cluster_id in kept_clusters:
+            continue
+        kept_clusters.add(cluster_id)
+        item['cluster_id'] = cluster_id
+        unique_news.append(item)
+    return unique_news
@@ -0,0 +1,149 @@
+"""Shared RSS feed cache so each feed is fetched once per analysis cycle"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+
+class RSSFeedCache:
+    """
+    Caches parsed RSS feeds by URL.
+
+    Each feed is downloaded and parsed at most once per TTL window. When the
+    TTL expires the feed is refreshed with a conditional request (ETag /
+    Last-Modified), so an unchanged feed costs a 304 rather than a full
+    download and re-parse. Entries are pre-normalised once so every symbol's
+    keyword filter only has to scan title and summary text.
+    """
+
+    def __init__(self, ttl_seconds: int = 900, max_entries: int = 20):
+        """
+        Initialize the RSSFeedCache.
+
+        Args:
+            ttl_seconds: How long a fetched feed is served without revalidation.
+            max_entries: Number of most recent entries kept per feed.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._feeds = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.stats = {'fetches': 0, 'not_modified': 0, 'cache_hits': 0, 'errors': 0}
+
+    def get_entries(self, feed_url: str) -> List[Dict]:
+        """
+        Return the normalised entries for a feed, fetching it only if stale.
+
+        Args:
+            feed_url: The RSS feed URL.
+
+        Returns:
+            A list of dicts with 'title', 'summary', 'link' and 'published'.
+        """
+        with self._url_lock(feed_url):
+            cached = self._feeds.get(feed_url)
+            if cached and time.time() - cached['fetched_at'] < self.ttl_seconds:
+                self.stats['cache_hits'] += 1
+                return cached['entries']
+
+            try:
+                feed = feedparser.parse(
+                    feed_url,
+                    etag=cached.get('etag') if cached else None,
+                    modified=cached.get('modified') if cached else None
+                )
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"Error fetching RSS feed {feed_url}: {e}")
+                return cached['entries'] if cached else []
+
+            if cached and getattr(feed, 'status', None) == 304:
+                # Feed unchanged since the last fetch; extend the cached copy
+                self.stats['not_modified'] += 1
+                cached['fetched_at'] = time.time()
+                return cached['entries']
+
+            # feedparser reports network and HTTP failures instead of raising;
+            # keep serving the last good copy and retry on the next call
+            status = getattr(feed, 'status', None)
+            if (status is not None and status >= 400) or (feed.get('bozo') and not feed.entries):
+                self.stats['errors'] += 1
+                logger.warning(f"Error fetching RSS feed {feed_url}: "
+                               f"{feed.get('bozo_exception') or f'HTTP {status}'}")
+                return cached['entries'] if cached else []
+
+            self.stats['fetches'] += 1
+            entries = [self._normalise_entry(entry) for entry in feed.entries[:self.max_entries]]
+            self._feeds[feed_url] = {
+                'entries': entries,
+                'etag': getattr(feed, 'etag', None),
+                'modified': getattr(feed, 'modified', None),
+                'fetched_at': time.time()
+            }
+            return entries
+
+    def prefetch(self, feed_urls: Iterable[str], max_workers: int = 6):
+        """
+        Warm the cache for several feeds concurrently.
+
+        Args:
+            feed_urls: Feed URLs to fetch (fresh ones are served from cache).
+            max_workers: Maximum number of feeds downloaded at once.
+        """
+        feed_urls = list(feed_urls)
+        if not feed_urls:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(feed_urls)),
+                                thread_name_prefix='rss-feed') as executor:
+            list(executor.map(self.get_entries, feed_urls))
+
+    def invalidate(self, feed_url: Optional[str] = None):
+        """Drop one cached feed, or all of them when no URL is given."""
+        with self._lock:
+            if feed_url is None:
+                self._feeds.clear()
+            else:
+                self._feeds.pop(feed_url, None)
+
+    def _url_lock(self, feed_url: str) -> threading.Lock:
+        """Per-URL lock so concurrent callers wait for a single fetch."""
+        with self._lock:
+            if feed_url not in self._locks:
+                self._locks[feed_url] = threading.Lock()
+            return self._locks[feed_url]
+
+    @staticmethod
+    def _normalise_entry(entry) -> Dict:
+        """Extract the fields the news analyzer needs from a feedparser entry."""
+        published = entry.get('published_parsed', None)
+        if published:
+            pub_date = datetime.fromtimestamp(time.mktime(published))
+        else:
+            pub_date = None
+
+        return {
+            'title': entry.get('title', ''),
+            'summary': entry.get('summary', ''),
+            'link': entry.get('link', ''),
+            'published': pub_date
+        }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_feed_cache(ttl_seconds: int = 900) -> RSSFeedCache:
+    """Return the process-wide feed cache shared by all analyzer instances."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = RSSFeedCache(ttl_seconds=ttl_seconds)
+        return _shared_cache
@@ -1,13 +1,25 @@
 """Sentiment history management"""
 import os
 import json
-from datetime import datetime
-import pandas as pd
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional
 from app.config.settings import Settings
 
+logger = logging.getLogger(__name__)
+
 
 class SentimentHistoryManager:
-    """Manages sentiment history data"""
+    """
+    Manages sentiment history data.
+
+    Records live in an append-only SQLite table (WAL mode) indexed by
+    (symbol, timestamp), so storing a record is a single insert and trend
+    queries read only the requested window. The legacy sentiment_history.json
+    file is imported once on first use.
+    """
 
     def __init__(self, settings: Settings):
         """
@@ -18,33 +30,178 @@ class SentimentHistoryManager:
         """
         self.settings = settings
         self.history_file = os.path.join(self.settings.DATA_DIR, 'sentiment_history.json')
-        self.history = self.load_sentiment_history()
+        self.db_path = os.path.join(self.settings.DATA_DIR, 'sentiment_history.db')
+        self._initialize_database()
+        self._migrate_json_history()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _initialize_database(self):
+        """
+        Create the history table and its (symbol, timestamp) index.
+
+        The statements run in one write transaction (executescript() would
+        commit after each), so processes starting together do not race.
+        """
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sentiment_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        symbol TEXT NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        sentiment_score REAL NOT NULL,
+                        confidence REAL NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_sentiment_history_symbol_ts
+                        ON sentiment_history(symbol, timestamp)
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sentiment_history_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+
+    def _migrate_json_history(self):
+        """
+        One-time import of the legacy JSON history file.
+
+        The migrated flag is checked and set inside the same write
+        transaction, so only one of several processes imports the file.
+        """
+        if not os.path.exists(self.history_file):
+            return
+
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            migrated = conn.execute(
+                "SELECT value FROM sentiment_history_meta WHERE key = 'json_migrated'"
+            ).fetchone()
+            if migrated:
+                conn.rollback()
+                return
 
-    def load_sentiment_history(self) -> list:
-        """Load sentiment history from file."""
-        if os.path.exists(self.history_file):
             try:
                 with open(self.history_file, 'r') as f:
-                    return json.load(f)
+                    records = json.load(f)
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading sentiment history: {e}")
-                return []
-        return []
+                logger.warning(f"Error loading sentiment history for migration: {e}")
+                records = []
+
+            rows = []
+            for record in records:
+                try:
+                    rows.append((
+                        record['symbol'],
+                        self._normalise_timestamp(record['timestamp']),
+                        float(record['sentiment_score']),
+                        float(record['confidence'])
+                    ))
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+            try:
+                conn.executemany(
+                    "INSERT INTO sentiment_history (symbol, timestamp, sentiment_score, confidence) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO sentiment_history_meta (key, value) VALUES ('json_migrated', ?)",
+                    (datetime.now().isoformat(),)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Error migrating sentiment history from {self.history_file}: {e}")
+                return
+            logger.info(f"Migrated {len(rows)} sentiment history records from {self.history_file}")
+
+    @staticmethod
+    def _normalise_timestamp(timestamp) -> str:
+        """Store timestamps in one sortable ISO format so range queries work lexically."""
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+        return timestamp.isoformat(timespec='microseconds')
+
+    def load_sentiment_history(self) -> list:
+        """Load the full sentiment history (prefer get_sentiment_history for windows)."""
+        return self.get_sentiment_history()
+
+    def get_sentiment_history(self, symbol: Optional[str] = None,
+                              start: Optional[datetime] = None,
+                              end: Optional[datetime] = None,
+                              symbols: Optional[List[str]] = None) -> List[dict]:
+        """
+        Read sentiment records, optionally limited to symbols and a time range.
+
+        Args:
+            symbol: Only return records for this symbol.
+            symbols: Only return records for any of these symbols.
+            start: Inclusive lower bound on the record timestamp.
+            end: Inclusive upper bound on the record timestamp.
+
+        Returns:
+            Records ordered by timestamp, in the same shape as the legacy JSON.
+        """
+        conditions = []
+        params = []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            params.append(symbol)
+        if symbols is not None:
+            conditions.append(f"symbol IN ({','.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(self._normalise_timestamp(start))
+        if end is not None:
+            conditions.append("timestamp <= ?")
+            params.append(self._normalise_timestamp(end))
+
+        query = "SELECT timestamp, symbol, sentiment_score, confidence FROM sentiment_history"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp"
+
+        try:
+            with self.get_connection() as conn:
+                return [dict(row) for row in conn.execute(query, params).fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Error loading sentiment history: {e}")
+            return []
 
     def store_sentiment(self, symbol: str, sentiment_score: float, confidence: float):
         """Store a new sentiment record."""
-        record = {
-            'timestamp': datetime.now().isoformat(),
-            'symbol': symbol,
-            'sentiment_score': sentiment_score,
-            'confidence': confidence
-        }
-        self.history.append(record)
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
-        except IOError as e:
-            print(f"Error saving sentiment history: {e}")
+            with self.get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO sentiment_history (symbol, timestamp, sentiment_score, confidence) "
+                    "VALUES (?, ?, ?, ?)",
+                    (symbol, self._normalise_timestamp(datetime.now()), sentiment_score, confidence)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error saving sentiment history: {e}")
 
     def get_sentiment_trend(self, symbol: str, days: int = 7) -> dict:
         """
@@ -57,47 +214,38 @@ class SentimentHistoryManager:
         Returns:
             A dictionary with trend information.
         """
-        if not self.history:
-            return {'trend': 0, 'confidence': 0, 'records_analyzed': 0}
-
-        df = pd.DataFrame(self.history)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
-        # Filter for the given symbol and time period
-        cutoff_date = datetime.now() - pd.Timedelta(days=days)
-        symbol_df = df[(df['symbol'] == symbol) & (df['timestamp'] >= cutoff_date)]
+        # Only the requested window is read, via the (symbol, timestamp) index
+        cutoff_date = datetime.now() - timedelta(days=days)
+        records = self.get_sentiment_history(symbol, start=cutoff_date)
 
-        if len(symbol_df) < 2:
-            return {'trend': 0, 'confidence': 0, 'records_analyzed': len(symbol_df)}
+        if len(records) < 2:
+            return {'trend': 0, 'confidence': 0, 'records_analyzed': len(records)}
 
-        # Sort by timestamp
-        symbol_df = symbol_df.sort_values(by='timestamp')
+        timestamps = [datetime.fromisoformat(r['timestamp']) for r in records]
+        first = min(timestamps)
+        time_delta = [(ts - first).total_seconds() for ts in timestamps]
 
-        # Linear regression to find the trend
-        symbol_df['time_delta'] = (symbol_df['timestamp'] - symbol_df['timestamp'].min()).dt.total_seconds()
-        
         # Handle the case where all timestamps are the same
-        if symbol_df['time_delta'].max() == 0:
-            return {'trend': 0, 'confidence': 0, 'records_analyzed': len(symbol_df)}
-            
+        if max(time_delta) == 0:
+            return {'trend': 0, 'confidence': 0, 'records_analyzed': len(records)}
+
         # Fit a simple linear regression model
         # Note: This is a simplified approach. For a more robust solution, consider using scikit-learn.
-        X = symbol_df['time_delta']
-        y = symbol_df['sentiment_score']
-        
+        y = [r['sentiment_score'] for r in records]
+
         # Using numpy for basic linear regression
         try:
             import numpy as np
-            coeffs = np.polyfit(X, y, 1)
+            coeffs = np.polyfit(time_delta, y, 1)
             trend = coeffs[0] # The slope of the line
         except ImportError:
             trend = 0 # Fallback if numpy is not available
 
         # Confidence can be based on the number of data points
-        confidence = min(len(symbol_df) / 10.0, 1.0)
+        confidence = min(len(records) / 10.0, 1.0)
 
         return {
             'trend': trend,
             'confidence': confidence,
-            'records_analyzed': len(symbol_df)
+            'records_analyzed': len(records)
         }
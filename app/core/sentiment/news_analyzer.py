@@ -6,49 +6,60 @@ Scrapes Australian financial news and analyzes sentiment
 
 import requests
 from bs4 import BeautifulSoup
-import feedparser
 from datetime import datetime, timedelta
 import re
-from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import logging
+from collections import OrderedDict
 from typing import Dict, List, Optional
 import time
-import praw
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 import os
 import numpy as np  # Add numpy import at the top
 
-# Import ML pipeline at the top
-from ..ml.training.pipeline import MLTrainingPipeline
+# Transformers for advanced sentiment analysis. transformers and torch/tensorflow
+# take seconds to import, so they are only loaded when a model is initialized.
+_TRANSFORMERS = None
 
-# Transformers for advanced sentiment analysis
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+def _load_transformers():
+    """
+    Import transformers and a deep-learning backend on first use.
+
+    Returns:
+        Tuple of (pipeline factory, backend name); the factory is None when
+        transformers or a backend is not installed.
+    """
+    global _TRANSFORMERS
+    if _TRANSFORMERS is not None:
+        return _TRANSFORMERS
+    
+    try:
+        from transformers import pipeline
+    except ImportError:
+        logging.warning("Transformers not available. Install with: pip install transformers torch")
+        _TRANSFORMERS = (None, "none")
+        return _TRANSFORMERS
+    
     # Try importing torch or tensorflow
-    backend_available = False
+    backend_type = None
     try:
         import torch
-        backend_available = True
-        BACKEND_TYPE = "torch"
+        backend_type = "torch"
     except ImportError:
         try:
             import tensorflow as tf
-            backend_available = True
-            BACKEND_TYPE = "tensorflow"
+            backend_type = "tensorflow"
         except ImportError:
             pass
     
-    TRANSFORMERS_AVAILABLE = backend_available
-    if not backend_available:
+    if backend_type is None:
         logging.warning("Neither PyTorch nor TensorFlow available. Transformers will not work.")
         logging.warning("For Python 3.13: Consider using Python 3.11 or 3.12 for full transformer support.")
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    BACKEND_TYPE = "none"
-    logging.warning("Transformers not available. Install with: pip install transformers torch")
-
-import yfinance as yf
-import pandas as pd
+        _TRANSFORMERS = (None, "none")
+    else:
+        _TRANSFORMERS = (pipeline, backend_type)
+    return _TRANSFORMERS
 
 # Import settings
 import sys
@@ -57,6 +68,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.config.settings import Settings
 # from utils.cache_manager import CacheManager  # Disabled for now
 from app.core.sentiment.history import SentimentHistoryManager
+from app.core.sentiment.feed_cache import get_shared_feed_cache
+from app.core.sentiment.score_cache import SentimentScoreCache, pipeline_model_id
+from app.core.sentiment.dedup_index import NearDuplicateIndex, deduplicate_news
 from app.core.analysis.news_impact import NewsImpactAnalyzer
 
 # Import ML trading components for enhanced analysis
@@ -69,6 +83,7 @@ except ImportError:
 
 # Import enhanced keyword system
 from app.utils.keywords import BankNewsFilter
+from app.utils.rate_limiter import HostRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -437,12 +452,48 @@ class NewsSentimentAnalyzer:
         self.vader = SentimentIntensityAnalyzer()
         self.history_manager = SentimentHistoryManager(self.settings)
         self.impact_analyzer = NewsImpactAnalyzer(self.settings)
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session_headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
+        # requests.Session is not thread-safe, so each source worker gets its own
+        self._thread_state = threading.local()
+        
+        # RSS feeds are shared across symbols, so fetch each one once per cycle
+        self.feed_cache = get_shared_feed_cache(
+            ttl_seconds=self.settings.CACHE_SETTINGS['rss_feed_ttl_minutes'] * 60
+        )
+        
+        # Per-host token buckets replace fixed sleeps between scraper requests
+        collection_config = self.settings.NEWS_SOURCES['collection']
+        self.rate_limiter = HostRateLimiter(
+            rate_per_second=collection_config['requests_per_second_per_host'],
+            burst=collection_config['host_burst']
+        )
+        
+        # Persistent per-article score cache so repeat headlines are scored once
+        try:
+            self.score_cache = SentimentScoreCache(
+                self.settings.DATA_DIR / 'sentiment_score_cache.db',
+                max_entries=self.settings.CACHE_SETTINGS['sentiment_score_max_entries'],
+                max_age_days=self.settings.CACHE_SETTINGS['sentiment_score_max_age_days']
+            )
+        except Exception as e:
+            logger.warning(f"Sentiment score cache unavailable: {e}")
+            self.score_cache = None
+        
+        # MinHash/LSH index so syndicated copies of a story share one cluster id across runs
+        try:
+            self.dedup_index = NearDuplicateIndex(
+                self.settings.DATA_DIR / 'news_dedup_index.db',
+                threshold=collection_config['dedup_similarity_threshold'],
+                max_age_days=collection_config['dedup_max_age_days']
+            )
+        except Exception as e:
+            logger.warning(f"Persistent news dedup index unavailable, using an in-memory one: {e}")
+            self.dedup_index = NearDuplicateIndex(threshold=collection_config['dedup_similarity_threshold'])
         
         # Initialize ML training pipeline
+        from ..ml.training.pipeline import MLTrainingPipeline
         self.ml_pipeline = MLTrainingPipeline()
         
         # Initialize keyword filter
@@ -499,12 +550,15 @@ class NewsSentimentAnalyzer:
         
         # Initialize transformer models if available
         self.transformer_pipelines = {}
+        # Recently scored article texts, least recently used evicted first
+        self._article_score_memo = OrderedDict()
+        self._article_score_memo_size = self.settings.SENTIMENT_CONFIG['transformer']['memo_size']
         
         # Check for selective transformer loading
         skip_transformers = os.getenv('SKIP_TRANSFORMERS', '').lower() in ['1', 'true', 'yes']
         finbert_only = os.getenv('FINBERT_ONLY', '').lower() in ['1', 'true', 'yes']
         
-        if TRANSFORMERS_AVAILABLE and not skip_transformers:
+        if not skip_transformers:
             if finbert_only:
                 self.init_finbert_only()
             else:
@@ -519,6 +573,7 @@ class NewsSentimentAnalyzer:
             user_agent = os.getenv('REDDIT_USER_AGENT', 'TradingAnalysisBot/1.0')
             
             if client_id and client_secret:
+                import praw
                 self.reddit = praw.Reddit(
                     client_id=client_id,
                     client_secret=client_secret,
@@ -579,13 +634,14 @@ class NewsSentimentAnalyzer:
     def init_transformer_models(self):
         """Initialize various transformer models for sentiment analysis"""
         
-        if not TRANSFORMERS_AVAILABLE:
+        pipeline, backend_type = _load_transformers()
+        if pipeline is None:
             logger.warning("Transformers backend not available. Skipping transformer model initialization.")
             logger.info("For Python 3.13 users: Consider using Python 3.11 or 3.12 for full transformer support.")
             return
         
         try:
-            logger.info(f"Initializing transformer models with {BACKEND_TYPE} backend...")
+            logger.info(f"Initializing transformer models with {backend_type} backend...")
             
             # Start with a simple model to test if transformers work
             logger.info("Testing transformer functionality with basic model...")
@@ -675,7 +731,8 @@ class NewsSentimentAnalyzer:
     def init_finbert_only(self):
         """Initialize only FinBERT for memory-constrained environments"""
         
-        if not TRANSFORMERS_AVAILABLE:
+        pipeline, _ = _load_transformers()
+        if pipeline is None:
             logger.warning("Transformers backend not available. Skipping FinBERT initialization.")
             return
             
@@ -968,19 +1025,21 @@ class NewsSentimentAnalyzer:
         # Return top 5 most relevant articles
         return [news for score, news in scored_news[:5]]
 
-    def analyze_bank_sentiment(self, symbol: str, keywords: list = None) -> Dict:
+    def collect_news_corpus(self, symbol: str, keywords: list = None) -> Dict:
         """
-        Analyzes news sentiment for a specific bank.
-        
+        Collects everything analyze_bank_sentiment needs from the network.
+
+        The returned corpus can be stored and passed back through
+        analyze_bank_sentiment(corpus=...) to rescore the same articles
+        (e.g. with FinBERT) without fetching any source again.
+
         Args:
             symbol (str): The stock symbol (e.g., 'CBA.AX').
             keywords (list, optional): Keywords to filter news. Defaults to None.
 
         Returns:
-            Dict: A dictionary with sentiment analysis results.
+            Dict: The deduplicated articles plus the Reddit and MarketAux sentiment.
         """
-        logger.info(f"Analyzing sentiment for {symbol}...")
-        
         # Use provided keywords or default to the symbol's name
         search_terms = keywords or [symbol.split('.')[0]]
         
@@ -1003,7 +1062,44 @@ class NewsSentimentAnalyzer:
             
             logger.info(f"Filtered news for {symbol} from {len(all_news)} to {len(filtered_news)} articles using keywords.")
             all_news = filtered_news
+        
+        corpus = {
+            'symbol': symbol,
+            'collected_at': datetime.now().isoformat(),
+            'articles': all_news,
+            'reddit_sentiment': None,
+            'marketaux_sentiment': None
+        }
+        
+        # Social and professional sentiment are only used when there is news to score
+        if all_news:
+            corpus['reddit_sentiment'] = self._get_reddit_sentiment(symbol)
+            corpus['marketaux_sentiment'] = self._get_marketaux_sentiment(symbol, strategy="balanced")
+        
+        return corpus
+    
+    def analyze_bank_sentiment(self, symbol: str, keywords: list = None, corpus: Dict = None) -> Dict:
+        """
+        Analyzes news sentiment for a specific bank.
+        
+        Args:
+            symbol (str): The stock symbol (e.g., 'CBA.AX').
+            keywords (list, optional): Keywords to filter news. Defaults to None.
+            corpus (Dict, optional): A previously collected corpus from
+                collect_news_corpus. When given, no news, Reddit or MarketAux
+                requests are made and only the scoring is rerun.
 
+        Returns:
+            Dict: A dictionary with sentiment analysis results.
+        """
+        logger.info(f"Analyzing sentiment for {symbol}...")
+        
+        if corpus is None:
+            corpus = self.collect_news_corpus(symbol, keywords)
+        else:
+            logger.info(f"Rescoring {len(corpus.get('articles', []))} stored articles for {symbol}")
+        all_news = corpus.get('articles') or []
+        
         if not all_news:
             logger.warning(f"No news found for {symbol}")
             return {
@@ -1047,11 +1143,9 @@ class NewsSentimentAnalyzer:
             # Analyze sentiment
             sentiment_analysis = self._analyze_news_sentiment(all_news)
             
-            # Get Reddit sentiment
-            reddit_sentiment = self._get_reddit_sentiment(symbol)
-            
-            # Get MarketAux professional sentiment
-            marketaux_sentiment = self._get_marketaux_sentiment(symbol, strategy="balanced")
+            # Reddit and MarketAux sentiment come from the corpus
+            reddit_sentiment = corpus.get('reddit_sentiment') or {}
+            marketaux_sentiment = corpus.get('marketaux_sentiment')
             
             # Check for specific events
             event_analysis = self._check_significant_events(all_news, symbol)
@@ -1524,8 +1618,8 @@ class NewsSentimentAnalyzer:
                     # If no sentiment found, analyze the title/summary quickly
                     text = item.get('title', '') + ' ' + item.get('summary', '')
                     if text.strip():
-                        # Use VADER for quick sentiment
-                        sentiment = self.vader.polarity_scores(text)['compound']
+                        # Use VADER for quick sentiment (shared with the article score cache)
+                        sentiment = self._cached_vader_score(text)
                 
                 sentiments.append(sentiment)
                 total_sentiment += sentiment
@@ -1573,6 +1667,19 @@ class NewsSentimentAnalyzer:
             logger.error(f"Error calculating ML trading score: {e}")
             return {'ml_score': 0, 'confidence': 0}
     
+    def _cached_vader_score(self, text: str) -> float:
+        """VADER compound score, read through the persistent score cache"""
+        key = SentimentScoreCache.content_key(text)
+        if self.score_cache:
+            cached = self.score_cache.get(key, 'vader')
+            if cached is not None:
+                return cached
+        
+        score = self.vader.polarity_scores(text)['compound']
+        if self.score_cache:
+            self.score_cache.put(key, 'vader', score)
+        return score
+    
     def _is_market_hours(self) -> bool:
         """Check if it's currently market hours (AEST)"""
         try:
@@ -1629,41 +1736,26 @@ class NewsSentimentAnalyzer:
         all_news = []
         source_errors = []
         
-        try:
-            # Fetch from RSS feeds
-            logger.debug(f"Fetching RSS news for {symbol}")
-            rss_news = self._fetch_rss_news(symbol)
-            all_news.extend(rss_news)
-            logger.debug(f"Found {len(rss_news)} RSS articles")
-        except Exception as e:
-            error_msg = f"RSS news fetch failed for {symbol}: {e}"
-            logger.warning(error_msg)
-            source_errors.append(error_msg)
-        
-        try:
-            # Fetch from Yahoo News
-            logger.debug(f"Fetching Yahoo news for {symbol}")
-            yahoo_news = self._fetch_yahoo_news(symbol)
-            all_news.extend(yahoo_news)
-            logger.debug(f"Found {len(yahoo_news)} Yahoo articles")
-        except Exception as e:
-            error_msg = f"Yahoo news fetch failed for {symbol}: {e}"
-            logger.warning(error_msg)
-            source_errors.append(error_msg)
-        
-        try:
-            # Scrape from news websites
-            logger.debug(f"Scraping news websites for {symbol}")
-            scraped_news = self._scrape_news_sites(symbol)
-            all_news.extend(scraped_news)
-            logger.debug(f"Found {len(scraped_news)} scraped articles")
-        except Exception as e:
-            error_msg = f"News site scraping failed for {symbol}: {e}"
-            logger.warning(error_msg)
-            source_errors.append(error_msg)
-        
-        # If all sources failed and no news found, raise error for testing
-        if not all_news and len(source_errors) >= 3:
+        # RSS, Yahoo and every website scraper run concurrently, so wall-clock
+        # is bounded by the slowest source rather than the sum of all of them
+        sources = [('RSS', self._fetch_rss_news), ('Yahoo', self._fetch_yahoo_news)] + self._scraper_sources()
+        logger.debug(f"Collecting news for {symbol} from {len(sources)} sources")
+        
+        sources_with_data = 0
+        for source_name, items, error in self._collect_from_sources(sources, symbol):
+            if error:
+                error_msg = f"{source_name} news fetch failed for {symbol}: {error}"
+                logger.warning(error_msg)
+                source_errors.append(error_msg)
+                continue
+            if items:
+                sources_with_data += 1
+            all_news.extend(items)
+            logger.debug(f"Found {len(items)} {source_name} articles")
+        
+        # Most sources log their own errors and return nothing, so judge failure
+        # by whether any source returned articles rather than by the error count
+        if sources_with_data == 0 and source_errors:
             raise RuntimeError(f"All news sources failed for {symbol}. Errors: {'; '.join(source_errors)}")
         
         # Remove duplicates based on title similarity
@@ -1676,45 +1768,38 @@ class NewsSentimentAnalyzer:
         return all_news
     
     def _remove_duplicate_news(self, news_items: List[Dict]) -> List[Dict]:
-        """Remove duplicate news articles based on title similarity"""
+        """
+        Remove duplicate news articles based on title similarity.
+        
+        Kept articles carry the 'cluster_id' of their story in the dedup index.
+        """
         if not news_items:
             return []
         
-        unique_news = []
-        seen_titles = set()
-        
-        for item in news_items:
-            title = item.get('title', '').lower().strip()
-            if not title:
-                continue
-                
-            # Simple deduplication - check if we've seen a very similar title
-            is_duplicate = False
-            for seen_title in seen_titles:
-                # If titles are very similar (80% overlap), consider it a duplicate
-                if len(set(title.split()) & set(seen_title.split())) / len(set(title.split()) | set(seen_title.split())) > 0.8:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_news.append(item)
-                seen_titles.add(title)
+        unique_news = deduplicate_news(news_items, self.dedup_index)
         
         logger.debug(f"Removed {len(news_items) - len(unique_news)} duplicate articles")
         return unique_news
     
     def _fetch_rss_news(self, symbol: str) -> List[Dict]:
-        """Fetch news from RSS feeds"""
+        """Fetch news from RSS feeds (served from the shared feed cache)"""
         news_items = []
-        keywords = self.bank_keywords.get(symbol, [symbol.replace('.AX', '')])
+        cutoff = datetime.now() - timedelta(days=7)
+        rss_feeds = self.settings.NEWS_SOURCES['rss_feeds']
         
-        for feed_name, feed_url in self.settings.NEWS_SOURCES['rss_feeds'].items():
+        # Download any stale feeds in parallel before filtering
+        self.feed_cache.prefetch(
+            rss_feeds.values(),
+            max_workers=self.settings.NEWS_SOURCES['collection']['rss_max_workers']
+        )
+        
+        for feed_name, feed_url in rss_feeds.items():
             try:
-                feed = feedparser.parse(feed_url)
+                entries = self.feed_cache.get_entries(feed_url)
                 
-                for entry in feed.entries[:20]:  # Check last 20 entries
-                    title = entry.get('title', '')
-                    summary = entry.get('summary', '')
+                for entry in entries:
+                    title = entry['title']
+                    summary = entry['summary']
                     
                     # Use enhanced keyword filtering
                     title_and_summary = f"{title} {summary}"
@@ -1724,20 +1809,15 @@ class NewsSentimentAnalyzer:
                     
                     # Include if relevant (either bank-specific or general banking news)
                     if relevance_result['is_relevant']:
-                        # Parse date
-                        published = entry.get('published_parsed', None)
-                        if published:
-                            pub_date = datetime.fromtimestamp(time.mktime(published))
-                        else:
-                            pub_date = datetime.now()
+                        pub_date = entry['published'] or datetime.now()
                         
                         # Only include recent news (last 7 days)
-                        if pub_date > datetime.now() - timedelta(days=7):
+                        if pub_date > cutoff:
                             news_items.append({
                                 'title': title,
                                 'summary': summary,
                                 'source': feed_name,
-                                'url': entry.get('link', ''),
+                                'url': entry['link'],
                                 'published': pub_date.isoformat(),
                                 'relevance': 'high' if relevance_result['relevance_score'] > 0.7 else 'medium',
                                 'matched_keywords': relevance_result.get('matched_keywords', []),
@@ -1785,7 +1865,109 @@ class NewsSentimentAnalyzer:
         return news_items
     
     def _scrape_news_sites(self, symbol: str) -> List[Dict]:
-        """Scrape news from financial websites"""
+        """Scrape news from financial websites (sites are scraped concurrently)"""
+        news_items = []
+        for source_name, items, error in self._collect_from_sources(self._scraper_sources(), symbol):
+            if error:
+                logger.warning(f"Error scraping {source_name}: {error}")
+            news_items.extend(items)
+        return news_items
+    
+    def _scraper_sources(self) -> List[tuple]:
+        """Website scrapers in the order their results are merged"""
+        return [
+            ('Google News', self._scrape_google_news),
+            ('ABC News', self._scrape_abc_news),
+            ('News.com.au', self._scrape_news_com_au),
+            ('Motley Fool AU', self._scrape_motley_fool_au),
+            ('The Market Online', self._scrape_market_online),
+            ('Investing.com AU', self._scrape_investing_au),
+            ('ABA news', self._scrape_aba_news),
+            ('ASX announcements', self._scrape_asx_announcements)
+        ]
+    
+    def _collect_from_sources(self, sources: List[tuple], symbol: str) -> List[tuple]:
+        """
+        Run news sources concurrently with a bounded worker pool.
+        
+        The whole batch shares one deadline (collection_deadline_seconds) so a
+        slow site cannot stall it; a source still running at the deadline is
+        reported as an error. Workers stop issuing requests once the deadline
+        has passed and every request timeout is clamped to the time left, so
+        the pool is shut down and joined before returning rather than left
+        running in the background. Politeness towards each site is enforced by
+        the per-host token buckets in _rate_limited_get rather than fixed sleeps.
+        
+        Args:
+            sources: (name, fetch_function) pairs; each function takes the symbol.
+            symbol: Stock symbol passed to every source.
+            
+        Returns:
+            (name, items, error) tuples in the same order as sources.
+        """
+        collection_config = self.settings.NEWS_SOURCES['collection']
+        timeout = collection_config['collection_deadline_seconds']
+        deadline = time.monotonic() + timeout
+        executor = ThreadPoolExecutor(
+            max_workers=min(collection_config['max_workers'], len(sources)),
+            thread_name_prefix='news-source'
+        )
+        
+        try:
+            futures = {
+                executor.submit(self._run_source, fetch, symbol, deadline): name
+                for name, fetch in sources
+            }
+            
+            outcomes = {}
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    try:
+                        outcomes[futures[future]] = (future.result(), None)
+                    except Exception as e:
+                        outcomes[futures[future]] = ([], str(e))
+            except FuturesTimeoutError:
+                for future, name in futures.items():
+                    if name not in outcomes:
+                        future.cancel()
+                        outcomes[name] = ([], f"timed out after {timeout}s")
+            
+            return [(name, *outcomes[name]) for name, _ in sources]
+        finally:
+            # Sources that overran stop at their next request, so this join is short
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _run_source(self, fetch, symbol: str, deadline: float) -> List[Dict]:
+        """Run one news source on a worker thread that honours the batch deadline"""
+        self._thread_state.deadline = deadline
+        try:
+            return fetch(symbol)
+        finally:
+            self._thread_state.deadline = None
+    
+    def _get_session(self) -> requests.Session:
+        """The calling thread's HTTP session, created on first use"""
+        session = getattr(self._thread_state, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.session_headers)
+            self._thread_state.session = session
+        return session
+    
+    def _rate_limited_get(self, url: str, timeout: int = 10):
+        """HTTP GET that waits for the per-host token bucket first"""
+        deadline = getattr(self._thread_state, 'deadline', None)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.rate_limiter.acquire(url, timeout=remaining):
+                raise requests.Timeout(f"News collection deadline passed before requesting {url}")
+            timeout = min(timeout, max(deadline - time.monotonic(), 0.1))
+        else:
+            self.rate_limiter.acquire(url)
+        return self._get_session().get(url, timeout=timeout)
+    
+    def _scrape_google_news(self, symbol: str) -> List[Dict]:
+        """Scrape Google News search results"""
         news_items = []
         keywords = self.bank_keywords.get(symbol, [symbol.replace('.AX', '')])
         
@@ -1794,7 +1976,7 @@ class NewsSentimentAnalyzer:
             query = '+'.join(keywords) + '+Australia+bank'
             url = f"https://news.google.com/search?q={query}&hl=en-AU&gl=AU&ceid=AU:en"
             
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -1817,55 +1999,9 @@ class NewsSentimentAnalyzer:
                                 'relevance': 'medium'
                             })
             
-            # Add delay to avoid rate limiting
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping Google News: {str(e)}")
         
-        # Scrape additional Australian news sources
-        try:
-            abc_news = self._scrape_abc_news(symbol)
-            news_items.extend(abc_news)
-        except Exception as e:
-            logger.warning(f"Error scraping ABC News: {str(e)}")
-        
-        try:
-            news_com_au_news = self._scrape_news_com_au(symbol)
-            news_items.extend(news_com_au_news)
-        except Exception as e:
-            logger.warning(f"Error scraping News.com.au: {str(e)}")
-        
-        try:
-            motley_fool_au_news = self._scrape_motley_fool_au(symbol)
-            news_items.extend(motley_fool_au_news)
-        except Exception as e:
-            logger.warning(f"Error scraping Motley Fool AU: {str(e)}")
-        
-        try:
-            market_online_news = self._scrape_market_online(symbol)
-            news_items.extend(market_online_news)
-        except Exception as e:
-            logger.warning(f"Error scraping The Market Online: {str(e)}")
-        
-        try:
-            investing_au_news = self._scrape_investing_au(symbol)
-            news_items.extend(investing_au_news)
-        except Exception as e:
-            logger.warning(f"Error scraping Investing.com AU: {str(e)}")
-        
-        try:
-            aba_news = self._scrape_aba_news(symbol)
-            news_items.extend(aba_news)
-        except Exception as e:
-            logger.warning(f"Error scraping ABA news: {str(e)}")
-        
-        try:
-            asx_announcements = self._scrape_asx_announcements(symbol)
-            news_items.extend(asx_announcements)
-        except Exception as e:
-            logger.warning(f"Error scraping ASX announcements: {str(e)}")
-        
         return news_items
     
     def _scrape_abc_news(self, symbol: str) -> List[Dict]:
@@ -1876,7 +2012,7 @@ class NewsSentimentAnalyzer:
         try:
             # ABC News Business section
             url = "https://www.abc.net.au/news/business/"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -1909,8 +2045,6 @@ class NewsSentimentAnalyzer:
                             'urgency_score': filter_result['urgency_score']
                         })
             
-            time.sleep(1)  # Rate limiting
-            
         except Exception as e:
             logger.warning(f"Error scraping ABC News: {str(e)}")
         
@@ -1923,7 +2057,7 @@ class NewsSentimentAnalyzer:
         
         try:
             url = "https://www.news.com.au/finance"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -1958,8 +2092,6 @@ class NewsSentimentAnalyzer:
                                 'urgency_score': filter_result['urgency_score']
                             })
             
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping News.com.au: {str(e)}")
         
@@ -1972,7 +2104,7 @@ class NewsSentimentAnalyzer:
         
         try:
             url = "https://www.fool.com.au/"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -2005,8 +2137,6 @@ class NewsSentimentAnalyzer:
                             'urgency_score': filter_result['urgency_score']
                         })
             
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping Motley Fool AU: {str(e)}")
         
@@ -2019,7 +2149,7 @@ class NewsSentimentAnalyzer:
         
         try:
             url = "https://themarketonline.com.au/"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -2044,8 +2174,6 @@ class NewsSentimentAnalyzer:
                                 'relevance': self._calculate_relevance(title, keywords)
                             })
             
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping The Market Online: {str(e)}")
         
@@ -2059,7 +2187,7 @@ class NewsSentimentAnalyzer:
         try:
             # Try to get ASX-specific news
             url = f"https://au.investing.com/search/?q={symbol}"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -2086,8 +2214,6 @@ class NewsSentimentAnalyzer:
                             'relevance': self._calculate_relevance(title, keywords)
                         })
             
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping Investing.com AU: {str(e)}")
         
@@ -2099,7 +2225,7 @@ class NewsSentimentAnalyzer:
         
         try:
             url = "https://ausbanking.org.au/news/"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -2123,8 +2249,6 @@ class NewsSentimentAnalyzer:
                             'relevance': 'high'  # Industry association news is always relevant
                         })
             
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping ABA news: {str(e)}")
         
@@ -2138,7 +2262,7 @@ class NewsSentimentAnalyzer:
             # Get company announcements from ASX
             company_code = symbol.replace('.AX', '')
             url = f"https://www.asx.com.au/markets/trade-our-cash-market/todays-announcements"
-            response = self.session.get(url, timeout=10)
+            response = self._rate_limited_get(url)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -2171,8 +2295,6 @@ class NewsSentimentAnalyzer:
                                 'urgency_score': filter_result['urgency_score']
                             })
             
-            time.sleep(1)
-            
         except Exception as e:
             logger.warning(f"Error scraping ASX announcements: {str(e)}")
         
@@ -2229,6 +2351,8 @@ class NewsSentimentAnalyzer:
                     'error': 'Reddit client not initialized'
                 }
             
+            from textblob import TextBlob
+            
             logger.debug(f"🔍 Collecting Reddit sentiment for {symbol} with keywords: {keywords}")
             subreddits = ['ASX_Bets', 'AusFinance', 'fiaustralia', 'ASX', 'investing']
             all_posts = []
@@ -2556,50 +2680,16 @@ class NewsSentimentAnalyzer:
             'very_negative': 0
         }
         
+        texts = []
         for article in news_articles:
             title = article.get('title', '')
             summary = article.get('summary', '')
             text = f"{title} {summary}".strip()
-            
-            if not text:
-                continue
-            
-            # Multiple sentiment analysis methods
-            sentiment_scores = []
-            
-            # TextBlob sentiment
-            try:
-                blob = TextBlob(text)
-                textblob_score = blob.sentiment.polarity
-                sentiment_scores.append(textblob_score)
-            except Exception:
-                pass
-            
-            # VADER sentiment
-            try:
-                vader_scores = self.vader.polarity_scores(text)
-                # Convert compound score to -1 to 1 range
-                vader_score = vader_scores['compound']
-                sentiment_scores.append(vader_score)
-            except Exception:
-                pass
-            
-            # Transformer sentiment (if available)
-            if self.transformer_pipelines.get('general'):
-                try:
-                    transformer_result = self.transformer_pipelines['general'](text)
-                    if transformer_result:
-                        # Convert to -1 to 1 scale
-                        if transformer_result[0]['label'] == 'POSITIVE':
-                            transformer_score = transformer_result[0]['score']
-                        elif transformer_result[0]['label'] == 'NEGATIVE':
-                            transformer_score = -transformer_result[0]['score']
-                        else:
-                            transformer_score = 0.0
-                        sentiment_scores.append(transformer_score)
-                except Exception:
-                    pass
-            
+            if text:
+                texts.append(text)
+        
+        # Score every article in one batched pass (TextBlob, VADER, transformer)
+        for sentiment_scores in self.score_article_texts(texts):
             # Average the sentiment scores
             if sentiment_scores:
                 avg_sentiment = sum(sentiment_scores) / len(sentiment_scores)
@@ -2643,6 +2733,134 @@ class NewsSentimentAnalyzer:
             'strongest_sentiment': strongest_sentiment
         }
     
+    def score_article_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Score article texts with TextBlob, VADER and the general transformer.
+        
+        Texts are pushed through the transformer pipeline in batches instead of
+        one call per article, and recent scores are kept in a bounded LRU memo
+        (SENTIMENT_MEMO_SIZE texts) so articles shared between symbols (e.g.
+        sector-wide RSS news) are only scored once per cycle. Scores are also
+        read from and written to the persistent score cache, so articles seen
+        in earlier runs are not rescored at all. Call this with the articles of
+        the whole bank universe up front to batch across symbols.
+        
+        Args:
+            texts: Article texts ("title summary").
+            
+        Returns:
+            One list of per-method scores for each input text, in input order.
+        """
+        scores = {}
+        for text in texts:
+            if text in self._article_score_memo:
+                self._article_score_memo.move_to_end(text)
+                scores[text] = self._article_score_memo[text]
+        pending = list(dict.fromkeys(t for t in texts if t not in scores))
+        
+        if pending:
+            from textblob import TextBlob
+            
+            keys = {text: SentimentScoreCache.content_key(text) for text in pending}
+            general_pipeline = self.transformer_pipelines.get('general')
+            transformer_id = pipeline_model_id(general_pipeline, 'general') if general_pipeline else None
+            
+            cached = {'textblob': {}, 'vader': {}, transformer_id: {}}
+            if self.score_cache:
+                for model_id in cached:
+                    if model_id:
+                        cached[model_id] = self.score_cache.get_many(keys.values(), model_id)
+            fresh = {model_id: {} for model_id in cached}
+            
+            if transformer_id:
+                missing = [text for text in pending if keys[text] not in cached[transformer_id]]
+                for text, score in zip(missing, self._score_transformer_batch(missing)):
+                    if score is not None:
+                        fresh[transformer_id][keys[text]] = score
+            
+            for text in pending:
+                key = keys[text]
+                
+                # TextBlob sentiment
+                if key not in cached['textblob']:
+                    try:
+                        fresh['textblob'][key] = TextBlob(text).sentiment.polarity
+                    except Exception:
+                        pass
+                
+                # VADER sentiment (compound score is already in the -1 to 1 range)
+                if key not in cached['vader']:
+                    try:
+                        fresh['vader'][key] = self.vader.polarity_scores(text)['compound']
+                    except Exception:
+                        pass
+                
+                sentiment_scores = []
+                for model_id in ('textblob', 'vader', transformer_id):
+                    if not model_id:
+                        continue
+                    score = cached[model_id].get(key, fresh[model_id].get(key))
+                    if score is not None:
+                        sentiment_scores.append(score)
+                
+                scores[text] = sentiment_scores
+                self._article_score_memo[text] = sentiment_scores
+                if len(self._article_score_memo) > self._article_score_memo_size:
+                    self._article_score_memo.popitem(last=False)
+            
+            if self.score_cache:
+                for model_id, model_scores in fresh.items():
+                    if model_id:
+                        self.score_cache.put_many(model_scores, model_id)
+        
+        return [scores[text] for text in texts]
+    
+    def _score_transformer_batch(self, texts: List[str]) -> List[Optional[float]]:
+        """Run the general transformer pipeline over texts in configurable batches"""
+        general_pipeline = self.transformer_pipelines.get('general')
+        if not general_pipeline:
+            return [None] * len(texts)
+        
+        batch_size = self.settings.SENTIMENT_CONFIG['transformer']['batch_size']
+        max_length = self.settings.SENTIMENT_CONFIG['transformer']['max_length']
+        scores = []
+        
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            try:
+                results = general_pipeline(
+                    batch, batch_size=batch_size, truncation=True, max_length=max_length
+                )
+                # A single-text call returns [result]; wrap each item the same way
+                # so the label conversion below behaves exactly as before
+                batch_results = [[result] for result in results]
+            except Exception as e:
+                logger.debug(f"Batched transformer call failed, scoring individually: {e}")
+                batch_results = []
+                for text in batch:
+                    try:
+                        batch_results.append(general_pipeline(text))
+                    except Exception:
+                        batch_results.append(None)
+            
+            scores.extend(self._transformer_result_to_score(result) for result in batch_results)
+        
+        return scores
+    
+    @staticmethod
+    def _transformer_result_to_score(transformer_result) -> Optional[float]:
+        """Convert a sentiment pipeline result to the -1 to 1 scale"""
+        if not transformer_result:
+            return None
+        try:
+            if transformer_result[0]['label'] == 'POSITIVE':
+                return transformer_result[0]['score']
+            elif transformer_result[0]['label'] == 'NEGATIVE':
+                return -transformer_result[0]['score']
+            return 0.0
+        except Exception:
+            return None
+    
     def _check_significant_events(self, news_articles: List[Dict], symbol: str) -> Dict:
         """Check for significant events in news articles"""
         
@@ -0,0 +1,169 @@
+"""Persistent per-article sentiment score cache"""
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class SentimentScoreCache:
+    """
+    SQLite-backed cache of sentiment scores keyed by article content and model.
+
+    Keys are a SHA-1 of the normalised "title summary" text, so the same
+    headline re-fetched from RSS, Yahoo or a scraper maps to the same entry.
+    Each model (TextBlob, VADER, a transformer checkpoint, ...) stores its own
+    score, and the database runs in WAL mode so several processes can share it.
+    """
+
+    def __init__(self, db_path, max_entries: int = 200000, max_age_days: int = 30):
+        """
+        Initialize the SentimentScoreCache.
+
+        Args:
+            db_path: Path to the SQLite cache file.
+            max_entries: Upper bound on cached scores before oldest are evicted.
+            max_age_days: Scores older than this are evicted.
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS article_scores (
+                    content_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (content_hash, model)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_article_scores_created ON article_scores(created_at)")
+            conn.commit()
+
+        self.evict()
+
+    @contextmanager
+    def get_connection(self):
+        """Context manager for database connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def content_key(title: str, summary: str = '') -> str:
+        """Hash the normalised article text into a cache key."""
+        text = f"{title or ''} {summary or ''}"
+        normalised = _WHITESPACE_RE.sub(' ', text).strip().lower()
+        return hashlib.sha1(normalised.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: Iterable[str], model: str) -> Dict[str, float]:
+        """
+        Look up cached scores for a model.
+
+        Args:
+            keys: Content keys from content_key().
+            model: Model identifier.
+
+        Returns:
+            A dict of key -> score for the keys that were cached.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        if not keys:
+            return found
+
+        try:
+            with self.get_connection() as conn:
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT content_hash, score FROM article_scores "
+                        f"WHERE model = ? AND content_hash IN ({placeholders})",
+                        [model] + chunk
+                    ).fetchall()
+                    found.update(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment score cache read failed: {e}")
+            return {}
+
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def get(self, key: str, model: str) -> Optional[float]:
+        """Look up a single cached score."""
+        return self.get_many([key], model).get(key)
+
+    def put_many(self, scores: Dict[str, float], model: str):
+        """Store scores for a model in a single transaction."""
+        if not scores:
+            return
+
+        now = time.time()
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO article_scores (content_hash, model, score, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, model, float(score), now) for key, score in scores.items()]
+                )
+                conn.commit()
+            self.stats['writes'] += len(scores)
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment score cache write failed: {e}")
+
+    def put(self, key: str, model: str, score: float):
+        """Store a single score."""
+        self.put_many({key: score}, model)
+
+    def evict(self) -> int:
+        """
+        Remove expired scores, then the oldest ones beyond max_entries.
+
+        Returns:
+            Number of rows removed.
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        try:
+            with self.get_connection() as conn:
+                removed = conn.execute(
+                    "DELETE FROM article_scores WHERE created_at < ?", (cutoff,)
+                ).rowcount
+
+                total = conn.execute("SELECT COUNT(*) FROM article_scores").fetchone()[0]
+                if total > self.max_entries:
+                    removed += conn.execute("""
+                        DELETE FROM article_scores WHERE rowid IN (
+                            SELECT rowid FROM article_scores ORDER BY created_at LIMIT ?
+                        )
+                    """, (total - self.max_entries,)).rowcount
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Sentiment score cache eviction failed: {e}")
+            return 0
+
+        if removed:
+            logger.info(f"Evicted {removed} cached sentiment scores")
+        return removed
+
+
+def pipeline_model_id(model, fallback: str) -> str:
+    """Identify a transformers pipeline by its checkpoint name for cache keys."""
+    name = getattr(getattr(model, 'model', None), 'name_or_path', None)
+    return f"transformer:{name or fallback}"
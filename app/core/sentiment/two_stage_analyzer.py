@@ -26,8 +26,9 @@ class TwoStageAnalyzer:
     Stage 2 (Enhanced): + FinBERT - Load on demand for financial accuracy
     """
     
-    def __init__(self, cache_dir: str = "data/sentiment_cache"):
+    def __init__(self, cache_dir: str = "data/sentiment_cache", corpus_max_age_hours: int = 24):
         self.cache_dir = cache_dir
+        self.corpus_max_age_hours = corpus_max_age_hours
         self.basic_analyzer = None
         self.finbert_analyzer = None
         self.stage1_results = {}
@@ -59,8 +60,10 @@ class TwoStageAnalyzer:
             
             for symbol in symbols:
                 try:
-                    # Use the bank sentiment analysis method
-                    result = self.basic_analyzer.analyze_bank_sentiment(symbol)
+                    # Collect once and keep the corpus so stage 2 can rescore it offline
+                    corpus = self.basic_analyzer.collect_news_corpus(symbol)
+                    self._save_corpus(symbol, corpus)
+                    result = self.basic_analyzer.analyze_bank_sentiment(symbol, corpus=corpus)
                     
                     # Extract key metrics for stage 1
                     stage1_data = {
@@ -134,8 +137,12 @@ class TwoStageAnalyzer:
             
             for symbol in symbols:
                 try:
-                    # Get enhanced analysis with FinBERT
-                    result = self.finbert_analyzer.analyze_bank_sentiment(symbol)
+                    # Rescore the stage 1 articles with FinBERT; only re-collect
+                    # news when no recent corpus was stored for this symbol
+                    corpus = self._load_corpus(symbol)
+                    if corpus is None:
+                        logger.info(f"   No stored corpus for {symbol}, collecting news again")
+                    result = self.finbert_analyzer.analyze_bank_sentiment(symbol, corpus=corpus)
                     
                     # Combine with stage 1 data if available
                     stage1_data = stage1_results.get(symbol, {}) if stage1_results else self.stage1_results.get(symbol, {})
@@ -152,6 +159,7 @@ class TwoStageAnalyzer:
                         'recent_headlines': result.get('recent_headlines', [])[:5],  # More headlines
                         'significant_events': result.get('significant_events', {}),
                         'method': 'finbert_enhanced',
+                        'corpus_collected_at': corpus.get('collected_at') if corpus else None,
                         'stage1_sentiment': stage1_data.get('overall_sentiment', 0),
                         'sentiment_improvement': result.get('overall_sentiment', 0) - stage1_data.get('overall_sentiment', 0)
                     }
@@ -271,6 +279,44 @@ class TwoStageAnalyzer:
         except Exception as e:
             logger.error(f"Error saving stage {stage} results: {e}")
     
+    def _corpus_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"stage1_corpus_{symbol.replace('/', '_')}.json")
+    
+    def _save_corpus(self, symbol: str, corpus: Dict[str, Any]):
+        """Save the stage 1 article corpus for a symbol"""
+        try:
+            filepath = self._corpus_path(symbol)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(corpus, f, default=str)
+            os.replace(tmp_path, filepath)
+            
+            logger.debug(f"Saved {len(corpus.get('articles', []))} articles for {symbol} to {filepath}")
+            
+        except Exception as e:
+            logger.error(f"Error saving stage 1 corpus for {symbol}: {e}")
+    
+    def _load_corpus(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Load the stage 1 article corpus for a symbol if it is recent enough"""
+        try:
+            filepath = self._corpus_path(symbol)
+            if not os.path.exists(filepath):
+                return None
+            
+            with open(filepath, 'r') as f:
+                corpus = json.load(f)
+            
+            cutoff_time = datetime.now() - timedelta(hours=self.corpus_max_age_hours)
+            if datetime.fromisoformat(corpus['collected_at']) < cutoff_time:
+                logger.info(f"Stage 1 corpus for {symbol} is older than {self.corpus_max_age_hours}h, ignoring it")
+                return None
+            
+            return corpus
+            
+        except Exception as e:
+            logger.error(f"Error loading stage 1 corpus for {symbol}: {e}")
+            return None
+    
     def _create_fallback_result(self, symbol: str, stage: int) -> Dict[str, Any]:
         """Create fallback result when analysis fails"""
         return {
@@ -1,9 +1,14 @@
 """Trading components package"""
 
-from .signals import TradingSignalGenerator
-from .risk_management import PositionRiskAssessor
-from .position_tracker import TradingOutcomeTracker
-from .paper_trading import AdvancedPaperTrader
+import importlib
+
+# Lazy imports so importing one trading module does not load all of them
+_LAZY_EXPORTS = {
+    "TradingSignalGenerator": ".signals",
+    "PositionRiskAssessor": ".risk_management",
+    "TradingOutcomeTracker": ".position_tracker",
+    "AdvancedPaperTrader": ".paper_trading",
+}
 
 __all__ = [
     "TradingSignalGenerator",
@@ -11,3 +16,9 @@ __all__ = [
     "TradingOutcomeTracker",
     "AdvancedPaperTrader",
 ]
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -209,6 +209,27 @@ class PaperTradingSimulator:
             logger.error(f"Error getting price for {symbol}: {e}")
             return 50.0  # Fallback price
     
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get current prices for several symbols with one batched quote request.
+        Symbols the batch cannot price fall back to get_current_price.
+        """
+        batch = {}
+        try:
+            from app.core.data.collectors.enhanced_market_data_collector import get_current_prices
+            batch = get_current_prices(symbols)
+        except Exception as e:
+            logger.warning(f"Enhanced collector batch failed for {symbols}: {e}")
+        
+        prices = {}
+        for symbol in symbols:
+            price_data = batch.get(symbol)
+            if price_data and price_data.get('success') and price_data.get('price', 0) > 0:
+                prices[symbol] = float(price_data['price'])
+            else:
+                prices[symbol] = self.get_current_price(symbol)
+        return prices
+    
     def calculate_position_size(self, symbol: str, ml_confidence: float, available_capital: float) -> int:
         """
         Calculate optimal position size based on ML confidence and risk management.
@@ -724,9 +745,10 @@ class PaperTradingSimulator:
     def get_portfolio_value(self) -> float:
         """Calculate total portfolio value including positions"""
         total_value = self.current_capital
+        current_prices = self.get_current_prices(list(self.positions))
         
         for symbol, position in self.positions.items():
-            current_price = self.get_current_price(symbol)
+            current_price = current_prices[symbol]
             position_value = position.position_size * current_price
             total_value += position_value
         
@@ -10,13 +10,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import logging
 import sqlite3
-import joblib
 import json
 import os
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, r2_score
-from sklearn.preprocessing import StandardScaler
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from enum import Enum
 
+import pandas as pd
+
 from ..sentiment.enhanced_scoring import EnhancedSentimentScorer, SentimentMetrics
 from ..analysis.technical import TechnicalAnalyzer
 from ...config.settings import Settings
@@ -48,7 +50,7 @@ class TradingSignalGenerator:
     
     def __init__(self):
         self.sentiment_scorer = EnhancedSentimentScorer()
-        self.technical_analyzer = TechnicalAnalyzer()
+        self.technical_analyzer = TechnicalAnalyzer(Settings())
         self.signal_history = []
         
     def generate_signal(
@@ -233,10 +235,27 @@ class TradingSignalGenerator:
         
         return "; ".join(reasoning_parts)
     
-    def generate_portfolio_signals(self, symbols: List[str]) -> Dict[str, TradingSignal]:
-        """Generate signals for multiple symbols"""
+    def generate_portfolio_signals(self, symbols: List[str],
+                                   market_data: Optional[pd.DataFrame] = None) -> Dict[str, TradingSignal]:
+        """
+        Generate signals for multiple symbols
+        
+        Args:
+            symbols: Stock symbols
+            market_data: Optional OHLCV panel for all symbols (see
+                technical.build_panel); technical analysis then runs once
+                across the whole panel
+        """
         signals = {}
         
+        technical_inputs = {}
+        if market_data is not None and not market_data.empty:
+            analyses = self.technical_analyzer.analyze_many(market_data, symbols)
+            technical_inputs = {
+                symbol: self._technical_inputs(analysis)
+                for symbol, analysis in analyses.items() if analysis.get('indicators')
+            }
+        
         for symbol in symbols:
             try:
                 # This would normally fetch real data - using placeholder for now
@@ -246,7 +265,8 @@ class TradingSignalGenerator:
                     'technical_momentum': 0.5
                 }
                 
-                signal = self.generate_signal(symbol, sentiment_data)
+                signal = self.generate_signal(symbol, sentiment_data,
+                                              technical_data=technical_inputs.get(symbol))
                 signals[symbol] = signal
                 
             except Exception as e:
@@ -255,6 +275,20 @@ class TradingSignalGenerator:
         
         return signals
     
+    @staticmethod
+    def _technical_inputs(analysis: Dict) -> Dict:
+        """Flatten a TechnicalAnalyzer result into the inputs of _calculate_technical_score"""
+        indicators = analysis['indicators']
+        price = analysis['current_price']
+        return {
+            'rsi': indicators['rsi'],
+            'macd_signal': indicators['macd']['histogram'],
+            'volume_ratio': indicators['volume']['ratio'],
+            'price': price,
+            'sma_20': indicators['sma'].get('sma_20', price),
+            'sma_50': indicators['sma'].get('sma_50', price)
+        }
+    
     def get_signal_summary(self, signals: Dict[str, TradingSignal]) -> Dict:
         """Generate summary of multiple signals"""
         if not signals:
@@ -8,8 +8,6 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
 import warnings
 
 from ..sentiment.enhanced_scoring import EnhancedSentimentScorer
@@ -27,6 +25,11 @@ class SmartPositionSizer:
     """
     
     def __init__(self, sentiment_scorer=None, pattern_detector=None, anomaly_detector=None):
+        # sklearn is imported here rather than at module level so that importing
+        # this module (e.g. for `app.main status`) stays cheap
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+        
         # Initialize AI components
         self.sentiment_scorer = sentiment_scorer or EnhancedSentimentScorer()
         self.pattern_detector = pattern_detector or AIPatternDetector()
@@ -1,10 +1,23 @@
 """Trading services package"""
 
-from .daily_manager import TradingSystemManager
-from .market_aware_daily_manager import MarketAwareTradingManager, create_market_aware_manager
+import importlib
+
+# Lazy imports: the market-aware manager loads the ML prediction stack, which
+# commands such as status and restart never use
+_LAZY_EXPORTS = {
+    "TradingSystemManager": ".daily_manager",
+    "MarketAwareTradingManager": ".market_aware_daily_manager",
+    "create_market_aware_manager": ".market_aware_daily_manager",
+}
 
 __all__ = [
     "TradingSystemManager",
     "MarketAwareTradingManager", 
     "create_market_aware_manager"
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,8 +12,12 @@ from typing import Dict, List, Optional
 from threading import Thread
 from pathlib import Path
 
+import pandas as pd
+
 from ..core.ml.enhanced_pipeline import EnhancedMLPipeline
 from ..core.analysis.pattern_ai import AIPatternDetector
+from ..core.analysis.technical import TechnicalAnalyzer, get_market_data
+from ..core.monitoring.anomaly_ai import AnomalyDetector
 from ..core.trading.alpaca_integration import AlpacaMLTrader
 from ..core.data.collectors.market_data import ASXDataFeed
 from ..services.email_notifier import EmailNotificationService, TradingAlert, create_alert_from_pattern_detection
@@ -33,6 +37,8 @@ class RealTimeSignalMonitor:
         self.ml_pipeline = EnhancedMLPipeline()
         self.alpaca_trader = AlpacaMLTrader()
         self.market_data = ASXDataFeed()
+        self.technical_analyzer = TechnicalAnalyzer(self.settings)
+        self.anomaly_detector = AnomalyDetector()
         
         # ASX Bank stocks to monitor
         self.symbols = ['CBA.AX', 'ANZ.AX', 'WBC.AX', 'NAB.AX', 'MQG.AX']
@@ -51,6 +57,11 @@ class RealTimeSignalMonitor:
         self.last_prices = {}
         self.monitoring_thread = None
         
+        # Completed daily bars and the incremental indicator state built from
+        # them, refreshed once a day
+        self.daily_history = {}  # symbol -> (date, DataFrame)
+        self.indicator_states = {}  # symbol -> (sync date, IndicatorState)
+        
     def start_monitoring(self):
         """Start real-time monitoring in background thread"""
         if self.is_monitoring:
@@ -137,16 +148,22 @@ class RealTimeSignalMonitor:
             # Run AI pattern detection
             pattern_results = self._analyze_patterns(symbol, current_data)
             
+            # Update technical indicators with the latest quote
+            technical_results = self._analyze_technicals(symbol, current_data)
+            
             # Run ML predictions
             ml_predictions = self._get_ml_predictions(symbol, current_data)
             
             # Check sentiment analysis
             sentiment_results = self._analyze_sentiment(symbol)
             
+            # Check the quote against the symbol's cached anomaly baseline
+            anomaly_results = self._check_anomalies(symbol, current_data, sentiment_results)
+            
             # Generate comprehensive alert if conditions are met
             alert = self._generate_comprehensive_alert(
                 symbol, current_price, pattern_results, ml_predictions, 
-                sentiment_results, price_change_pct
+                sentiment_results, price_change_pct, technical_results, anomaly_results
             )
             
             # Send email if alert is significant enough
@@ -220,6 +237,84 @@ class RealTimeSignalMonitor:
             logger.error(f"Error analyzing patterns for {symbol}: {e}")
             return {}
     
+    def _get_daily_history(self, symbol: str) -> pd.DataFrame:
+        """
+        Completed daily bars for symbol, read (from the local OHLCV store)
+        once per day. Today's bar is still forming, so ticks supply it.
+        """
+        today = datetime.now().date()
+        cached = self.daily_history.get(symbol)
+        if cached and cached[0] == today:
+            return cached[1]
+        
+        history = get_market_data(symbol, period='1y', interval='1d')
+        if not history.empty:
+            bar_dates = history.index.tz_localize(None) if history.index.tz else history.index
+            history = history[bar_dates.normalize() < pd.Timestamp(today)]
+        self.daily_history[symbol] = (today, history)
+        return history
+    
+    def _get_indicator_state(self, symbol: str):
+        """
+        Daily indicator state for symbol, holding completed bars only.
+        Ticks are evaluated against the state without reloading history.
+        """
+        today = datetime.now().date()
+        cached = self.indicator_states.get(symbol)
+        if cached and cached[0] == today:
+            return cached[1]
+        
+        history = self._get_daily_history(symbol)
+        if history.empty:
+            return None
+        
+        state = self.technical_analyzer.update_indicator_state(symbol, history, interval='1d')
+        self.indicator_states[symbol] = (today, state)
+        return state
+    
+    def _check_anomalies(self, symbol: str, market_data: Dict, sentiment_results: Dict) -> Dict:
+        """
+        Anomaly check of the latest quote. The detectors are trained once
+        per new daily bar (and cached on disk), so a check only scores the
+        quote against the cached baseline.
+        """
+        try:
+            history = self._get_daily_history(symbol)
+            if history.empty:
+                return {}
+            
+            current = {
+                'price': market_data['price'],
+                'volume': market_data.get('volume', 0),
+                'sentiment_score': sentiment_results.get('sentiment_score', 0)
+            }
+            return self.anomaly_detector.detect_anomalies(symbol, current, history)
+            
+        except Exception as e:
+            logger.error(f"Error checking anomalies for {symbol}: {e}")
+            return {}
+    
+    def _analyze_technicals(self, symbol: str, market_data: Dict) -> Dict:
+        """Technical analysis with the latest quote as today's pending bar"""
+        try:
+            state = self._get_indicator_state(symbol)
+            if state is None:
+                return {}
+            
+            volume = market_data.get('volume') or None
+            analysis = self.technical_analyzer.analyze_state(symbol, state, market_data['price'], volume)
+            
+            return {
+                'technical_signal': analysis['recommendation'],
+                'technical_confidence': min(abs(analysis['overall_signal']) / 100, 1.0),
+                'rsi': analysis['indicators'].get('rsi', 50.0),
+                'trend': analysis['trend'].get('direction', 'unknown')
+            }
+            
+        except Exception as e:
+            logger.error(f"Error analyzing technicals for {symbol}: {e}")
+            return {}
+    
     def _get_ml_predictions(self, symbol: str, market_data: Dict) -> Dict:
         """Get ML model predictions"""
         try:
@@ -255,7 +350,9 @@ class RealTimeSignalMonitor:
     
     def _generate_comprehensive_alert(self, symbol: str, current_price: float, 
                                     pattern_results: Dict, ml_predictions: Dict, 
-                                    sentiment_results: Dict, price_change_pct: float) -> Optional[TradingAlert]:
+                                    sentiment_results: Dict, price_change_pct: float,
+                                    technical_results: Optional[Dict] = None,
+                                    anomaly_results: Optional[Dict] = None) -> Optional[TradingAlert]:
         """Generate comprehensive trading alert from all analysis components"""
         
         # Combine signals from different sources
@@ -277,6 +374,14 @@ class RealTimeSignalMonitor:
             reasoning_parts.append(f"ML Model predicts {ml_predictions.get('ml_signal')} "
                                  f"with {ml_predictions.get('ml_confidence', 0):.1%} confidence")
         
+        # Technical indicator signal
+        technical_results = technical_results or {}
+        if technical_results.get('technical_signal', 'HOLD') != 'HOLD' and technical_results.get('technical_confidence', 0) > 0.6:
+            signals.append(technical_results['technical_signal'])
+            confidences.append(technical_results['technical_confidence'])
+            reasoning_parts.append(f"Technical indicators suggest {technical_results['technical_signal']} "
+                                 f"(RSI {technical_results.get('rsi', 50):.1f}, {technical_results.get('trend', 'unknown')} trend)")
+        
         # Sentiment analysis
         sentiment_score = sentiment_results.get('sentiment_score', 0)
         if abs(sentiment_score) > 0.5:
@@ -291,6 +396,12 @@ class RealTimeSignalMonitor:
             movement_signal = 'BUY' if price_change_pct > 0 else 'SELL'
             reasoning_parts.append(f"Significant price movement: {price_change_pct:+.1f}%")
         
+        # Market anomalies qualify the alert but do not add a direction
+        anomaly_results = anomaly_results or {}
+        if anomaly_results.get('severity') in ('moderate', 'severe'):
+            reasoning_parts.append(f"{anomaly_results['severity'].capitalize()} market anomaly detected "
+                                 f"(score: {anomaly_results.get('overall_anomaly_score', 0):.3f})")
+        
         # Determine overall signal
         if not signals:
             return None
@@ -4,6 +4,9 @@ Comprehensive keyword list for Australian banking news filtering
 Enhanced news relevance detection for trading analysis
 """
 
+from collections import deque
+from functools import lru_cache
+
 # Major Australian Banks - Core names and variations
 BANK_KEYWORDS_COMPREHENSIVE = {
     'CBA.AX': [
@@ -203,6 +206,100 @@ TIME_KEYWORDS = [
     'this morning', 'this afternoon', 'overnight', 'after hours'
 ]
 
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of lowercase keywords.
+    
+    The goto/failure structure is flattened into a DFA at build time so a scan
+    is a single dict lookup per character, and every keyword occurring anywhere
+    in the text (including overlapping ones) is reported in one pass.
+    """
+    
+    def __init__(self, keywords):
+        goto = [{}]
+        outputs = [set()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].add(keyword)
+        
+        # Breadth-first pass: failure links, inherited outputs and full transitions
+        fail = [0] * len(goto)
+        self._delta = [None] * len(goto)
+        self._delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(self._delta[fail[state]])
+            transitions.update(goto[state])
+            self._delta[state] = transitions
+            outputs[state] |= outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0)
+                queue.append(child)
+        
+        self._outputs = [frozenset(found) if found else None for found in outputs]
+    
+    def find(self, text: str) -> frozenset:
+        """Return every keyword that occurs as a substring of text"""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        found = set()
+        for char in text:
+            state = delta[state].get(char, 0)
+            if outputs[state] is not None:
+                found |= outputs[state]
+        return frozenset(found)
+
+
+class _KeywordIndex:
+    """Keyword lists compiled once into an automaton plus per-keyword scoring rules"""
+    
+    def __init__(self, bank_keywords, regulatory_keywords, banking_terms, event_keywords,
+                 action_verbs, risk_keywords, time_keywords, sentiment_modifiers):
+        # Rules keep the original list order so results are built exactly as
+        # the sequential per-list scan would build them
+        rules = []
+        for symbol, keywords in bank_keywords.items():
+            rules.extend(('bank', keyword, symbol) for keyword in keywords)
+        rules.extend(('scored', keyword, (2, 'regulatory')) for keyword in regulatory_keywords)
+        rules.extend(('scored', keyword, (1, 'banking_operations')) for keyword in banking_terms)
+        for event_type, keywords in event_keywords.items():
+            rules.extend(('scored', keyword, (2, f'event_{event_type}')) for keyword in keywords)
+        rules.extend(('scored', keyword, (1, 'action_verb')) for keyword in action_verbs)
+        rules.extend(('risk', keyword, None) for keyword in risk_keywords)
+        rules.extend(('time', keyword, None) for keyword in time_keywords)
+        for sentiment_type, modifiers in sentiment_modifiers.items():
+            rules.extend(('modifier', modifier, sentiment_type) for modifier in modifiers)
+        
+        self.rules_by_pattern = {}
+        for order, (kind, keyword, detail) in enumerate(rules):
+            self.rules_by_pattern.setdefault(keyword.lower(), []).append((order, kind, keyword, detail))
+        
+        self.automaton = KeywordAutomaton(self.rules_by_pattern.keys())
+        self.find = lru_cache(maxsize=4096)(self.automaton.find)
+
+
+_default_index = None
+
+
+def _get_default_index() -> _KeywordIndex:
+    """Compile the module keyword lists once per process"""
+    global _default_index
+    if _default_index is None:
+        _default_index = _KeywordIndex(
+            BANK_KEYWORDS_COMPREHENSIVE, REGULATORY_KEYWORDS, BANKING_TERMS, EVENT_KEYWORDS,
+            ACTION_VERBS, RISK_KEYWORDS, TIME_KEYWORDS, SENTIMENT_MODIFIERS
+        )
+    return _default_index
+
+
 class BankNewsFilter:
     """
     Advanced news filtering system for Australian banking news
@@ -217,11 +314,15 @@ class BankNewsFilter:
         self.risk_keywords = RISK_KEYWORDS
         self.sentiment_modifiers = SENTIMENT_MODIFIERS
         self.time_keywords = TIME_KEYWORDS
+        self._index = _get_default_index()
     
     def is_relevant_banking_news(self, title: str, content: str = "", bank_symbol: str = None) -> dict:
         """
         Enhanced check if a news title/content is relevant to Australian banking.
         
+        All keyword lists are matched in a single pass over the text by a
+        precompiled Aho-Corasick automaton.
+        
         Args:
             title (str): News article title
             content (str): News article content (optional)
@@ -238,79 +339,68 @@ class BankNewsFilter:
             }
         """
         text_to_analyze = f"{title} {content}".lower()
+        return self._build_result(self._index.find(text_to_analyze), bank_symbol)
+    
+    def classify_articles(self, articles: list, bank_symbols: list = None) -> list:
+        """
+        Classify many articles against many banks, scanning each text once.
+        
+        Args:
+            articles (list): Article dicts with 'title' and optional 'summary',
+                or plain title strings
+            bank_symbols (list, optional): Symbols to score against; defaults to
+                every bank in the keyword lists
+        
+        Returns:
+            list: One {symbol: is_relevant_banking_news result} dict per article
+        """
+        bank_symbols = bank_symbols or list(self.bank_keywords.keys())
+        results = []
+        for article in articles:
+            if isinstance(article, dict):
+                text = f"{article.get('title', '')} {article.get('summary', '')}"
+            else:
+                text = f"{article} "
+            found = self._index.find(text.lower())
+            results.append({symbol: self._build_result(found, symbol) for symbol in bank_symbols})
+        return results
+    
+    def _build_result(self, found: frozenset, bank_symbol: str = None) -> dict:
+        """Turn the set of keywords present in a text into the relevance result"""
         matched_keywords = []
         relevance_score = 0
         categories = []
         urgency_score = 0
         sentiment_indicators = {'positive': [], 'negative': [], 'risk': []}
+        specific_bank = bool(bank_symbol) and bank_symbol in self.bank_keywords
         
-        # Check for specific bank if provided
-        if bank_symbol and bank_symbol in self.bank_keywords:
-            for keyword in self.bank_keywords[bank_symbol]:
-                if keyword.lower() in text_to_analyze:
-                    matched_keywords.append(keyword)
-                    relevance_score += 3  # High weight for specific bank match
-                    categories.append(f'specific_bank_{bank_symbol}')
-        else:
-            # Check all banks
-            for symbol, bank_keywords in self.bank_keywords.items():
-                for keyword in bank_keywords:
-                    if keyword.lower() in text_to_analyze:
-                        matched_keywords.append(keyword)
-                        relevance_score += 3
-                        categories.append(f'bank_{symbol}')
-        
-        # Check regulatory keywords
-        for keyword in self.regulatory_keywords:
-            if keyword.lower() in text_to_analyze:
+        rules = sorted(rule for pattern in found for rule in self._index.rules_by_pattern[pattern])
+        for _, kind, keyword, detail in rules:
+            if kind == 'bank':
+                # Only the requested bank counts when one is given, otherwise all banks
+                if specific_bank and detail != bank_symbol:
+                    continue
                 matched_keywords.append(keyword)
-                relevance_score += 2
-                categories.append('regulatory')
-        
-        # Check banking terms
-        for keyword in self.banking_terms:
-            if keyword.lower() in text_to_analyze:
+                relevance_score += 3
+                categories.append(f'specific_bank_{detail}' if specific_bank else f'bank_{detail}')
+            elif kind == 'scored':
+                weight, category = detail
                 matched_keywords.append(keyword)
-                relevance_score += 1
-                categories.append('banking_operations')
-        
-        # Check event keywords
-        for event_type, keywords in self.event_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in text_to_analyze:
-                    matched_keywords.append(keyword)
-                    relevance_score += 2
-                    categories.append(f'event_{event_type}')
-        
-        # Check action verbs
-        for verb in self.action_verbs:
-            if verb.lower() in text_to_analyze:
-                matched_keywords.append(verb)
-                relevance_score += 1
-                categories.append('action_verb')
-        
-        # Check risk keywords (add extra weight for risk-related news)
-        for keyword in self.risk_keywords:
-            if keyword.lower() in text_to_analyze:
+                relevance_score += weight
+                categories.append(category)
+            elif kind == 'risk':
+                # Extra weight for risk-related news
                 matched_keywords.append(keyword)
                 relevance_score += 2
                 categories.append('risk')
                 sentiment_indicators['risk'].append(keyword)
-        
-        # Check time-sensitive keywords (add urgency score)
-        for keyword in self.time_keywords:
-            if keyword.lower() in text_to_analyze:
+            elif kind == 'time':
                 urgency_score += 1
                 categories.append('time_sensitive')
-        
-        # Check sentiment modifiers
-        for sentiment_type, modifiers in self.sentiment_modifiers.items():
-            for modifier in modifiers:
-                if modifier.lower() in text_to_analyze:
-                    if sentiment_type in ['positive', 'negative']:
-                        sentiment_indicators[sentiment_type].append(modifier)
-                    elif sentiment_type == 'intensifiers':
-                        urgency_score += 0.5
+            elif detail in ('positive', 'negative'):
+                sentiment_indicators[detail].append(keyword)
+            elif detail == 'intensifiers':
+                urgency_score += 0.5
         
         # Determine overall relevance
         is_relevant = relevance_score >= 3  # Threshold for relevance
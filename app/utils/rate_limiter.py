@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting Utilities
+Thread-safe token buckets for polite concurrent scraping
+"""
+
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token bucket that refills at a fixed rate and blocks callers until a token is free"""
+
+    def __init__(self, rate_per_second: float = 1.0, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take one token, waiting for the bucket to refill if necessary.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely.
+
+        Returns:
+            True if a token was taken, False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) * self.rate_per_second
+                )
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate_per_second
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            # Sleep outside the lock so other hosts' callers are not blocked
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use"""
+
+    def __init__(self, rate_per_second: float = 1.0, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str, timeout: float = None) -> bool:
+        """Wait for a request slot for the host of the given URL"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_second, self.burst)
+                self._buckets[host] = bucket
+        return bucket.acquire(timeout)
@@ -12,12 +12,25 @@ import json
 import uuid
 import pickle
 import os
+import sys
 from typing import Dict, List, Optional, Tuple
 import logging
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 
+# Put the repository root on the path for app imports
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+try:
+    from app.core.data.prediction_feed import publish_saved_predictions
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError as e:
+    PREDICTION_FEED_AVAILABLE = False
+    logging.warning(f"Prediction feed not available, new predictions will not be published: {e}")
+
 class PredictionStore:
     """Handles storage and retrieval of predictions and outcomes"""
     
@@ -105,6 +118,12 @@ class PredictionStore:
             
             conn.commit()
             conn.close()
+            
+            if PREDICTION_FEED_AVAILABLE:
+                try:
+                    publish_saved_predictions(self.db_path, [prediction['prediction_id']])
+                except Exception as e:
+                    logging.warning(f"Prediction feed publish failed for {prediction['symbol']}: {e}")
             return True
             
         except Exception as e:
@@ -13,6 +13,18 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings("ignore")
 
+# Put the repository root on the path for app imports
+repo_root = os.path.dirname(os.path.abspath(__file__))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+try:
+    from app.core.data.prediction_feed import publish_saved_predictions
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError as e:
+    PREDICTION_FEED_AVAILABLE = False
+    print(f"⚠️ Prediction feed not available, new predictions will not be published: {e}")
+
 class TechnicalAnalyzer:
     """Lightweight technical analysis"""
     
@@ -271,6 +283,12 @@ class EnhancedEfficientPredictionSystem:
             conn.commit()
             conn.close()
             
+            if PREDICTION_FEED_AVAILABLE:
+                try:
+                    publish_saved_predictions(self.db_path, [prediction_id])
+                except Exception as e:
+                    self.log_message(f"⚠️ Prediction feed publish failed for {prediction['symbol']}: {e}")
+            
             tech_data = prediction.get("tech_data", {})
             rsi = tech_data.get("rsi", 0)
             tech_score = tech_data.get("tech_score", 0)
@@ -41,7 +41,7 @@ logging.basicConfig(
 # Import our enhanced components
 try:
     from app.core.ml.enhanced_training_pipeline import EnhancedMLTrainingPipeline, DataValidator
-    from app.core.analysis.technical import TechnicalAnalyzer, get_market_data
+    from app.core.analysis.technical import TechnicalAnalyzer, get_market_data, build_panel
     from app.core.sentiment.news_analyzer import NewsSentimentAnalyzer
     from app.config.settings import Settings
     ML_ENHANCED_AVAILABLE = True
@@ -139,6 +139,11 @@ class EnhancedMorningAnalyzer:
         
         total_sentiment = 0
         analyzed_count = 0
+        pending_predictions = {}
+        
+        # Technical analysis for all banks in one vectorized pass
+        market_frames = {symbol: get_market_data(symbol, period='3mo', interval='1h') for symbol in self.banks}
+        technical_results = self.technical_analyzer.analyze_many(build_panel(market_frames), list(self.banks))
         
         for symbol, name in self.banks.items():
             try:
@@ -151,49 +156,24 @@ class EnhancedMorningAnalyzer:
                 if self.data_validator.validate_sentiment_data(sentiment_data):
                     self.logger.info(f"✅ {symbol}: Sentiment data validated")
                 
-                # Step 3: Get market data and technical analysis
-                market_data = get_market_data(symbol, period='3mo', interval='1h')
+                # Step 3: Market data and technical analysis
+                market_data = market_frames[symbol]
                 
                 if not market_data.empty:
-                    technical_result = self.technical_analyzer.analyze(symbol, market_data)
+                    technical_result = technical_results[symbol]
                     
                     # Step 4: Validate technical data
                     if self.data_validator.validate_technical_data(technical_result):
                         self.logger.info(f"✅ {symbol}: Technical data validated")
                     
-                    # Phase 2: Multi-Output Prediction
-                    self.logger.info(f"🧠 Phase 2: Multi-Output ML Prediction for {symbol}")
-                    
                     # Collect enhanced training data
                     feature_id = self.enhanced_pipeline.collect_enhanced_training_data(
                         sentiment_data, symbol
                     )
                     
                     if feature_id:
-                        # Make enhanced predictions
-                        ml_prediction = self.enhanced_pipeline.predict_enhanced(
-                            sentiment_data, symbol
-                        )
-                        
-                        if 'error' not in ml_prediction:
-                            analysis_results['ml_predictions'][symbol] = ml_prediction
-                            
-                            # Phase 3: Feature Engineering Validation
-                            feature_count = len(self.enhanced_pipeline.required_features['technical_indicators']) + \
-                                          len(self.enhanced_pipeline.required_features['price_features']) + \
-                                          len(self.enhanced_pipeline.required_features['volume_features']) + \
-                                          len(self.enhanced_pipeline.required_features['market_context']) + \
-                                          len(self.enhanced_pipeline.required_features['sentiment_features']) + \
-                                          len(self.enhanced_pipeline.interaction_features) + \
-                                          len(self.enhanced_pipeline.time_features)
-                            
-                            analysis_results['feature_counts'][symbol] = feature_count
-                            
-                            self.logger.info(f"✅ {symbol}: Enhanced prediction generated ({feature_count} features)")
-                            self.logger.info(f"   - Action: {ml_prediction['optimal_action']}")
-                            self.logger.info(f"   - Confidence: {ml_prediction['confidence_scores']['average']:.3f}")
-                        else:
-                            self.logger.warning(f"❌ {symbol}: ML prediction failed - {ml_prediction['error']}")
+                        # Predicted for all banks at once after the loop
+                        pending_predictions[symbol] = sentiment_data
                     
                     # Traditional technical signals for comparison
                     technical_signal = self._generate_traditional_signal(
@@ -222,6 +202,38 @@ class EnhancedMorningAnalyzer:
                 self.logger.error(f"❌ {symbol}: Analysis failed - {e}")
                 continue
         
+        # Phase 2: Multi-Output Prediction, one model call per model for all banks
+        if pending_predictions:
+            self.logger.info(f"🧠 Phase 2: Multi-Output ML Prediction for {len(pending_predictions)} banks")
+            try:
+                batch_predictions = self.enhanced_pipeline.predict_batch(
+                    list(pending_predictions), pending_predictions
+                )
+            except Exception as e:
+                self.logger.error(f"❌ Batch ML prediction failed - {e}")
+                batch_predictions = {}
+            
+            for symbol, ml_prediction in batch_predictions.items():
+                if 'error' not in ml_prediction:
+                    analysis_results['ml_predictions'][symbol] = ml_prediction
+                    
+                    # Phase 3: Feature Engineering Validation
+                    feature_count = len(self.enhanced_pipeline.required_features['technical_indicators']) + \
+                                  len(self.enhanced_pipeline.required_features['price_features']) + \
+                                  len(self.enhanced_pipeline.required_features['volume_features']) + \
+                                  len(self.enhanced_pipeline.required_features['market_context']) + \
+                                  len(self.enhanced_pipeline.required_features['sentiment_features']) + \
+                                  len(self.enhanced_pipeline.interaction_features) + \
+                                  len(self.enhanced_pipeline.time_features)
+                    
+                    analysis_results['feature_counts'][symbol] = feature_count
+                    
+                    self.logger.info(f"✅ {symbol}: Enhanced prediction generated ({feature_count} features)")
+                    self.logger.info(f"   - Action: {ml_prediction['optimal_action']}")
+                    self.logger.info(f"   - Confidence: {ml_prediction['confidence_scores']['average']:.3f}")
+                else:
+                    self.logger.warning(f"❌ {symbol}: ML prediction failed - {ml_prediction['error']}")
+        
         # Calculate overall market sentiment
         if analyzed_count > 0:
             analysis_results['overall_market_sentiment'] = total_sentiment / analyzed_count
@@ -554,6 +566,16 @@ class EnhancedMorningAnalyzer:
                 json.dumps(analysis_results['model_performance'])
             ))
             
+            # Normalized per-symbol signals for the backtesters
+            from app.core.data.signal_store import record_morning_signals
+            record_morning_signals(
+                conn,
+                cursor.lastrowid,
+                analysis_results['timestamp'],
+                analysis_results['technical_signals'],
+                analysis_results['ml_predictions']
+            )
+            
             conn.commit()
             conn.close()
             
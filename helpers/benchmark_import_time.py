@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the app.main CLI
+Runs subcommands under `python -X importtime` and reports how long module
+imports took in total and which top-level packages were the most expensive
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `restart` only needs app.main itself, so importing the CLI module measures it
+# without actually stopping any running processes
+DEFAULT_COMMANDS = ['import', 'status']
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse -X importtime output into (total_us, {top_level_module: cumulative_us}).
+    Top-level rows are the ones imported directly, with no nesting indent.
+    """
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        if name.startswith(' ') and not name.startswith('  '):
+            top_level[name.strip()] = top_level.get(name.strip(), 0) + int(cumulative)
+    return sum(top_level.values()), top_level
+
+
+def measure(command: str):
+    """Run one subcommand (or a bare import of app.main) with import timing enabled"""
+    if command == 'import':
+        args = [sys.executable, '-X', 'importtime', '-c', 'import app.main']
+    else:
+        args = [sys.executable, '-X', 'importtime', '-m', 'app.main', command]
+
+    start = time.perf_counter()
+    completed = subprocess.run(args, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall_time = time.perf_counter() - start
+
+    total_us, modules = parse_importtime(completed.stderr)
+    return wall_time, total_us, modules, completed.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time per app.main subcommand")
+    parser.add_argument('commands', nargs='*', default=DEFAULT_COMMANDS,
+                        help="Subcommands to run ('import' imports app.main only)")
+    parser.add_argument('--top', type=int, default=8, help='Heaviest imports to list per command')
+    args = parser.parse_args()
+
+    print("⏱️ APP.MAIN IMPORT-TIME BENCHMARK")
+    print("=" * 50)
+
+    for command in args.commands:
+        wall_time, total_us, modules, returncode = measure(command)
+        status = '✅' if returncode == 0 else f'⚠️ exit {returncode}'
+        print(f"\n{command}: {total_us / 1000:8.1f} ms importing, {wall_time:6.2f} s wall ({status})")
+
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for name, cumulative in heaviest:
+            print(f"   {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for BankNewsFilter keyword matching
+Compares the compiled automaton against the original per-list substring scan
+and checks both produce the same relevance results
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.keywords import BankNewsFilter
+
+HEADLINES = [
+    "NAB announces record profit amid rising interest rates",
+    "RBA holds cash rate steady at 4.35% as inflation eases",
+    "Commonwealth Bank faces ASIC investigation over fees",
+    "Westpac launches new digital banking platform for business customers",
+    "Major scam warning for ANZ customers after data breach",
+    "Macquarie Group CEO to retire next year, board begins succession",
+    "Australian housing market shows signs of cooling in latest auction data",
+    "Tech stocks surge on Wall Street overnight",
+    "Suncorp bank sale to ANZ cleared by ACCC after lengthy inquiry",
+    "QBE Insurance posts solid half year results, lifts dividend",
+]
+
+SUMMARIES = [
+    "Analysts expect net interest margin pressure to continue as mortgage competition intensifies.",
+    "The regulator said the probe would examine remediation of customers charged fees for no service.",
+    "Shares rose strongly in early trading on the ASX following the announcement this morning.",
+    "Economists warn that household debt and unemployment remain key risks to the outlook.",
+    "",
+]
+
+
+def reference_is_relevant(filter_system, title, content="", bank_symbol=None):
+    """Original sequential substring implementation, kept here for comparison"""
+    text_to_analyze = f"{title} {content}".lower()
+    matched_keywords = []
+    relevance_score = 0
+    categories = []
+    urgency_score = 0
+    sentiment_indicators = {'positive': [], 'negative': [], 'risk': []}
+
+    if bank_symbol and bank_symbol in filter_system.bank_keywords:
+        for keyword in filter_system.bank_keywords[bank_symbol]:
+            if keyword.lower() in text_to_analyze:
+                matched_keywords.append(keyword)
+                relevance_score += 3
+                categories.append(f'specific_bank_{bank_symbol}')
+    else:
+        for symbol, bank_keywords in filter_system.bank_keywords.items():
+            for keyword in bank_keywords:
+                if keyword.lower() in text_to_analyze:
+                    matched_keywords.append(keyword)
+                    relevance_score += 3
+                    categories.append(f'bank_{symbol}')
+
+    for keyword in filter_system.regulatory_keywords:
+        if keyword.lower() in text_to_analyze:
+            matched_keywords.append(keyword)
+            relevance_score += 2
+            categories.append('regulatory')
+
+    for keyword in filter_system.banking_terms:
+        if keyword.lower() in text_to_analyze:
+            matched_keywords.append(keyword)
+            relevance_score += 1
+            categories.append('banking_operations')
+
+    for event_type, keywords in filter_system.event_keywords.items():
+        for keyword in keywords:
+            if keyword.lower() in text_to_analyze:
+                matched_keywords.append(keyword)
+                relevance_score += 2
+                categories.append(f'event_{event_type}')
+
+    for verb in filter_system.action_verbs:
+        if verb.lower() in text_to_analyze:
+            matched_keywords.append(verb)
+            relevance_score += 1
+            categories.append('action_verb')
+
+    for keyword in filter_system.risk_keywords:
+        if keyword.lower() in text_to_analyze:
+            matched_keywords.append(keyword)
+            relevance_score += 2
+            categories.append('risk')
+            sentiment_indicators['risk'].append(keyword)
+
+    for keyword in filter_system.time_keywords:
+        if keyword.lower() in text_to_analyze:
+            urgency_score += 1
+            categories.append('time_sensitive')
+
+    for sentiment_type, modifiers in filter_system.sentiment_modifiers.items():
+        for modifier in modifiers:
+            if modifier.lower() in text_to_analyze:
+                if sentiment_type in ['positive', 'negative']:
+                    sentiment_indicators[sentiment_type].append(modifier)
+                elif sentiment_type == 'intensifiers':
+                    urgency_score += 0.5
+
+    return {
+        'is_relevant': relevance_score >= 3,
+        'relevance_score': min(relevance_score / 10.0, 1.0),
+        'matched_keywords': list(set(matched_keywords)),
+        'categories': list(set(categories)),
+        'urgency_score': min(urgency_score / 5.0, 1.0),
+        'sentiment_indicators': sentiment_indicators
+    }
+
+
+def build_corpus(size=500, seed=42):
+    """RSS-style title + summary texts"""
+    rng = random.Random(seed)
+    return [f"{rng.choice(HEADLINES)} {rng.choice(SUMMARIES)}" for _ in range(size)]
+
+
+def same_result(a, b):
+    """Compare results, ignoring the arbitrary order of set-derived lists"""
+    return (
+        a['is_relevant'] == b['is_relevant']
+        and a['relevance_score'] == b['relevance_score']
+        and a['urgency_score'] == b['urgency_score']
+        and sorted(a['matched_keywords']) == sorted(b['matched_keywords'])
+        and sorted(a['categories']) == sorted(b['categories'])
+        and a['sentiment_indicators'] == b['sentiment_indicators']
+    )
+
+
+def run_benchmark():
+    filter_system = BankNewsFilter()
+    symbols = list(filter_system.bank_keywords.keys())
+    # Unique texts so the automaton's scan cache does not flatter the numbers
+    corpus = [f"{text} #{i}" for i, text in enumerate(build_corpus())]
+
+    print("🔍 BANK NEWS FILTER BENCHMARK")
+    print("=" * 50)
+    print(f"Corpus: {len(corpus)} articles x {len(symbols)} symbols")
+
+    mismatches = 0
+    for text in corpus:
+        for symbol in symbols + [None]:
+            expected = reference_is_relevant(filter_system, text, bank_symbol=symbol)
+            actual = filter_system.is_relevant_banking_news(text, bank_symbol=symbol)
+            if not same_result(expected, actual):
+                mismatches += 1
+    print(f"{'✅' if mismatches == 0 else '❌'} Result mismatches: {mismatches}")
+
+    start = time.perf_counter()
+    for text in corpus:
+        for symbol in symbols:
+            reference_is_relevant(filter_system, text, bank_symbol=symbol)
+    reference_time = time.perf_counter() - start
+
+    filter_system._index.find.cache_clear()
+    start = time.perf_counter()
+    for text in corpus:
+        for symbol in symbols:
+            filter_system.is_relevant_banking_news(text, bank_symbol=symbol)
+    automaton_time = time.perf_counter() - start
+
+    filter_system._index.find.cache_clear()
+    start = time.perf_counter()
+    filter_system.classify_articles(corpus, symbols)
+    batch_time = time.perf_counter() - start
+
+    print(f"Sequential substring scan: {reference_time * 1000:8.1f} ms")
+    print(f"Automaton, per symbol:     {automaton_time * 1000:8.1f} ms ({reference_time / automaton_time:.1f}x)")
+    print(f"Automaton, batch API:      {batch_time * 1000:8.1f} ms ({reference_time / batch_time:.1f}x)")
+
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
@@ -20,6 +20,19 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings("ignore")
 
+# Import the prediction feed from the main application first, so app resolves
+# there; its Settings is a superset of this directory's copy
+main_app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if main_app_dir not in sys.path:
+    sys.path.insert(0, main_app_dir)
+
+try:
+    from app.core.data.prediction_feed import publish_saved_predictions
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError as e:
+    PREDICTION_FEED_AVAILABLE = False
+    print(f"⚠️ Prediction feed not available, new predictions will not be published: {e}")
+
 # Try to import settings configuration
 try:
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -679,6 +692,12 @@ def test_market_aware_system():
             conn.commit()
             conn.close()
             
+            if PREDICTION_FEED_AVAILABLE:
+                try:
+                    publish_saved_predictions("data/trading_predictions.db", [prediction_id])
+                except Exception as e:
+                    print(f"⚠️ Prediction feed publish failed for {symbol}: {e}")
+            
         except Exception as e:
             print(f"❌ Error processing {symbol}: {e}")
             continue
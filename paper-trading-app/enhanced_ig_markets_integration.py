@@ -106,6 +106,46 @@ class EnhancedPaperTradingPriceSource:
             self.logger.error(f"Error fetching price for {symbol}: {e}")
             return None
     
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get current prices for several symbols in one round-trip
+        Uncached symbols go to the collector's batch API (one IG Markets request plus
+        one yfinance download); anything still missing falls back per symbol
+        """
+        prices = {}
+        pending = []
+        now = datetime.now()
+
+        for symbol in dict.fromkeys(symbols):
+            self.stats['total_requests'] += 1
+            if (symbol in self.price_cache and
+                symbol in self.cache_expiry and
+                now < self.cache_expiry[symbol]):
+                self.stats['cache_hits'] += 1
+                prices[symbol] = self.price_cache[symbol]
+            else:
+                pending.append(symbol)
+
+        if pending and self.ig_markets_collector and self.symbol_mapper:
+            try:
+                batch = self.ig_markets_collector.get_current_prices_batch(pending)
+                for symbol, price_data in batch.items():
+                    if price_data and price_data.get('price'):
+                        price = float(price_data['price'])
+                        if price > 0:
+                            self.stats['ig_markets_requests'] += 1
+                            self.price_cache[symbol] = price
+                            self.cache_expiry[symbol] = now + timedelta(minutes=5)
+                            prices[symbol] = price
+            except Exception as e:
+                self.logger.debug(f"IG Markets batch price fetch failed for {pending}: {e}")
+
+        for symbol in pending:
+            if symbol not in prices:
+                prices[symbol] = self._get_yfinance_price(symbol) if self.use_yfinance_fallback else None
+
+        return {symbol: prices.get(symbol) for symbol in symbols}
+
     def _get_yfinance_price(self, symbol: str) -> Optional[float]:
         """
         Original yfinance price fetching logic (unchanged)
@@ -25,6 +25,8 @@ import pytz
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from trading.market_calendar import asx_calendar
+
 # Import enhanced IG Markets integration
 try:
     from enhanced_ig_markets_integration import get_enhanced_price_source
@@ -33,6 +35,19 @@ except ImportError:
     ENHANCED_PRICING_AVAILABLE = False
     logging.warning("Enhanced IG Markets pricing not available, using yfinance only")
 
+# Import the prediction feed from the main application
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+try:
+    from app.core.data.prediction_feed import PredictionSubscriber, RECONCILE_INTERVAL_SECONDS
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError:
+    PREDICTION_FEED_AVAILABLE = False
+    RECONCILE_INTERVAL_SECONDS = 3600
+    logging.warning("Prediction feed not available, polling the predictions database")
+
 # Global lock file handle
 lock_file = None
 
@@ -75,95 +90,24 @@ def signal_handler(signum, frame):
 def is_asx_trading_hours(dt: datetime) -> bool:
     """
     Check if the given datetime is during ASX trading hours
-    ASX trades Monday-Friday 10:00 AM - 4:00 PM AEST/AEDT
+    ASX trades Monday-Friday 10:00 AM - 4:00 PM AEST/AEDT, excluding public holidays
+    Naive datetimes are assumed to be in Australian timezone
     """
-    # Convert to Australian timezone
-    au_tz = pytz.timezone('Australia/Sydney')
-    
-    # If no timezone info, assume it's already in Australian timezone
-    if dt.tzinfo is None:
-        au_time = au_tz.localize(dt)
-    else:
-        au_time = dt.astimezone(au_tz)
-    
-    # Check if it's a weekday (Monday = 0, Sunday = 6)
-    if au_time.weekday() >= 5:  # Saturday or Sunday
-        return False
-    
-    # Check if it's during trading hours (10:00 AM - 4:00 PM)
-    trading_start = au_time.replace(hour=10, minute=0, second=0, microsecond=0)
-    trading_end = au_time.replace(hour=16, minute=0, second=0, microsecond=0)
-    
-    return trading_start <= au_time <= trading_end
+    return asx_calendar.is_trading_hours(dt)
 
 def is_position_opening_hours(dt: datetime) -> bool:
     """
     Check if new positions can be opened (10:00 AM - 3:15 PM AEST/AEDT)
     Allows closing positions until 4:00 PM but stops new positions at 3:15 PM
     """
-    # Convert to Australian timezone
-    au_tz = pytz.timezone('Australia/Sydney')
-    
-    # If no timezone info, assume it's already in Australian timezone
-    if dt.tzinfo is None:
-        au_time = au_tz.localize(dt)
-    else:
-        au_time = dt.astimezone(au_tz)
-    
-    # Check if it's a weekday (Monday = 0, Sunday = 6)
-    if au_time.weekday() >= 5:  # Saturday or Sunday
-        return False
-    
-    # Check if it's during position opening hours (10:00 AM - 3:15 PM)
-    opening_start = au_time.replace(hour=10, minute=0, second=0, microsecond=0)
-    opening_end = au_time.replace(hour=15, minute=15, second=0, microsecond=0)
-    
-    return opening_start <= au_time < opening_end
+    return asx_calendar.is_position_opening_hours(dt)
 
 def calculate_trading_time_minutes(entry_time: datetime, current_time: datetime) -> float:
     """
     Calculate the actual trading time in minutes between entry and current time,
-    excluding weekends and after-hours periods
+    excluding weekends, public holidays and after-hours periods
     """
-    if entry_time >= current_time:
-        return 0.0
-    
-    trading_minutes = 0.0
-    check_time = entry_time
-    
-    # Step through time in 1-minute increments and count trading minutes
-    while check_time < current_time:
-        if is_asx_trading_hours(check_time):
-            trading_minutes += 1.0
-        
-        check_time += timedelta(minutes=1)
-        
-        # Optimization: if we're outside trading hours, jump to next trading period
-        if not is_asx_trading_hours(check_time):
-            au_tz = pytz.timezone('Australia/Sydney')
-            if check_time.tzinfo is None:
-                check_time = pytz.utc.localize(check_time)
-            
-            au_time = check_time.astimezone(au_tz)
-            
-            # If it's weekend, jump to Monday 10 AM
-            if au_time.weekday() >= 5:
-                days_until_monday = 7 - au_time.weekday()
-                next_trading = au_time.replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=days_until_monday)
-            # If it's after hours on weekday, jump to next day 10 AM
-            elif au_time.hour >= 16:
-                next_trading = (au_time + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
-            # If it's before hours on weekday, jump to 10 AM same day
-            elif au_time.hour < 10:
-                next_trading = au_time.replace(hour=10, minute=0, second=0, microsecond=0)
-            else:
-                # We're in trading hours, continue normal increment
-                continue
-            
-            # Convert back to UTC and update check_time
-            check_time = next_trading.astimezone(pytz.utc).replace(tzinfo=None)
-    
-    return trading_minutes
+    return asx_calendar.trading_minutes_between(entry_time, current_time)
 
 # Set up logging
 logging.basicConfig(
@@ -200,7 +144,9 @@ class EnhancedPaperTradingService:
             'min_commission': 0.0,  # Minimum commission (default $0)
             'max_commission': 100.0,  # Maximum commission cap
             'check_interval_seconds': 60,  # Check every 1 minute
-            'prediction_check_interval_seconds': 300,  # Check for new predictions every 5 minutes
+            'prediction_check_interval_seconds': 300,  # Check for new predictions every 5 minutes (without the feed)
+            'prediction_reconcile_interval_seconds': RECONCILE_INTERVAL_SECONDS,  # Database scan while the feed is up
+            'prediction_max_age_seconds': 3600,  # Never buy on (or retry) a prediction older than 1 hour
             'db_retry_attempts': 3,  # Number of retry attempts for database operations
             'db_retry_delay': 0.5  # Delay between retry attempts
         }
@@ -208,6 +154,9 @@ class EnhancedPaperTradingService:
         # Active positions tracking
         self.active_positions = {}
         
+        # BUY predictions whose order failed, retried every check until bought or expired
+        self.failed_predictions = {}
+        
         # Verify databases exist
         if not os.path.exists(self.predictions_db_path):
             raise FileNotFoundError(f"Predictions database not found: {self.predictions_db_path}")
@@ -215,9 +164,20 @@ class EnhancedPaperTradingService:
             raise FileNotFoundError(f"Paper trading database not found: {self.paper_trading_db_path}")
             
         self._initialize_database()
+        self._ensure_prediction_indexes()
         self._load_active_positions()
-        # Initialize last processed timestamp to 1 hour ago
-        self.last_processed_timestamp = (datetime.now() - timedelta(hours=1)).isoformat()
+        # Resume from the persisted high-water mark, or the oldest tradable prediction on first start
+        self.last_processed_timestamp = self._load_prediction_cursor() or (
+            datetime.now() - timedelta(seconds=self.config['prediction_max_age_seconds'])
+        ).isoformat()
+        
+        # Published predictions wake the service instead of waiting for the next poll
+        self.prediction_feed = None
+        if PREDICTION_FEED_AVAILABLE:
+            try:
+                self.prediction_feed = PredictionSubscriber('enhanced_paper_trading')
+            except Exception as e:
+                logger.warning(f"⚠️ Prediction feed unavailable, polling instead: {e}")
     
     def _execute_db_operation(self, operation_name: str, operation_func, *args, **kwargs):
         """Execute database operation with retry logic and proper error handling"""
@@ -314,6 +274,15 @@ class EnhancedPaperTradingService:
                 )
             """)
             
+            # High-water mark of prediction_timestamp already checked, kept across restarts
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS prediction_cursor (
+                    name TEXT PRIMARY KEY,
+                    last_prediction_timestamp TEXT NOT NULL,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             # Insert default config
             cursor.execute("""
                 INSERT OR REPLACE INTO trading_config (key, value) VALUES 
@@ -341,6 +310,49 @@ class EnhancedPaperTradingService:
         except Exception as e:
             logger.error(f"❌ Error initializing database: {e}")
     
+    def _ensure_prediction_indexes(self):
+        """Index the predictions table for the reconciliation query"""
+        try:
+            conn = sqlite3.connect(self.predictions_db_path, timeout=10.0)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_predictions_action_timestamp
+                ON predictions(predicted_action, prediction_timestamp)
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_prediction_id ON predictions(prediction_id)")
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not index predictions table: {e}")
+    
+    def _load_prediction_cursor(self) -> Optional[str]:
+        """Last prediction timestamp checked before the previous shutdown"""
+        try:
+            conn = sqlite3.connect(self.paper_trading_db_path, timeout=10.0)
+            row = conn.execute(
+                "SELECT last_prediction_timestamp FROM prediction_cursor WHERE name = 'predictions'"
+            ).fetchone()
+            conn.close()
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load prediction cursor: {e}")
+            return None
+    
+    def _save_prediction_cursor(self):
+        """Persist the high-water mark so a restart only reconciles newer predictions"""
+        try:
+            def save_cursor():
+                conn = sqlite3.connect(self.paper_trading_db_path, timeout=10.0)
+                conn.execute("""
+                    INSERT OR REPLACE INTO prediction_cursor (name, last_prediction_timestamp, updated_at)
+                    VALUES ('predictions', ?, CURRENT_TIMESTAMP)
+                """, (self.last_processed_timestamp,))
+                conn.commit()
+                conn.close()
+            
+            self._execute_db_operation("save_prediction_cursor", save_cursor)
+        except Exception as e:
+            logger.error(f"❌ Error saving prediction cursor: {e}")
+    
     def _load_config_from_database(self):
         """Load configuration from database (for dashboard updates)"""
         try:
@@ -407,19 +419,20 @@ class EnhancedPaperTradingService:
     def check_for_new_predictions(self) -> List[Dict]:
         """Check for new BUY predictions in the database that haven't been processed yet"""
         try:
-            conn = sqlite3.connect(self.predictions_db_path, timeout=10.0)
+            # Both databases in one read-only connection, so dedup is a single anti-join
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.predictions_db_path)}?mode=ro", uri=True, timeout=10.0)
+            conn.execute("ATTACH DATABASE ? AS pt", (f"file:{os.path.abspath(self.paper_trading_db_path)}?mode=ro",))
             cursor = conn.cursor()
             
-            # Get new BUY predictions that haven't been processed yet
             cursor.execute("""
                 SELECT p.prediction_id, p.symbol, p.predicted_action, p.action_confidence, 
                        p.prediction_timestamp, p.entry_price, p.predicted_direction
                 FROM predictions p
-                WHERE p.prediction_timestamp > ? 
-                AND p.predicted_action = 'BUY'
-                AND p.prediction_id NOT IN (
-                    SELECT prediction_id FROM processed_predictions 
-                    WHERE prediction_id = p.prediction_id
+                WHERE p.predicted_action = 'BUY'
+                AND p.prediction_timestamp > ?
+                AND NOT EXISTS (
+                    SELECT 1 FROM pt.processed_predictions pp
+                    WHERE pp.prediction_id = p.prediction_id
                 )
                 ORDER BY p.prediction_timestamp ASC
             """, (self.last_processed_timestamp,))
@@ -427,46 +440,153 @@ class EnhancedPaperTradingService:
             predictions_data = cursor.fetchall()
             conn.close()
             
-            # Also check paper trading database for processed predictions
-            if predictions_data:
-                pt_conn = sqlite3.connect(self.paper_trading_db_path, timeout=10.0)
-                pt_cursor = pt_conn.cursor()
-                
-                new_predictions = []
-                for row in predictions_data:
-                    prediction_id = row[0]
-                    
-                    # Check if this prediction was already processed
-                    pt_cursor.execute("""
-                        SELECT COUNT(*) FROM processed_predictions 
-                        WHERE prediction_id = ?
-                    """, (prediction_id,))
-                    
-                    already_processed = pt_cursor.fetchone()[0] > 0
-                    
-                    if not already_processed:
-                        prediction = {
-                            'prediction_id': row[0],
-                            'symbol': row[1],
-                            'predicted_action': row[2],
-                            'action_confidence': row[3],
-                            'prediction_timestamp': row[4],
-                            'entry_price': row[5],
-                            'predicted_direction': row[6]
-                        }
-                        new_predictions.append(prediction)
-                        # Update last processed timestamp
-                        self.last_processed_timestamp = row[4]
-                
-                pt_conn.close()
-                return new_predictions
-            else:
-                return []
+            new_predictions = []
+            for row in predictions_data:
+                new_predictions.append({
+                    'prediction_id': row[0],
+                    'symbol': row[1],
+                    'predicted_action': row[2],
+                    'action_confidence': row[3],
+                    'prediction_timestamp': row[4],
+                    'entry_price': row[5],
+                    'predicted_direction': row[6]
+                })
+            
+            return new_predictions
             
         except Exception as e:
             logger.error(f"❌ Error checking predictions: {e}")
             return []
     
+    def check_prediction_feed(self) -> bool:
+        """
+        Handle published predictions, acknowledging them only once handled.
+        
+        Returns True if the feed had new events.
+        """
+        if self.prediction_feed is None:
+            return False
+        
+        try:
+            events = self.prediction_feed.fetch()
+            if not events:
+                return False
+            
+            prediction_ids = [event['prediction_id'] for event in events]
+            conn = sqlite3.connect(self.paper_trading_db_path, timeout=10.0)
+            processed = {row[0] for row in conn.execute(
+                f"SELECT prediction_id FROM processed_predictions WHERE prediction_id IN ({','.join('?' * len(prediction_ids))})",
+                prediction_ids
+            )}
+            conn.close()
+            
+            new_predictions = []
+            for event in events:
+                if event.get('predicted_action') != 'BUY' or event['prediction_id'] in processed:
+                    continue
+                new_predictions.append({
+                    'prediction_id': event['prediction_id'],
+                    'symbol': event['symbol'],
+                    'predicted_action': event['predicted_action'],
+                    'action_confidence': event.get('action_confidence'),
+                    'prediction_timestamp': event.get('prediction_timestamp'),
+                    'entry_price': event.get('entry_price'),
+                    'predicted_direction': event.get('predicted_direction')
+                })
+            
+            if new_predictions:
+                self.record_failed_predictions(self.handle_new_predictions(new_predictions))
+            # A crash before this point redelivers the events on restart
+            self.prediction_feed.ack(events[-1]['seq'])
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error reading prediction feed: {e}")
+            return False
+    
+    def handle_new_predictions(self, new_predictions: List[Dict]) -> List[Dict]:
+        """
+        Open positions for new BUY predictions.
+        
+        Returns the predictions whose buy did not go through (e.g. no price
+        available), so the prediction cursor can stop short of them. Predictions
+        older than prediction_max_age_seconds are recorded as expired instead of
+        being bought or retried, so the cursor moves past them.
+        """
+        failed = []
+        if new_predictions:
+            logger.info(f"📈 Found {len(new_predictions)} new BUY predictions")
+            for prediction in new_predictions:
+                if self.is_prediction_expired(prediction):
+                    logger.info(f"⌛ Skipping {prediction['symbol']} - prediction {prediction['prediction_id']} is too old to trade")
+                    self.mark_prediction_processed(
+                        prediction['prediction_id'],
+                        prediction['symbol'],
+                        'POSITION_SKIPPED',
+                        'EXPIRED'
+                    )
+                elif self.can_take_position(prediction['symbol']):
+                    if not self.execute_buy_order(prediction):
+                        failed.append(prediction)
+                else:
+                    logger.info(f"⚠️ Skipping {prediction['symbol']} - position already exists")
+        else:
+            logger.info("😴 No new BUY predictions")
+        return failed
+    
+    def record_failed_predictions(self, failed: List[Dict]):
+        """Queue predictions whose buy failed for retry_failed_predictions"""
+        for prediction in failed:
+            self.failed_predictions[prediction['prediction_id']] = prediction
+    
+    def retry_failed_predictions(self):
+        """Retry failed buys; each drops out once bought, skipped or expired"""
+        if not self.failed_predictions:
+            return
+        retries = list(self.failed_predictions.values())
+        self.failed_predictions = {}
+        logger.info(f"🔁 Retrying {len(retries)} failed BUY predictions")
+        self.record_failed_predictions(self.handle_new_predictions(retries))
+    
+    def is_prediction_expired(self, prediction: Dict) -> bool:
+        """True if the prediction is older than prediction_max_age_seconds (or has no readable timestamp)"""
+        try:
+            predicted_at = datetime.fromisoformat(str(prediction['prediction_timestamp']))
+        except (KeyError, TypeError, ValueError):
+            return True
+        now = datetime.now(predicted_at.tzinfo) if predicted_at.tzinfo else datetime.now()
+        return (now - predicted_at).total_seconds() > self.config['prediction_max_age_seconds']
+    
+    def advance_prediction_cursor(self, handled: List[Dict], failed: List[Dict]) -> bool:
+        """
+        Move the high-water mark past handled predictions, stopping before the first failed one.
+        
+        Returns True if the cursor moved.
+        """
+        retry_from = min((prediction['prediction_timestamp'] for prediction in failed), default=None)
+        timestamps = [
+            prediction['prediction_timestamp'] for prediction in handled
+            if retry_from is None or prediction['prediction_timestamp'] < retry_from
+        ]
+        if not timestamps or max(timestamps) <= self.last_processed_timestamp:
+            return False
+        self.last_processed_timestamp = max(timestamps)
+        return True
+    
+    def wait_for_next_check(self, seconds: float):
+        """Sleep until the next check, acting on published predictions as they arrive"""
+        if self.prediction_feed is None:
+            time.sleep(seconds)
+            return
+        
+        deadline = time.time() + seconds
+        while self.running:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if self.prediction_feed.wait(remaining) and is_position_opening_hours(datetime.now(pytz.UTC)):
+                self.check_prediction_feed()
+    
     def mark_prediction_processed(self, prediction_id: str, symbol: str, action_taken: str, result: str):
         """Mark a prediction as processed to prevent reprocessing"""
         try:
@@ -509,6 +629,21 @@ class EnhancedPaperTradingService:
             logger.error(f"❌ Error getting price for {symbol}: {e}")
             return None
     
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Get current prices for several symbols with one batched quote request"""
+        prices = {}
+        if ENHANCED_PRICING_AVAILABLE:
+            try:
+                prices = get_enhanced_price_source().get_current_prices(symbols)
+            except Exception as e:
+                logger.error(f"❌ Error getting batch prices for {symbols}: {e}")
+        
+        # Anything the batch could not price falls back to the single-symbol path
+        return {
+            symbol: prices[symbol] if prices.get(symbol) is not None else self.get_current_price(symbol)
+            for symbol in symbols
+        }
+    
     def can_take_position(self, symbol: str) -> bool:
         """Check if we can take a position (one per symbol rule)"""
         return symbol not in self.active_positions
@@ -616,9 +751,17 @@ class EnhancedPaperTradingService:
         
         positions_to_close = []
         
+        # One quote round-trip and one trading-calendar pass for every open position
+        current_prices = self.get_current_prices(list(self.active_positions))
+        hold_times = dict(zip(
+            self.active_positions,
+            asx_calendar.trading_minutes_many(
+                [position['entry_time'] for position in self.active_positions.values()], current_time
+            )
+        ))
+        
         for symbol, position in self.active_positions.items():
-            # Get current price
-            current_price = self.get_current_price(symbol)
+            current_price = current_prices.get(symbol)
             if current_price is None:
                 continue
             
@@ -632,7 +775,7 @@ class EnhancedPaperTradingService:
             current_profit = net_proceeds - position['investment']
             
             # Calculate trading time (only count time during ASX trading hours)
-            hold_time_minutes = calculate_trading_time_minutes(position['entry_time'], current_time)
+            hold_time_minutes = float(hold_times[symbol])
             
             # Check exit conditions
             should_exit = False
@@ -792,7 +935,11 @@ class EnhancedPaperTradingService:
         logger.info("🚀 Enhanced Paper Trading Service started!")
         logger.info(f"🎯 Strategy: One position per symbol, ${self.config['profit_target']} profit target")
         logger.info(f"⏰ Position checks every {self.config['check_interval_seconds']}s")
-        logger.info(f"📡 Prediction checks every {self.config['prediction_check_interval_seconds']}s")
+        if self.prediction_feed is not None:
+            logger.info("📡 Published predictions are handled as they arrive")
+            logger.info(f"📡 Database reconcile every {self.config['prediction_reconcile_interval_seconds']}s")
+        else:
+            logger.info(f"📡 Prediction checks every {self.config['prediction_check_interval_seconds']}s")
         
         last_prediction_check = 0
         last_config_check = 0
@@ -823,20 +970,28 @@ class EnhancedPaperTradingService:
                         if current_time % 600 == 0:  # Every 10 minutes
                             logger.info(f"💤 Market closed - {len(self.active_positions)} positions waiting for market open")
                 
-                # Check for new predictions every 5 minutes (during position opening hours only)
-                if is_position_opening_hours(datetime.now(pytz.UTC)) and current_time - last_prediction_check >= self.config['prediction_check_interval_seconds']:
-                    new_predictions = self.check_for_new_predictions()
-                    
-                    if new_predictions:
-                        logger.info(f"📈 Found {len(new_predictions)} new BUY predictions")
-                        for prediction in new_predictions:
-                            if self.can_take_position(prediction['symbol']):
-                                self.execute_buy_order(prediction)
-                            else:
-                                logger.info(f"⚠️ Skipping {prediction['symbol']} - position already exists")
-                    else:
-                        logger.info("😴 No new BUY predictions")
-                    
+                # Predictions published outside opening hours wait in the feed until it opens
+                if self.prediction_feed is not None and is_position_opening_hours(datetime.now(pytz.UTC)):
+                    self.check_prediction_feed()
+                
+                if is_position_opening_hours(datetime.now(pytz.UTC)):
+                    self.retry_failed_predictions()
+                
+                # Scan the database for new predictions (during position opening hours only): every
+                # 5 minutes without the feed, otherwise hourly to reconcile any publish that was missed
+                prediction_check_interval = self.config[
+                    'prediction_check_interval_seconds' if self.prediction_feed is None
+                    else 'prediction_reconcile_interval_seconds'
+                ]
+                if is_position_opening_hours(datetime.now(pytz.UTC)) and current_time - last_prediction_check >= prediction_check_interval:
+                    new_predictions = [
+                        prediction for prediction in self.check_for_new_predictions()
+                        if prediction['prediction_id'] not in self.failed_predictions
+                    ]
+                    self.record_failed_predictions(self.handle_new_predictions(new_predictions))
+                    # Persist only once handled, so failed buys are retried after a restart
+                    if self.advance_prediction_cursor(new_predictions, list(self.failed_predictions.values())):
+                        self._save_prediction_cursor()
                     last_prediction_check = current_time
                 elif not is_position_opening_hours(datetime.now(pytz.UTC)) and is_asx_trading_hours(datetime.now(pytz.UTC)):
                     # After 3:15 PM but before 4:00 PM - only log occasionally
@@ -850,7 +1005,7 @@ class EnhancedPaperTradingService:
                         logger.info(f"💼 Portfolio: {summary['active_positions']} positions, {summary['total_trades']} trades, ${summary['total_profit']:.2f} profit")
                 
                 # Wait for next check
-                time.sleep(self.config['check_interval_seconds'])
+                self.wait_for_next_check(self.config['check_interval_seconds'])
                 
             except KeyboardInterrupt:
                 logger.info("🛑 Service stopped by user")
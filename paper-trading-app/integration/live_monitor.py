@@ -12,7 +12,7 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from integration.prediction_signal_handler import PredictionSignalHandler
+from integration.prediction_signal_handler import PredictionSignalHandler, RECONCILE_INTERVAL_SECONDS
 
 class LivePredictionMonitor:
     """Live monitoring service for prediction signals"""
@@ -44,24 +44,36 @@ class LivePredictionMonitor:
         
         last_summary_time = datetime.now()
         
+        # The feed acts on published predictions as they arrive; with it up the
+        # database is only checked as an hourly reconcile
+        feed = self.handler.open_prediction_feed('live_prediction_monitor')
+        db_check_interval = check_interval_seconds if feed is None else max(check_interval_seconds, RECONCILE_INTERVAL_SECONDS)
+        last_check = 0.0
+        
         while self.running:
             try:
                 # Check for new predictions
-                new_signals = self.check_for_new_predictions()
-                
-                if new_signals:
-                    print(f"\n🔔 Found {len(new_signals)} new prediction(s)")
+                if time.time() - last_check >= db_check_interval:
+                    new_signals = self.check_for_new_predictions()
+                    last_check = time.time()
                     
-                    for signal_data in new_signals:
-                        self.process_signal(signal_data)
+                    if new_signals:
+                        print(f"\n🔔 Found {len(new_signals)} new prediction(s)")
+                        
+                        for signal_data in new_signals:
+                            self.process_signal(signal_data)
                 
                 # Show periodic summary (every 5 minutes)
                 if (datetime.now() - last_summary_time).seconds > 300:
                     self.show_periodic_summary()
                     last_summary_time = datetime.now()
                 
-                # Wait before next check
-                time.sleep(check_interval_seconds)
+                # Wait before next check, waking at least every interval for the summary
+                remaining = max(min(db_check_interval - (time.time() - last_check), check_interval_seconds), 0)
+                if feed is None:
+                    time.sleep(remaining)
+                else:
+                    self.check_prediction_feed(feed, remaining)
                 
             except KeyboardInterrupt:
                 print("\n🛑 Monitoring stopped by user")
@@ -70,6 +82,8 @@ class LivePredictionMonitor:
                 print(f"❌ Error in monitoring loop: {e}")
                 time.sleep(60)  # Wait 1 minute before retrying
         
+        if feed is not None:
+            feed.close()
         print("👋 Live monitoring stopped")
     
     def check_for_new_predictions(self):
@@ -138,6 +152,31 @@ class LivePredictionMonitor:
             print(f"❌ Error checking for new predictions: {e}")
             return []
     
+    def check_prediction_feed(self, feed, timeout: float) -> int:
+        """
+        Wait up to timeout for published predictions and process the new ones.
+        
+        Each event is acknowledged only after it has been processed, so a
+        crash redelivers it. Returns the number of predictions processed.
+        """
+        events = feed.wait_for_events(timeout)
+        if not events:
+            return 0
+        
+        new_events = [event for event in events if event['prediction_id'] not in self.processed_predictions]
+        if new_events:
+            print(f"\n🔔 Found {len(new_events)} new prediction(s)")
+        
+        for event in events:
+            if event['prediction_id'] not in self.processed_predictions:
+                self.process_signal(self.handler.prediction_data_from_feed(event))
+                
+                # Mark as processed
+                self.processed_predictions.add(event['prediction_id'])
+            feed.ack(event['seq'])
+        
+        return len(new_events)
+    
     def process_signal(self, signal_data):
         """Process a single prediction signal"""
         try:
@@ -7,6 +7,7 @@ import sys
 import os
 import sqlite3
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
@@ -18,6 +19,18 @@ from database.models import create_database, get_session, init_default_account
 from trading.engine import PaperTradingEngine, StrategyInterface, TradeResult
 from config import TRADING_CONFIG
 
+# Import the prediction feed from the main application
+main_app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if main_app_dir not in sys.path:
+    sys.path.insert(0, main_app_dir)
+
+try:
+    from app.core.data.prediction_feed import PredictionSubscriber, RECONCILE_INTERVAL_SECONDS
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError:
+    PREDICTION_FEED_AVAILABLE = False
+    RECONCILE_INTERVAL_SECONDS = 3600
+
 class PredictionSignalHandler:
     """Handles incoming prediction signals and converts them to paper trades"""
     
@@ -182,74 +195,120 @@ class PredictionSignalHandler:
             self.logger.error(f"Error processing prediction signal: {e}")
             return TradeResult(success=False, message=f"Processing error: {str(e)}")
     
+    def open_prediction_feed(self, consumer: str):
+        """Subscribe to the prediction feed, or None to fall back to polling"""
+        if not PREDICTION_FEED_AVAILABLE:
+            return None
+        try:
+            return PredictionSubscriber(consumer)
+        except Exception as e:
+            self.logger.warning(f"Prediction feed unavailable, polling instead: {e}")
+            return None
+    
+    @staticmethod
+    def prediction_data_from_feed(event: Dict) -> Dict:
+        """Convert a published prediction into the signal format used by process_prediction_signal"""
+        return {
+            'prediction_id': event.get('prediction_id'),
+            'symbol': event.get('symbol', ''),
+            'prediction': event.get('prediction') or event.get('predicted_action', ''),
+            'confidence': event.get('confidence', event.get('action_confidence', 0.0)),
+            'timestamp': event.get('timestamp') or event.get('prediction_timestamp', datetime.now()),
+            'signal_strength': event.get('signal_strength') or 0.5,
+            'reasoning': event.get('reasoning') or 'ML Model Prediction'
+        }
+    
     def monitor_predictions_database(self, check_interval_minutes: int = 5):
         """Monitor the predictions database for new predictions"""
         self.logger.info(f"Starting prediction monitoring (checking every {check_interval_minutes} minutes)")
         
         last_check = datetime.now() - timedelta(days=1)  # Start from yesterday
+        check_interval = check_interval_minutes * 60
+        last_poll = 0.0
+        handled = set()  # Prediction IDs already traded by this monitor
+        
+        # The feed acts on published predictions as they arrive; with it up the
+        # database is only polled as an hourly reconcile
+        feed = self.open_prediction_feed('prediction_signal_handler')
+        if feed is not None:
+            check_interval = max(check_interval, RECONCILE_INTERVAL_SECONDS)
         
         while True:
             try:
-                # Connect to predictions database
-                conn = sqlite3.connect(self.predictions_db)
-                cursor = conn.cursor()
-                
-                # Query for new predictions since last check
-                cursor.execute('''
-                    SELECT 
-                        p.prediction_id,
-                        p.symbol,
-                        p.prediction,
-                        p.confidence,
-                        p.timestamp,
-                        p.signal_strength,
-                        p.reasoning
-                    FROM predictions p
-                    WHERE p.timestamp > ?
-                    ORDER BY p.timestamp DESC
-                ''', (last_check,))
-                
-                new_predictions = cursor.fetchall()
-                
-                if new_predictions:
-                    self.logger.info(f"Found {len(new_predictions)} new predictions")
+                if time.time() - last_poll >= check_interval:
+                    # Connect to predictions database
+                    conn = sqlite3.connect(self.predictions_db)
+                    cursor = conn.cursor()
                     
-                    for pred in new_predictions:
-                        prediction_data = {
-                            'prediction_id': pred[0],
-                            'symbol': pred[1],
-                            'prediction': pred[2],
-                            'confidence': pred[3],
-                            'timestamp': pred[4],
-                            'signal_strength': pred[5] if pred[5] else 0.5,
-                            'reasoning': pred[6] if pred[6] else 'ML Model Prediction'
-                        }
-                        
-                        # Process the signal
-                        result = self.process_prediction_signal(prediction_data)
+                    # Query for new predictions since last check
+                    cursor.execute('''
+                        SELECT 
+                            p.prediction_id,
+                            p.symbol,
+                            p.prediction,
+                            p.confidence,
+                            p.timestamp,
+                            p.signal_strength,
+                            p.reasoning
+                        FROM predictions p
+                        WHERE p.timestamp > ?
+                        ORDER BY p.timestamp DESC
+                    ''', (last_check,))
+                    
+                    new_predictions = [pred for pred in cursor.fetchall() if pred[0] not in handled]
+                    
+                    if new_predictions:
+                        self.logger.info(f"Found {len(new_predictions)} new predictions")
                         
-                        # Log result to console/file
-                        if result.success:
-                            print(f"✅ {prediction_data['symbol']}: {result.message}")
-                        else:
-                            print(f"❌ {prediction_data['symbol']}: {result.message}")
-                
-                # Update last check time
-                last_check = datetime.now()
-                conn.close()
+                        for pred in new_predictions:
+                            prediction_data = {
+                                'prediction_id': pred[0],
+                                'symbol': pred[1],
+                                'prediction': pred[2],
+                                'confidence': pred[3],
+                                'timestamp': pred[4],
+                                'signal_strength': pred[5] if pred[5] else 0.5,
+                                'reasoning': pred[6] if pred[6] else 'ML Model Prediction'
+                            }
+                            
+                            # Process the signal
+                            self._process_and_report(prediction_data)
+                            handled.add(pred[0])
+                    
+                    # Update last check time
+                    last_check = datetime.now()
+                    last_poll = time.time()
+                    conn.close()
                 
                 # Wait before next check
-                import time
-                time.sleep(check_interval_minutes * 60)
+                remaining = max(check_interval - (time.time() - last_poll), 0)
+                if feed is None:
+                    time.sleep(remaining)
+                    continue
+                
+                for event in feed.wait_for_events(remaining):
+                    if event['prediction_id'] not in handled:
+                        self._process_and_report(self.prediction_data_from_feed(event))
+                        handled.add(event['prediction_id'])
+                    # Acknowledged only once handled, so a crash redelivers it
+                    feed.ack(event['seq'])
                 
             except KeyboardInterrupt:
                 self.logger.info("Monitoring stopped by user")
                 break
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop: {e}")
-                import time
                 time.sleep(60)  # Wait 1 minute before retrying
     
+    def _process_and_report(self, prediction_data: Dict) -> TradeResult:
+        """Process one prediction signal and log the result to console/file"""
+        result = self.process_prediction_signal(prediction_data)
+        if result.success:
+            print(f"✅ {prediction_data['symbol']}: {result.message}")
+        else:
+            print(f"❌ {prediction_data['symbol']}: {result.message}")
+        return result
+    
     def process_historical_predictions(self, days_back: int = 7):
         """Process historical predictions for backtesting"""
         try:
@@ -19,6 +19,17 @@ import json
 paper_trading_path = os.path.join(os.path.dirname(__file__), 'paper-trading-app')
 sys.path.append(paper_trading_path)
 
+# Import the prediction feed from the main application
+main_app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if main_app_dir not in sys.path:
+    sys.path.insert(0, main_app_dir)
+
+try:
+    from app.core.data.prediction_feed import PredictionSubscriber, RECONCILE_INTERVAL_SECONDS
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError:
+    PREDICTION_FEED_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +53,17 @@ class PaperTradingService:
         # Load processed predictions from state file
         self._load_state()
         
+        # Published predictions wake the service instead of waiting for the next poll;
+        # with the feed up the database is only scanned as an hourly reconcile
+        self.prediction_feed = None
+        self.db_check_interval = check_interval
+        if PREDICTION_FEED_AVAILABLE:
+            try:
+                self.prediction_feed = PredictionSubscriber('paper_trading_background_service')
+                self.db_check_interval = max(check_interval, RECONCILE_INTERVAL_SECONDS)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Prediction feed unavailable, polling instead: {e}")
+        
         # Initialize paper trading components
         try:
             from database.models import create_database, get_session, init_default_account
@@ -80,6 +102,11 @@ class PaperTradingService:
             'price_validation': {
                 'max_age_minutes': 10,  # Use prices up to 10 minutes old
                 'required_volume': 1000 # Minimum daily volume
+            },
+            'exit_orders': {
+                'stop_loss_pct': 0.05,    # Stop-loss 5% below the buy price
+                'take_profit_pct': 0.10,  # Take-profit 10% above the buy price
+                'quote_interval': 60      # Seconds between quote checks for triggered exits
             }
         }
         
@@ -208,6 +235,66 @@ class PaperTradingService:
             self.logger.error(f"❌ Error checking for new predictions: {e}")
             return []
     
+    def check_prediction_feed(self, timeout: float) -> int:
+        """
+        Wait up to timeout for published predictions and process the new ones.
+        
+        Events are acknowledged only after they have been processed and the
+        state file saved, so a crash redelivers them. Returns the number of
+        predictions processed.
+        """
+        try:
+            events = self.prediction_feed.wait_for_events(timeout)
+            if not events:
+                return 0
+            
+            new_predictions = []
+            for event in events:
+                if event['prediction_id'] in self.processed_predictions:
+                    continue
+                new_predictions.append({
+                    'prediction_id': event['prediction_id'],
+                    'symbol': event['symbol'],
+                    'predicted_action': event.get('predicted_action') or 'HOLD',
+                    'confidence': event.get('action_confidence') if event.get('action_confidence') is not None else 0.0,
+                    'timestamp': event.get('prediction_timestamp'),
+                    'magnitude': event.get('predicted_magnitude') if event.get('predicted_magnitude') is not None else 0.0,
+                    'reasoning': event.get('reasoning') or 'ML Prediction'
+                })
+            
+            if new_predictions:
+                self.logger.info(f"🔍 Found {len(new_predictions)} new predictions to process")
+                self.process_predictions(new_predictions)
+            
+            self.prediction_feed.ack(events[-1]['seq'])
+            return len(new_predictions)
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error reading prediction feed: {e}")
+            return 0
+    
+    def process_predictions(self, predictions: List[Dict]):
+        """Process a batch of predictions and record them in the state file"""
+        self.logger.info(f"🔔 Processing {len(predictions)} new predictions")
+        
+        successful = 0
+        failed = 0
+        
+        for pred in predictions:
+            if self.process_prediction(pred):
+                successful += 1
+            else:
+                failed += 1
+            
+            # Mark as processed
+            self.processed_predictions.add(pred['prediction_id'])
+        
+        # Summary
+        self.logger.info(f"📋 Batch complete: {successful} successful, {failed} failed")
+        
+        # Save state after processing
+        self._save_state()
+    
     def calculate_position_size(self, symbol: str, confidence: float, current_price: float) -> int:
         """Calculate position size based on confidence and portfolio constraints"""
         try:
@@ -331,6 +418,8 @@ class PaperTradingService:
                     self.logger.info(f"   💰 Executed: {result.executed_quantity} shares @ ${result.executed_price:.2f} = ${total_value:,.2f}")
                     if result.commission:
                         self.logger.info(f"   💸 Commission: ${result.commission:.2f}")
+                if action == 'BUY' and result.executed_price:
+                    self.place_exit_orders(symbol, result.executed_price)
                 return True
             else:
                 self.logger.warning(f"   ❌ FAILED: {result.message}")
@@ -340,6 +429,33 @@ class PaperTradingService:
             self.logger.error(f"❌ Error processing prediction {pred_data.get('prediction_id', 'unknown')}: {e}")
             return False
     
+    def place_exit_orders(self, symbol: str, buy_price: float):
+        """Protect a position with stop-loss and take-profit orders around the buy price"""
+        exit_config = self.config['exit_orders']
+        results = self.trading_engine.place_exit_orders(
+            symbol,
+            stop_price=round(buy_price * (1 - exit_config['stop_loss_pct']), 2),
+            target_price=round(buy_price * (1 + exit_config['take_profit_pct']), 2),
+            strategy_source="ML_Background_Service",
+            notes="Exit for ML prediction trade"
+        )
+        for result in results:
+            if result.success:
+                self.logger.info(f"   🎯 {result.message}")
+            else:
+                self.logger.warning(f"   ⚠️ Exit order not placed: {result.message}")
+    
+    def check_exit_orders(self) -> int:
+        """Fill pending stop-loss, take-profit and limit orders triggered by current quotes"""
+        filled = 0
+        for result in self.trading_engine.process_quotes():
+            if result.success:
+                filled += 1
+                self.logger.info(f"🎯 Order {result.order_id} filled: {result.message}")
+            else:
+                self.logger.warning(f"⚠️ Order {result.order_id} not filled: {result.message}")
+        return filled
+    
     def show_portfolio_summary(self):
         """Display current portfolio summary"""
         try:
@@ -367,7 +483,9 @@ class PaperTradingService:
         self.logger.info("🚀 Paper Trading Background Service Starting")
         self.logger.info("=" * 60)
         self.logger.info(f"📊 Monitoring: {self.predictions_db}")
-        self.logger.info(f"⏱️  Check interval: {self.check_interval} seconds")
+        self.logger.info(f"⏱️  Check interval: {self.db_check_interval} seconds")
+        if self.prediction_feed is not None:
+            self.logger.info("📡 Published predictions are handled as they arrive")
         self.logger.info(f"🎯 BUY threshold: {self.config['confidence_thresholds']['BUY']:.0%}")
         self.logger.info(f"💰 Base position: ${self.config['position_sizing']['base_amount']:,}")
         self.logger.info("🔄 Service running... Press Ctrl+C to stop")
@@ -375,31 +493,25 @@ class PaperTradingService:
         
         last_summary_time = datetime.now()
         processed_this_session = 0
+        last_check = 0.0
+        last_quote_check = 0.0
+        quote_interval = self.config['exit_orders']['quote_interval']
         
         while self.running:
             try:
-                # Check for new predictions
-                new_predictions = self.check_for_new_predictions()
-                
-                if new_predictions:
-                    self.logger.info(f"🔔 Processing {len(new_predictions)} new predictions")
-                    
-                    successful = 0
-                    failed = 0
+                # Check the database every interval; the feed acts on published predictions in between
+                if time.time() - last_check >= self.db_check_interval:
+                    new_predictions = self.check_for_new_predictions()
+                    last_check = time.time()
                     
-                    for pred in new_predictions:
-                        if self.process_prediction(pred):
-                            successful += 1
-                        else:
-                            failed += 1
-                    
-                    processed_this_session += len(new_predictions)
-                    
-                    # Summary
-                    self.logger.info(f"📋 Batch complete: {successful} successful, {failed} failed")
-                    
-                    # Save state after processing
-                    self._save_state()
+                    if new_predictions:
+                        self.process_predictions(new_predictions)
+                        processed_this_session += len(new_predictions)
+                
+                # Refresh quotes for symbols with pending orders and fill any that triggered
+                if time.time() - last_quote_check >= quote_interval:
+                    self.check_exit_orders()
+                    last_quote_check = time.time()
                 
                 # Show periodic summary (every 30 minutes)
                 if (datetime.now() - last_summary_time).seconds > 1800:
@@ -408,8 +520,13 @@ class PaperTradingService:
                     last_summary_time = datetime.now()
                 
                 # Wait before next check
-                self.logger.debug(f"😴 Sleeping for {self.check_interval} seconds...")
-                time.sleep(self.check_interval)
+                remaining = max(min(self.db_check_interval - (time.time() - last_check),
+                                    quote_interval - (time.time() - last_quote_check)), 0)
+                if self.prediction_feed is None:
+                    self.logger.debug(f"😴 Sleeping for {remaining:.0f} seconds...")
+                    time.sleep(remaining)
+                else:
+                    processed_this_session += self.check_prediction_feed(remaining)
                 
             except KeyboardInterrupt:
                 self.logger.info("🛑 Service stopped by user")
@@ -419,6 +536,8 @@ class PaperTradingService:
                 time.sleep(60)  # Wait 1 minute before retrying
         
         # Cleanup
+        if self.prediction_feed is not None:
+            self.prediction_feed.close()
         self._save_state()
         self.show_portfolio_summary()
         self.logger.info(f"👋 Paper Trading Service stopped. Processed {processed_this_session} predictions this session.")
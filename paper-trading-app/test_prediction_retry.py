@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Prediction Retry Test
+Checks that a BUY prediction whose order fails is retried while it is fresh,
+including one delivered by the prediction feed between database scans, and
+is recorded as expired, never bought, once it is older than
+prediction_max_age_seconds, so the prediction cursor can move past it
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('PREDICTION_FEED_DB', os.path.join(tempfile.mkdtemp(), 'prediction_feed.db'))
+os.environ.setdefault('PREDICTION_FEED_SOCKET_DIR', tempfile.mkdtemp())
+
+import enhanced_paper_trading_service as service_module
+from enhanced_paper_trading_service import EnhancedPaperTradingService
+from app.core.data.prediction_feed import publish_prediction
+
+
+def make_service(use_feed=False):
+    """Service on empty temporary databases, with no prices available"""
+    db_dir = tempfile.mkdtemp()
+    predictions_db = os.path.join(db_dir, 'trading_predictions.db')
+    conn = sqlite3.connect(predictions_db)
+    conn.execute("""
+        CREATE TABLE predictions (
+            prediction_id TEXT PRIMARY KEY, symbol TEXT, predicted_action TEXT,
+            action_confidence REAL, prediction_timestamp TEXT, entry_price REAL,
+            predicted_direction INTEGER
+        )
+    """)
+    conn.commit()
+    conn.close()
+    paper_trading_db = os.path.join(db_dir, 'paper_trading.db')
+    sqlite3.connect(paper_trading_db).close()
+
+    service_module.PREDICTIONS_DB_PATH = predictions_db
+    service_module.PAPER_TRADING_DB_PATH = paper_trading_db
+    service = EnhancedPaperTradingService()
+    if service.prediction_feed is not None and not use_feed:
+        service.prediction_feed.close()
+        service.prediction_feed = None
+    service.prices = {}
+    service.get_current_price = service.prices.get
+    return service
+
+
+def add_prediction(service, prediction_id, symbol, age_minutes):
+    conn = sqlite3.connect(service.predictions_db_path)
+    conn.execute(
+        "INSERT INTO predictions VALUES (?, ?, 'BUY', 0.8, ?, 100.0, 1)",
+        (prediction_id, symbol, (datetime.now() - timedelta(minutes=age_minutes)).isoformat())
+    )
+    conn.commit()
+    conn.close()
+
+
+def processed_result(service, prediction_id):
+    conn = sqlite3.connect(service.paper_trading_db_path)
+    row = conn.execute(
+        "SELECT action_taken, result FROM processed_predictions WHERE prediction_id = ?", (prediction_id,)
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def poll(service):
+    """One database check, as run() does it"""
+    new_predictions = service.check_for_new_predictions()
+    failed = service.handle_new_predictions(new_predictions)
+    service.advance_prediction_cursor(new_predictions, failed)
+    return new_predictions, failed
+
+
+def test_failed_buy_is_retried_while_fresh():
+    service = make_service()
+    add_prediction(service, 'p1', 'CBA.AX', age_minutes=5)
+
+    _, failed = poll(service)
+    assert [p['prediction_id'] for p in failed] == ['p1'], f"failed {failed}"
+    assert processed_result(service, 'p1') is None, "failed buy recorded as processed"
+
+    service.prices['CBA.AX'] = 100.0
+    new_predictions, failed = poll(service)
+    assert [p['prediction_id'] for p in new_predictions] == ['p1'], "failed buy not retried"
+    assert not failed and 'CBA.AX' in service.active_positions
+    assert processed_result(service, 'p1') == ('POSITION_OPENED', 'SUCCESS')
+
+
+def test_failed_buy_expires_instead_of_buying_late():
+    service = make_service()
+    add_prediction(service, 'p1', 'CBA.AX', age_minutes=5)
+    _, failed = poll(service)
+    assert failed, "buy without a price should fail"
+
+    # The price only comes back after the prediction has aged out
+    service.config['prediction_max_age_seconds'] = 60
+    service.prices['CBA.AX'] = 100.0
+    _, failed = poll(service)
+    assert not failed, f"expired prediction still retried: {failed}"
+    assert 'CBA.AX' not in service.active_positions, "stale prediction was bought"
+    assert processed_result(service, 'p1') == ('POSITION_SKIPPED', 'EXPIRED')
+    assert service.check_for_new_predictions() == [], "expired prediction returned again"
+
+
+def test_cursor_moves_past_expired_prediction():
+    service = make_service()
+    service.last_processed_timestamp = (datetime.now() - timedelta(days=2)).isoformat()
+    add_prediction(service, 'old', 'CBA.AX', age_minutes=24 * 60)
+    add_prediction(service, 'new', 'ANZ.AX', age_minutes=1)
+    service.prices['ANZ.AX'] = 25.0
+
+    new_predictions, failed = poll(service)
+    assert [p['prediction_id'] for p in new_predictions] == ['old', 'new']
+    assert not failed and 'CBA.AX' not in service.active_positions and 'ANZ.AX' in service.active_positions
+    assert service.last_processed_timestamp == new_predictions[-1]['prediction_timestamp'], "cursor held back"
+
+
+def test_failed_feed_buy_is_retried_without_a_database_scan():
+    service = make_service(use_feed=True)
+    assert service.prediction_feed is not None, "prediction feed not available"
+    try:
+        timestamp = (datetime.now() - timedelta(minutes=1)).isoformat()
+        publish_prediction({'prediction_id': 'f1', 'symbol': 'WBC.AX', 'predicted_action': 'BUY',
+                            'action_confidence': 0.8, 'prediction_timestamp': timestamp})
+
+        assert service.check_prediction_feed(), "published prediction not delivered"
+        assert 'f1' in service.failed_predictions and 'WBC.AX' not in service.active_positions
+        assert service.prediction_feed.fetch() == [], "handled event not acknowledged"
+
+        service.prices['WBC.AX'] = 30.0
+        service.retry_failed_predictions()
+        assert not service.failed_predictions and 'WBC.AX' in service.active_positions
+        assert processed_result(service, 'f1') == ('POSITION_OPENED', 'SUCCESS')
+    finally:
+        service.prediction_feed.close()
+
+
+if __name__ == "__main__":
+    print("🔁 PREDICTION RETRY TEST")
+    print("=" * 50)
+    tests = [
+        test_failed_buy_is_retried_while_fresh,
+        test_failed_buy_expires_instead_of_buying_late,
+        test_cursor_moves_past_expired_prediction,
+        test_failed_feed_buy_is_retried_without_a_database_scan,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+ASX Trading Calendar Test
+Checks the closed-form trading calendar against the minute-stepping implementation
+it replaced in enhanced_paper_trading_service.py
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from trading.market_calendar import ASXTradingCalendar, asx_calendar, asx_holidays
+
+AU_TZ = pytz.timezone('Australia/Sydney')
+
+# Weekends and trading hours only, like the original service functions
+plain_calendar = ASXTradingCalendar(include_holidays=False, include_early_closes=False)
+
+
+def legacy_is_asx_trading_hours(dt: datetime) -> bool:
+    """Original is_asx_trading_hours, kept here for comparison"""
+    au_time = AU_TZ.localize(dt) if dt.tzinfo is None else dt.astimezone(AU_TZ)
+    if au_time.weekday() >= 5:
+        return False
+    trading_start = au_time.replace(hour=10, minute=0, second=0, microsecond=0)
+    trading_end = au_time.replace(hour=16, minute=0, second=0, microsecond=0)
+    return trading_start <= au_time <= trading_end
+
+
+def legacy_is_position_opening_hours(dt: datetime) -> bool:
+    """Original is_position_opening_hours, kept here for comparison"""
+    au_time = AU_TZ.localize(dt) if dt.tzinfo is None else dt.astimezone(AU_TZ)
+    if au_time.weekday() >= 5:
+        return False
+    opening_start = au_time.replace(hour=10, minute=0, second=0, microsecond=0)
+    opening_end = au_time.replace(hour=15, minute=15, second=0, microsecond=0)
+    return opening_start <= au_time < opening_end
+
+
+def legacy_trading_minutes(entry_time: datetime, current_time: datetime) -> float:
+    """
+    Minute-stepping count the original calculate_trading_time_minutes performed.
+    The original's skip-ahead jump mixed naive and aware datetimes and raised as
+    soon as a span left a session, so this steps every minute instead.
+    """
+    if entry_time >= current_time:
+        return 0.0
+    trading_minutes = 0.0
+    check_time = entry_time
+    while check_time < current_time:
+        if legacy_is_asx_trading_hours(check_time):
+            trading_minutes += 1.0
+        check_time += timedelta(minutes=1)
+    return trading_minutes
+
+
+def session_closes_in_window(start: datetime, end: datetime) -> int:
+    """
+    The stepper counts the 4:00pm minute itself (the close is inclusive), so it
+    reports one extra minute for every session close it steps onto
+    """
+    closes = 0
+    day = start.astimezone(AU_TZ).date()
+    while day <= end.astimezone(AU_TZ).date():
+        if day.weekday() < 5:
+            close = AU_TZ.localize(datetime.combine(day, datetime.min.time()).replace(hour=16))
+            if start <= close < end:
+                closes += 1
+        day += timedelta(days=1)
+    return closes
+
+
+def random_timestamps(count: int, seed: int, aligned: bool = True):
+    rng = random.Random(seed)
+    base = pytz.UTC.localize(datetime(2026, 3, 2))
+    for _ in range(count):
+        offset = timedelta(minutes=rng.randrange(0, 60 * 24 * 300))
+        if not aligned:
+            offset += timedelta(seconds=rng.randrange(60), microseconds=rng.randrange(1_000_000))
+        yield base + offset
+
+
+def test_trading_hours_match_legacy():
+    for ts in random_timestamps(5000, seed=1):
+        assert plain_calendar.is_trading_hours(ts) == legacy_is_asx_trading_hours(ts), ts
+        assert plain_calendar.is_position_opening_hours(ts) == legacy_is_position_opening_hours(ts), ts
+    for ts in random_timestamps(500, seed=2):
+        naive = ts.astimezone(AU_TZ).replace(tzinfo=None)
+        assert plain_calendar.is_trading_hours(naive) == legacy_is_asx_trading_hours(naive), naive
+
+
+def test_trading_minutes_match_minute_stepping():
+    rng = random.Random(3)
+    # Spans across weekends and both 2026 DST transitions (5 Apr and 4 Oct)
+    for start in random_timestamps(150, seed=4):
+        end = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 5))
+        expected = legacy_trading_minutes(start, end) - session_closes_in_window(start, end)
+        actual = plain_calendar.trading_minutes_between(start, end)
+        assert actual == expected, (start, end, actual, expected)
+
+
+def test_unaligned_timestamps_within_a_minute_per_session():
+    rng = random.Random(5)
+    for start in random_timestamps(100, seed=6, aligned=False):
+        end = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 3), seconds=rng.randrange(60))
+        stepped = legacy_trading_minutes(start, end)
+        actual = plain_calendar.trading_minutes_between(start, end)
+        sessions = session_closes_in_window(start, end) + 1
+        assert abs(stepped - actual) <= sessions, (start, end, actual, stepped)
+
+
+def test_vectorized_matches_scalar():
+    starts = list(random_timestamps(300, seed=7, aligned=False))
+    end = max(starts) - timedelta(days=20)
+    batch = asx_calendar.trading_minutes_many(starts, end)
+    for start, minutes in zip(starts, batch):
+        assert abs(minutes - asx_calendar.trading_minutes_between(start, end)) < 1e-6, start
+
+
+def test_vectorized_handles_dst_transitions():
+    # Naive Sydney times in the DST gap (5 Oct 2025 02:00-03:00) and the
+    # repeated hour (6 Apr 2025 02:00-03:00) resolve like the scalar path
+    starts = [
+        datetime(2025, 10, 5, 2, 30),
+        datetime(2025, 4, 6, 2, 30),
+        datetime(2025, 4, 6, 2, 0),
+    ]
+    end = AU_TZ.localize(datetime(2025, 10, 8, 12, 0))
+    batch = asx_calendar.trading_minutes_many(starts, end)
+    for start, minutes in zip(starts, batch):
+        assert not np.isnan(minutes), start
+        assert abs(minutes - asx_calendar.trading_minutes_between(start, end)) < 1e-6, start
+
+
+def test_holidays_and_early_closes():
+    # ASX 2025 trading calendar
+    assert set(asx_holidays(2025)) == {
+        date(2025, 1, 1), date(2025, 1, 27), date(2025, 4, 18), date(2025, 4, 21),
+        date(2025, 4, 25), date(2025, 6, 9), date(2025, 12, 25), date(2025, 12, 26),
+    }
+    good_friday = AU_TZ.localize(datetime(2025, 4, 18, 11, 0))
+    assert not asx_calendar.is_trading_hours(good_friday)
+    assert asx_calendar.is_trading_hours(AU_TZ.localize(datetime(2025, 12, 24, 14, 0)))
+    assert not asx_calendar.is_trading_hours(AU_TZ.localize(datetime(2025, 12, 24, 15, 0)))
+
+    # Thursday before Easter 2pm -> Tuesday after Easter 11am: 2h + 1h
+    start = AU_TZ.localize(datetime(2025, 4, 17, 14, 0))
+    end = AU_TZ.localize(datetime(2025, 4, 22, 11, 0))
+    assert asx_calendar.trading_minutes_between(start, end) == 180.0
+
+
+def run_benchmark():
+    """Time a position held over a long weekend, as check_position_exits sees it"""
+    entry = AU_TZ.localize(datetime(2025, 4, 17, 14, 0)).astimezone(pytz.UTC)
+    now = AU_TZ.localize(datetime(2025, 4, 22, 11, 0)).astimezone(pytz.UTC)
+
+    start = time.perf_counter()
+    legacy_trading_minutes(entry, now)
+    stepping_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        asx_calendar.trading_minutes_between(entry, now)
+    closed_form_time = (time.perf_counter() - start) / 1000
+
+    print(f"Minute stepping: {stepping_time * 1000:8.2f} ms")
+    print(f"Closed form:     {closed_form_time * 1000:8.3f} ms ({stepping_time / closed_form_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    print("🗓️ ASX TRADING CALENDAR TEST")
+    print("=" * 50)
+    tests = [
+        test_trading_hours_match_legacy,
+        test_trading_minutes_match_minute_stepping,
+        test_unaligned_timestamps_within_a_minute_per_session,
+        test_vectorized_matches_scalar,
+        test_vectorized_handles_dst_transitions,
+        test_holidays_and_early_closes,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    run_benchmark()
+    sys.exit(1 if failures else 0)
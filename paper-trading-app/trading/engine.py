@@ -13,6 +13,7 @@ import time
 
 from database.models import *
 from config import TRADING_CONFIG, RISK_CONFIG, MARKET_CONFIG
+from trading.order_book import OrderBook, PendingOrder, TRIGGERED_ORDER_TYPES, pending_orders_from_rows
 
 @dataclass
 class TradeResult:
@@ -24,6 +25,7 @@ class TradeResult:
     executed_quantity: Optional[int] = None
     commission: Optional[float] = None
     slippage: Optional[float] = None
+    order_id: Optional[int] = None
 
 class PaperTradingEngine:
     """Core paper trading engine for order execution and portfolio management"""
@@ -37,6 +39,12 @@ class PaperTradingEngine:
         self.price_cache = {}
         self.cache_expiry = {}
         
+        # Pending LIMIT/STOP_LOSS/TAKE_PROFIT orders, matched against quotes by process_quotes;
+        # other engines on the same database add orders, so new rows are picked up by id
+        self.order_book = OrderBook()
+        self._last_loaded_order_id = 0
+        self.load_pending_orders()
+        
     def get_current_price(self, symbol: str) -> Optional[float]:
         """Get current market price with caching"""
         try:
@@ -186,81 +194,92 @@ class PaperTradingEngine:
             if price is None:
                 return TradeResult(success=False, message=f"Could not get price for {symbol}")
             
-            # Calculate costs
-            trade_value = quantity * price
-            commission = self.calculate_commission(trade_value)
-            slippage_rate = self.calculate_slippage(symbol, quantity, "BUY")
-            slippage = trade_value * slippage_rate
-            
-            # Adjust price for slippage (buy at higher price)
-            executed_price = price * (1 + slippage_rate)
-            net_amount = quantity * executed_price + commission
-            
-            # Create trade record
-            trade = Trade(
-                account_id=self.account_id,
-                symbol=symbol,
-                side="BUY",
-                quantity=quantity,
-                price=executed_price,
-                total_value=quantity * executed_price,
-                commission=commission,
-                slippage=slippage,
-                net_amount=net_amount,
-                timestamp=datetime.utcnow(),
-                status="FILLED",
-                strategy_source=strategy_source,
-                confidence=confidence,
-                notes=notes
-            )
-            
-            self.session.add(trade)
-            
-            # Update account cash
-            account = self.session.query(Account).filter_by(id=self.account_id).first()
-            account.cash_balance -= net_amount
-            
-            # Update or create position
-            position = self.session.query(Position).filter_by(
-                account_id=self.account_id, symbol=symbol
-            ).first()
-            
-            if position:
-                # Update existing position
-                total_shares = position.quantity + quantity
-                total_cost = position.total_cost + net_amount
-                position.quantity = total_shares
-                position.avg_cost = total_cost / total_shares
-                position.total_cost = total_cost
-            else:
-                # Create new position
-                position = Position(
-                    account_id=self.account_id,
-                    symbol=symbol,
-                    quantity=quantity,
-                    avg_cost=executed_price,
-                    total_cost=net_amount,
-                    entry_date=datetime.utcnow()
-                )
-                self.session.add(position)
-            
+            trade, result = self._apply_buy(symbol, quantity, price, strategy_source, confidence, notes)
             self.session.commit()
             
-            return TradeResult(
-                success=True,
-                message=f"Bought {quantity} shares of {symbol} at ${executed_price:.2f}",
-                trade_id=trade.id,
-                executed_price=executed_price,
-                executed_quantity=quantity,
-                commission=commission,
-                slippage=slippage
-            )
+            result.trade_id = trade.id
+            return result
             
         except Exception as e:
             self.session.rollback()
             self.logger.error(f"Error executing buy order: {e}")
             return TradeResult(success=False, message=f"Execution error: {str(e)}")
     
+    def _apply_buy(self, symbol: str, quantity: int, price: float, strategy_source: str = None,
+                   confidence: float = None, notes: str = None,
+                   limit_price: float = None) -> Tuple[Trade, TradeResult]:
+        """Record a buy fill at the quoted price in the session, without committing"""
+        # Calculate costs
+        trade_value = quantity * price
+        commission = self.calculate_commission(trade_value)
+        slippage_rate = self.calculate_slippage(symbol, quantity, "BUY")
+        slippage = trade_value * slippage_rate
+        
+        # Adjust price for slippage (buy at higher price)
+        executed_price = price * (1 + slippage_rate)
+        if limit_price is not None and executed_price > limit_price:
+            # Limit orders never fill above their limit
+            executed_price = max(limit_price, price)
+            slippage = quantity * (executed_price - price)
+        net_amount = quantity * executed_price + commission
+        
+        # Create trade record
+        trade = Trade(
+            account_id=self.account_id,
+            symbol=symbol,
+            side="BUY",
+            quantity=quantity,
+            price=executed_price,
+            total_value=quantity * executed_price,
+            commission=commission,
+            slippage=slippage,
+            net_amount=net_amount,
+            timestamp=datetime.utcnow(),
+            status="FILLED",
+            strategy_source=strategy_source,
+            confidence=confidence,
+            notes=notes
+        )
+        
+        self.session.add(trade)
+        
+        # Update account cash
+        account = self.session.query(Account).filter_by(id=self.account_id).first()
+        account.cash_balance -= net_amount
+        
+        # Update or create position
+        position = self.session.query(Position).filter_by(
+            account_id=self.account_id, symbol=symbol
+        ).first()
+        
+        if position:
+            # Update existing position
+            total_shares = position.quantity + quantity
+            total_cost = position.total_cost + net_amount
+            position.quantity = total_shares
+            position.avg_cost = total_cost / total_shares
+            position.total_cost = total_cost
+        else:
+            # Create new position
+            position = Position(
+                account_id=self.account_id,
+                symbol=symbol,
+                quantity=quantity,
+                avg_cost=executed_price,
+                total_cost=net_amount,
+                entry_date=datetime.utcnow()
+            )
+            self.session.add(position)
+        
+        return trade, TradeResult(
+            success=True,
+            message=f"Bought {quantity} shares of {symbol} at ${executed_price:.2f}",
+            executed_price=executed_price,
+            executed_quantity=quantity,
+            commission=commission,
+            slippage=slippage
+        )
+    
     def execute_market_sell(self, symbol: str, quantity: int, strategy_source: str = None,
                            confidence: float = None, notes: str = None) -> TradeResult:
         """Execute a market sell order"""
@@ -275,78 +294,342 @@ class PaperTradingEngine:
             if price is None:
                 return TradeResult(success=False, message=f"Could not get price for {symbol}")
             
-            # Get position
-            position = self.session.query(Position).filter_by(
-                account_id=self.account_id, symbol=symbol
-            ).first()
-            
-            if not position or position.quantity < quantity:
-                return TradeResult(success=False, message="Insufficient position")
-            
-            # Calculate proceeds
-            trade_value = quantity * price
-            commission = self.calculate_commission(trade_value)
-            slippage_rate = self.calculate_slippage(symbol, quantity, "SELL")
-            slippage = trade_value * slippage_rate
-            
-            # Adjust price for slippage (sell at lower price)
-            executed_price = price * (1 - slippage_rate)
-            net_proceeds = quantity * executed_price - commission
+            trade, result = self._apply_sell(symbol, quantity, price, strategy_source, confidence, notes)
+            if trade is None:
+                return result
+            self.session.commit()
             
-            # Calculate P&L
-            avg_cost_for_shares = position.avg_cost * quantity
-            realized_pnl = net_proceeds - avg_cost_for_shares
+            result.trade_id = trade.id
+            return result
             
-            # Create trade record
-            trade = Trade(
+        except Exception as e:
+            self.session.rollback()
+            self.load_pending_orders()
+            self.logger.error(f"Error executing sell order: {e}")
+            return TradeResult(success=False, message=f"Execution error: {str(e)}")
+    
+    def _apply_sell(self, symbol: str, quantity: int, price: float, strategy_source: str = None,
+                    confidence: float = None, notes: str = None,
+                    limit_price: float = None) -> Tuple[Optional[Trade], TradeResult]:
+        """Record a sell fill at the quoted price in the session, without committing"""
+        # Get position
+        position = self.session.query(Position).filter_by(
+            account_id=self.account_id, symbol=symbol
+        ).first()
+        
+        if not position or position.quantity < quantity:
+            return None, TradeResult(success=False, message="Insufficient position")
+        
+        # Calculate proceeds
+        trade_value = quantity * price
+        commission = self.calculate_commission(trade_value)
+        slippage_rate = self.calculate_slippage(symbol, quantity, "SELL")
+        slippage = trade_value * slippage_rate
+        
+        # Adjust price for slippage (sell at lower price)
+        executed_price = price * (1 - slippage_rate)
+        if limit_price is not None and executed_price < limit_price:
+            # Limit and target orders never fill below their limit
+            executed_price = min(limit_price, price)
+            slippage = quantity * (price - executed_price)
+        net_proceeds = quantity * executed_price - commission
+        
+        # Calculate P&L
+        avg_cost_for_shares = position.avg_cost * quantity
+        realized_pnl = net_proceeds - avg_cost_for_shares
+        
+        # Create trade record
+        trade = Trade(
+            account_id=self.account_id,
+            symbol=symbol,
+            side="SELL",
+            quantity=quantity,
+            price=executed_price,
+            total_value=quantity * executed_price,
+            commission=commission,
+            slippage=slippage,
+            net_amount=net_proceeds,
+            timestamp=datetime.utcnow(),
+            status="FILLED",
+            pnl=realized_pnl,
+            strategy_source=strategy_source,
+            confidence=confidence,
+            notes=notes
+        )
+        
+        self.session.add(trade)
+        
+        # Update account cash
+        account = self.session.query(Account).filter_by(id=self.account_id).first()
+        account.cash_balance += net_proceeds
+        account.total_pnl += realized_pnl
+        
+        # Update position
+        position.quantity -= quantity
+        position.total_cost -= avg_cost_for_shares
+        
+        # Remove position if fully sold, along with its remaining stop/target orders
+        if position.quantity == 0:
+            self.session.delete(position)
+            self._cancel_exit_orders(symbol, "Position closed")
+        
+        return trade, TradeResult(
+            success=True,
+            message=f"Sold {quantity} shares of {symbol} at ${executed_price:.2f} (P&L: ${realized_pnl:+.2f})",
+            executed_price=executed_price,
+            executed_quantity=quantity,
+            commission=commission,
+            slippage=slippage
+        )
+    
+    def load_pending_orders(self):
+        """Rebuild the in-memory order book from PENDING rows in OrderHistory"""
+        self.order_book.clear()
+        self._last_loaded_order_id = 0
+        loaded = self._load_new_pending_orders()
+        if loaded:
+            self.logger.info(f"Loaded {loaded} pending orders")
+    
+    def _load_new_pending_orders(self) -> int:
+        """Add PENDING rows inserted since the last load, e.g. by another process"""
+        try:
+            rows = self.session.query(OrderHistory).filter(
+                OrderHistory.account_id == self.account_id,
+                OrderHistory.id > self._last_loaded_order_id,
+                OrderHistory.status == "PENDING",
+                OrderHistory.order_type.in_(TRIGGERED_ORDER_TYPES)
+            ).order_by(OrderHistory.id).all()
+            
+            orders = pending_orders_from_rows(rows)
+            for order in orders:
+                self.order_book.add(order)
+            if rows:
+                self._last_loaded_order_id = rows[-1].id
+            return len(orders)
+                
+        except Exception as e:
+            self.logger.error(f"Error loading pending orders: {e}")
+            return 0
+    
+    def _claim_order(self, order_id: int, status: str) -> bool:
+        """Move a PENDING order to status in one conditional UPDATE, without committing
+        
+        Returns False if the order is no longer PENDING, e.g. because another
+        engine on the same database has already filled or cancelled it.
+        """
+        claimed = self.session.query(OrderHistory).filter(
+            OrderHistory.id == order_id,
+            OrderHistory.status == "PENDING"
+        ).update({OrderHistory.status: status}, synchronize_session=False)
+        return claimed == 1
+    
+    def place_order(self, symbol: str, side: str, order_type: str, quantity: int, trigger_price: float,
+                    strategy_source: str = None, confidence: float = None, notes: str = None) -> TradeResult:
+        """Place a pending LIMIT, STOP_LOSS or TAKE_PROFIT order
+        
+        LIMIT buys fill once the price falls to the trigger and LIMIT sells once it
+        rises to it; sell STOP_LOSS orders fill on a fall and TAKE_PROFIT orders on a
+        rise. Orders are filled by process_quotes.
+        """
+        side = side.upper()
+        order_type = order_type.upper()
+        
+        if side not in ("BUY", "SELL"):
+            return TradeResult(success=False, message=f"Invalid side: {side}")
+        if order_type not in TRIGGERED_ORDER_TYPES:
+            return TradeResult(success=False, message=f"Invalid order type: {order_type}")
+        if quantity <= 0 or trigger_price is None or trigger_price <= 0:
+            return TradeResult(success=False, message="Quantity and trigger price must be positive")
+        
+        try:
+            order = OrderHistory(
                 account_id=self.account_id,
                 symbol=symbol,
-                side="SELL",
+                order_type=order_type,
+                side=side,
                 quantity=quantity,
-                price=executed_price,
-                total_value=quantity * executed_price,
-                commission=commission,
-                slippage=slippage,
-                net_amount=net_proceeds,
-                timestamp=datetime.utcnow(),
-                status="FILLED",
-                pnl=realized_pnl,
+                target_price=None if order_type == "STOP_LOSS" else trigger_price,
+                stop_price=trigger_price if order_type == "STOP_LOSS" else None,
+                status="PENDING",
+                created_at=datetime.utcnow(),
                 strategy_source=strategy_source,
                 confidence=confidence,
                 notes=notes
             )
+            self.session.add(order)
+            self.session.commit()
             
-            self.session.add(trade)
+            self._last_loaded_order_id = max(self._last_loaded_order_id, order.id)
+            self.order_book.add(PendingOrder(
+                order_id=order.id,
+                symbol=symbol,
+                side=side,
+                order_type=order_type,
+                quantity=quantity,
+                trigger_price=trigger_price
+            ))
             
-            # Update account cash
-            account = self.session.query(Account).filter_by(id=self.account_id).first()
-            account.cash_balance += net_proceeds
-            account.total_pnl += realized_pnl
+            return TradeResult(
+                success=True,
+                message=f"Placed {order_type} {side} {quantity} {symbol} @ ${trigger_price:.2f}",
+                order_id=order.id
+            )
+            
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Error placing order: {e}")
+            return TradeResult(success=False, message=f"Order error: {str(e)}")
+    
+    def place_exit_orders(self, symbol: str, stop_price: float = None, target_price: float = None,
+                          strategy_source: str = None, notes: str = None) -> List[TradeResult]:
+        """Replace a position's stop-loss and take-profit with new exit orders
+        
+        The exits are one-cancels-other: when one fills the other is cancelled.
+        """
+        position = self.session.query(Position).filter_by(
+            account_id=self.account_id, symbol=symbol
+        ).first()
+        if not position:
+            return [TradeResult(success=False, message=f"No position in {symbol}")]
+        
+        try:
+            self._load_new_pending_orders()
+            self._cancel_exit_orders(symbol, "Replaced by new exit orders")
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.load_pending_orders()
+            self.logger.error(f"Error replacing exit orders: {e}")
+            return [TradeResult(success=False, message=f"Order error: {str(e)}")]
+        
+        results = []
+        if stop_price is not None:
+            results.append(self.place_order(symbol, "SELL", "STOP_LOSS", position.quantity, stop_price,
+                                            strategy_source=strategy_source, notes=notes))
+        if target_price is not None:
+            results.append(self.place_order(symbol, "SELL", "TAKE_PROFIT", position.quantity, target_price,
+                                            strategy_source=strategy_source, notes=notes))
+        return results
+    
+    def cancel_order(self, order_id: int) -> bool:
+        """Cancel a pending order"""
+        try:
+            order = self.session.query(OrderHistory).filter_by(
+                id=order_id, account_id=self.account_id, status="PENDING"
+            ).first()
+            if not order or not self._claim_order(order_id, "CANCELLED"):
+                self.session.rollback()
+                self.order_book.cancel(order_id)
+                return False
+            
+            order.status = "CANCELLED"
+            self.session.commit()
+            self.order_book.cancel(order_id)
+            return True
             
-            # Update position
-            position.quantity -= quantity
-            position.total_cost -= avg_cost_for_shares
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Error cancelling order {order_id}: {e}")
+            return False
+    
+    def _cancel_exit_orders(self, symbol: str, reason: str):
+        """Cancel pending stop/target orders for a symbol in the session, without committing"""
+        for pending in self.order_book.cancel_exits(symbol):
+            order = self.session.query(OrderHistory).filter_by(id=pending.order_id).first()
+            if order is not None and self._claim_order(pending.order_id, "CANCELLED"):
+                order.status = "CANCELLED"
+                order.notes = f"{order.notes}; {reason}" if order.notes else reason
+    
+    def process_quotes(self, quotes: Optional[Dict[str, float]] = None) -> List[TradeResult]:
+        """Fill pending orders triggered by the latest quotes
+        
+        Only the orders a quote triggers are touched, found through the order
+        book's price-sorted heaps, so this replaces scanning every position for
+        stop/target exits. All fills from one batch of quotes are written to
+        Trade and OrderHistory in a single transaction.
+        
+        Args:
+            quotes: {symbol: price}; fetched for symbols with pending orders if omitted
+        """
+        self._load_new_pending_orders()
+        if not len(self.order_book):
+            return []
+        
+        if quotes is None:
+            quotes = {symbol: self.get_current_price(symbol) for symbol in self.order_book.symbols()}
+        
+        triggered, cancelled = self.order_book.match_quotes(quotes)
+        if not triggered and not cancelled:
+            return []
+        
+        try:
+            order_ids = [order.order_id for order in triggered + cancelled]
+            rows = {
+                row.id: row for row in self.session.query(OrderHistory).filter(
+                    OrderHistory.id.in_(order_ids)
+                ).all()
+            }
             
-            # Remove position if fully sold
-            if position.quantity == 0:
-                self.session.delete(position)
+            for pending in cancelled:
+                row = rows.get(pending.order_id)
+                if row is not None and self._claim_order(row.id, "CANCELLED"):
+                    row.status = "CANCELLED"
+                    row.notes = f"{row.notes}; Other exit triggered" if row.notes else "Other exit triggered"
+            
+            fills = []
+            for pending in triggered:
+                row = rows.get(pending.order_id)
+                # The claim decides between engines sharing the database; the loser skips the order
+                if row is None or not self._claim_order(row.id, "FILLED"):
+                    continue
+                
+                trade, result = self._fill_order(pending, row, quotes[pending.symbol])
+                if trade is None:
+                    row.status = "CANCELLED"
+                    row.notes = f"{row.notes}; {result.message}" if row.notes else result.message
+                else:
+                    row.status = "FILLED"
+                    row.filled_at = datetime.utcnow()
+                    row.filled_price = result.executed_price
+                    row.filled_quantity = (row.filled_quantity or 0) + result.executed_quantity
+                result.order_id = row.id
+                fills.append((trade, result))
             
             self.session.commit()
             
-            return TradeResult(
-                success=True,
-                message=f"Sold {quantity} shares of {symbol} at ${executed_price:.2f} (P&L: ${realized_pnl:+.2f})",
-                trade_id=trade.id,
-                executed_price=executed_price,
-                executed_quantity=quantity,
-                commission=commission,
-                slippage=slippage
-            )
+            for trade, result in fills:
+                if trade is not None:
+                    result.trade_id = trade.id
+            return [result for _, result in fills]
             
         except Exception as e:
             self.session.rollback()
-            self.logger.error(f"Error executing sell order: {e}")
-            return TradeResult(success=False, message=f"Execution error: {str(e)}")
+            self.load_pending_orders()
+            self.logger.error(f"Error processing triggered orders: {e}")
+            return [TradeResult(success=False, message=f"Execution error: {str(e)}")]
+    
+    def _fill_order(self, pending: PendingOrder, order: OrderHistory, price: float) -> Tuple[Optional[Trade], TradeResult]:
+        """Apply the fill of a triggered order to the session"""
+        limit_price = None
+        if pending.order_type == "LIMIT" or (pending.order_type == "TAKE_PROFIT" and pending.side == "SELL"):
+            limit_price = pending.trigger_price
+        
+        if pending.side == "BUY":
+            valid, message = self.validate_trade(pending.symbol, "BUY", pending.quantity, price)
+            if not valid:
+                return None, TradeResult(success=False, message=message)
+            return self._apply_buy(pending.symbol, pending.quantity, price, order.strategy_source,
+                                   order.confidence, order.notes, limit_price=limit_price)
+        
+        # Sells close at most what is still held; exits are not subject to the daily loss limit
+        position = self.session.query(Position).filter_by(
+            account_id=self.account_id, symbol=pending.symbol
+        ).first()
+        quantity = min(pending.quantity, position.quantity) if position else 0
+        if quantity <= 0:
+            return None, TradeResult(success=False, message=f"No {pending.symbol} position to sell")
+        return self._apply_sell(pending.symbol, quantity, price, order.strategy_source,
+                                order.confidence, order.notes, limit_price=limit_price)
     
     def update_portfolio_values(self):
         """Update current market values for all positions"""
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+ASX Trading Calendar
+Session boundaries, public holidays and closed-form trading-minute arithmetic
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+SYDNEY_TZ = pytz.timezone('Australia/Sydney')
+
+# Regular session and the cut-off for opening new positions (local Sydney time)
+SESSION_OPEN = time(10, 0)
+SESSION_CLOSE = time(16, 0)
+POSITION_CUTOFF = time(15, 15)
+
+# Christmas Eve and New Year's Eve close early when they fall on a trading day
+EARLY_CLOSE = time(14, 10)
+
+# One-off market closures not covered by the recurring holiday rules
+ADDITIONAL_CLOSURES = {
+    date(2022, 9, 22): 'National Day of Mourning',
+}
+
+
+def _minute_of_day(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+OPEN_MINUTE = _minute_of_day(SESSION_OPEN)
+SESSION_MINUTES = _minute_of_day(SESSION_CLOSE) - OPEN_MINUTE
+EARLY_CLOSE_MINUTES = _minute_of_day(EARLY_CLOSE) - OPEN_MINUTE
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _next_monday_if_weekend(day: date) -> date:
+    if day.weekday() >= 5:
+        return day + timedelta(days=7 - day.weekday())
+    return day
+
+
+@lru_cache(maxsize=64)
+def asx_holidays(year: int) -> Dict[date, str]:
+    """ASX market holidays for a year, with weekend holidays moved to their observed day"""
+    easter = easter_sunday(year)
+    june_first = date(year, 6, 1)
+    second_monday_june = june_first + timedelta(days=(7 - june_first.weekday()) % 7 + 7)
+
+    holidays = {
+        _next_monday_if_weekend(date(year, 1, 1)): "New Year's Day",
+        _next_monday_if_weekend(date(year, 1, 26)): 'Australia Day',
+        easter - timedelta(days=2): 'Good Friday',
+        easter + timedelta(days=1): 'Easter Monday',
+        second_monday_june: "King's Birthday",
+    }
+
+    # Anzac Day has no substitute holiday on the ASX
+    anzac_day = date(year, 4, 25)
+    if anzac_day.weekday() < 5:
+        holidays[anzac_day] = 'Anzac Day'
+
+    christmas = date(year, 12, 25)
+    boxing_day = date(year, 12, 26)
+    if christmas.weekday() == 5:        # Saturday: observed Mon 27 and Tue 28
+        holidays[date(year, 12, 27)] = 'Christmas Day'
+        holidays[date(year, 12, 28)] = 'Boxing Day'
+    elif christmas.weekday() == 6:      # Sunday: Boxing Day Mon 26, Christmas Tue 27
+        holidays[boxing_day] = 'Boxing Day'
+        holidays[date(year, 12, 27)] = 'Christmas Day'
+    elif christmas.weekday() == 4:      # Friday: Boxing Day observed Mon 28
+        holidays[christmas] = 'Christmas Day'
+        holidays[date(year, 12, 28)] = 'Boxing Day'
+    else:
+        holidays[christmas] = 'Christmas Day'
+        holidays[boxing_day] = 'Boxing Day'
+
+    for closure, name in ADDITIONAL_CLOSURES.items():
+        if closure.year == year:
+            holidays[closure] = name
+
+    return holidays
+
+
+class ASXTradingCalendar:
+    """
+    ASX trading calendar in Australia/Sydney local time.
+
+    Trading minutes between two timestamps are computed arithmetically: whole
+    trading days come from numpy's business-day count (weekends and holidays
+    excluded) and only the first and last day need their partial sessions
+    clipped. Sessions sit well clear of the 2-3am DST transitions, so wall-clock
+    arithmetic inside a session is exact. Naive datetimes are taken to be
+    Sydney local time.
+    """
+
+    def __init__(self, include_holidays: bool = True, include_early_closes: bool = True):
+        """
+        Initialize the ASXTradingCalendar.
+
+        Args:
+            include_holidays: Treat ASX public holidays as closed days.
+            include_early_closes: Close at 2:10pm on Christmas Eve and New Year's Eve.
+        """
+        self.include_holidays = include_holidays
+        self.include_early_closes = include_early_closes
+
+    def is_holiday(self, day: date) -> bool:
+        """ASX public holiday or one-off closure"""
+        return self.include_holidays and day in asx_holidays(day.year)
+
+    def is_trading_day(self, day: date) -> bool:
+        """Weekday that is not an ASX holiday"""
+        return day.weekday() < 5 and not self.is_holiday(day)
+
+    def session_minutes(self, day: date) -> int:
+        """Length of the session on a day in minutes (0 when the market is closed)"""
+        if not self.is_trading_day(day):
+            return 0
+        if self._is_early_close(day):
+            return EARLY_CLOSE_MINUTES
+        return SESSION_MINUTES
+
+    def session_bounds(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """Localized (open, close) for a day, or None when the market is closed"""
+        minutes = self.session_minutes(day)
+        if not minutes:
+            return None
+        open_time = SYDNEY_TZ.localize(datetime.combine(day, SESSION_OPEN))
+        return open_time, open_time + timedelta(minutes=minutes)
+
+    def next_session_open(self, dt: datetime) -> datetime:
+        """The first session open strictly after dt"""
+        local = self.to_local(dt)
+        day = local.date()
+        if local.time() >= SESSION_OPEN:
+            day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return SYDNEY_TZ.localize(datetime.combine(day, SESSION_OPEN))
+
+    def is_trading_hours(self, dt: datetime) -> bool:
+        """Market open at dt (session open to close, both inclusive)"""
+        local = self.to_local(dt)
+        minutes = self.session_minutes(local.date())
+        offset = self._minutes_since_open(local)
+        return minutes > 0 and 0 <= offset <= minutes
+
+    def is_position_opening_hours(self, dt: datetime) -> bool:
+        """New positions allowed at dt (session open until the 3:15pm cut-off)"""
+        local = self.to_local(dt)
+        minutes = self.session_minutes(local.date())
+        cutoff = min(minutes, _minute_of_day(POSITION_CUTOFF) - OPEN_MINUTE)
+        offset = self._minutes_since_open(local)
+        return minutes > 0 and 0 <= offset < cutoff
+
+    def trading_minutes_between(self, start: datetime, end: datetime) -> float:
+        """Minutes of open market between start and end (0 when end <= start)"""
+        start_local = self.to_local(start)
+        end_local = self.to_local(end)
+        if end_local <= start_local:
+            return 0.0
+
+        start_day = start_local.date()
+        end_day = end_local.date()
+
+        holidays = self._holiday_array(start_day.year, end_day.year)
+        full_days = int(np.busday_count(start_day, end_day, holidays=holidays))
+        early_closes = self._early_closes_between(
+            np.datetime64(start_day, 'D'), np.datetime64(end_day, 'D'), start_day.year, end_day.year
+        )
+
+        # Whole sessions on [start_day, end_day), minus what had elapsed on the
+        # start day, plus what has elapsed on the end day
+        total = full_days * SESSION_MINUTES - early_closes * (SESSION_MINUTES - EARLY_CLOSE_MINUTES)
+        total -= self._elapsed_session_minutes(start_local)
+        total += self._elapsed_session_minutes(end_local)
+        return float(total)
+
+    def trading_minutes_many(self, starts: Iterable[datetime], end: datetime) -> np.ndarray:
+        """
+        Vectorized trading_minutes_between for many start times sharing one end time.
+
+        Args:
+            starts: Entry timestamps (aware, or naive Sydney local time).
+            end: The common end timestamp, e.g. now.
+
+        Returns:
+            Float array of trading minutes, one per start (0 where start >= end).
+        """
+        starts = list(starts)
+        if not starts:
+            return np.zeros(0)
+
+        local_starts = pd.DatetimeIndex(starts)
+        if local_starts.tz is None:
+            # Resolve DST gaps and overlaps like to_local (pytz is_dst=False): gap times
+            # keep the standard offset, i.e. move an hour forward, and repeated times
+            # take the standard-time occurrence
+            local_starts = local_starts.tz_localize(
+                SYDNEY_TZ,
+                nonexistent=pd.Timedelta(hours=1),
+                ambiguous=np.zeros(len(local_starts), dtype=bool)
+            )
+        else:
+            local_starts = local_starts.tz_convert(SYDNEY_TZ)
+        end_local = pd.Timestamp(self.to_local(end)).tz_convert(SYDNEY_TZ)
+
+        start_days = local_starts.tz_localize(None).normalize().values.astype('datetime64[D]')
+        end_day = np.datetime64(end_local.date(), 'D')
+        first_year = min(int(start_days.min().astype(object).year), end_local.year)
+        last_year = max(int(start_days.max().astype(object).year), end_local.year)
+
+        holidays = self._holiday_array(first_year, last_year)
+        full_days = np.busday_count(start_days, end_day, holidays=holidays)
+        early_closes = self._early_closes_between(start_days, end_day, first_year, last_year)
+
+        start_minutes = (local_starts.hour * 60 + local_starts.minute
+                         + local_starts.second / 60 + local_starts.microsecond / 60_000_000).to_numpy()
+        session_lengths = np.where(
+            np.isin(start_days, self._early_close_array(first_year, last_year)),
+            EARLY_CLOSE_MINUTES, SESSION_MINUTES
+        ) * np.is_busday(start_days, holidays=holidays)
+        elapsed_start = np.clip(start_minutes - OPEN_MINUTE, 0, session_lengths)
+
+        total = (full_days * SESSION_MINUTES
+                 - early_closes * (SESSION_MINUTES - EARLY_CLOSE_MINUTES)
+                 - elapsed_start
+                 + self._elapsed_session_minutes(end_local.to_pydatetime()))
+
+        ends_after_start = local_starts < end_local
+        return np.where(ends_after_start, total, 0.0).astype(float)
+
+    @staticmethod
+    def to_local(dt: datetime) -> datetime:
+        """Convert to Sydney time; naive datetimes are assumed to already be Sydney time"""
+        if dt.tzinfo is None:
+            return SYDNEY_TZ.localize(dt)
+        return dt.astimezone(SYDNEY_TZ)
+
+    @staticmethod
+    def _minutes_since_open(local: datetime) -> float:
+        return (local.hour * 60 + local.minute + local.second / 60
+                + local.microsecond / 60_000_000 - OPEN_MINUTE)
+
+    def _elapsed_session_minutes(self, local: datetime) -> float:
+        """Minutes of the day's session that have passed by local time"""
+        minutes = self.session_minutes(local.date())
+        return min(max(self._minutes_since_open(local), 0.0), float(minutes))
+
+    def _is_early_close(self, day: date) -> bool:
+        return self.include_early_closes and (day.month, day.day) in ((12, 24), (12, 31))
+
+    def _holiday_array(self, first_year: int, last_year: int) -> np.ndarray:
+        if not self.include_holidays:
+            return np.array([], dtype='datetime64[D]')
+        return _holidays_for_years(first_year, last_year)
+
+    def _early_close_array(self, first_year: int, last_year: int) -> np.ndarray:
+        if not self.include_early_closes:
+            return np.array([], dtype='datetime64[D]')
+        days = [date(year, 12, month_day)
+                for year in range(first_year, last_year + 1) for month_day in (24, 31)]
+        return np.array([d for d in days if self.is_trading_day(d)], dtype='datetime64[D]')
+
+    def _early_closes_between(self, start_days, end_day, first_year: int, last_year: int):
+        """Early-close trading days in [start_day, end_day)"""
+        early = self._early_close_array(first_year, last_year)
+        return np.searchsorted(early, end_day) - np.searchsorted(early, start_days)
+
+
+@lru_cache(maxsize=32)
+def _holidays_for_years(first_year: int, last_year: int) -> np.ndarray:
+    """Sorted holiday dates across a range of years, in numpy's busday format"""
+    days = sorted(
+        day for year in range(first_year, last_year + 1) for day in asx_holidays(year)
+    )
+    return np.array(days, dtype='datetime64[D]')
+
+
+# Shared default calendar
+asx_calendar = ASXTradingCalendar()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+In-memory order book of pending price-triggered orders
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Order types that wait for a trigger price
+TRIGGERED_ORDER_TYPES = ('LIMIT', 'STOP_LOSS', 'TAKE_PROFIT')
+
+# Sell-side orders that close a position; they are one-cancels-other per symbol
+EXIT_ORDER_TYPES = ('STOP_LOSS', 'TAKE_PROFIT')
+
+@dataclass
+class PendingOrder:
+    """A pending order waiting for its trigger price"""
+    order_id: int
+    symbol: str
+    side: str                   # BUY, SELL
+    order_type: str             # LIMIT, STOP_LOSS, TAKE_PROFIT
+    quantity: int
+    trigger_price: float
+    
+    @property
+    def triggers_on_rise(self) -> bool:
+        """True if the order fires once the price rises to its trigger, False if it fires on a fall"""
+        if self.order_type == 'LIMIT':
+            # Buy at or below the limit, sell at or above it
+            return self.side == 'SELL'
+        if self.order_type == 'TAKE_PROFIT':
+            return self.side == 'SELL'
+        # STOP_LOSS: sell stops fire on a fall, buy stops on a rise
+        return self.side == 'BUY'
+    
+    @property
+    def is_exit(self) -> bool:
+        """True for stop/target orders that close a long position"""
+        return self.side == 'SELL' and self.order_type in EXIT_ORDER_TYPES
+    
+    def is_triggered(self, price: float) -> bool:
+        """Check whether a quote reaches this order's trigger price"""
+        if self.triggers_on_rise:
+            return price >= self.trigger_price
+        return price <= self.trigger_price
+
+class SymbolOrderBook:
+    """
+    Pending orders for one symbol, kept in two heaps of trigger prices.
+    
+    Orders that fire on a rising price sit in a min-heap, orders that fire on
+    a falling price in a max-heap, so a quote only inspects the heap tops:
+    matching costs O(log n) per triggered order instead of a scan of every
+    pending order. Cancelled orders are dropped lazily when they surface.
+    """
+    
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._rise: List[Tuple[float, int, int]] = []   # (trigger, seq, order_id)
+        self._fall: List[Tuple[float, int, int]] = []   # (-trigger, seq, order_id)
+        self._orders: Dict[int, PendingOrder] = {}
+        self._seq = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._orders)
+    
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self._orders
+    
+    def orders(self) -> List[PendingOrder]:
+        """Live pending orders"""
+        return list(self._orders.values())
+    
+    def add(self, order: PendingOrder):
+        """Add a pending order"""
+        self._orders[order.order_id] = order
+        # seq keeps orders at the same trigger price in arrival order
+        if order.triggers_on_rise:
+            heapq.heappush(self._rise, (order.trigger_price, next(self._seq), order.order_id))
+        else:
+            heapq.heappush(self._fall, (-order.trigger_price, next(self._seq), order.order_id))
+    
+    def cancel(self, order_id: int) -> Optional[PendingOrder]:
+        """Remove a pending order, returning it if it was live"""
+        return self._orders.pop(order_id, None)
+    
+    def match(self, price: float) -> List[PendingOrder]:
+        """Remove and return every order the quote triggers, in trigger order"""
+        triggered = []
+        
+        while self._rise and self._rise[0][0] <= price:
+            _, _, order_id = heapq.heappop(self._rise)
+            order = self._orders.pop(order_id, None)
+            if order is not None:
+                triggered.append(order)
+        
+        while self._fall and -self._fall[0][0] >= price:
+            _, _, order_id = heapq.heappop(self._fall)
+            order = self._orders.pop(order_id, None)
+            if order is not None:
+                triggered.append(order)
+        
+        self._compact()
+        return triggered
+    
+    def _compact(self):
+        # Rebuild the heaps once cancelled entries dominate them
+        if len(self._rise) + len(self._fall) > 2 * len(self._orders) + 64:
+            self._rise = [entry for entry in self._rise if entry[2] in self._orders]
+            self._fall = [entry for entry in self._fall if entry[2] in self._orders]
+            heapq.heapify(self._rise)
+            heapq.heapify(self._fall)
+
+class OrderBook:
+    """
+    Pending orders for all symbols.
+    
+    Exit orders (sell STOP_LOSS/TAKE_PROFIT) on the same symbol are
+    one-cancels-other: when one is triggered the others are cancelled.
+    """
+    
+    def __init__(self):
+        self.books: Dict[str, SymbolOrderBook] = {}
+        self._symbol_of: Dict[int, str] = {}
+    
+    def __len__(self) -> int:
+        return len(self._symbol_of)
+    
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self._symbol_of
+    
+    def symbols(self) -> List[str]:
+        """Symbols with pending orders"""
+        return [symbol for symbol, book in self.books.items() if len(book)]
+    
+    def orders(self, symbol: Optional[str] = None) -> List[PendingOrder]:
+        """Live pending orders, optionally for one symbol"""
+        if symbol is not None:
+            book = self.books.get(symbol)
+            return book.orders() if book else []
+        return [order for book in self.books.values() for order in book.orders()]
+    
+    def add(self, order: PendingOrder):
+        """Add a pending order"""
+        if order.order_type not in TRIGGERED_ORDER_TYPES:
+            raise ValueError(f"Order type {order.order_type} has no trigger price")
+        if order.order_id in self._symbol_of:
+            self.cancel(order.order_id)
+        self.books.setdefault(order.symbol, SymbolOrderBook(order.symbol)).add(order)
+        self._symbol_of[order.order_id] = order.symbol
+    
+    def cancel(self, order_id: int) -> Optional[PendingOrder]:
+        """Cancel a pending order, returning it if it was live"""
+        symbol = self._symbol_of.pop(order_id, None)
+        if symbol is None:
+            return None
+        return self.books[symbol].cancel(order_id)
+    
+    def cancel_exits(self, symbol: str) -> List[PendingOrder]:
+        """Cancel every pending exit order on a symbol"""
+        return [self.cancel(order.order_id) for order in self.orders(symbol) if order.is_exit]
+    
+    def clear(self):
+        """Drop all pending orders"""
+        self.books.clear()
+        self._symbol_of.clear()
+    
+    def match(self, symbol: str, price: float) -> Tuple[List[PendingOrder], List[PendingOrder]]:
+        """
+        Match a quote against a symbol's pending orders.
+
+        Returns:
+            (triggered orders, exit orders cancelled because a sibling exit triggered)
+        """
+        book = self.books.get(symbol)
+        if book is None or not len(book):
+            return [], []
+        
+        triggered, cancelled = [], []
+        exit_taken = False
+        for order in book.match(price):
+            self._symbol_of.pop(order.order_id, None)
+            if order.is_exit:
+                # Only the first exit triggered by this quote closes the position
+                if exit_taken:
+                    cancelled.append(order)
+                    continue
+                exit_taken = True
+            triggered.append(order)
+        
+        if exit_taken:
+            cancelled.extend(self.cancel_exits(symbol))
+        return triggered, cancelled
+    
+    def match_quotes(self, quotes: Dict[str, float]) -> Tuple[List[PendingOrder], List[PendingOrder]]:
+        """Match a batch of {symbol: price} quotes"""
+        triggered, cancelled = [], []
+        for symbol, price in quotes.items():
+            if price is None:
+                continue
+            symbol_triggered, symbol_cancelled = self.match(symbol, price)
+            triggered.extend(symbol_triggered)
+            cancelled.extend(symbol_cancelled)
+        return triggered, cancelled
+
+def pending_orders_from_rows(rows: Iterable) -> List[PendingOrder]:
+    """Build pending orders from OrderHistory rows, skipping rows without a trigger price"""
+    orders = []
+    for row in rows:
+        trigger_price = row.stop_price if row.order_type == 'STOP_LOSS' else row.target_price
+        if trigger_price is None:
+            trigger_price = row.target_price if row.target_price is not None else row.stop_price
+        if trigger_price is None or row.order_type not in TRIGGERED_ORDER_TYPES:
+            continue
+        orders.append(PendingOrder(
+            order_id=row.id,
+            symbol=row.symbol,
+            side=row.side.upper(),
+            order_type=row.order_type,
+            quantity=row.quantity - (row.filled_quantity or 0),
+            trigger_price=trigger_price
+        ))
+    return orders
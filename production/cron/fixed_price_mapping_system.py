@@ -10,6 +10,20 @@ import json
 import re
 from collections import defaultdict
 import hashlib
+import os
+import sys
+
+# Cron runs this file directly, so put the repository root on the path for app imports
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+try:
+    from app.core.data.prediction_feed import publish_saved_predictions
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError as e:
+    PREDICTION_FEED_AVAILABLE = False
+    print(f"⚠️ Prediction feed not available, new predictions will not be published: {e}")
 
 def add_noise_to_prevent_duplicates(base_value, symbol, component):
     """Add deterministic but varied noise to prevent exact duplicates"""
@@ -507,6 +521,13 @@ def save_enhanced_prediction(analysis, validation_results):
         conn.commit()
         conn.close()
         
+        # Wake the paper-trading services instead of waiting for their next poll
+        if PREDICTION_FEED_AVAILABLE:
+            try:
+                publish_saved_predictions('predictions.db', [prediction_id])
+            except Exception as e:
+                print(f"⚠️ Prediction feed publish failed for {analysis['symbol']}: {e}")
+        
         # Enhanced verification logging
         validation_status = "✅ VALIDATED" if analysis.get('validation_meta', {}).get('validation') == 'passed' else "⚠️ MODIFIED"
         print(f"{validation_status} {analysis['symbol']}: {analysis['action']} ({analysis['confidence']:.1%}) @ ${analysis['price']:.2f}")
@@ -8,9 +8,22 @@ import json
 import uuid
 from datetime import datetime
 import yfinance as yf
+import os
 import sys
 import signal
 
+# Put the repository root on the path for app imports
+repo_root = os.path.dirname(os.path.abspath(__file__))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+try:
+    from app.core.data.prediction_feed import publish_saved_predictions
+    PREDICTION_FEED_AVAILABLE = True
+except ImportError as e:
+    PREDICTION_FEED_AVAILABLE = False
+    print(f"⚠️ Prediction feed not available, new predictions will not be published: {e}")
+
 # Set up timeout handler
 def timeout_handler(signum, frame):
     print("❌ Script timed out!")
@@ -33,6 +46,7 @@ def quick_prediction():
         cursor = conn.cursor()
         
         predictions_made = 0
+        saved_ids = []
         
         for symbol in symbols:
             try:
@@ -89,6 +103,7 @@ def quick_prediction():
                 ))
                 
                 predictions_made += 1
+                saved_ids.append(prediction_id)
                 print(f"✅ {symbol}: {action} (conf: {confidence:.2f}, price: ${current_price:.2f})")
                 
             except Exception as e:
@@ -98,6 +113,12 @@ def quick_prediction():
         conn.commit()
         conn.close()
         
+        if PREDICTION_FEED_AVAILABLE:
+            try:
+                publish_saved_predictions(db_path, saved_ids)
+            except Exception as e:
+                print(f"⚠️ Prediction feed publish failed: {e}")
+        
         print(f"🎯 Generated {predictions_made} quick predictions!")
         return predictions_made
         
@@ -26,7 +26,8 @@ logger = logging.getLogger(__name__)
 class RealisticTradingSimulator:
     """Simulates realistic trading based on ML predictions with proper constraints"""
     
-    def __init__(self, db_path="predictions.db", initial_capital=100000):
+    def __init__(self, db_path="predictions.db", initial_capital=100000,
+                 minute_cache_dir="data/minute_bar_cache"):
         self.db_path = Path(db_path)
         self.initial_capital = initial_capital
         self.trade_amount = 15000  # $15,000 per trade
@@ -48,6 +49,11 @@ class RealisticTradingSimulator:
         self.portfolio_value = initial_capital
         self.cash_available = initial_capital
         
+        # Minute bars are downloaded once per (symbol, day); completed days are
+        # also kept on disk so re-running a simulation needs no downloads
+        self.minute_cache_dir = Path(minute_cache_dir) if minute_cache_dir else None
+        self._minute_bars = {}  # (symbol, date) -> (UTC times, closes) or None
+        
         logger.info(f"Initialized trading simulator with ${initial_capital:,} capital")
         logger.info(f"Trade size: ${self.trade_amount:,} per position")
         logger.info(f"Minimum confidence: {self.min_confidence:.1%}")
@@ -131,42 +137,100 @@ class RealisticTradingSimulator:
             logger.error(f"Error loading predictions: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _to_utc_naive(timestamp: datetime) -> datetime:
+        """Naive UTC datetime (naive inputs are already UTC)"""
+        if timestamp.tzinfo is not None:
+            return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
+    
+    def get_minute_bars(self, symbol: str, day) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        1-minute bars for one symbol and day, downloaded at most once.
+        
+        Returns:
+            (bar times as naive UTC datetime64, close prices), or None when
+            yfinance has no data for that day.
+        """
+        key = (symbol, day)
+        if key in self._minute_bars:
+            return self._minute_bars[key]
+        
+        cache_file = None
+        if self.minute_cache_dir is not None:
+            cache_file = self.minute_cache_dir / f"{symbol}_{day.isoformat()}.npz"
+            if cache_file.exists():
+                with np.load(cache_file) as cached:
+                    bars = (cached['times'], cached['closes']) if len(cached['times']) else None
+                self._minute_bars[key] = bars
+                return bars
+        
+        try:
+            ticker = yf.Ticker(symbol)
+            hist = ticker.history(start=day, end=day + timedelta(days=1), interval='1m')
+        except Exception as e:
+            logger.error(f"Error downloading minute bars for {symbol} on {day}: {e}")
+            return None
+        
+        if hist.empty:
+            bars = None
+            times = np.array([], dtype='datetime64[ns]')
+            closes = np.array([], dtype=float)
+        else:
+            # Bars come in exchange time; compare against UTC prediction times
+            index = hist.index.tz_convert('UTC').tz_localize(None) if hist.index.tz is not None else hist.index
+            times = index.values.astype('datetime64[ns]')
+            closes = hist['Close'].to_numpy(dtype=float)
+            bars = (times, closes)
+        
+        # Only completed days are final; today's bars are still growing
+        if cache_file is not None and day < datetime.now(timezone.utc).date():
+            try:
+                self.minute_cache_dir.mkdir(parents=True, exist_ok=True)
+                np.savez(cache_file, times=times, closes=closes)
+            except OSError as e:
+                logger.warning(f"Could not cache minute bars for {symbol} on {day}: {e}")
+        
+        self._minute_bars[key] = bars
+        return bars
+    
+    @staticmethod
+    def _closest_closes(bars: Tuple[np.ndarray, np.ndarray], query_times: np.ndarray) -> np.ndarray:
+        """Close of the bar nearest to each query time (the earlier bar on ties)"""
+        times, closes = bars
+        right = np.clip(np.searchsorted(times, query_times), 0, len(times) - 1)
+        left = np.clip(right - 1, 0, len(times) - 1)
+        use_left = np.abs(query_times - times[left]) <= np.abs(times[right] - query_times)
+        return closes[np.where(use_left, left, right)]
+    
+    @staticmethod
+    def _spread_variation(size=None):
+        """
+        Small random variation to simulate bid-ask spread and micro-movements.
+        This prevents identical entry/exit prices on same-minute trades.
+        """
+        # Add 0.01% to 0.1% random variation (typical bid-ask spread)
+        return np.random.uniform(-0.001, 0.001, size=size)  # ±0.1%
+    
     def get_historical_price(self, symbol: str, timestamp: datetime, delay_minutes: int = 15) -> Optional[float]:
         """Get historical price with realistic delay simulation"""
         try:
             # Ensure timestamp is timezone-naive for yfinance compatibility
-            if timestamp.tzinfo is not None:
-                # Convert to UTC and make naive
-                timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            timestamp = self._to_utc_naive(timestamp)
             
             # Add delay to simulate yfinance data lag
             actual_time = timestamp + timedelta(minutes=delay_minutes)
             
             # Get data for the day
-            ticker = yf.Ticker(symbol)
-            start_date = timestamp.date()
-            end_date = start_date + timedelta(days=1)
-            
-            hist = ticker.history(start=start_date, end=end_date, interval='1m')
-            
-            if hist.empty:
+            bars = self.get_minute_bars(symbol, timestamp.date())
+            if bars is None:
                 logger.warning(f"No price data for {symbol} at {timestamp}")
                 return None
             
-            # Convert hist index to naive datetime for comparison
-            hist_times = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
-            
             # Find closest price to actual_time
-            time_diffs = np.abs(hist_times - actual_time)
-            closest_idx = np.argmin(time_diffs)
-            
-            # Add small random variation to simulate bid-ask spread and micro-movements
-            # This prevents identical entry/exit prices on same-minute trades
-            base_price = float(hist.iloc[closest_idx]['Close'])
-            
-            # Add 0.01% to 0.1% random variation (typical bid-ask spread)
-            variation = np.random.uniform(-0.001, 0.001)  # ±0.1%
-            price = base_price * (1 + variation)
+            query = np.array([np.datetime64(actual_time, 'ns')])
+            base_price = float(self._closest_closes(bars, query)[0])
+            price = base_price * (1 + self._spread_variation())
             
             logger.debug(f"Price for {symbol} at {actual_time}: ${price:.2f} (base: ${base_price:.2f})")
             return price
@@ -175,6 +239,63 @@ class RealisticTradingSimulator:
             logger.error(f"Error getting price for {symbol}: {e}")
             return None
     
+    def scan_position_exit(self, symbol: str, check_times: List[datetime]) -> Optional[Tuple[datetime, float, str]]:
+        """
+        Find the first check time at which the open position exits.
+        
+        Prices for every check come from the cached minute bars in one
+        vectorized lookup, and stop-loss, take-profit, time-limit and
+        market-close conditions are evaluated for all checks at once.
+        Spread noise is drawn in check order exactly as if each check had
+        fetched its own price, so seeded runs are reproducible.
+        
+        Returns:
+            (exit time, exit price, reason), or None if no check triggers an exit.
+        """
+        position = self.current_positions[symbol]
+        utc_times = [self._to_utc_naive(t) for t in check_times]
+        query_times = np.array([np.datetime64(t, 'ns') for t in utc_times])
+        
+        base_prices = np.full(len(check_times), np.nan)
+        for day in dict.fromkeys(t.date() for t in utc_times):
+            on_day = np.array([t.date() == day for t in utc_times])
+            bars = self.get_minute_bars(symbol, day)
+            if bars is not None:
+                base_prices[on_day] = self._closest_closes(bars, query_times[on_day])
+        
+        has_price = ~np.isnan(base_prices)
+        if not has_price.any():
+            return None
+        
+        # One spread draw per available quote, in check order
+        random_state = np.random.get_state()
+        prices = base_prices.copy()
+        prices[has_price] *= 1 + self._spread_variation(int(has_price.sum()))
+        
+        if position['action'] == 'BUY':
+            price_exit = (prices <= position['stop_loss']) | (prices >= position['take_profit'])
+        else:  # SELL (short)
+            price_exit = (prices >= position['stop_loss']) | (prices <= position['take_profit'])
+        
+        entry_time = np.datetime64(self._to_utc_naive(position['entry_time']), 'ns')
+        holding = query_times - entry_time
+        aest_times = query_times + np.timedelta64(10, 'h')
+        aest_minutes = (aest_times - aest_times.astype('datetime64[D]')).astype('timedelta64[m]').astype(int)
+        time_exit = holding >= np.timedelta64(4, 'h')
+        close_exit = (aest_minutes >= 15 * 60 + 45) & (holding >= np.timedelta64(30, 'm'))
+        
+        exits = np.flatnonzero(has_price & (price_exit | time_exit | close_exit))
+        if len(exits) == 0:
+            return None
+        first = exits[0]
+        
+        # Leave the random stream where per-check fetching would have left it
+        np.random.set_state(random_state)
+        self._spread_variation(int(has_price[:first + 1].sum()))
+        
+        exit_reason = self.check_exit_conditions(symbol, prices[first], check_times[first])
+        return check_times[first], float(prices[first]), exit_reason
+    
     def can_open_position(self, symbol: str, action: str) -> bool:
         """Check if we can open a new position"""
         # Check if symbol already has open position
@@ -354,22 +475,13 @@ class RealisticTradingSimulator:
             position = self.open_position(prediction, entry_price, actual_entry_time)
             
             # Monitor position for exits (simulate checking every 15 minutes from actual entry time)
-            check_time = actual_entry_time + timedelta(minutes=15)  # First check 15 min after actual entry
             max_check_time = actual_entry_time + timedelta(hours=4)  # Max 4 hours from actual entry
+            check_times = [actual_entry_time + timedelta(minutes=15 * i) for i in range(1, 17)]
             
-            while check_time <= max_check_time and symbol in self.current_positions:
-                # Get current price
-                current_price = self.get_historical_price(symbol, check_time, delay_minutes=0)
-                
-                if current_price:
-                    # Check exit conditions
-                    exit_reason = self.check_exit_conditions(symbol, current_price, check_time)
-                    
-                    if exit_reason:
-                        self.close_position(symbol, current_price, check_time, exit_reason)
-                        break
-                
-                check_time += timedelta(minutes=15)  # Check every 15 minutes
+            exit_result = self.scan_position_exit(symbol, check_times)
+            if exit_result:
+                exit_time, exit_price, exit_reason = exit_result
+                self.close_position(symbol, exit_price, exit_time, exit_reason)
             
             # Force close if still open at end of monitoring period
             if symbol in self.current_positions:
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Incremental Indicator State Test
+Checks that IndicatorState, fed one bar at a time, matches
+TechnicalAnalyzer._calculate_indicators recomputed over every prefix of the
+series (including the RSI and MACD warm-up boundaries), and that a state
+saved to and loaded from IndicatorStateStore carries on identically
+"""
+
+import math
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config.settings import Settings
+from app.core.analysis.indicator_state import IndicatorState, IndicatorStateStore
+from app.core.analysis.technical import TechnicalAnalyzer
+
+analyzer = TechnicalAnalyzer(Settings)
+
+
+def make_bars(count=260, seed=7):
+    """Random-walk daily bars with a flat stretch (zero RSI loss) and a zero-volume stretch"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    close[40:60] = close[40]
+    volume = rng.integers(100_000, 500_000, count).astype(float)
+    volume[80:105] = 0.0
+    index = pd.bdate_range('2024-01-01', periods=count, tz='Australia/Sydney')
+    return pd.DataFrame({'Close': close, 'Volume': volume}, index=index)
+
+
+def new_state():
+    return IndicatorState.from_settings('CBA.AX', '1d', Settings.TECHNICAL_INDICATORS)
+
+
+def flatten(indicators):
+    """{'macd': {'line': x}} -> {'macd.line': x}"""
+    flat = {}
+    for key, value in indicators.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                flat[f'{key}.{sub_key}'] = float(sub_value)
+        else:
+            flat[key] = float(value)
+    return flat
+
+
+def assert_indicators_close(actual, expected, context, rtol=1e-9, atol=1e-9):
+    actual, expected = flatten(actual), flatten(expected)
+    assert actual.keys() == expected.keys(), f"{context}: keys {sorted(actual)} != {sorted(expected)}"
+    for key in expected:
+        assert math.isclose(actual[key], expected[key], rel_tol=rtol, abs_tol=atol), \
+            f"{context}: {key} {actual[key]!r} != {expected[key]!r}"
+
+
+def test_streamed_bars_match_full_recomputation():
+    bars = make_bars()
+    state = new_state()
+    for n in range(1, len(bars) + 1):
+        close, volume = bars['Close'].iloc[n - 1], bars['Volume'].iloc[n - 1]
+        expected = analyzer._calculate_indicators(bars.iloc[:n])
+
+        # The forming bar evaluated as pending must agree before it is committed
+        assert_indicators_close(state.indicators(close, volume), expected, f"pending bar {n}")
+        state.update(close, volume, bars.index[n - 1])
+        assert_indicators_close(state.indicators(), expected, f"prefix of {n} bars")
+
+
+def test_warm_up_boundaries():
+    bars = make_bars(count=60)
+    state = new_state()
+    values = {}
+    for n in range(1, len(bars) + 1):
+        state.update(bars['Close'].iloc[n - 1], bars['Volume'].iloc[n - 1], bars.index[n - 1])
+        values[n] = state.indicators()
+
+    rsi_period = Settings.TECHNICAL_INDICATORS['RSI']['period']
+    macd_slow = Settings.TECHNICAL_INDICATORS['MACD']['slow']
+    assert values[rsi_period - 1]['rsi'] == 50.0, "RSI reported before its window is full"
+    assert values[rsi_period]['rsi'] == analyzer._calculate_rsi(bars['Close'].iloc[:rsi_period])
+    assert values[rsi_period + 1]['rsi'] != 50.0, "RSI still neutral after warm-up"
+    assert values[macd_slow - 1]['macd'] == {'line': 0.0, 'signal': 0.0, 'histogram': 0.0}
+    assert values[macd_slow]['macd']['line'] != 0.0, "MACD still zero after warm-up"
+    for n in (rsi_period - 1, rsi_period, macd_slow - 1, macd_slow):
+        assert_indicators_close(values[n], analyzer._calculate_indicators(bars.iloc[:n]), f"boundary {n}")
+
+
+def test_update_frame_matches_bar_by_bar():
+    bars = make_bars()
+    by_bar = new_state()
+    for timestamp, row in bars.iterrows():
+        by_bar.update(row['Close'], row['Volume'], timestamp)
+
+    by_frame = new_state()
+    assert by_frame.update_frame(bars.iloc[:150]) == 150
+    assert by_frame.is_continuation(bars.iloc[149:])
+    assert by_frame.update_frame(bars) == len(bars) - 150, "already committed bars added again"
+    assert_indicators_close(by_frame.indicators(), by_bar.indicators(), "update_frame", rtol=0, atol=0)
+
+
+def test_store_round_trip():
+    bars = make_bars()
+    store = IndicatorStateStore(os.path.join(tempfile.mkdtemp(), 'indicator_state.db'))
+
+    state = new_state()
+    state.update_frame(bars.iloc[:200])
+    store.save(state)
+    loaded = store.load('CBA.AX', '1d')
+    assert loaded is not None, "saved state not found"
+    assert loaded.bars == state.bars and loaded.last_timestamp == state.last_timestamp
+    assert loaded.matches_settings(Settings.TECHNICAL_INDICATORS)
+    # JSON round-trips floats to within an ulp or so
+    assert_indicators_close(loaded.indicators(), state.indicators(), "after load", rtol=1e-12, atol=1e-12)
+
+    # Both copies carry on with the remaining bars and still agree with a full recomputation
+    assert loaded.is_continuation(bars.iloc[199:])
+    state.update_frame(bars)
+    loaded.update_frame(bars)
+    expected = analyzer._calculate_indicators(bars)
+    assert_indicators_close(loaded.indicators(), state.indicators(), "continued after load", rtol=1e-12, atol=1e-12)
+    assert_indicators_close(loaded.indicators(), expected, "continued vs full recomputation")
+
+    assert store.load('CBA.AX', '1h') is None
+    store.delete('CBA.AX')
+    assert store.load('CBA.AX', '1d') is None
+
+
+if __name__ == "__main__":
+    print("📐 INCREMENTAL INDICATOR STATE TEST")
+    print("=" * 50)
+    tests = [
+        test_streamed_bars_match_full_recomputation,
+        test_warm_up_boundaries,
+        test_update_frame_matches_bar_by_bar,
+        test_store_round_trip,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
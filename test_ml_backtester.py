@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ML Backtester Sweep Test
+Checks that a backtest which ends while still holding a position is marked
+to the last aligned price, so sweep_parameters ranks it by its real return
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.ml.prediction.backtester import MLBacktester
+
+
+def make_aligned():
+    """Ten daily rows on a rising price: buy, sell, then a buy that is never closed"""
+    days = pd.date_range('2025-03-03', periods=10, freq='D')
+    return {
+        'dates': days.date,
+        'day_numbers': days.to_numpy().astype('datetime64[D]'),
+        'prices': np.linspace(100.0, 118.0, 10),
+        'probabilities': np.array([0.9, 0.6, 0.6, 0.3, 0.6, 0.9, 0.6, 0.6, 0.6, 0.6]),
+        'known': np.ones(10, dtype=bool)
+    }
+
+
+def make_backtester(aligned):
+    backtester = object.__new__(MLBacktester)
+    backtester.prepare_backtest_data = lambda *args, **kwargs: aligned
+    return backtester
+
+
+def test_open_position_is_marked_to_market():
+    aligned = make_aligned()
+    result = make_backtester(aligned)._run_backtest(aligned, 0.5, 0.5)
+    prices = aligned['prices']
+    
+    expected = 10000 * prices[3] / prices[0] * prices[-1] / prices[4]
+    assert np.isclose(result['final_capital'], expected), f"{result['final_capital']} != {expected}"
+    assert result['total_return'] > 0, f"total_return {result['total_return']}"
+    assert result['open_position']['entry_price'] == prices[4]
+    assert result['open_position']['mark_price'] == prices[-1]
+    assert len(result['trades']) == 1, "open position counted as a closed trade"
+
+
+def test_sweep_ranks_open_position_by_marked_return():
+    aligned = make_aligned()
+    sweep = make_backtester(aligned).sweep_parameters('CBA.AX', '2025-03-01', '2025-03-31',
+                                                      thresholds=[0.5], holding_periods=[None, 1, 3])
+    by_holding = {None if pd.isna(h) else int(h): r
+                  for h, r in zip(sweep['max_holding_days'], sweep['total_return'])}
+    assert (sweep['total_return'] > 0).all(), f"returns {by_holding}"
+    # Holding until the end of the rising series beats forced early exits
+    assert pd.isna(sweep['max_holding_days'].iloc[0]), f"ranking {by_holding}"
+
+
+def test_closed_trades_unchanged():
+    aligned = make_aligned()
+    aligned['probabilities'][-1] = 0.3
+    result = make_backtester(aligned)._run_backtest(aligned, 0.5, 0.5)
+    prices = aligned['prices']
+    expected = 10000 * prices[3] / prices[0] * prices[-1] / prices[4]
+    assert result['open_position'] is None
+    assert np.isclose(result['final_capital'], expected)
+    assert len(result['trades']) == 2
+
+
+if __name__ == "__main__":
+    print("📈 ML BACKTESTER SWEEP TEST")
+    print("=" * 50)
+    tests = [
+        test_open_position_is_marked_to_market,
+        test_sweep_ranks_open_position_by_marked_return,
+        test_closed_trades_unchanged,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+News Source Collection Test
+Checks that _collect_from_sources applies one deadline to the whole fan-out
+and has joined its workers when it returns, that each worker thread gets its
+own HTTP session, and that get_all_news only reports total failure when no
+source returned any articles
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config.settings import Settings
+from app.core.sentiment.news_analyzer import NewsSentimentAnalyzer
+from app.utils.rate_limiter import HostRateLimiter
+
+
+def make_analyzer(deadline_seconds=1):
+    """Analyzer with only the state the collection fan-out needs"""
+    analyzer = object.__new__(NewsSentimentAnalyzer)
+    analyzer.settings = Settings()
+    analyzer.settings.NEWS_SOURCES = dict(Settings.NEWS_SOURCES)
+    analyzer.settings.NEWS_SOURCES['collection'] = dict(
+        Settings.NEWS_SOURCES['collection'], collection_deadline_seconds=deadline_seconds
+    )
+    analyzer.session_headers = {'User-Agent': 'test'}
+    analyzer._thread_state = threading.local()
+    analyzer.rate_limiter = HostRateLimiter(rate_per_second=1000, burst=10)
+    analyzer._remove_duplicate_news = lambda news: news
+    return analyzer
+
+
+def article(title):
+    return {'title': title, 'summary': '', 'source': 'test', 'url': '', 'published': ''}
+
+
+def test_one_deadline_and_workers_joined():
+    analyzer = make_analyzer(deadline_seconds=1)
+    finished = []
+
+    def slow(symbol):
+        # A well-behaved source: gives up at its next request once the deadline passes
+        while True:
+            time.sleep(0.05)
+            deadline = analyzer._thread_state.deadline
+            if time.monotonic() >= deadline:
+                finished.append('slow')
+                raise TimeoutError('deadline passed')
+
+    started = time.monotonic()
+    results = analyzer._collect_from_sources(
+        [('Fast', lambda symbol: [article('fast')]), ('Slow', slow)], 'CBA.AX'
+    )
+    elapsed = time.monotonic() - started
+
+    assert [name for name, _, _ in results] == ['Fast', 'Slow'], f"results out of order: {results}"
+    assert results[0][1] == [article('fast')] and results[0][2] is None
+    assert results[1][1] == [] and 'timed out' in results[1][2], f"slow source not timed out: {results[1]}"
+    assert elapsed < 2, f"collection took {elapsed:.1f}s for a 1s deadline"
+    assert finished == ['slow'], "overrunning worker still running after return"
+
+
+def test_each_worker_has_its_own_session():
+    analyzer = make_analyzer()
+    barrier = threading.Barrier(3)
+    sessions = []
+
+    def source(symbol):
+        barrier.wait(timeout=5)
+        sessions.append(analyzer._get_session())
+        assert analyzer._get_session() is sessions[-1]
+        return []
+
+    analyzer._collect_from_sources([(f'S{i}', source) for i in range(3)], 'CBA.AX')
+    assert len({id(session) for session in sessions}) == 3, "workers share a session"
+    assert all(session.headers['User-Agent'] == 'test' for session in sessions)
+
+
+def test_all_sources_failed_when_none_returned_data():
+    analyzer = make_analyzer()
+
+    def broken(symbol):
+        raise ConnectionError('unreachable')
+
+    quiet = lambda symbol: []
+    analyzer._scraper_sources = lambda: [('Quiet', quiet)]
+    analyzer._fetch_rss_news = broken
+    analyzer._fetch_yahoo_news = quiet
+    try:
+        analyzer.get_all_news(['CBA'], 'CBA.AX')
+        assert False, "no RuntimeError when no source returned articles"
+    except RuntimeError as e:
+        assert 'All news sources failed' in str(e)
+
+    # One source with articles is enough, even if others failed
+    analyzer._fetch_yahoo_news = lambda symbol: [article('yahoo')]
+    assert analyzer.get_all_news(['CBA'], 'CBA.AX') == [article('yahoo')]
+
+
+if __name__ == "__main__":
+    print("📰 NEWS SOURCE COLLECTION TEST")
+    print("=" * 50)
+    tests = [
+        test_one_deadline_and_workers_joined,
+        test_each_worker_has_its_own_session,
+        test_all_sources_failed_when_none_returned_data,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
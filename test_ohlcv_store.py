@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+OHLCV Store Period Test
+Checks that the periods existing callers pass to the local OHLCV store
+('1d', '3d', '5d', f"{days}d", '2wk', '30d', '3mo', ...) are served, and
+that day periods count trading sessions rather than calendar days
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.data.ohlcv_store import OHLCVStore
+
+EXCHANGE_TZ = 'Australia/Sydney'
+
+
+def fake_history(symbol, interval, period=None, start=None):
+    """Daily bars stamped at exchange midnight for the last 400 weekdays"""
+    today = pd.Timestamp(datetime.now(timezone.utc).astimezone().date())
+    days = pd.bdate_range(end=today, periods=400).tz_localize(EXCHANGE_TZ)
+    bars = pd.DataFrame({
+        'Open': np.arange(len(days), dtype=float),
+        'High': np.arange(len(days), dtype=float) + 1,
+        'Low': np.arange(len(days), dtype=float) - 1,
+        'Close': np.arange(len(days), dtype=float),
+        'Volume': 1000.0,
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=days)
+    if start is not None:
+        bars = bars[bars.index >= pd.Timestamp(start)]
+    elif period is not None:
+        sessions = {'1d': 1, '5d': 5}.get(period)
+        if sessions:
+            bars = bars.iloc[-sessions:]
+    return bars
+
+
+def make_store():
+    db_path = os.path.join(tempfile.mkdtemp(), 'ohlcv_store.db')
+    return OHLCVStore(db_path=db_path, refresh_seconds=3600, fetcher=fake_history)
+
+
+def test_day_periods_count_sessions():
+    store = make_store()
+    for days in (1, 3, 5, 7, 30):
+        bars = store.get_history('CBA.AX', period=f"{days}d", interval='1d')
+        assert len(bars) == days, f"{days}d returned {len(bars)} bars"
+        assert (bars.index.dayofweek < 5).all(), f"{days}d returned weekend bars"
+
+
+def test_callers_periods_are_supported():
+    store = make_store()
+    # news_impact, paper_trading_simulator, news_processor, market_data, backtester
+    for period in ('1d', '3d', '5d', '30d', '2wk', '1mo', '3mo', '6mo', '1y', 'ytd'):
+        bars = store.get_history('CBA.AX', period=period, interval='1d')
+        assert not bars.empty, f"{period} returned no bars"
+
+
+def test_week_and_month_periods_use_calendar_span():
+    store = make_store()
+    bars = store.get_history('CBA.AX', period='2wk', interval='1d')
+    assert bars.index[0] >= pd.Timestamp.now(tz='UTC') - timedelta(days=15), "2wk window too long"
+    assert 8 <= len(bars) <= 11, f"2wk returned {len(bars)} bars"
+
+
+def test_unknown_period_passes_through():
+    seen = []
+
+    def fetcher(symbol, interval, period=None, start=None):
+        seen.append(period)
+        return fake_history(symbol, interval, period='5d')
+
+    store = OHLCVStore(db_path=os.path.join(tempfile.mkdtemp(), 'ohlcv_store.db'),
+                       refresh_seconds=3600, fetcher=fetcher)
+    bars = store.get_history('CBA.AX', period='15min', interval='1d')
+    assert seen == ['15min'], f"fetcher saw {seen}"
+    assert len(bars) == 5, f"pass-through returned {len(bars)} bars"
+
+
+if __name__ == "__main__":
+    print("📦 OHLCV STORE PERIOD TEST")
+    print("=" * 50)
+    tests = [
+        test_day_periods_count_sessions,
+        test_callers_periods_are_supported,
+        test_week_and_month_periods_use_calendar_span,
+        test_unknown_period_passes_through,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Sentiment History Migration Test
+Checks that the legacy sentiment_history.json is imported exactly once when
+several SentimentHistoryManager instances start on the same data directory
+at the same time, and that records can be stored and read back afterwards
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.sentiment.history import SentimentHistoryManager
+
+
+def make_settings(records=None):
+    data_dir = tempfile.mkdtemp()
+    if records is not None:
+        with open(os.path.join(data_dir, 'sentiment_history.json'), 'w') as f:
+            json.dump(records, f)
+    return SimpleNamespace(DATA_DIR=data_dir)
+
+
+def legacy_records(count=50):
+    return [{'symbol': 'CBA.AX', 'timestamp': f'2026-10-01T10:{minute:02d}:00',
+             'sentiment_score': 0.1, 'confidence': 0.8} for minute in range(count)]
+
+
+def test_concurrent_startup_migrates_once():
+    settings = make_settings(legacy_records())
+    barrier = threading.Barrier(6)
+    errors = []
+
+    def start():
+        try:
+            barrier.wait(timeout=5)
+            SentimentHistoryManager(settings)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=start) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, f"startup failed: {errors}"
+    history = SentimentHistoryManager(settings).get_sentiment_history('CBA.AX')
+    assert len(history) == 50, f"legacy records imported {len(history) / 50:g} times"
+
+
+def test_store_after_migration():
+    manager = SentimentHistoryManager(make_settings(legacy_records(3)))
+    manager.store_sentiment('ANZ.AX', 0.4, 0.9)
+    assert len(manager.get_sentiment_history('CBA.AX')) == 3
+    [record] = manager.get_sentiment_history('ANZ.AX')
+    assert (record['sentiment_score'], record['confidence']) == (0.4, 0.9)
+
+
+if __name__ == "__main__":
+    print("🗃️ SENTIMENT HISTORY MIGRATION TEST")
+    print("=" * 50)
+    tests = [
+        test_concurrent_startup_migrates_once,
+        test_store_after_migration,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Article Sentiment Scoring Test
+Checks that score_article_texts returns one score list per input text when
+some texts are already in the persistent score cache or the in-memory memo
+and others have to be scored in the same call
+"""
+
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from app.core.sentiment.news_analyzer import NewsSentimentAnalyzer
+from app.core.sentiment.score_cache import SentimentScoreCache
+
+
+def make_analyzer(score_cache=None):
+    """Analyzer with only the state score_article_texts needs (no transformer)"""
+    analyzer = object.__new__(NewsSentimentAnalyzer)
+    analyzer.vader = SentimentIntensityAnalyzer()
+    analyzer.transformer_pipelines = {}
+    analyzer.score_cache = score_cache
+    analyzer._article_score_memo = OrderedDict()
+    analyzer._article_score_memo_size = 100
+    return analyzer
+
+
+def make_cache():
+    return SentimentScoreCache(os.path.join(tempfile.mkdtemp(), 'sentiment_score_cache.db'))
+
+
+def test_new_and_persisted_texts_in_one_call():
+    cache = make_cache()
+    make_analyzer(cache).score_article_texts(['ANZ dividend cut'])
+    
+    # A new analyzer has an empty memo, so 'ANZ dividend cut' comes from the score cache
+    analyzer = make_analyzer(cache)
+    scores = analyzer.score_article_texts(['CBA profit surges', 'ANZ dividend cut'])
+    assert len(scores) == 2, f"returned {len(scores)} score lists"
+    assert scores[0] and scores[1], f"missing scores: {scores}"
+    assert scores[0][1] > 0 > scores[1][1], f"unexpected VADER scores: {scores}"
+
+
+def test_new_and_memoised_texts_in_one_call():
+    analyzer = make_analyzer(make_cache())
+    first = analyzer.score_article_texts(['ANZ dividend cut'])
+    scores = analyzer.score_article_texts(['CBA profit surges', 'ANZ dividend cut', 'CBA profit surges'])
+    assert scores[1] == first[0], "memoised score changed"
+    assert scores[0] == scores[2], "duplicate text scored differently"
+
+
+def test_cached_scores_match_fresh_scores():
+    cache = make_cache()
+    fresh = make_analyzer(None).score_article_texts(['Westpac fined over breaches'])
+    make_analyzer(cache).score_article_texts(['Westpac fined over breaches'])
+    cached = make_analyzer(cache).score_article_texts(['Westpac fined over breaches'])
+    assert cached == fresh, f"{cached} != {fresh}"
+
+
+if __name__ == "__main__":
+    print("📰 ARTICLE SENTIMENT SCORING TEST")
+    print("=" * 50)
+    tests = [
+        test_new_and_persisted_texts_in_one_call,
+        test_new_and_memoised_texts_in_one_call,
+        test_cached_scores_match_fresh_scores,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)